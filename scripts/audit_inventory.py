@@ -5,12 +5,18 @@ Protocol: v4.3 (Zero-Trust Edition)
 
 This script orchestrates the global data asset audit, generates reports,
 and produces physical evidence for the zero-trust verification protocol.
+
+Usage:
+    python scripts/audit_inventory.py                        # incremental via the metadata index
+    python scripts/audit_inventory.py --since 2026-10-01     # only check files modified since
+    python scripts/audit_inventory.py --no-index             # full re-probe, no index
 """
 
 import sys
 import os
 import json
 import logging
+import argparse
 from pathlib import Path
 from datetime import datetime
 
@@ -57,8 +63,25 @@ def ensure_output_directory() -> Path:
     return task_dir
 
 
-def main():
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Global data asset audit (Task #110)")
+    parser.add_argument('--since', type=datetime.fromisoformat, default=None,
+                        help="Only check files modified at or after this ISO date/time; "
+                             "older files are reported from the index")
+    parser.add_argument('--index', default=None,
+                        help="Metadata index path (default: <output dir>/ASSET_INDEX.db)")
+    parser.add_argument('--no-index', action='store_true',
+                        help="Probe every file and do not read or write the index")
+    parser.add_argument('--workers', type=int, default=AssetAuditor.DEFAULT_IO_WORKERS,
+                        help="Threads for directory listing and file probing")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
     """Main execution flow."""
+    args = parse_args(argv)
+
     # Setup logging
     logger = setup_logging()
 
@@ -76,7 +99,9 @@ def main():
 
         # Create auditor instance
         logger.info("\nInitializing AssetAuditor...")
-        auditor = AssetAuditor(logger=logger)
+        index_path = None if args.no_index else (args.index or str(output_dir / 'ASSET_INDEX.db'))
+        auditor = AssetAuditor(logger=logger, index_path=index_path, max_workers=args.workers)
+        logger.info(f"Metadata index: {index_path or 'disabled'}")
 
         # Get data roots to scan
         data_roots = auditor._get_default_roots()
@@ -86,7 +111,8 @@ def main():
 
         # Execute full scan
         logger.info("\nStarting comprehensive data asset scan...")
-        results = auditor.scan_all(data_roots)
+        results = auditor.scan_all(data_roots, since=args.since)
+        auditor.close()
 
         logger.info(f"\n✓ Scan completed successfully")
         logger.info(f"✓ Total files scanned: {len(results)}")
@@ -120,6 +146,7 @@ def main():
         logger.info(f"Total Files Scanned: {len(results)}")
         logger.info(f"Total Size: {json_report['total_size_mb']:.2f} MB")
         logger.info(f"Scan Duration: {json_report['scan_duration_seconds']:.2f} seconds")
+        logger.info(f"Scan Stats: {json_report['scan_stats']}")
 
         quality = json_report['data_quality']
         logger.info(f"Quality Stats:")
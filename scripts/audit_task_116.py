@@ -112,26 +112,24 @@ class TestOptunaOptimizer(unittest.TestCase):
             logger.error(f"{RED}❌ [Test 002] OptunaOptimizer 初始化失败: {e}{RESET}")
             self.fail(f"OptunaOptimizer 初始化错误: {e}")
 
-    def test_003_objective_function_exists(self):
-        """测试 objective 函数存在且可调用"""
+    def test_003_search_space_exists(self):
+        """测试搜索空间函数存在且返回完整参数"""
         try:
-            from src.model.optimization import OptunaOptimizer
+            import optuna
+            from src.model.optimization import xgboost_search_space
 
-            optimizer = OptunaOptimizer(
-                X_train=self.X_train,
-                X_test=self.X_test,
-                y_train=self.y_train,
-                y_test=self.y_test,
-                n_trials=5,
-                random_state=42
-            )
+            params = xgboost_search_space(optuna.trial.FixedTrial({
+                'max_depth': 5, 'learning_rate': 0.1, 'n_estimators': 100,
+                'subsample': 0.8, 'colsample_bytree': 0.8, 'colsample_bylevel': 0.8,
+                'min_child_weight': 1, 'gamma': 0.0, 'reg_alpha': 0.1, 'reg_lambda': 1.0,
+            }), random_state=42)
 
-            self.assertTrue(hasattr(optimizer, 'objective'))
-            self.assertTrue(callable(optimizer.objective))
-            logger.info(f"{GREEN}✅ [Test 003] objective 函数存在且可调用{RESET}")
+            self.assertEqual(params['n_estimators'], 100)
+            self.assertEqual(params['random_state'], 42)
+            logger.info(f"{GREEN}✅ [Test 003] 搜索空间函数存在且可调用{RESET}")
         except Exception as e:
-            logger.error(f"{RED}❌ [Test 003] objective 函数测试失败: {e}{RESET}")
-            self.fail(f"objective 函数测试错误: {e}")
+            logger.error(f"{RED}❌ [Test 003] 搜索空间函数测试失败: {e}{RESET}")
+            self.fail(f"搜索空间函数测试错误: {e}")
 
     def test_004_optimize_method_exists(self):
         """测试 optimize 方法存在"""
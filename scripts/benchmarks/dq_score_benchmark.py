@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+DQ 评分基准测试: 逐维度 pandas 计算 (旧实现) vs 共用列统计 (FrameProfile)
+功能: 生成 N 行分钟级特征数据, 分别用旧实现和新实现计算 DQ Score,
+      校验五个维度得分逐位相同, 并报告各自耗时。
+依赖: pandas, numpy
+
+用法:
+    python scripts/benchmarks/dq_score_benchmark.py --rows 10000000 --features 10
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.monitoring.dq_score import DQScoreCalculator  # noqa: E402
+
+DIMENSIONS = ('completeness', 'accuracy', 'consistency', 'timeliness', 'validity')
+
+
+class LegacyDQScoreCalculator(DQScoreCalculator):
+    """旧实现: 每个维度各自扫描 DataFrame (用于对照耗时与得分)"""
+
+    def calculate_completeness_score(self, df, profile=None):
+        if df.empty:
+            return 0.0
+        total_cells = df.shape[0] * df.shape[1]
+        missing_rate = df.isnull().sum().sum() / total_cells
+        col_completeness = (1 - df.isnull().sum() / len(df))
+        good_cols_ratio = (col_completeness > 0.95).sum() / len(df.columns)
+        row_completeness = (1 - df.isnull().sum(axis=1) / len(df.columns))
+        good_rows_ratio = (row_completeness > 0.90).sum() / len(df)
+        score = (1 - missing_rate) * 50 + good_cols_ratio * 30 + good_rows_ratio * 20
+        return min(100.0, max(0.0, score))
+
+    def calculate_accuracy_score(self, df, profile=None):
+        if df.empty:
+            return 0.0
+        score = 100.0
+        numeric_cols = df.select_dtypes(include=[np.number]).columns
+        if len(numeric_cols) > 0:
+            inf_count = np.isinf(df[numeric_cols]).sum().sum()
+            total_numeric_cells = len(df) * len(numeric_cols)
+            inf_rate = inf_count / total_numeric_cells if total_numeric_cells > 0 else 0
+            score -= inf_rate * 30
+        if 'date' in df.columns and 'symbol' in df.columns:
+            duplicates = df.duplicated(subset=['date', 'symbol']).sum()
+            score -= duplicates / len(df) * 30
+        outlier_count = 0
+        for col in numeric_cols:
+            Q1 = df[col].quantile(0.25)
+            Q3 = df[col].quantile(0.75)
+            IQR = Q3 - Q1
+            if IQR > 0:
+                outlier_count += ((df[col] < (Q1 - 3 * IQR)) | (df[col] > (Q3 + 3 * IQR))).sum()
+        outlier_rate = outlier_count / (len(df) * len(numeric_cols)) if len(numeric_cols) > 0 else 0
+        score -= outlier_rate * 40
+        return min(100.0, max(0.0, score))
+
+    def calculate_consistency_score(self, df, profile=None):
+        if df.empty:
+            return 0.0
+        score = 100.0
+        if 'date' in df.columns:
+            dates = pd.to_datetime(df.sort_values('date')['date'])
+            non_continuous = (dates.diff() > pd.Timedelta(days=1) * 3).sum()
+            non_continuous_rate = non_continuous / len(dates) if len(dates) > 1 else 0
+            score -= non_continuous_rate * 40
+        mixed_type_cols = 0
+        for col in df.columns:
+            if df[col].dtype == 'object':
+                null_before = df[col].isnull().sum()
+                null_after = pd.to_numeric(df[col], errors='coerce').isnull().sum()
+                if null_after > null_before:
+                    mixed_type_cols += 1
+        score -= mixed_type_cols / len(df.columns) * 30
+        irregular_names = sum(1 for col in df.columns if ' ' in col or col != col.lower())
+        score -= irregular_names / len(df.columns) * 30
+        return min(100.0, max(0.0, score))
+
+    def calculate_timeliness_score(self, df, expected_update_time=None, profile=None):
+        if df.empty:
+            return 0.0
+        if 'date' not in df.columns:
+            return 100.0
+        dates = pd.to_datetime(df['date'])
+        return self.score_date_range(dates.min(), dates.max())
+
+    def calculate_dq_score(self, df, expected_update_time=None, profile=None):
+        scores = [
+            self.calculate_completeness_score(df),
+            self.calculate_accuracy_score(df),
+            self.calculate_consistency_score(df),
+            self.calculate_timeliness_score(df, expected_update_time),
+            self.calculate_validity_score(df),
+        ]
+        return dict(zip(DIMENSIONS, scores))
+
+
+def make_frame(rows: int, features: int, seed: int = 0) -> pd.DataFrame:
+    """分钟级 OHLCV + 特征列 (约 1% 缺失, 少量异常值与无穷值)"""
+    rng = np.random.default_rng(seed)
+    close = 100 + rng.standard_normal(rows).cumsum() * 0.01
+    df = pd.DataFrame({
+        'date': pd.date_range('2005-01-01', periods=rows, freq='min'),
+        'symbol': 'EURUSD',
+        'open': close,
+        'high': close + 0.1,
+        'low': close - 0.1,
+        'close': close,
+        'volume': rng.integers(0, 1000, rows),
+    })
+    for i in range(features):
+        x = rng.standard_normal(rows)
+        x[rng.random(rows) < 0.01] = np.nan
+        x[rng.random(rows) < 0.0001] = 50.0
+        x[rng.random(rows) < 0.00001] = np.inf
+        df[f'feat_{i}'] = x
+    return df
+
+
+def dimension_scores(calculator: DQScoreCalculator, df: pd.DataFrame) -> dict:
+    """五个维度的原始 (未取整) 得分"""
+    profile = calculator.profile(df)
+    return {
+        'completeness': calculator.calculate_completeness_score(df, profile),
+        'accuracy': calculator.calculate_accuracy_score(df, profile),
+        'consistency': calculator.calculate_consistency_score(df, profile),
+        'timeliness': calculator.calculate_timeliness_score(df, None, profile),
+        'validity': calculator.calculate_validity_score(df),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--features", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=None, help="数值列并行线程数 (默认 CPU 核数)")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    df = make_frame(args.rows, args.features)
+    print(f"rows={len(df):,} columns={len(df.columns)}")
+
+    config = {} if args.workers is None else {'max_workers': args.workers}
+    start = time.perf_counter()
+    legacy = LegacyDQScoreCalculator(config).calculate_dq_score(df)
+    legacy_sec = time.perf_counter() - start
+
+    start = time.perf_counter()
+    profiled = dimension_scores(DQScoreCalculator(config), df)
+    profiled_sec = time.perf_counter() - start
+
+    for name in DIMENSIONS:
+        mark = "==" if legacy[name] == profiled[name] else "!="
+        print(f"{name:<13} legacy={legacy[name]!r:<22} {mark} profile={profiled[name]!r}")
+    print(f"legacy   {legacy_sec:7.3f}s")
+    print(f"profile  {profiled_sec:7.3f}s  ({legacy_sec / profiled_sec:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
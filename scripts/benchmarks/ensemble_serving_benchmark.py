@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+集成模型单 tick 推理基准测试: EnsemblePredictor (每 tick 重建窗口 + 对齐) vs EnsembleServingEngine
+功能: 对每个 tick 分别用两种方式计算最新样本的集成概率, 报告端到端延迟 (p50/p99)
+      以及 EnsembleServingEngine 各组件 (gather / lgb / lstm / meta) 的延迟;
+      另测多品种一次批量推理的总耗时。
+依赖: lightgbm, scikit-learn; 安装 torch 时 LSTM 使用 LSTMModel, 否则使用 NumPy 序列模型代替
+
+用法:
+    python scripts/benchmarks/ensemble_serving_benchmark.py --ticks 2000 --symbols 16
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import lightgbm as lgb  # noqa: E402
+from sklearn.linear_model import LogisticRegression  # noqa: E402
+
+from src.model.ensemble.alignment import DataAlignmentHandler  # noqa: E402
+from src.model.ensemble.ensemble import EnsemblePredictor  # noqa: E402
+from src.model.ensemble.serving import EnsembleServingEngine  # noqa: E402
+
+N_FEATURES = 23
+SEQ_LEN = 60
+
+
+class BinaryLGB:
+    """LGBPredictor 的换算逻辑 (二分类概率 -> 3 类), 不依赖 torch 导入"""
+
+    def __init__(self, booster):
+        self.model = booster
+
+    def predict_proba(self, X):
+        p = self.model.predict(X)
+        return np.column_stack([1 - p, np.zeros_like(p), p])
+
+
+class NumpySequenceModel:
+    """无 torch 时的序列模型: 时间加权池化 + 线性层 + softmax"""
+
+    def __init__(self, seed=0):
+        rng = np.random.default_rng(seed)
+        self.time_weights = rng.random(SEQ_LEN).astype(np.float32)
+        self.w = rng.normal(size=(N_FEATURES, 3)).astype(np.float32)
+
+    def predict_proba(self, X):
+        z = np.einsum('nlf,l->nf', X, self.time_weights) @ self.w
+        z -= z.max(axis=1, keepdims=True)
+        e = np.exp(z)
+        return e / e.sum(axis=1, keepdims=True)
+
+
+def build_learners(seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(5000, N_FEATURES)).astype(np.float32)
+    y = (X[:, 0] + X[:, 1] > 0).astype(int)
+    booster = lgb.train({'objective': 'binary', 'num_leaves': 31, 'verbose': -1},
+                        lgb.Dataset(X, y), num_boost_round=100)
+    try:
+        from src.model.dl.models import LSTMModel
+        from src.model.ensemble.predictors import LSTMPredictor
+        sequence = LSTMPredictor(LSTMModel(N_FEATURES, hidden_dim=64, num_layers=2, output_size=3))
+    except ImportError:
+        sequence = NumpySequenceModel(seed)
+    meta = LogisticRegression(max_iter=1000).fit(rng.random((1000, 6)), rng.integers(-1, 2, 1000))
+    return BinaryLGB(booster), sequence, meta
+
+
+def percentiles(values_ms):
+    p50, p99 = np.percentile(values_ms, [50, 99])
+    return f"p50={p50:8.3f}ms  p99={p99:8.3f}ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--ticks", type=int, default=2000)
+    parser.add_argument("--symbols", type=int, default=16)
+    parser.add_argument("--torch-threads", type=int, default=1)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    lgb_predictor, sequence_predictor, meta = build_learners()
+    ensemble = EnsemblePredictor(lgb_predictor, sequence_predictor,
+                                 DataAlignmentHandler(sequence_length=SEQ_LEN), use_stacking=True)
+    ensemble.meta_learner = meta
+    engine = EnsembleServingEngine.from_ensemble(ensemble, N_FEATURES, torch_threads=args.torch_threads)
+    print(f"sequence learner: {type(sequence_predictor).__name__}")
+
+    rng = np.random.default_rng(1)
+    stream = rng.normal(size=(SEQ_LEN + args.ticks, N_FEATURES)).astype(np.float32)
+    engine.seed("EURUSD", stream[:SEQ_LEN - 1])
+
+    legacy, serving = [], []
+    max_diff = 0.0
+    for t in range(SEQ_LEN - 1, len(stream)):
+        start = time.perf_counter()
+        window = stream[t + 1 - SEQ_LEN:t + 1]
+        expected = ensemble.predict_proba(window, window[None])[-1]
+        legacy.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        got = engine.on_tick("EURUSD", stream[t])
+        serving.append((time.perf_counter() - start) * 1000)
+        max_diff = max(max_diff, float(np.abs(got - expected).max()))
+
+    print(f"EnsemblePredictor     {percentiles(legacy)}")
+    print(f"EnsembleServingEngine {percentiles(serving)}  (max |diff| {max_diff:.2e})")
+    for name, stats in engine.latency_stats().items():
+        print(f"  {name:<7} p50={stats['p50_ms']:8.3f}ms  p99={stats['p99_ms']:8.3f}ms")
+
+    symbols = [f"SYM{i}" for i in range(args.symbols)]
+    for i, symbol in enumerate(symbols):
+        engine.seed(symbol, rng.normal(size=(SEQ_LEN, N_FEATURES)).astype(np.float32))
+    batch = []
+    for _ in range(200):
+        start = time.perf_counter()
+        engine.predict_proba(symbols)
+        batch.append((time.perf_counter() - start) * 1000)
+    print(f"batch of {args.symbols} symbols  {percentiles(batch)}")
+    engine.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+事件总线消费吞吐基准测试
+功能: 向 Stream 写入 N 条事件, 以不同 batch_size 消费 (空处理函数),
+      测量 events/sec 与每批 Redis 命令数, 验证吞吐随批大小增长
+依赖: redis, prometheus_client; 默认使用 fakeredis, --redis-url 指向真实 Redis
+
+用法:
+    python scripts/benchmarks/event_consumer_benchmark.py --events 5000
+    python scripts/benchmarks/event_consumer_benchmark.py --redis-url redis://localhost:6379/15
+"""
+
+import argparse
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+
+import redis
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src"))
+
+from event_bus.base_consumer import BaseEventConsumer  # noqa: E402
+
+STREAM = "bench:events"
+GROUP = "bench-group"
+BATCH_SIZES = (1, 10, 100, 500)
+
+
+class NoopConsumer(BaseEventConsumer):
+    """空处理消费者, 统计 Redis 命令数"""
+
+    def __init__(self, make_client, **kwargs):
+        self._make_client = make_client
+        self.command_count = 0
+        super().__init__(stream_key=STREAM, consumer_group=GROUP, consumer_name="bench", block_ms=1, **kwargs)
+
+    def _connect(self):
+        client = self._make_client()
+        execute = client.execute_command
+
+        def counting(*args, **kwargs):
+            self.command_count += 1
+            return execute(*args, **kwargs)
+
+        client.execute_command = counting
+        self.redis_client = client
+
+    def process_event(self, event_id, event_data):
+        return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Event consumer batching benchmark")
+    parser.add_argument("--events", type=int, default=5000)
+    parser.add_argument("--redis-url", type=str, default=None)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    if args.redis_url:
+        def make_client():
+            return redis.Redis.from_url(args.redis_url, decode_responses=True)
+    else:
+        import fakeredis
+        server = fakeredis.FakeServer()
+
+        def make_client():
+            return fakeredis.FakeRedis(server=server, decode_responses=True)
+
+    results = {}
+    for batch_size in BATCH_SIZES:
+        client = make_client()
+        client.delete(STREAM)
+        pipe = client.pipeline(transaction=False)
+        for i in range(args.events):
+            pipe.xadd(STREAM, {"n": str(i), "payload": json.dumps({"price": 1.0 + i * 1e-5})})
+        pipe.execute()
+
+        consumer = NoopConsumer(make_client, batch_size=batch_size)
+        consumer.command_count = 0
+        start = time.perf_counter()
+        while consumer.stats["events"] < args.events:
+            consumer._consume_new_messages()
+        elapsed = time.perf_counter() - start
+
+        results[batch_size] = {
+            "events_per_sec": round(args.events / elapsed, 1),
+            "commands_per_event": round(consumer.command_count / args.events, 3),
+        }
+        client.delete(STREAM)
+
+    print(f"{'batch':>6} {'events/s':>12} {'cmds/event':>11}")
+    for batch_size, r in results.items():
+        print(f"{batch_size:>6} {r['events_per_sec']:>12,.0f} {r['commands_per_event']:>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+事件总线发布吞吐基准测试
+功能: 对比逐条 produce() 与 produce_batch() 在不同 chunk_size 下的 events/sec,
+      以及 AsyncEventProducer 的批量发布
+依赖: redis, prometheus_client; 默认使用 fakeredis, --redis-url 指向真实 Redis
+      (真实网络往返下 pipeline 的收益更明显)
+
+用法:
+    python scripts/benchmarks/event_producer_benchmark.py --events 5000
+    python scripts/benchmarks/event_producer_benchmark.py --redis-url redis://localhost:6379/15
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from pathlib import Path
+
+import redis
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src"))
+
+from event_bus.base_producer import AsyncEventProducer, BaseEventProducer  # noqa: E402
+
+STREAM = "bench:produced"
+CHUNK_SIZES = (1, 10, 100, 500)
+
+
+def make_producers(redis_url):
+    if redis_url:
+        def sync_client():
+            return redis.Redis.from_url(redis_url, decode_responses=True)
+
+        def async_client():
+            return redis.asyncio.Redis.from_url(redis_url, decode_responses=True)
+    else:
+        import fakeredis
+        server = fakeredis.FakeServer()
+
+        def sync_client():
+            return fakeredis.FakeRedis(server=server, decode_responses=True)
+
+        def async_client():
+            return fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+
+    class Producer(BaseEventProducer):
+        def _connect(self):
+            self.redis_client = sync_client()
+
+    class AsyncProducer(AsyncEventProducer):
+        def _connect(self):
+            self.redis_client = async_client()
+
+    return Producer(STREAM), AsyncProducer(STREAM)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Event producer batching benchmark")
+    parser.add_argument("--events", type=int, default=5000)
+    parser.add_argument("--redis-url", type=str, default=None)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    producer, async_producer = make_producers(args.redis_url)
+    events = [
+        {"news_id": str(i), "title": f"headline {i}", "tickers": ["AAPL", "TSLA"], "score": 0.5}
+        for i in range(args.events)
+    ]
+
+    def timed(label, fn):
+        producer.redis_client.delete(STREAM)
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        print(f"{label:>24} {args.events / elapsed:>12,.0f} events/s")
+
+    print(f"{'path':>24} {'throughput':>19}")
+    timed("produce() loop", lambda: [producer.produce(e, "bench") for e in events])
+    for chunk_size in CHUNK_SIZES:
+        timed(f"produce_batch({chunk_size})",
+              lambda: producer.produce_batch(events, "bench", chunk_size=chunk_size))
+    timed("async produce_batch(500)",
+          lambda: asyncio.run(async_producer.produce_batch(events, "bench", chunk_size=500)))
+
+    producer.redis_client.delete(STREAM)
+
+
+if __name__ == "__main__":
+    main()
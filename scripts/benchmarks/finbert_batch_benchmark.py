@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+FinBERT 批量推理基准测试
+功能: 模拟一次新闻突发 (N 篇文章 × 每篇若干 ticker, 部分标题重复),
+      对比逐条分析 (每个 ticker 窗口一次前向计算) 与批量分析
+      (长度分桶 + 动态 padding + LRU 缓存) 的 CPU 吞吐
+依赖: torch, transformers
+模型: 在临时目录生成一个随机初始化的微型 BERT (2 层, hidden=128),
+      通过 FinBERTAnalyzer 的本地模型路径 (cache_dir/ProsusAI--finbert) 加载
+
+用法:
+    python scripts/benchmarks/finbert_batch_benchmark.py --articles 200 --tickers 3
+"""
+
+import argparse
+import json
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import torch
+from transformers import BertConfig, BertForSequenceClassification, BertTokenizerFast
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src"))
+
+from sentiment_service.finbert_analyzer import FinBERTAnalyzer  # noqa: E402
+
+WORDS = (
+    "stock shares surge fall earnings beat miss guidance revenue profit loss "
+    "analyst upgrade downgrade market rally slump quarter growth outlook demand "
+    "supply chain delay record high low investors expect strong weak sales"
+).split()
+TICKERS = ["AAPL", "TSLA", "MSFT", "AMZN", "GOOG", "NVDA", "META", "NFLX"]
+
+
+def build_tiny_finbert(cache_dir: Path) -> None:
+    """在 cache_dir/ProsusAI--finbert 写入微型 BERT 分类模型与分词器"""
+    model_dir = cache_dir / "ProsusAI--finbert"
+    model_dir.mkdir(parents=True)
+    vocab = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]", ".", ",", "$"]
+    vocab += WORDS + [t.lower() for t in TICKERS]
+    (model_dir / "vocab.txt").write_text("\n".join(vocab))
+    BertTokenizerFast(vocab_file=str(model_dir / "vocab.txt")).save_pretrained(str(model_dir))
+
+    torch.manual_seed(0)
+    config = BertConfig(
+        vocab_size=len(vocab), hidden_size=128, num_hidden_layers=2, num_attention_heads=2,
+        intermediate_size=256, max_position_embeddings=512, num_labels=3,
+    )
+    BertForSequenceClassification(config).save_pretrained(str(model_dir))
+
+
+def news_burst(n_articles: int, n_tickers: int, duplicate_rate: float, seed: int = 0):
+    """生成 [(全文, ticker)], 文章长度 20~300 词, 部分标题重复"""
+    rng = np.random.default_rng(seed)
+    articles = []
+    for i in range(n_articles):
+        if articles and rng.random() < duplicate_rate:
+            articles.append(articles[rng.integers(len(articles))])
+            continue
+        tickers = list(rng.choice(TICKERS, size=n_tickers, replace=False))
+        words = list(rng.choice(WORDS, size=int(rng.integers(20, 300))))
+        for ticker in tickers:
+            words.insert(int(rng.integers(len(words))), f"${ticker}")
+        articles.append((" ".join(words), tickers))
+    return [(text, ticker) for text, tickers in articles for ticker in tickers]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FinBERT batching benchmark")
+    parser.add_argument("--articles", type=int, default=200)
+    parser.add_argument("--tickers", type=int, default=3)
+    parser.add_argument("--duplicate-rate", type=float, default=0.3)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--threads", type=int, default=None, help="torch CPU 线程数")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    items = news_burst(args.articles, args.tickers, args.duplicate_rate)
+    results = {"windows": len(items)}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        build_tiny_finbert(Path(tmp))
+
+        # 原实现: 每个 (文章, ticker) 窗口单独分词 + 前向计算, 无缓存
+        legacy = FinBERTAnalyzer(device="cpu", cache_dir=tmp, cache_size=0)
+        start = time.perf_counter()
+        for text, ticker in items:
+            legacy.analyze_with_ticker_context(text, ticker)
+        results["per_window_s"] = time.perf_counter() - start
+
+        batched = FinBERTAnalyzer(device="cpu", cache_dir=tmp)
+        start = time.perf_counter()
+        batched.analyze_ticker_contexts(items, batch_size=args.batch_size)
+        results["batched_cold_s"] = time.perf_counter() - start
+        results["forward_passes"] = batched.forward_passes
+
+        start = time.perf_counter()
+        batched.analyze_ticker_contexts(items, batch_size=args.batch_size)
+        results["batched_warm_s"] = time.perf_counter() - start
+
+    for key in ("per_window_s", "batched_cold_s", "batched_warm_s"):
+        results[key.replace("_s", "_windows_per_sec")] = round(len(items) / results[key], 1)
+    results["speedup_cold"] = round(results["per_window_s"] / results["batched_cold_s"], 1)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
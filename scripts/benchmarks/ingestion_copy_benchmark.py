@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+历史行情写入基准测试: ORM bulk_save_objects vs COPY + staging upsert
+功能: 对本地 PostgreSQL/TimescaleDB 的 market_data 表分别用两种方式写入同样的数据,
+      报告 rows/sec 与加速比 (目标 ≥10×)
+依赖: 本地 Postgres, 连接参数读取 DB_HOST / DB_PORT / POSTGRES_USER / POSTGRES_PASSWORD / POSTGRES_DB
+
+用法:
+    python scripts/benchmarks/ingestion_copy_benchmark.py --rows 200000 --symbols 50
+"""
+
+import argparse
+import json
+import sys
+import time
+from decimal import Decimal
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.data_nexus.database.connection import PostgresConnection  # noqa: E402
+from src.data_nexus.ingestion.copy_sink import (  # noqa: E402
+    MARKET_DATA_COLUMNS,
+    CopyIngestionSink,
+)
+from src.data_nexus.models import Base, MarketData  # noqa: E402
+
+
+def make_frame(rows: int, symbols: int, prefix: str) -> pd.DataFrame:
+    """生成 rows 行合成 OHLCV 数据 (symbols 个品种, 每品种连续日线)"""
+    per_symbol = max(1, rows // symbols)
+    times = pd.date_range("1990-01-01", periods=per_symbol, freq="D", tz="UTC")
+    rng = np.random.default_rng(42)
+    n = per_symbol * symbols
+    close = 100 + rng.standard_normal(n).cumsum() * 0.1
+    return pd.DataFrame({
+        "time": np.tile(times, symbols),
+        "symbol": np.repeat([f"{prefix}{i:04d}.US" for i in range(symbols)], per_symbol),
+        "open": close.round(4),
+        "high": (close + 0.5).round(4),
+        "low": (close - 0.5).round(4),
+        "close": close.round(4),
+        "adjusted_close": close.round(4),
+        "volume": rng.integers(1_000, 1_000_000, n),
+    })
+
+
+def bench_orm(conn: PostgresConnection, df: pd.DataFrame, batch: int) -> float:
+    """原写入路径: MarketData 对象 + session.bulk_save_objects()"""
+    start = time.perf_counter()
+    with conn.get_session() as session:
+        for i in range(0, len(df), batch):
+            objects = [
+                MarketData(
+                    time=r.time, symbol=r.symbol,
+                    open=Decimal(str(r.open)), high=Decimal(str(r.high)),
+                    low=Decimal(str(r.low)), close=Decimal(str(r.close)),
+                    adjusted_close=Decimal(str(r.adjusted_close)), volume=int(r.volume),
+                )
+                for r in df.iloc[i:i + batch].itertuples(index=False)
+            ]
+            session.bulk_save_objects(objects)
+            session.commit()
+    return time.perf_counter() - start
+
+
+def bench_copy(conn: PostgresConnection, df: pd.DataFrame, batch: int) -> float:
+    """新写入路径: CopyIngestionSink (COPY + staging upsert)"""
+    sink = CopyIngestionSink(conn.engine, "market_data", MARKET_DATA_COLUMNS, ["time", "symbol"])
+    start = time.perf_counter()
+    for i in range(0, len(df), batch):
+        sink.write(df.iloc[i:i + batch])
+    return time.perf_counter() - start
+
+
+def cleanup(conn: PostgresConnection, prefix: str) -> None:
+    with conn.engine.begin() as db:
+        db.execute(text("DELETE FROM market_data WHERE symbol LIKE :p"), {"p": f"{prefix}%"})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ORM vs COPY ingestion benchmark")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--symbols", type=int, default=20)
+    parser.add_argument("--batch", type=int, default=5000)
+    args = parser.parse_args()
+
+    conn = PostgresConnection()
+    Base.metadata.create_all(conn.engine, tables=[MarketData.__table__])
+
+    results = {}
+    for name, fn, prefix in (("orm", bench_orm, "BENCHORM"), ("copy", bench_copy, "BENCHCPY")):
+        df = make_frame(args.rows, args.symbols, prefix)
+        cleanup(conn, prefix)
+        elapsed = fn(conn, df, args.batch)
+        cleanup(conn, prefix)
+        results[name] = {
+            "rows": len(df),
+            "seconds": round(elapsed, 3),
+            "rows_per_sec": round(len(df) / elapsed, 1),
+        }
+        print(f"{name:>5}: {len(df):,} rows in {elapsed:.2f}s → {len(df) / elapsed:,.0f} rows/s")
+
+    speedup = results["copy"]["rows_per_sec"] / results["orm"]["rows_per_sec"]
+    results["speedup"] = round(speedup, 1)
+    print(f"speedup: {speedup:.1f}×")
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
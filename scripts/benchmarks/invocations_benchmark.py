@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+/invocations 推理吞吐基准测试
+功能: 在进程内 (FastAPI TestClient) 对 1 / 100 / 10k 行请求分别测量
+      JSON、.npy、Arrow IPC 三种载荷的延迟与 rows/sec,
+      并与原逐行路径 (map_sentinel_to_model + predictor.predict) 对比
+依赖: xgboost, fastapi; Arrow 载荷需 pyarrow
+模型: 默认在随机数据上训练一个 100 棵树的小模型, 可用 --model/--metadata 指定真实模型
+
+用法:
+    python scripts/benchmarks/invocations_benchmark.py --repeat 5
+"""
+
+import argparse
+import importlib
+import io
+import json
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import xgboost as xgb
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from src.model.predict import PricePredictor  # noqa: E402
+from src.serving.feature_map import SENTINEL_DIM, FeatureMapper, map_sentinel_to_model  # noqa: E402
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+serving_app = importlib.import_module("src.serving.app")
+
+BATCH_SIZES = (1, 100, 10_000)
+
+
+def synthetic_predictor(workdir: Path) -> PricePredictor:
+    """训练一个与默认 15 特征匹配的小模型"""
+    features = FeatureMapper().model_features
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(5000, len(features)))
+    y = (X[:, 1] + X[:, 12] > 0).astype(int)
+    booster = xgb.train(
+        {"objective": "binary:logistic", "max_depth": 6},
+        xgb.DMatrix(X, label=y, feature_names=features),
+        num_boost_round=100,
+    )
+    booster.save_model(str(workdir / "model.json"))
+    (workdir / "meta.json").write_text(json.dumps({"features": features}))
+    return PricePredictor(workdir / "model.json", workdir / "meta.json")
+
+
+def encode(rows: np.ndarray, kind: str):
+    """返回 (请求参数 dict)"""
+    if kind == "json":
+        return {"json": {"dataframe_split": {"data": [[row.tolist(), []] for row in rows]}}}
+    if kind == "npy":
+        buf = io.BytesIO()
+        np.save(buf, rows)
+        return {"content": buf.getvalue(), "headers": {"content-type": "application/x-npy"}}
+    table = pa.table({f"f{i}": rows[:, i] for i in range(SENTINEL_DIM)})
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return {
+        "content": sink.getvalue().to_pybytes(),
+        "headers": {"content-type": "application/vnd.apache.arrow.stream"},
+    }
+
+
+def timed(fn, repeat: int) -> float:
+    """最优耗时 (秒)"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="/invocations throughput benchmark")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--model", type=str, default=None)
+    parser.add_argument("--metadata", type=str, default=None)
+    parser.add_argument("--skip-legacy-above", type=int, default=10_000,
+                        help="逐行基线只测到该行数 (逐行路径很慢)")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.model:
+            predictor = PricePredictor(args.model, args.metadata)
+        else:
+            predictor = synthetic_predictor(Path(tmp))
+
+    serving_app.model_predictor = predictor
+    serving_app.ENABLE_MOCK_INFERENCE = False
+    client = TestClient(serving_app.app)
+
+    kinds = ["json", "npy"] + (["arrow"] if pa is not None else [])
+    results = {}
+    rng = np.random.default_rng(1)
+    for n in BATCH_SIZES:
+        rows = rng.normal(size=(n, SENTINEL_DIM))
+        results[n] = {}
+
+        if n <= args.skip_legacy_above:
+            def legacy():
+                for row in rows:
+                    predictor.predict(map_sentinel_to_model(list(row), predictor.feature_names))
+            results[n]["legacy_per_row"] = timed(legacy, 1 if n > 100 else args.repeat)
+
+        for kind in kinds:
+            request = encode(rows, kind)
+            results[n][kind] = timed(lambda: client.post("/invocations", **request), args.repeat)
+
+    print(f"{'rows':>7} {'path':>15} {'ms':>10} {'rows/s':>12}")
+    for n, paths in results.items():
+        for path, seconds in paths.items():
+            print(f"{n:>7} {path:>15} {seconds * 1e3:>10.2f} {n / seconds:>12,.0f}")
+
+    print(json.dumps({
+        str(n): {path: {"ms": round(s * 1e3, 3), "rows_per_sec": round(n / s, 1)} for path, s in paths.items()}
+        for n, paths in results.items()
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+在线特征计算延迟基准测试
+功能: 对 OnlineFeatureCalculator 逐 tick 调用 update() / get_feature_vector(),
+      报告单次耗时 (µs) 的均值与分位数 (目标: update < 10 µs)
+
+用法:
+    python scripts/benchmarks/online_features_benchmark.py --ticks 200000
+"""
+
+import argparse
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.inference.online_features import OnlineFeatureCalculator  # noqa: E402
+
+
+def make_ticks(n: int, seed: int = 42):
+    """生成 n 个合成 tick (close, high, low, volume)"""
+    rng = np.random.default_rng(seed)
+    close = 1.1 + np.cumsum(rng.normal(0, 1e-4, n))
+    high = close + np.abs(rng.normal(0, 5e-5, n))
+    low = close - np.abs(rng.normal(0, 5e-5, n))
+    volume = rng.integers(1, 1000, n).astype(float)
+    return list(zip(close.tolist(), high.tolist(), low.tolist(), volume.tolist()))
+
+
+def bench(ticks, read: bool) -> np.ndarray:
+    """返回每个 tick 的耗时 (µs)"""
+    calc = OnlineFeatureCalculator()
+    for tick in ticks[:100]:  # 预热, 填满窗口
+        calc.update(*tick)
+
+    timings = np.empty(len(ticks))
+    clock = time.perf_counter_ns
+    for i, tick in enumerate(ticks):
+        start = clock()
+        calc.update(*tick)
+        if read:
+            calc.get_feature_vector()
+        timings[i] = clock() - start
+    return timings / 1000.0
+
+
+def summarize(timings: np.ndarray) -> dict:
+    return {
+        "mean_us": round(float(timings.mean()), 2),
+        "p50_us": round(float(np.percentile(timings, 50)), 2),
+        "p99_us": round(float(np.percentile(timings, 99)), 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OnlineFeatureCalculator latency benchmark")
+    parser.add_argument("--ticks", type=int, default=100_000)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    ticks = make_ticks(args.ticks)
+
+    results = {
+        "update": summarize(bench(ticks, read=False)),
+        "update+vector": summarize(bench(ticks, read=True)),
+    }
+    for name, stats in results.items():
+        print(f"{name:>14}: mean {stats['mean_us']:.2f} µs, p50 {stats['p50_us']:.2f} µs, "
+              f"p99 {stats['p99_us']:.2f} µs")
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
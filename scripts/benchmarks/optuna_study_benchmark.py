@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Optuna 超参数搜索吞吐基准测试: 原串行驱动 vs StudyRunner
+功能: 在同一合成数据上运行相同次数的试验 (相同 XGBoost 搜索空间与 TimeSeriesSplit 3 折 F1 目标),
+      分别计时:
+        serial  - 原驱动的串行目标函数 (每折每试验由 XGBClassifier 重建 DMatrix, 无中途剪枝)
+        runner  - StudyRunner: memmap 共享矩阵, 每折 DMatrix 只构建一次, 每轮上报 + 剪枝, journal 存储
+      报告 trials/hour、剪枝次数与最佳 F1。
+依赖: optuna, xgboost, scikit-learn
+
+用法:
+    python scripts/benchmarks/optuna_study_benchmark.py --trials 30 --rows 20000 --jobs 1 2
+"""
+
+import argparse
+import logging
+import sys
+import time
+from functools import partial
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import optuna  # noqa: E402
+import xgboost as xgb  # noqa: E402
+from optuna.samplers import TPESampler  # noqa: E402
+from sklearn.metrics import f1_score  # noqa: E402
+from sklearn.model_selection import TimeSeriesSplit  # noqa: E402
+
+from src.model.optimization import xgboost_search_space  # noqa: E402
+from src.model.study_runner import StudyRunner  # noqa: E402
+
+
+def make_data(rows, features, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(rows, features)).astype(np.float32)
+    y = (X[:, 0] + 0.5 * X[:, 1] + rng.normal(size=rows) > 0).astype(int)
+    return X, y
+
+
+def serial_objective(trial, X, y, seed):
+    """原驱动的目标函数: 每折新建 XGBClassifier 训练, 加权 F1 取均值"""
+    params = xgboost_search_space(trial, seed)
+    scores = []
+    for train_idx, val_idx in TimeSeriesSplit(n_splits=3).split(X):
+        model = xgb.XGBClassifier(**params)
+        model.fit(X[train_idx], y[train_idx], verbose=False)
+        scores.append(f1_score(y[val_idx], model.predict(X[val_idx]), average='weighted', zero_division=0))
+    return float(np.mean(scores))
+
+
+def run_serial(X, y, trials, seed):
+    """原驱动: optuna 内存 Study + 串行目标函数 (无中途上报)"""
+    study = optuna.create_study(direction='maximize', sampler=TPESampler(seed=seed, n_startup_trials=10))
+    start = time.perf_counter()
+    study.optimize(partial(serial_objective, X=X, y=y, seed=seed), n_trials=trials)
+    elapsed = time.perf_counter() - start
+    return {'elapsed_seconds': elapsed, 'trials_per_hour': trials / elapsed * 3600,
+            'pruned': 0, 'best_value': study.best_value}
+
+
+def run_runner(X, y, trials, seed, n_jobs, pruner):
+    with StudyRunner(X, y, list(TimeSeriesSplit(n_splits=3).split(X)),
+                     partial(xgboost_search_space, random_state=seed), pruner=pruner,
+                     n_jobs=n_jobs, max_rounds=500, seed=seed) as runner:
+        return runner.optimize(trials)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--trials", type=int, default=30)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--features", type=int, default=20)
+    parser.add_argument("--jobs", type=int, nargs="+", default=[1])
+    parser.add_argument("--pruner", default="median", choices=["median", "hyperband", "none"])
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+    optuna.logging.set_verbosity(optuna.logging.WARNING)
+
+    X, y = make_data(args.rows, args.features, args.seed)
+    print(f"data: {args.rows} rows x {args.features} features, {args.trials} trials")
+
+    results = [("serial driver", run_serial(X, y, args.trials, args.seed))]
+    for n_jobs in args.jobs:
+        results.append((f"runner n_jobs={n_jobs}",
+                        run_runner(X, y, args.trials, args.seed, n_jobs, args.pruner)))
+
+    baseline = results[0][1]['trials_per_hour']
+    for name, r in results:
+        print(f"{name:<18} {r['elapsed_seconds']:8.1f}s  {r['trials_per_hour']:8.0f} trials/hour  "
+              f"x{r['trials_per_hour'] / baseline:5.2f}  pruned={r['pruned']:<3d} best F1={r['best_value']:.4f}")
+
+
+if __name__ == "__main__":
+    main()
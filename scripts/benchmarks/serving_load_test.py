@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+服务端并发负载测试
+功能: N 个并发客户端持续请求 /invocations (单行), 可同时混入慢速
+      /features/historical 客户端, 测量 /invocations 的 p50 / p99 延迟与吞吐,
+      验证慢查询不会阻塞推理请求
+依赖: httpx, fastapi, xgboost
+模式: 默认进程内 (httpx ASGITransport, 合成模型 + 模拟慢速特征服务);
+      --url 指向运行中的服务时只发请求
+
+用法:
+    python scripts/benchmarks/serving_load_test.py --clients 200 --duration 5 --slow-clients 20
+"""
+
+import argparse
+import asyncio
+import importlib
+import json
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from src.serving.feature_map import SENTINEL_DIM  # noqa: E402
+from invocations_benchmark import synthetic_predictor  # noqa: E402
+
+serving_app = importlib.import_module("src.serving.app")
+
+
+class SlowFeatureService:
+    """模拟阻塞的 Feast 离线查询"""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+
+    def get_historical_frame(self, symbols, features, start_date, end_date):
+        time.sleep(self.delay)
+        return pd.DataFrame(columns=["symbol", "event_timestamp"] + features), self.delay * 1000
+
+
+async def invocation_client(client, payload, deadline, latencies, errors):
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        response = await client.post("/invocations", json=payload)
+        if response.status_code == 200:
+            latencies.append(time.perf_counter() - start)
+        else:
+            errors.append(response.status_code)
+
+
+async def historical_client(client, index, deadline, counter):
+    # 不同的日期区间: 每个客户端都是独立查询, 不被 single-flight 合并
+    payload = {
+        "symbols": ["EURUSD"], "features": ["rsi_14"],
+        "start_date": "2024-01-01", "end_date": f"2024-02-{index % 28 + 1:02d}",
+    }
+    while time.perf_counter() < deadline:
+        await client.post("/features/historical", json=payload)
+        counter.append(1)
+
+
+async def run(args) -> dict:
+    if args.url:
+        transport = httpx.AsyncHTTPTransport(limits=httpx.Limits(max_connections=args.clients + args.slow_clients))
+        base_url = args.url
+    else:
+        transport = httpx.ASGITransport(app=serving_app.app)
+        base_url = "http://loadtest"
+
+    row = np.random.default_rng(0).normal(size=SENTINEL_DIM).tolist()
+    payload = {"instances": [[row]]}
+    latencies, errors, slow = [], [], []
+
+    async with httpx.AsyncClient(transport=transport, base_url=base_url, timeout=60) as client:
+        deadline = time.perf_counter() + args.duration
+        await asyncio.gather(
+            *(invocation_client(client, payload, deadline, latencies, errors) for _ in range(args.clients)),
+            *(historical_client(client, i, deadline, slow) for i in range(args.slow_clients)),
+        )
+        metrics = (await client.get("/metrics/serving")).json()
+
+    lat = np.array(latencies) * 1e3
+    return {
+        "clients": args.clients,
+        "slow_clients": args.slow_clients,
+        "requests": len(latencies),
+        "errors": len(errors),
+        "throughput_rps": round(len(latencies) / args.duration, 1),
+        "p50_ms": round(float(np.percentile(lat, 50)), 2) if len(lat) else None,
+        "p99_ms": round(float(np.percentile(lat, 99)), 2) if len(lat) else None,
+        "historical_requests": len(slow),
+        "serving_metrics": metrics,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serving concurrency load test")
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--slow-clients", type=int, default=0,
+                        help="并发的慢速 /features/historical 客户端数")
+    parser.add_argument("--slow-delay", type=float, default=0.5,
+                        help="模拟离线查询耗时 (秒, 仅进程内模式)")
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--url", type=str, default=None, help="运行中的服务地址")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    tmp = tempfile.TemporaryDirectory()
+    if not args.url:
+        serving_app.model_predictor = synthetic_predictor(Path(tmp.name))
+        serving_app.ENABLE_MOCK_INFERENCE = False
+        serving_app.feature_service = SlowFeatureService(args.slow_delay)
+
+    result = asyncio.run(run(args))
+    tmp.cleanup()
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+单行推理延迟微基准: 旧路径 (dict -> DataFrame -> DMatrix) vs 编译树 (CompiledBooster)
+功能: 对 PricePredictor.predict(dict)、predict_vector、inplace_predict 与
+      LiveStrategyAdapter.generate_signal (predict_proba vs 编译路径) 测量单行 p50/p99 延迟,
+      并报告批量 predict_proba 的 rows/sec 与新旧输出最大误差
+依赖: xgboost, pandas
+模型: 在随机数据上训练 --trees 棵、深度 --depth 的二分类模型 (--features 个特征)
+
+用法:
+    python scripts/benchmarks/single_row_inference_benchmark.py --trees 200 --depth 6 --iterations 2000
+"""
+
+import argparse
+import json
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.model.predict import PricePredictor  # noqa: E402
+from src.strategy.live_adapter import LiveStrategyAdapter  # noqa: E402
+
+
+def train(workdir: Path, n_features: int, trees: int, depth: int):
+    """训练 Booster (PricePredictor) 与 XGBClassifier (LiveStrategyAdapter) 两个模型"""
+    names = [f"f{i}" for i in range(n_features)]
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(20_000, n_features))
+    X[rng.random(X.shape) < 0.02] = np.nan
+    y = (np.nan_to_num(X[:, 0]) + rng.normal(size=len(X)) > 0).astype(int)
+
+    params = {"objective": "binary:logistic", "max_depth": depth, "eta": 0.1}
+    booster = xgb.train(params, xgb.DMatrix(X, label=y, feature_names=names), num_boost_round=trees)
+    booster.save_model(str(workdir / "model.json"))
+    (workdir / "meta.json").write_text(json.dumps({"features": names}))
+
+    clf = xgb.XGBClassifier(n_estimators=trees, max_depth=depth, learning_rate=0.1)
+    clf.fit(X, y)
+    clf.save_model(str(workdir / "clf.json"))
+    return names, X
+
+
+def legacy_predict(predictor: PricePredictor, features: dict) -> float:
+    """旧实现: 每次构造单行 DataFrame 与 DMatrix"""
+    df = pd.DataFrame([features])[predictor.feature_names]
+    return float(predictor.model.predict(xgb.DMatrix(df, feature_names=predictor.feature_names))[0])
+
+
+def measure(fn, rows, iterations: int):
+    """返回 (p50, p99) 微秒"""
+    for row in rows[:50]:
+        fn(row)
+    samples = np.empty(iterations)
+    for i in range(iterations):
+        row = rows[i % len(rows)]
+        start = time.perf_counter()
+        fn(row)
+        samples[i] = time.perf_counter() - start
+    return np.percentile(samples, 50) * 1e6, np.percentile(samples, 99) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--features", type=int, default=18)
+    parser.add_argument("--trees", type=int, default=200)
+    parser.add_argument("--depth", type=int, default=6)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        names, X = train(workdir, args.features, args.trees, args.depth)
+        predictor = PricePredictor(workdir / "model.json", workdir / "meta.json")
+        adapter = LiveStrategyAdapter(str(workdir / "clf.json"))
+        compiled = adapter.compiled
+
+        rows = X[:1000]
+        dicts = [dict(zip(names, row)) for row in rows]
+        row32 = rows.astype(np.float32)
+
+        def slow_signal(row):
+            adapter.compiled = None
+            try:
+                return adapter.generate_signal(row)
+            finally:
+                adapter.compiled = compiled
+
+        cases = [
+            ("PricePredictor legacy dict->DMatrix", lambda d: legacy_predict(predictor, d), dicts),
+            ("PricePredictor.predict(dict)", predictor.predict, dicts),
+            ("PricePredictor.predict_vector", predictor.predict_vector, rows),
+            ("Booster.inplace_predict (1 row)",
+             lambda r: predictor.model.inplace_predict(r.reshape(1, -1)), row32),
+            ("LiveStrategyAdapter predict_proba", slow_signal, rows),
+            ("LiveStrategyAdapter compiled", adapter.generate_signal, rows),
+        ]
+        print(f"trees={args.trees} depth={args.depth} features={args.features} "
+              f"compiled={predictor.compiled.info()}")
+        for name, fn, data in cases:
+            p50, p99 = measure(fn, data, args.iterations)
+            print(f"{name:<38} p50={p50:8.1f}us  p99={p99:8.1f}us")
+
+        legacy = np.array([legacy_predict(predictor, d) for d in dicts])
+        fast = np.array([predictor.predict_vector(r)["probability"] for r in rows])
+        print(f"max |legacy - compiled| = {np.abs(legacy - fast).max():.2e}")
+
+        batch = X[:10_000]
+        start = time.perf_counter()
+        probabilities = predictor.predict_proba(batch)
+        elapsed = time.perf_counter() - start
+        print(f"predict_proba batch: {len(batch) / elapsed:,.0f} rows/sec ({probabilities.dtype})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+轨道隔离基准测试: 阻塞式 RateLimiter vs asyncio 原生 AsyncRateLimiter
+功能: BTC 轨道被远超限额的订单压满, 同时 EUR (FX) 轨道按低于限额的节奏下单,
+      对比两种限流实现下 EUR 订单的提交延迟 (p50 / p99 / max)。
+      阻塞式实现在协程里 time.sleep 忙等, 会冻结整个事件循环; 异步实现应使
+      EUR 延迟与 BTC 是否饱和无关。
+依赖: 无 (纯进程内, 不连接 MT5)
+
+用法:
+    python scripts/benchmarks/track_isolation_benchmark.py --fx-orders 100 --crypto-orders 500
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.trading import AssetType, DispatcherConfig, Order, OrderSide, OrderType, TrackConfig  # noqa: E402
+from src.trading import TrackDispatcher  # noqa: E402
+from src.trading.core.limiter import RateLimiter  # noqa: E402
+
+
+class BlockingRateLimiter:
+    """旧实现: 在协程中调用同步 wait_and_acquire (阻塞事件循环)"""
+
+    def __init__(self, requests_per_second: int):
+        self._limiter = RateLimiter(requests_per_second)
+        self._limiter.wait_and_acquire = self._legacy_wait
+
+    def _legacy_wait(self, tokens: int = 1):
+        while not self._limiter.acquire(tokens):
+            time.sleep(0.01)
+
+    async def acquire(self, tokens: int = 1) -> float:
+        self._limiter.wait_and_acquire(tokens)
+        return 0.0
+
+    def get_metrics(self):
+        return {}
+
+
+def make_dispatcher(rate: int, mode: str) -> TrackDispatcher:
+    """EUR / BTC 两条轨道, 并发上限足够大, 只由速率限制约束"""
+    config = DispatcherConfig(track_configs={
+        asset: TrackConfig(
+            track_id=f"TRACK_{asset.value}", asset_type=asset,
+            max_concurrent=1000, rate_limit_per_second=rate, timeout_seconds=300,
+        )
+        for asset in (AssetType.EUR, AssetType.BTC)
+    })
+    dispatcher = TrackDispatcher(config)
+    if mode == "blocking":
+        for track in dispatcher.tracks.values():
+            track.rate_limiter = BlockingRateLimiter(rate)
+    return dispatcher
+
+
+async def run_scenario(mode: str, rate: int, fx_orders: int, fx_interval: float,
+                       crypto_orders: int) -> dict:
+    """返回 EUR 轨道延迟统计 (毫秒, 相对计划发送时刻)"""
+    dispatcher = make_dispatcher(rate, mode)
+
+    crypto = [
+        asyncio.create_task(dispatcher.dispatch(
+            Order(asset_type=AssetType.BTC, order_type=OrderType.MARKET,
+                  side=OrderSide.BUY, quantity=0.01)
+        ))
+        for _ in range(crypto_orders)
+    ]
+
+    # 延迟从计划发送时刻算起: 事件循环被冻结导致的发送推迟也计入
+    fx_latencies = []
+    start = time.perf_counter()
+    for i in range(fx_orders):
+        scheduled = start + i * fx_interval
+        await asyncio.sleep(max(0.0, scheduled - time.perf_counter()))
+        result = await dispatcher.dispatch(
+            Order(asset_type=AssetType.EUR, order_type=OrderType.MARKET,
+                  side=OrderSide.BUY, quantity=0.1)
+        )
+        assert result.success
+        fx_latencies.append((time.perf_counter() - scheduled) * 1000)
+
+    for task in crypto:
+        task.cancel()
+    await asyncio.gather(*crypto, return_exceptions=True)
+    dispatcher.shutdown_all()
+
+    fx_latencies.sort()
+    return {
+        "mode": mode,
+        "fx_orders": len(fx_latencies),
+        "fx_p50_ms": round(statistics.median(fx_latencies), 3),
+        "fx_p99_ms": round(fx_latencies[min(len(fx_latencies) - 1, int(0.99 * len(fx_latencies)))], 3),
+        "fx_max_ms": round(fx_latencies[-1], 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--rate", type=int, default=50, help="每轨道每秒限额")
+    parser.add_argument("--fx-orders", type=int, default=100)
+    parser.add_argument("--crypto-orders", type=int, default=500)
+    parser.add_argument("--output", type=Path, help="结果 JSON 输出路径")
+    args = parser.parse_args()
+
+    # FX 节奏为限额的一半, 单独运行时不应触发限流
+    fx_interval = 2.0 / args.rate
+    results = []
+    for mode in ("blocking", "async"):
+        for crypto in (0, args.crypto_orders):
+            stats = asyncio.run(run_scenario(mode, args.rate, args.fx_orders, fx_interval, crypto))
+            stats["crypto_orders"] = crypto
+            results.append(stats)
+            print(f"{mode:<9} crypto={crypto:<5} "
+                  f"FX p50={stats['fx_p50_ms']:8.3f}ms p99={stats['fx_p99_ms']:8.3f}ms "
+                  f"max={stats['fx_max_ms']:8.3f}ms")
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+交易指标记录开销基准测试: 全局锁 (旧实现) vs 线程分片 + 延迟直方图
+功能: 测量 record_order_success / record_order_failure 每次调用的平均耗时
+      (单线程与多线程), 目标为亚微秒级; 并报告 10k 订单/秒时的 CPU 占比。
+依赖: 无
+
+用法:
+    python scripts/benchmarks/trading_metrics_benchmark.py --records 1000000 --threads 4
+"""
+
+import argparse
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.trading.utils.atomic import AtomicCounter  # noqa: E402
+from src.trading.utils.metrics import MetricsCollector  # noqa: E402
+
+TRACKS = ["TRACK_EUR", "TRACK_BTC", "TRACK_GBP"]
+
+
+class GlobalLockCollector:
+    """旧实现的记录路径: 原子计数器 + 一把全局锁更新轨道字典, 只保留执行时间累计"""
+
+    def __init__(self):
+        self._successful = AtomicCounter(0)
+        self._failed = AtomicCounter(0)
+        self._total_time = 0.0
+        self._tracks = {}
+        self._lock = threading.Lock()
+
+    def _update(self, track_id, name, value):
+        metrics = self._tracks.setdefault(track_id, {})
+        metrics[name] = metrics.get(name, 0.0) + value
+
+    def record_order_success(self, execution_time_ms, track_id):
+        self._successful.increment()
+        with self._lock:
+            self._total_time += execution_time_ms
+            self._update(track_id, 'successful', 1)
+            self._update(track_id, 'total_execution_time', execution_time_ms)
+
+    def record_order_failure(self, track_id, error_code=None, execution_time_ms=None):
+        self._failed.increment()
+        with self._lock:
+            self._update(track_id, 'failed', 1)
+            if error_code:
+                self._update(track_id, f'error_{error_code}', 1)
+
+
+def run(collector, records: int, threads: int) -> float:
+    """返回每次记录的平均耗时 (纳秒, 按总墙钟时间 / 总记录数)"""
+    rng = random.Random(42)
+    samples = [(rng.choice(TRACKS), rng.lognormvariate(1.0, 0.8), rng.random() < 0.05)
+               for _ in range(10_000)]
+    per_thread = records // threads
+
+    def worker():
+        success = collector.record_order_success
+        failure = collector.record_order_failure
+        for i in range(per_thread):
+            track, latency, failed = samples[i % len(samples)]
+            if failed:
+                failure(track, "TIMEOUT", latency)
+            else:
+                success(latency, track)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    start = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    return (time.perf_counter() - start) / (per_thread * threads) * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--records", type=int, default=1_000_000)
+    parser.add_argument("--threads", type=int, default=4)
+    args = parser.parse_args()
+
+    for threads in sorted({1, args.threads}):
+        for name, factory in (("global_lock", GlobalLockCollector), ("sharded", MetricsCollector)):
+            ns = run(factory(), args.records, threads)
+            print(f"{name:<12} threads={threads}  {ns:7.1f} ns/record  "
+                  f"CPU@10k/s={ns * 10_000 / 1e9 * 100:.3f}%")
+
+    collector = MetricsCollector()
+    run(collector, 100_000, 1)
+    for track in TRACKS:
+        print(track, collector.get_latency_percentiles(track))
+
+
+if __name__ == "__main__":
+    main()
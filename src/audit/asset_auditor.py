@@ -6,18 +6,29 @@ This module performs comprehensive metadata scanning of data assets across
 all locations (Inf, Hub, GTW) without reading full file contents.
 It identifies file types, timeframes, time ranges, data quality, and gaps.
 
+Scans are incremental: probed metadata is persisted in a SQLite index keyed by
+(path, size, mtime, hash prefix), so only new or changed files are probed again.
+Directory listing and probing run on a thread pool sized for I/O-bound work
+(NFS/SMB mounts).
+
 Classes:
     FileMetadata: Data class representing metadata of a single file
+    MetadataIndex: Persistent SQLite index of probed file metadata
     AssetAuditor: Main auditor class for scanning and analyzing data assets
 """
 
 import os
+import io
 import json
+import hashlib
 import logging
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from dataclasses import dataclass, asdict, field
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, Iterable, List, Tuple, Optional
 from collections import Counter
 import csv
 import warnings
@@ -63,6 +74,93 @@ class FileMetadata:
     error_message: str = ""
 
 
+# ============================================================================
+# Persistent Metadata Index
+# ============================================================================
+
+HASH_PREFIX_BYTES = 64 * 1024
+
+
+def hash_prefix(file_path: Path, num_bytes: int = HASH_PREFIX_BYTES) -> str:
+    """Hash the first ``num_bytes`` of a file (cheap content check for touched files)."""
+    with open(file_path, 'rb') as f:
+        return hashlib.blake2b(f.read(num_bytes), digest_size=16).hexdigest()
+
+
+@dataclass
+class IndexEntry:
+    """A probed file as recorded in the metadata index."""
+    size: int
+    mtime_ns: int
+    hash_prefix: str
+    metadata: FileMetadata
+
+
+class MetadataIndex:
+    """
+    Persistent SQLite index mapping (path, size, mtime, hash prefix) to FileMetadata.
+
+    The whole index is loaded once per scan and written back in a single
+    transaction, so it is only accessed from the scanning thread.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS files (
+            path TEXT PRIMARY KEY,
+            size INTEGER NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            hash_prefix TEXT NOT NULL,
+            metadata TEXT NOT NULL,
+            probed_at TEXT NOT NULL
+        )
+    """
+
+    def __init__(self, db_path: str):
+        """
+        Open (or create) the index.
+
+        Args:
+            db_path: SQLite database file
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path))
+        self._conn.execute(self.SCHEMA)
+        self._conn.commit()
+
+    def load(self) -> Dict[str, IndexEntry]:
+        """Load all indexed entries keyed by path."""
+        entries = {}
+        rows = self._conn.execute('SELECT path, size, mtime_ns, hash_prefix, metadata FROM files')
+        for path, size, mtime_ns, prefix, metadata in rows:
+            try:
+                entries[path] = IndexEntry(size, mtime_ns, prefix, FileMetadata(**json.loads(metadata)))
+            except (TypeError, ValueError):
+                continue  # Stale schema: the file is simply probed again
+        return entries
+
+    def upsert(self, entries: Dict[str, IndexEntry]) -> None:
+        """Insert or replace entries."""
+        now = datetime.now().isoformat()
+        with self._conn:
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?)',
+                [
+                    (path, e.size, e.mtime_ns, e.hash_prefix, json.dumps(asdict(e.metadata), default=bool), now)
+                    for path, e in entries.items()
+                ],
+            )
+
+    def delete(self, paths: Iterable[str]) -> None:
+        """Remove entries for files that no longer exist."""
+        with self._conn:
+            self._conn.executemany('DELETE FROM files WHERE path = ?', [(p,) for p in paths])
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+
 # ============================================================================
 # Main Auditor Class
 # ============================================================================
@@ -87,13 +185,34 @@ class AssetAuditor:
         'D1': (82800, 90000),  # 86400 seconds ±
     }
 
-    def __init__(self, logger: Optional[logging.Logger] = None):
-        """Initialize the auditor."""
+    # Default thread pool size: probing is I/O bound (network mounts), not CPU bound
+    DEFAULT_IO_WORKERS = 16
+
+    # Rows sampled from the head of a file for timeframe detection
+    TIMEFRAME_SAMPLE_ROWS = 1000
+
+    SKIP_DIRECTORIES = {'__pycache__', '.git', '.pytest_cache'}
+
+    def __init__(self, logger: Optional[logging.Logger] = None,
+                 index_path: Optional[str] = None,
+                 max_workers: int = DEFAULT_IO_WORKERS):
+        """
+        Initialize the auditor.
+
+        Args:
+            logger: Logger to use (a default console logger if None)
+            index_path: SQLite metadata index; if None every scan probes all files
+            max_workers: Thread pool size for directory listing and probing
+        """
         self.logger = logger or self._setup_logger()
         self.results: Dict[str, FileMetadata] = {}
         self.errors: List[str] = []
         self.scan_start: Optional[datetime] = None
         self.scan_end: Optional[datetime] = None
+        self.index = MetadataIndex(index_path) if index_path else None
+        self.max_workers = max(1, max_workers)
+        self.scan_stats: Dict[str, int] = {}
+        self._errors_lock = threading.Lock()
 
     @staticmethod
     def _setup_logger() -> logging.Logger:
@@ -109,12 +228,20 @@ class AssetAuditor:
             logger.addHandler(handler)
         return logger
 
-    def scan_all(self, data_roots: Optional[List[str]] = None) -> Dict[str, FileMetadata]:
+    def scan_all(self, data_roots: Optional[List[str]] = None,
+                 since: Optional[datetime] = None) -> Dict[str, FileMetadata]:
         """
         Scan all data locations and return comprehensive results.
 
+        Files whose (size, mtime) match the index are reused without probing.
+        Files that were only touched (same size and hash prefix) are reused
+        too. Everything else is probed on the thread pool.
+
         Args:
             data_roots: List of root directories to scan. If None, uses defaults.
+            since: Incremental mode. Files last modified before this time are
+                not checked at all: they are reported from the index when
+                present and skipped otherwise.
 
         Returns:
             Dictionary mapping file paths to FileMetadata objects.
@@ -126,15 +253,58 @@ class AssetAuditor:
         self.logger.info("="*80)
         self.logger.info(f"Starting global data asset audit at {self.scan_start}")
         self.logger.info(f"Scanning {len(data_roots)} root locations...")
-
-        for root in data_roots:
-            root_path = Path(root)
-            if not root_path.exists():
-                self.logger.warning(f"Root directory does not exist: {root}")
-                continue
-
-            self.logger.info(f"\nScanning: {root}")
-            self._scan_directory(root_path)
+        if since is not None:
+            self.logger.info(f"Incremental mode: probing files modified since {since.isoformat()}")
+
+        stats = {'files': 0, 'probed': 0, 'reused': 0, 'hash_reused': 0, 'skipped': 0, 'removed': 0}
+        indexed = self.index.load() if self.index else {}
+        since_ns = int(since.timestamp() * 1e9) if since is not None else None
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='asset-audit') as pool:
+            roots = []
+            for root in data_roots:
+                root_path = Path(root)
+                if not root_path.exists():
+                    self.logger.warning(f"Root directory does not exist: {root}")
+                    continue
+                self.logger.info(f"\nScanning: {root}")
+                roots.append(root_path)
+
+            found = self._scan_directory(roots, pool)
+
+            pending = []
+            for key, st in found.items():
+                entry = indexed.get(key)
+                if since_ns is not None and st.st_mtime_ns < since_ns:
+                    if entry is None:
+                        stats['skipped'] += 1
+                    else:
+                        self.results[key] = entry.metadata
+                        stats['reused'] += 1
+                elif entry is not None and (entry.size, entry.mtime_ns) == (st.st_size, st.st_mtime_ns):
+                    self.results[key] = entry.metadata
+                    stats['reused'] += 1
+                else:
+                    pending.append((key, st, entry))
+
+            updated: Dict[str, IndexEntry] = {}
+            for key, new_entry, reused in pool.map(lambda item: self._probe_pending(*item), pending):
+                if new_entry is None:
+                    continue
+                self.results[key] = new_entry.metadata
+                updated[key] = new_entry
+                stats['hash_reused' if reused else 'probed'] += 1
+
+        removed = [
+            key for key in indexed
+            if key not in found and any(Path(key).is_relative_to(root) for root in roots)
+        ]
+        if self.index:
+            self.index.upsert(updated)
+            self.index.delete(removed)
+        stats['removed'] = len(removed)
+        stats['files'] = len(self.results)
+        self.scan_stats = stats
 
         self.scan_end = datetime.now()
         duration = (self.scan_end - self.scan_start).total_seconds()
@@ -142,10 +312,47 @@ class AssetAuditor:
         self.logger.info("\n" + "="*80)
         self.logger.info(f"Scan completed in {duration:.2f} seconds")
         self.logger.info(f"Total files scanned: {len(self.results)}")
+        self.logger.info(
+            f"Probed: {stats['probed']}, reused from index: {stats['reused'] + stats['hash_reused']}, "
+            f"skipped (--since): {stats['skipped']}"
+        )
         self.logger.info(f"Total errors: {len(self.errors)}")
 
         return self.results
 
+    def _probe_pending(self, key: str, st: os.stat_result,
+                       entry: Optional[IndexEntry]) -> Tuple[str, Optional[IndexEntry], bool]:
+        """
+        Probe a new or changed file, reusing its indexed metadata if only the mtime changed.
+
+        Returns:
+            Tuple of (path, new index entry or None on error, reused_bool)
+        """
+        file_path = Path(key)
+        try:
+            prefix = hash_prefix(file_path)
+        except OSError as e:
+            self._record_error(f"Error probing {file_path}: {str(e)}")
+            return key, None, False
+
+        if entry is not None and entry.size == st.st_size and entry.hash_prefix == prefix:
+            return key, IndexEntry(st.st_size, st.st_mtime_ns, prefix, entry.metadata), True
+
+        metadata = self._probe_file(file_path, st.st_size)
+        if metadata is None:
+            return key, None, False
+        return key, IndexEntry(st.st_size, st.st_mtime_ns, prefix, metadata), False
+
+    def _record_error(self, error_msg: str) -> None:
+        with self._errors_lock:
+            self.errors.append(error_msg)
+        self.logger.warning(error_msg)
+
+    def close(self) -> None:
+        """Close the metadata index."""
+        if self.index:
+            self.index.close()
+
     def _get_default_roots(self) -> List[str]:
         """Get default data root directories."""
         roots = [
@@ -172,28 +379,52 @@ class AssetAuditor:
 
         return roots
 
-    def _scan_directory(self, root_path: Path, max_depth: int = 10) -> None:
+    def _scan_directory(self, roots: List[Path], pool: ThreadPoolExecutor,
+                        max_depth: int = 10) -> Dict[str, os.stat_result]:
         """
-        Recursively scan directory for data files.
+        Walk directories breadth-first, listing each level in parallel.
 
         Args:
-            root_path: Path object for the root directory
+            roots: Root directories
+            pool: Thread pool used for directory listings
             max_depth: Maximum recursion depth to prevent infinite loops
-        """
-        if max_depth <= 0:
-            return
 
+        Returns:
+            Dictionary mapping data file paths to their stat results
+        """
+        found: Dict[str, os.stat_result] = {}
+        level = list(roots)
+        for _ in range(max_depth):
+            if not level:
+                break
+            next_level = []
+            for files, subdirs in pool.map(self._list_directory, level):
+                found.update(files)
+                next_level.extend(subdirs)
+            level = next_level
+        return found
+
+    def _list_directory(self, directory: Path) -> Tuple[Dict[str, os.stat_result], List[Path]]:
+        """List one directory: data files with their stat results, and subdirectories."""
+        files: Dict[str, os.stat_result] = {}
+        subdirs: List[Path] = []
         try:
-            for item in root_path.iterdir():
-                if item.is_file() and self._is_data_file(item):
-                    self._probe_file(item)
-                elif item.is_dir() and not item.name.startswith('.'):
-                    # Skip cache and system directories
-                    if item.name not in {'__pycache__', '.git', '.pytest_cache'}:
-                        self._scan_directory(item, max_depth - 1)
+            with os.scandir(directory) as it:
+                for item in it:
+                    try:
+                        if item.is_file() and self._is_data_file(Path(item.name)):
+                            files[str(directory / item.name)] = item.stat()
+                        elif item.is_dir() and not item.name.startswith('.'):
+                            # Skip cache and system directories
+                            if item.name not in self.SKIP_DIRECTORIES:
+                                subdirs.append(directory / item.name)
+                    except OSError:
+                        continue
         except (PermissionError, OSError) as e:
-            self.errors.append(f"Error scanning {root_path}: {str(e)}")
-            self.logger.warning(f"Permission denied: {root_path}")
+            with self._errors_lock:
+                self.errors.append(f"Error scanning {directory}: {str(e)}")
+            self.logger.warning(f"Permission denied: {directory}")
+        return files, subdirs
 
     @staticmethod
     def _is_data_file(path: Path) -> bool:
@@ -201,18 +432,22 @@ class AssetAuditor:
         data_extensions = {'.csv', '.parquet', '.pq', '.json'}
         return path.suffix.lower() in data_extensions
 
-    def _probe_file(self, file_path: Path) -> None:
+    def _probe_file(self, file_path: Path, size_bytes: Optional[int] = None) -> Optional[FileMetadata]:
         """
         Probe a single file for metadata.
 
         Args:
             file_path: Path to the file
+            size_bytes: File size if already known from the directory walk
+
+        Returns:
+            FileMetadata, or None if the file could not be probed
         """
         try:
-            file_key = str(file_path)
-
             # Get file size
-            size_mb = file_path.stat().st_size / (1024 * 1024)
+            if size_bytes is None:
+                size_bytes = file_path.stat().st_size
+            size_mb = size_bytes / (1024 * 1024)
 
             # Determine format and probe accordingly
             if file_path.suffix.lower() == '.csv':
@@ -222,15 +457,14 @@ class AssetAuditor:
             elif file_path.suffix.lower() == '.json':
                 metadata = self._probe_json(file_path, size_mb)
             else:
-                return
+                return None
 
-            self.results[file_key] = metadata
             self._log_file_found(metadata)
+            return metadata
 
         except Exception as e:
-            error_msg = f"Error probing {file_path}: {str(e)}"
-            self.errors.append(error_msg)
-            self.logger.warning(error_msg)
+            self._record_error(f"Error probing {file_path}: {str(e)}")
+            return None
 
     def _probe_csv(self, file_path: Path, size_mb: float) -> FileMetadata:
         """
@@ -260,8 +494,7 @@ class AssetAuditor:
                 return metadata
 
             # Count total rows
-            with open(file_path, 'r') as f:
-                row_count = sum(1 for _ in f) - 1  # Subtract header
+            row_count = self._count_lines(file_path) - 1  # Subtract header
             metadata.row_count = row_count
 
             # Extract symbol from filename
@@ -279,10 +512,10 @@ class AssetAuditor:
                 dates = pd.to_datetime(df[date_col], format='mixed')
                 metadata.start_date = str(dates.iloc[0].date())
 
-                # Read last row to get end date
-                last_rows = pd.read_csv(file_path, nrows=1, skiprows=row_count, dtype=str)
-                if len(last_rows) > 0:
-                    last_date = pd.to_datetime(last_rows[date_col].iloc[0], format='mixed')
+                # Read last row (from the file tail) to get end date
+                last_value = self._read_last_csv_value(file_path, list(df.columns).index(date_col))
+                if last_value:
+                    last_date = pd.to_datetime(last_value, format='mixed')
                     metadata.end_date = str(last_date.date())
                 else:
                     metadata.end_date = metadata.start_date
@@ -336,15 +569,12 @@ class AssetAuditor:
         try:
             # Read parquet metadata without loading full file
             parquet_file = pq.ParquetFile(file_path)
-            schema = parquet_file.schema
+            columns = parquet_file.schema_arrow.names
             num_rows = parquet_file.metadata.num_rows
 
             metadata.row_count = num_rows
             metadata.symbol = self._extract_symbol(file_path)
 
-            # Get column names
-            columns = [name.lower() for name in schema.names]
-
             # Find date column
             date_col = self._find_date_column(columns)
             if date_col is None:
@@ -352,25 +582,28 @@ class AssetAuditor:
                 metadata.error_message = 'No date/time column found'
                 return metadata
 
-            # Sample rows for date range and quality
-            df_sample = parquet_file.read(
-                columns=[date_col] + [c for c in columns if c in self.OHLCV_COLUMNS]
-            ).to_pandas()
+            if num_rows > 0:
+                ohlcv_cols = [c for c in columns if c.lower() in self.OHLCV_COLUMNS]
 
-            if len(df_sample) > 0:
-                # Get date range
-                dates = pd.to_datetime(df_sample[date_col])
-                metadata.start_date = str(dates.min().date())
-                metadata.end_date = str(dates.max().date())
+                # Get date range (row group statistics, no data pages read)
+                start, end = self._parquet_date_range(parquet_file, date_col)
+                metadata.start_date = str(start.date())
+                metadata.end_date = str(end.date())
 
-                # Identify timeframe
+                # Identify timeframe from a sample of leading rows
+                batch = next(parquet_file.iter_batches(
+                    batch_size=self.TIMEFRAME_SAMPLE_ROWS, columns=[date_col] + ohlcv_cols
+                ))
+                df_sample = batch.to_pandas()
+                dates = pd.to_datetime(df_sample[date_col])
                 timeframe, _ = self._identify_timeframe_parquet(dates)
                 metadata.timeframe = timeframe
 
-                # Check quality
+                # Check quality (column statistics, plus the sample)
                 quality = self._check_parquet_quality(df_sample)
-                metadata.has_nan = quality['has_nan']
-                metadata.has_zero_volume = quality['has_zero_volume']
+                stats_quality = self._parquet_stats_quality(parquet_file, [date_col] + ohlcv_cols)
+                metadata.has_nan = bool(quality['has_nan'] or stats_quality['has_nan'])
+                metadata.has_zero_volume = bool(quality['has_zero_volume'] or stats_quality['has_zero_volume'])
 
                 metadata.status = 'healthy'
 
@@ -444,6 +677,83 @@ class AssetAuditor:
 
         return None
 
+    @staticmethod
+    def _count_lines(file_path: Path, chunk_size: int = 1 << 20) -> int:
+        """Count lines by scanning raw bytes (no decoding or per-line objects)."""
+        count = 0
+        last = b''
+        with open(file_path, 'rb') as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                count += chunk.count(b'\n')
+                last = chunk[-1:]
+        if last and last != b'\n':
+            count += 1  # Final line without trailing newline
+        return count
+
+    @staticmethod
+    def _read_last_csv_value(file_path: Path, column_index: int, tail_bytes: int = 64 * 1024) -> Optional[str]:
+        """Return a column of the last non-empty CSV line, read from the file tail."""
+        with open(file_path, 'rb') as f:
+            f.seek(0, io.SEEK_END)
+            size = f.tell()
+            f.seek(max(0, size - tail_bytes))
+            tail = f.read().decode('utf-8', errors='replace')
+
+        lines = [line for line in tail.splitlines() if line.strip()]
+        if len(lines) < 2 and size > tail_bytes:
+            return None  # Last line longer than the tail window
+        if not lines:
+            return None
+        row = next(csv.reader([lines[-1]]))
+        return row[column_index] if column_index < len(row) else None
+
+    @staticmethod
+    def _parquet_date_range(parquet_file, date_col: str) -> Tuple:
+        """
+        Min/max of the date column from row group statistics.
+
+        Falls back to reading only the date column if any row group lacks
+        statistics.
+        """
+        metadata = parquet_file.metadata
+        col_index = parquet_file.schema_arrow.get_field_index(date_col)
+        mins, maxs = [], []
+        for rg in range(metadata.num_row_groups):
+            stats = metadata.row_group(rg).column(col_index).statistics
+            if stats is None or not stats.has_min_max:
+                dates = pd.to_datetime(parquet_file.read(columns=[date_col]).column(0).to_pandas())
+                return dates.min(), dates.max()
+            mins.append(stats.min)
+            maxs.append(stats.max)
+        bounds = pd.to_datetime(pd.Series([min(mins), max(maxs)]))
+        return bounds.iloc[0], bounds.iloc[1]
+
+    @staticmethod
+    def _parquet_stats_quality(parquet_file, columns: List[str]) -> Dict[str, bool]:
+        """
+        Quality flags for the whole file from column statistics.
+
+        has_nan: any null in the given columns (pandas NaN is written as null).
+        has_zero_volume: a row group whose volume minimum is exactly zero.
+        """
+        metadata = parquet_file.metadata
+        schema = parquet_file.schema_arrow
+        quality = {'has_nan': False, 'has_zero_volume': False}
+        for col in columns:
+            col_index = schema.get_field_index(col)
+            for rg in range(metadata.num_row_groups):
+                stats = metadata.row_group(rg).column(col_index).statistics
+                if stats is None:
+                    continue
+                if stats.has_null_count and stats.null_count > 0:
+                    quality['has_nan'] = True
+                if col.lower() == 'volume' and stats.has_min_max and stats.min == 0:
+                    quality['has_zero_volume'] = True
+        return quality
+
     def _identify_timeframe_csv(self, dates: pd.Series) -> Tuple[str, bool]:
         """
         Identify timeframe from datetime series.
@@ -526,7 +836,7 @@ class AssetAuditor:
 
         log_msg = f"  {status_emoji} {Path(metadata.path).name:40} " \
                   f"[{metadata.format:8}] " \
-                  f"Timeframe: {metadata.timeframe:8} " \
+                  f"Timeframe: {metadata.timeframe or 'N/A':8} " \
                   f"Rows: {metadata.row_count or 'N/A':>10}"
 
         self.logger.info(log_msg)
@@ -567,6 +877,7 @@ class AssetAuditor:
             'by_format': by_format,
             'by_timeframe': by_timeframe,
             'data_quality': quality_stats,
+            'scan_stats': self.scan_stats,
             'files': files_list,
             'errors': self.errors
         }
@@ -30,6 +30,7 @@ sys.path.insert(0, str(PROJECT_ROOT))
 
 from src.gateway.mt5_client import MT5Client
 from src.strategy import LiveStrategyAdapter
+from src.utils.http_client import FeatureSnapshotCache, get_http_client
 
 # Configure logging
 logging.basicConfig(
@@ -69,7 +70,8 @@ class TradingBot:
 
     Features:
     - Real-time tick processing
-    - Feature fetching from API
+    - Feature fetching from API (pooled keep-alive client, per-bar snapshot cache,
+      optional prefetch at bar close)
     - ML-based signal generation
     - Order execution with error handling
     - Comprehensive logging
@@ -83,7 +85,11 @@ class TradingBot:
         zmq_market_url: str = "tcp://localhost:5556",
         zmq_execution_host: str = "localhost",
         zmq_execution_port: int = 5555,
-        volume: float = 0.1
+        volume: float = 0.1,
+        bar_seconds: int = 60,
+        feature_timeout: float = 2.0,
+        prefetch: bool = False,
+        prefetch_delay: float = 0.5
     ):
         """
         Initialize Trading Bot
@@ -96,12 +102,25 @@ class TradingBot:
             zmq_execution_host: MT5 Gateway host
             zmq_execution_port: MT5 Gateway port
             volume: Default trading volume (lots)
+            bar_seconds: Bar period; ticks within one bar reuse the cached features
+            feature_timeout: Feature API read timeout (seconds)
+            prefetch: Fetch features for every symbol right after each bar closes
+            prefetch_delay: Seconds after the bar boundary before prefetching
         """
         self.symbols = symbols
         self.model_path = model_path
         self.api_url = api_url
         self.zmq_market_url = zmq_market_url
         self.volume = volume
+        self.feature_timeout = feature_timeout
+        self.prefetch = prefetch
+        self.prefetch_delay = prefetch_delay
+
+        # Feature API: shared keep-alive client + per-(symbol, bar) snapshots
+        self.http = get_http_client(api_url)
+        self.feature_cache = FeatureSnapshotCache(bar_seconds)
+        self._prefetch_thread = None
+        self._prefetch_stop = threading.Event()
 
         # Components
         self.model = None
@@ -166,7 +185,7 @@ class TradingBot:
 
             # 3. Test Feature API
             logger.info(f"  Testing Feature API...")
-            response = requests.get(f"{self.api_url}/health", timeout=5)
+            response = self.http.get("/health", timeout=5)
             if response.status_code != 200:
                 raise ConnectionError(f"Feature API unhealthy: {response.status_code}")
             logger.info(f"{GREEN}  ✅ Feature API accessible{RESET}")
@@ -193,6 +212,9 @@ class TradingBot:
         """
         Fetch features from Feature Serving API
 
+        Features only change once per bar, so the first tick of a bar fetches
+        them and later ticks in the same bar are served from the snapshot cache.
+
         Args:
             symbol: Trading symbol
             timestamp: Current timestamp
@@ -200,6 +222,22 @@ class TradingBot:
         Returns:
             Feature array (18 features) or None if failed
         """
+        try:
+            bar = self.feature_cache.bar_of(timestamp)
+        except (TypeError, ValueError):
+            bar = self.feature_cache.bar_of(None)
+
+        cached = self.feature_cache.get(symbol, bar)
+        if cached is not None:
+            return cached
+
+        features_array = self._request_features(symbol, timestamp)
+        if features_array is not None:
+            self.feature_cache.put(symbol, bar, features_array)
+        return features_array
+
+    def _request_features(self, symbol: str, timestamp: Any) -> Optional[np.ndarray]:
+        """Call /features/latest over the pooled connection."""
         try:
             # Call Feature API
             payload = {
@@ -207,10 +245,10 @@ class TradingBot:
                 "timestamp": timestamp
             }
 
-            response = requests.post(
-                f"{self.api_url}/features/latest",
-                json=payload,
-                timeout=2
+            response = self.http.post_json(
+                "/features/latest",
+                payload,
+                timeout=self.feature_timeout
             )
 
             if response.status_code != 200:
@@ -248,6 +286,48 @@ class TradingBot:
             logger.error(f"{RED}❌ Feature fetch error: {e}{RESET}")
             return None
 
+    def prefetch_features(self, timestamp: Optional[float] = None) -> int:
+        """
+        Fetch and cache features for every symbol for the bar containing timestamp.
+
+        Returns:
+            Number of symbols fetched
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        bar = self.feature_cache.bar_of(timestamp)
+        iso_time = datetime.fromtimestamp(timestamp).isoformat()
+
+        fetched = 0
+        for symbol in self.symbols:
+            features = self._request_features(symbol, iso_time)
+            if features is not None:
+                self.feature_cache.put(symbol, bar, features)
+                fetched += 1
+        return fetched
+
+    def _prefetch_loop(self):
+        """Prefetch features shortly after each bar boundary."""
+        bar_seconds = self.feature_cache.bar_seconds
+        while not self._prefetch_stop.is_set():
+            now = time.time()
+            next_run = (now // bar_seconds + 1) * bar_seconds + self.prefetch_delay
+            if self._prefetch_stop.wait(next_run - now):
+                break
+            fetched = self.prefetch_features()
+            logger.debug(f"{CYAN}[FEAT] Prefetched {fetched}/{len(self.symbols)} symbols{RESET}")
+
+    def get_latency_stats(self) -> Dict[str, Any]:
+        """
+        Feature path instrumentation.
+
+        Returns:
+            Dictionary with per-endpoint HTTP latency and snapshot cache hit rate
+        """
+        return {
+            'http': self.http.get_stats(),
+            'feature_cache': self.feature_cache.get_stats()
+        }
+
     def predict_signal(self, features: np.ndarray) -> int:
         """
         Generate trading signal using LiveStrategyAdapter
@@ -363,6 +443,13 @@ class TradingBot:
         self.running = True
         start_time = time.time()
 
+        if self.prefetch:
+            self._prefetch_stop.clear()
+            self._prefetch_thread = threading.Thread(
+                target=self._prefetch_loop, name="feature-prefetch", daemon=True
+            )
+            self._prefetch_thread.start()
+
         logger.info(f"{CYAN}🔄 Entering main loop...{RESET}")
         logger.info(f"  Duration: {duration_seconds} seconds")
         print()
@@ -403,6 +490,20 @@ class TradingBot:
 
         self.running = False
 
+        if self._prefetch_thread is not None:
+            self._prefetch_stop.set()
+            self._prefetch_thread.join(timeout=5)
+            self._prefetch_thread = None
+
+        stats = self.get_latency_stats()
+        latest = stats['http'].get('/features/latest')
+        if latest:
+            logger.info(
+                f"  Feature API: {latest['count']} calls, "
+                f"p50={latest['p50_ms']:.1f}ms p99={latest['p99_ms']:.1f}ms"
+            )
+        logger.info(f"  Feature cache hit rate: {stats['feature_cache']['hit_rate']:.1%}")
+
         if self.zmq_subscriber:
             self.zmq_subscriber.close()
 
@@ -1,13 +1,31 @@
 """多周期数据管理和对齐模块"""
 
 import logging
+import math
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Set
+from typing import Dict, List, Optional, Set, Union
 from collections import deque
 from datetime import datetime
 
+import numpy as np
+import pandas as pd
+
 logger = logging.getLogger(__name__)
 
+_EPOCH = datetime(1970, 1, 1)
+
+# 形成中 bar 的字段下标: [timestamp, open, high, low, close, volume, 已合并数, 时间桶]
+_TS, _OPEN, _HIGH, _LOW, _CLOSE, _VOLUME, _FOLDS, _BUCKET = range(8)
+
+
+def _to_seconds(timestamp: Union[datetime, int, float]) -> float:
+    """时间戳转为 epoch 秒 (naive datetime 按 UTC 解释, 数值视为 epoch 秒)"""
+    if isinstance(timestamp, datetime):
+        if timestamp.tzinfo is None:
+            return (timestamp - _EPOCH).total_seconds()
+        return timestamp.timestamp()
+    return float(timestamp)
+
 
 @dataclass
 class TimeframeConfig:
@@ -95,27 +113,47 @@ class MultiTimeframeDataFeed:
 
     支持多个不同周期的数据对齐和聚合。基础周期为 M5 (5 分钟),
     其他周期必须是 M5 的整数倍。
+
+    每个高级周期维护一根形成中的 bar, 每根基础 bar 以 O(1) 更新
+    high/low/volume, 不再回扫历史 bar。边界对齐方式:
+    - 'count': 按 bar 数量 (默认), 高级周期由能整除它的最大下级周期分层聚合
+    - 'clock': 按时钟对齐 (例如 H1 在整点收盘), session_offset 平移锚点
+      (例如外汇日线 17:00 纽约 = session_offset=1320); 缺口导致的未满 bar
+      在下一根 bar 进入新时间段时收盘
     """
 
-    def __init__(self, base_period: int = 5):
+    ALIGN_MODES = ('count', 'clock')
+
+    def __init__(self, base_period: int = 5, align: str = 'count', session_offset: int = 0):
         """初始化多周期数据源
 
         Args:
             base_period: 基础周期 (分钟), 默认 5 分钟 (M5)
+            align: 边界对齐方式, 'count' 或 'clock'
+            session_offset: 时钟对齐锚点偏移 (分钟), 仅 align='clock' 时生效
         """
+        if align not in self.ALIGN_MODES:
+            raise ValueError(f"对齐方式必须是 {self.ALIGN_MODES} 之一, 得到 {align!r}")
+
         self.base_period = base_period
+        self.align = align
+        self.session_offset = session_offset
         self.timeframes: Dict[int, TimeframeConfig] = {}  # {period: config}
         self.buffers: Dict[int, TimeframeBuffer] = {}     # {period: buffer}
         self.bar_counters: Dict[int, int] = {}            # {period: count}
         self.completed_timeframes: Set[int] = set()       # 本次完成的高级周期
 
+        # 聚合计划: 按周期升序的 (period, source_period, multiplier)
+        self._plan: List[tuple] = []
+        self._partials: Dict[int, list] = {}              # {period: 形成中的 bar}
+
         # 自动添加基础周期缓冲区
         base_config = TimeframeConfig(base_period)
         self.timeframes[base_period] = base_config
         self.buffers[base_period] = TimeframeBuffer(base_config)
         self.bar_counters[base_period] = 0
 
-        logger.info(f"✓ MultiTimeframeDataFeed 初始化: 基础周期 {base_period} 分钟")
+        logger.info(f"✓ MultiTimeframeDataFeed 初始化: 基础周期 {base_period} 分钟 (align={align})")
 
     def add_timeframe(self, period: int, lookback: int = 100) -> None:
         """添加新周期
@@ -146,9 +184,31 @@ class MultiTimeframeDataFeed:
         self.timeframes[period] = config
         self.buffers[period] = TimeframeBuffer(config)
         self.bar_counters[period] = 0
+        self._rebuild_plan()
 
         logger.info(f"✓ 添加周期: {config.period_name} (period={period}, lookback={lookback})")
 
+    def _rebuild_plan(self) -> None:
+        """预计算每个高级周期的聚合来源, on_base_bar 中不再排序/搜索"""
+        old_sources = {period: source for period, source, _ in self._plan}
+        periods = sorted(p for p in self.timeframes if p != self.base_period)
+
+        plan = []
+        for period in periods:
+            source = self.base_period
+            if self.align == 'count':
+                # 能整除该周期的最大下级周期, 保证分层边界一致
+                for lower in periods:
+                    if lower < period and period % lower == 0:
+                        source = lower
+            plan.append((period, source, period // source))
+
+            # 来源变化时丢弃旧的形成中 bar (其合并计数单位已失效)
+            if old_sources.get(period, source) != source:
+                self._partials.pop(period, None)
+
+        self._plan = plan
+
     def on_base_bar(self, ohlc: OHLC) -> Dict[int, OHLC]:
         """处理基础周期新 bar, 返回完成的高级周期 bar
 
@@ -165,68 +225,170 @@ class MultiTimeframeDataFeed:
         self.buffers[self.base_period].append(ohlc)
         self.bar_counters[self.base_period] += 1
 
-        # 按周期大小升序处理，支持分层聚合
-        sorted_periods = sorted(self.timeframes.keys())
+        if self.align == 'clock':
+            self._advance_clock(ohlc, completed)
+            return completed
 
-        for period in sorted_periods:
-            if period == self.base_period:
+        # 按周期大小升序处理，支持分层聚合
+        for period, source, multiplier in self._plan:
+            bar = ohlc if source == self.base_period else completed.get(source)
+            if bar is None:
                 continue
 
-            # 找到最接近的下级周期用于聚合
-            source_period = self.base_period
-            for lower_period in sorted_periods:
-                if lower_period < period and lower_period > source_period:
-                    source_period = lower_period
-
-            multiplier = period // source_period
-
-            # 判断该周期是否完成
-            if self.bar_counters[source_period] % multiplier == 0:
-                # 聚合 bar
-                aggregated = self._aggregate_bars(source_period, period)
-                if aggregated is not None:
-                    completed[period] = aggregated
-                    self.buffers[period].append(aggregated)
-                    self.bar_counters[period] += 1
-                    self.completed_timeframes.add(period)
-                    logger.debug(
-                        f"✓ {self.timeframes[period].period_name} bar 完成 "
-                        f"(第 {self.bar_counters[period]} 根)"
-                    )
+            partial = self._fold(period, bar)
+            if partial[_FOLDS] == multiplier:
+                self._complete(period, completed)
 
         return completed
 
-    def _aggregate_bars(self, from_period: int, to_period: int) -> Optional[OHLC]:
-        """将基础周期 bar 聚合成高级周期 bar
+    def _advance_clock(self, ohlc: OHLC, completed: Dict[int, OHLC]) -> None:
+        """时钟对齐: 每个周期直接合并基础 bar, bar 结束时刻跨越边界即收盘"""
+        start = _to_seconds(ohlc.timestamp) - self.session_offset * 60
+        end = start + self.base_period * 60
+
+        for period, _, _ in self._plan:
+            span = period * 60
+            bucket = math.floor(start / span)
+
+            partial = self._partials.get(period)
+            if partial is not None and partial[_BUCKET] != bucket:
+                # 数据缺口: 旧时间段未满即结束
+                self._complete(period, completed)
+
+            self._fold(period, ohlc)[_BUCKET] = bucket
+            if math.floor(end / span) != bucket:
+                self._complete(period, completed)
+
+    def _fold(self, period: int, bar: OHLC) -> list:
+        """将一根下级 bar 合并进形成中的 bar (O(1))"""
+        partial = self._partials.get(period)
+        if partial is None:
+            partial = [bar.timestamp, bar.open, bar.high, bar.low, bar.close, bar.volume, 1, None]
+            self._partials[period] = partial
+            return partial
+
+        partial[_TS] = bar.timestamp
+        if bar.high > partial[_HIGH]:
+            partial[_HIGH] = bar.high
+        if bar.low < partial[_LOW]:
+            partial[_LOW] = bar.low
+        partial[_CLOSE] = bar.close
+        partial[_VOLUME] += bar.volume
+        partial[_FOLDS] += 1
+        return partial
+
+    def _complete(self, period: int, completed: Dict[int, OHLC]) -> None:
+        """形成中的 bar 收盘, 写入缓冲区"""
+        partial = self._partials.pop(period)
+        aggregated = OHLC(
+            timestamp=partial[_TS],  # 最后一根 bar 的时间戳
+            open=partial[_OPEN],
+            high=partial[_HIGH],
+            low=partial[_LOW],
+            close=partial[_CLOSE],
+            volume=partial[_VOLUME],
+        )
+        completed[period] = aggregated
+        self.buffers[period].append(aggregated)
+        self.bar_counters[period] += 1
+        self.completed_timeframes.add(period)
+        logger.debug(
+            f"✓ {self.timeframes[period].period_name} bar 完成 "
+            f"(第 {self.bar_counters[period]} 根)"
+        )
+
+    def get_partial(self, period: int) -> Optional[OHLC]:
+        """获取指定周期形成中 (未收盘) 的 bar
 
         Args:
-            from_period: 源周期
-            to_period: 目标周期
+            period: 周期 (分钟)
 
         Returns:
-            聚合后的 OHLC, 若数据不足则返回 None
+            形成中的 OHLC, 若无则返回 None
         """
-        source_buffer = self.buffers[from_period]
-        multiplier = to_period // from_period
-
-        # 检查是否有足够的 bar
-        if len(source_buffer) < multiplier:
+        partial = self._partials.get(period)
+        if partial is None:
             return None
+        return OHLC(*partial[_TS:_FOLDS])
 
-        # 获取最后 multiplier 根 bar
-        bars = source_buffer.get_last(multiplier)
-        if len(bars) < multiplier:
-            return None
+    def replay(self, df: pd.DataFrame) -> Dict[int, pd.DataFrame]:
+        """向量化回放历史基础周期数据, 一次构建所有周期的 bar
 
-        # 聚合 OHLC
-        return OHLC(
-            timestamp=bars[-1].timestamp,  # 最后一根 bar 的时间戳
-            open=bars[0].open,             # 第一根 bar 的 open
-            high=max(b.high for b in bars),  # 最大 high
-            low=min(b.low for b in bars),    # 最小 low
-            close=bars[-1].close,          # 最后一根 bar 的 close
-            volume=sum(b.volume for b in bars),  # 总成交量
-        )
+        结果与逐根调用 on_base_bar 完全一致, 但不修改流式状态
+        (缓冲区/计数/形成中 bar)。
+
+        Args:
+            df: 基础周期 OHLCV 数据, 按时间升序; 时间取自 'timestamp' 列、
+                'time' 列或索引 (datetime 或 epoch 秒)
+
+        Returns:
+            {period: DataFrame[timestamp, open, high, low, close, volume]},
+            仅包含已收盘的 bar (包括基础周期本身)
+        """
+        missing = [c for c in ('open', 'high', 'low', 'close', 'volume') if c not in df.columns]
+        if missing:
+            raise ValueError(f"缺少列: {missing}")
+
+        if 'timestamp' in df.columns:
+            timestamps = df['timestamp']
+        elif 'time' in df.columns:
+            timestamps = df['time']
+        else:
+            timestamps = df.index.to_series()
+        timestamps = timestamps.to_numpy()
+
+        opens = df['open'].to_numpy(dtype=np.float64)
+        highs = df['high'].to_numpy(dtype=np.float64)
+        lows = df['low'].to_numpy(dtype=np.float64)
+        closes = df['close'].to_numpy(dtype=np.float64)
+        volumes = df['volume'].to_numpy(dtype=np.float64)
+        n = len(df)
+
+        result = {
+            self.base_period: pd.DataFrame({
+                'timestamp': timestamps, 'open': opens, 'high': highs,
+                'low': lows, 'close': closes, 'volume': volumes,
+            })
+        }
+        if self.align == 'clock' and n:
+            if np.issubdtype(timestamps.dtype, np.number):
+                seconds = timestamps.astype(np.float64)
+            else:
+                # naive 按 UTC 解释, 与 _to_seconds 一致
+                index = pd.DatetimeIndex(timestamps)
+                if index.tz is not None:
+                    index = index.tz_convert('UTC').tz_localize(None)
+                seconds = (index.values - np.datetime64(0, 's')) / np.timedelta64(1, 's')
+            seconds = seconds - self.session_offset * 60
+
+        for period, _, _ in self._plan:
+            if n == 0:
+                starts = ends = np.empty(0, dtype=np.int64)
+            elif self.align == 'count':
+                # 分层来源都能整除, 等价于直接按基础 bar 数分组
+                size = period // self.base_period
+                starts = np.arange(0, (n // size) * size, size)
+                ends = starts + size - 1
+            else:
+                span = period * 60
+                buckets = np.floor(seconds / span)
+                starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+                ends = np.r_[starts[1:] - 1, n - 1]
+                # 最后一段只有在最后一根 bar 结束时刻跨越边界时才收盘
+                if np.floor((seconds[-1] + self.base_period * 60) / span) == buckets[-1]:
+                    starts, ends = starts[:-1], ends[:-1]
+
+            stop = ends[-1] + 1 if len(ends) else 0
+            result[period] = pd.DataFrame({
+                'timestamp': timestamps[ends],
+                'open': opens[starts],
+                'high': np.maximum.reduceat(highs[:stop], starts) if stop else highs[:0],
+                'low': np.minimum.reduceat(lows[:stop], starts) if stop else lows[:0],
+                'close': closes[ends],
+                'volume': np.add.reduceat(volumes[:stop], starts) if stop else volumes[:0],
+            })
+
+        return result
 
     def get_bars(self, period: int, count: int = 1) -> List[OHLC]:
         """获取指定周期的最后 n 根 bar
@@ -314,5 +476,6 @@ class MultiTimeframeDataFeed:
         for period in self.bar_counters:
             self.bar_counters[period] = 0
 
+        self._partials.clear()
         self.completed_timeframes.clear()
         logger.info("✓ MultiTimeframeDataFeed 已重置")
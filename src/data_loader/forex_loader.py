@@ -11,6 +11,9 @@ import argparse
 from datetime import datetime, timedelta
 from sqlalchemy import text
 from src.database.timescale_client import TimescaleClient
+from src.data_nexus.ingestion.copy_sink import CopyIngestionSink
+
+MARKET_CANDLES_COLUMNS = ['time', 'symbol', 'open', 'high', 'low', 'close', 'volume', 'period']
 
 
 class ForexLoader:
@@ -26,6 +29,12 @@ class ForexLoader:
         self.base_url = "https://eodhistoricaldata.com/api"
         self.db = TimescaleClient()
         self._init_schema()
+        self.sink = CopyIngestionSink(
+            self.db.engine,
+            table='market_candles',
+            columns=MARKET_CANDLES_COLUMNS,
+            conflict_columns=['time', 'symbol', 'period'],
+        )
 
     def _init_schema(self):
         """Initialize database schema with market_candles table"""
@@ -147,28 +156,13 @@ class ForexLoader:
             print("⚠️  Empty dataframe, skipping load")
             return
 
-        required_cols = ['time', 'symbol', 'open', 'high', 'low', 'close', 'volume', 'period']
-        df_load = df[required_cols].copy()
+        df_load = df[MARKET_CANDLES_COLUMNS]
 
         try:
-            # Use ON CONFLICT to handle duplicates
-            with self.db.engine.begin() as conn:
-                # Insert with upsert logic
-                for _, row in df_load.iterrows():
-                    conn.execute(text("""
-                        INSERT INTO market_candles
-                        (time, symbol, open, high, low, close, volume, period)
-                        VALUES (:time, :symbol, :open, :high, :low, :close, :volume, :period)
-                        ON CONFLICT (time, symbol, period)
-                        DO UPDATE SET
-                            open = EXCLUDED.open,
-                            high = EXCLUDED.high,
-                            low = EXCLUDED.low,
-                            close = EXCLUDED.close,
-                            volume = EXCLUDED.volume
-                    """), row.to_dict())
-
-            print(f"✅ Loaded {len(df_load)} rows for {symbol} into TimescaleDB")
+            # COPY into a staging table, then one upsert (ON CONFLICT) for the whole frame
+            rows = self.sink.write(df_load)
+
+            print(f"✅ Loaded {rows} rows for {symbol} into TimescaleDB")
 
         except Exception as e:
             print(f"❌ Error loading data: {e}")
@@ -22,6 +22,12 @@ Usage:
     # Hash operations
     redis.hset("market:EURUSD", "bid", "1.0850")
     bid = redis.hget("market:EURUSD", "bid")
+
+    # Pipelined multi-key read (single round trip)
+    pipe = redis.pipeline()
+    for symbol in ("EURUSD", "GBPUSD"):
+        pipe.hgetall(f"market:{symbol}")
+    quotes = pipe.execute()
 """
 
 import json
@@ -315,6 +321,22 @@ class RedisClient:
         """
         return self.client.ttl(key)
 
+    # ----------------------------------------------------------------------
+    # Pipelining
+    # ----------------------------------------------------------------------
+
+    def pipeline(self, transaction: bool = False):
+        """
+        Create a command pipeline (one round trip on execute()).
+
+        Args:
+            transaction: Wrap commands in MULTI/EXEC
+
+        Returns:
+            redis.client.Pipeline
+        """
+        return self.client.pipeline(transaction=transaction)
+
     # ----------------------------------------------------------------------
     # Utilities
     # ----------------------------------------------------------------------
@@ -6,10 +6,19 @@ Async ETL pipeline for EODHD data ingestion.
 Components:
 - AssetDiscovery: Exchange symbol list discovery
 - EODHistoryLoader: Async OHLCV data downloader
+- CopyIngestionSink: PostgreSQL COPY + staging-table upsert writer
+- ConcurrentIngestor: Rate-limited async workers with resumable checkpoints
 - Retry policies and error handling
 """
 
 from .asset_discovery import AssetDiscovery
+from .copy_sink import ConcurrentIngestor, CopyIngestionSink, SymbolCheckpoint
 from .history_loader import EODHistoryLoader
 
-__all__ = ["AssetDiscovery", "EODHistoryLoader"]
+__all__ = [
+    "AssetDiscovery",
+    "ConcurrentIngestor",
+    "CopyIngestionSink",
+    "EODHistoryLoader",
+    "SymbolCheckpoint",
+]
@@ -6,7 +6,7 @@ Task #039.5 (ID #040): Bulk data ingestion for US equities (~45k tickers)
 Provides BulkEODLoader class for:
 - Fetching bulk EOD data via EODHD Bulk API
 - Async downloading with rate limiting
-- Efficient batch database insertion
+- Efficient batch database insertion (COPY + staging upsert)
 - Asset registration
 """
 
@@ -21,6 +21,12 @@ from sqlalchemy import text
 
 from src.data_nexus.config import DatabaseConfig
 from src.data_nexus.database.connection import PostgresConnection
+from src.data_nexus.ingestion.copy_sink import (
+    MARKET_DATA_COLUMNS,
+    ConcurrentIngestor,
+    CopyIngestionSink,
+    SymbolCheckpoint,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -31,9 +37,9 @@ class BulkEODLoader:
 
     Handles:
     1. Fetching bulk EOD data via EODHD API
-    2. Async concurrent downloads with Semaphore rate limiting
+    2. Async concurrent downloads with token-bucket rate limiting
     3. Data validation and transformation
-    4. Batched database insertion
+    4. Batched COPY insertion with resumable checkpoints
     5. Asset registration
 
     Attributes:
@@ -54,6 +60,7 @@ class BulkEODLoader:
         self.db_config = db_config or DatabaseConfig()
         self.base_url = "https://eodhd.com/api"
         self.conn = None
+        self.sink: Optional[CopyIngestionSink] = None
 
         logger.info(f"Initialized BulkEODLoader")
 
@@ -196,61 +203,90 @@ class BulkEODLoader:
         from_date: str,
         to_date: str,
         batch_size: int = 100,
-        save: bool = True
+        save: bool = True,
+        requests_per_second: int = 10,
+        checkpoint_path: Optional[str] = None,
     ) -> int:
         """
         Backfill historical data for selected symbols (async).
 
+        Fetches run under a shared token-bucket rate limiter and are written
+        through CopyIngestionSink. With checkpoint_path, symbols that were
+        already flushed resume from their last stored date.
+
         Args:
             symbols: List of symbols (e.g., ['AAPL.US', 'MSFT.US'])
             from_date: Start date (YYYY-MM-DD)
             to_date: End date (YYYY-MM-DD)
-            batch_size: Number of rows to save per batch
+            batch_size: Number of symbols buffered per COPY flush
             save: Whether to save to database
+            requests_per_second: API request rate across all workers
+            checkpoint_path: Optional JSON file for per-symbol progress
 
         Returns:
             Total rows ingested
         """
         logger.info(f"Starting backfill for {len(symbols)} symbols ({from_date} to {to_date})")
 
-        total_rows = 0
-
-        # Batch symbols for concurrent fetching
         semaphore = asyncio.Semaphore(10)  # Max 10 concurrent requests
+        checkpoint = SymbolCheckpoint(checkpoint_path) if checkpoint_path else None
 
         async with aiohttp.ClientSession() as session:
-            for i in range(0, len(symbols), batch_size):
-                batch_symbols = symbols[i:i + batch_size]
-
-                tasks = [
-                    self.fetch_symbol_history_async(
-                        session, symbol, from_date, to_date, semaphore
-                    )
-                    for symbol in batch_symbols
-                ]
-
-                results = await asyncio.gather(*tasks, return_exceptions=True)
 
-                # Combine results
-                dfs = [df for df in results if isinstance(df, pd.DataFrame) and len(df) > 0]
-
-                if dfs:
-                    batch_df = pd.concat(dfs, ignore_index=True)
-
-                    if save:
-                        rows = self.save_batch(batch_df)
-                        total_rows += rows
-                        logger.info(f"Batch {i//batch_size + 1}: Saved {rows} rows")
-
-        logger.info(f"Backfill complete: {total_rows} total rows")
+            async def fetch(symbol: str, since: Optional[str]) -> pd.DataFrame:
+                start = from_date
+                if since:
+                    resume = (datetime.fromisoformat(since) + timedelta(days=1)).strftime('%Y-%m-%d')
+                    start = max(start, resume)
+                    if start > to_date:
+                        return pd.DataFrame()
+                df = await self.fetch_symbol_history_async(
+                    session, symbol, start, to_date, semaphore
+                )
+                if df is None or df.empty:
+                    return pd.DataFrame()
+                return self._prepare_market_data(df)
+
+            if not save:
+                frames = await asyncio.gather(
+                    *(fetch(symbol, None) for symbol in symbols), return_exceptions=True
+                )
+                total_rows = sum(len(df) for df in frames if isinstance(df, pd.DataFrame))
+                logger.info(f"Backfill complete (dry run): {total_rows} total rows")
+                return total_rows
+
+            ingestor = ConcurrentIngestor(
+                self._get_sink(),
+                fetch,
+                requests_per_second=requests_per_second,
+                concurrency=10,
+                checkpoint=checkpoint,
+                flush_rows=batch_size * 250,  # ~1 year of daily bars per symbol
+            )
+            summary = await ingestor.run(symbols)
+
+        total_rows = summary["total_rows"]
+        logger.info(f"Backfill complete: {total_rows} total rows ({summary['rows_per_sec']} rows/s)")
 
         return total_rows
 
+    def _get_sink(self) -> CopyIngestionSink:
+        """Get or create the COPY sink for market_data."""
+        if self.sink is None:
+            self.sink = CopyIngestionSink(
+                self._get_connection().engine,
+                table="market_data",
+                columns=MARKET_DATA_COLUMNS,
+                conflict_columns=["time", "symbol"],
+            )
+        return self.sink
+
     def save_batch(self, df: pd.DataFrame, batch_size: int = 10000) -> int:
         """
         Save batch of data to market_data table.
 
-        Uses PostgreSQL COPY for efficient bulk insert with conflict handling.
+        Uses PostgreSQL COPY into a staging table followed by one
+        INSERT ... ON CONFLICT upsert per chunk (CopyIngestionSink).
 
         Args:
             df: DataFrame with columns: date, symbol, open, high, low, close, volume
@@ -265,15 +301,8 @@ class BulkEODLoader:
         logger.info(f"Saving {len(df)} rows to market_data...")
 
         try:
-            conn = self._get_connection()
-
-            # Prepare data
-            df['time'] = pd.to_datetime(df['date'])
-            df['adjusted_close'] = df.get('adjusted_close', df['close'])
-
-            # Select and rename columns
-            save_df = df[['time', 'symbol', 'open', 'high', 'low', 'close', 'adjusted_close', 'volume']].copy()
-            save_df = save_df.dropna()
+            sink = self._get_sink()
+            save_df = self._prepare_market_data(df)
 
             rows_saved = 0
 
@@ -282,20 +311,7 @@ class BulkEODLoader:
                 batch = save_df.iloc[i:i + batch_size]
 
                 try:
-                    # Use SQLAlchemy to_sql with 'append' mode
-                    from sqlalchemy import create_engine
-                    engine = conn.engine
-
-                    batch.to_sql(
-                        'market_data',
-                        con=engine,
-                        if_exists='append',
-                        index=False,
-                        method='multi',
-                        chunksize=1000
-                    )
-
-                    rows_saved += len(batch)
+                    rows_saved += sink.write(batch)
                     logger.debug(f"Saved batch {i//batch_size + 1}: {len(batch)} rows")
 
                 except Exception as e:
@@ -310,6 +326,27 @@ class BulkEODLoader:
             logger.error(f"Failed to save batch: {e}")
             return 0
 
+    @staticmethod
+    def _prepare_market_data(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Map an EODHD frame onto the market_data column layout.
+
+        Bulk API frames carry 'code' instead of 'symbol'; volume is cast to
+        int64 the same way as EODHistoryLoader._to_frame.
+        """
+        save_df = pd.DataFrame({"time": pd.to_datetime(df["date"], utc=True)})
+        save_df["symbol"] = df["symbol"] if "symbol" in df.columns else df["code"]
+        for col in ("open", "high", "low", "close"):
+            save_df[col] = df[col]
+        save_df["adjusted_close"] = df["adjusted_close"] if "adjusted_close" in df.columns else df["close"]
+
+        # market_data.volume is BigInteger: COPY rejects float text such as "123.0"
+        volume = df["volume"] if "volume" in df.columns else 0
+        save_df["volume"] = pd.to_numeric(volume, errors="coerce")
+        save_df["volume"] = save_df["volume"].fillna(0).astype("int64")
+
+        return save_df.dropna()[MARKET_DATA_COLUMNS]
+
     def register_assets(self, symbols: List[str], exchange: str = 'US') -> int:
         """
         Register symbols in assets table.
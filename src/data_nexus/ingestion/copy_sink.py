@@ -0,0 +1,501 @@
+"""
+COPY-based Bulk Ingestion Sink
+
+Shared high-throughput write path for historical OHLCV data, used by
+EODHistoryLoader, BulkEODLoader and ForexLoader.
+
+Key Design Principles:
+1. PostgreSQL COPY: One streamed CSV buffer per batch instead of ORM objects / per-row INSERTs
+2. Staging-table upsert: COPY into a temp table, then a single INSERT ... ON CONFLICT
+3. Columnar input: pandas DataFrame, pyarrow Table or dict of NumPy arrays
+4. Rate-limited async workers: token bucket shared by all workers (RateLimiter)
+5. Resumable: SymbolCheckpoint records per-symbol progress so interrupted backfills resume
+
+Usage:
+    sink = CopyIngestionSink(
+        conn.engine,
+        table="market_data",
+        columns=MARKET_DATA_COLUMNS,
+        conflict_columns=["time", "symbol"],
+    )
+    rows = sink.write(df)
+
+    ingestor = ConcurrentIngestor(sink, fetch, requests_per_second=10,
+                                  checkpoint=SymbolCheckpoint("var/backfill.json"))
+    summary = await ingestor.run(["AAPL.US", "MSFT.US"])
+"""
+
+import asyncio
+import io
+import json
+import logging
+import os
+import re
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional, Sequence
+
+import pandas as pd
+
+from src.trading.core.limiter import RateLimiter
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+logger = logging.getLogger(__name__)
+
+# Column layout of the market_data hypertable (see src/data_nexus/models.py)
+MARKET_DATA_COLUMNS = [
+    "time", "symbol", "open", "high", "low", "close", "adjusted_close", "volume",
+]
+
+_IDENTIFIER_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*(\.[A-Za-z_][A-Za-z0-9_]*)?$")
+
+
+def _check_identifier(name: str) -> str:
+    """Reject anything that is not a plain (optionally schema-qualified) identifier."""
+    if not _IDENTIFIER_RE.match(name):
+        raise ValueError(f"Invalid SQL identifier: {name!r}")
+    return name
+
+
+class CopyIngestionSink:
+    """
+    PostgreSQL COPY + staging-table upsert writer.
+
+    Each write():
+    1. Encodes the batch as CSV in memory (vectorized, no per-row Python objects)
+    2. CREATE TEMP TABLE <staging> AS SELECT <columns> FROM <table> WITH NO DATA
+    3. COPY <staging> FROM STDIN (one round-trip for the whole batch)
+    4. INSERT INTO <table> SELECT DISTINCT ON (<conflict>) ... ON CONFLICT DO UPDATE
+    5. DROP the staging table
+
+    Attributes:
+        stats: Cumulative counters {'rows', 'batches', 'seconds'}
+    """
+
+    def __init__(
+        self,
+        engine: Any,
+        table: str,
+        columns: Sequence[str],
+        conflict_columns: Sequence[str],
+        update_columns: Optional[Sequence[str]] = None,
+    ):
+        """
+        Initialize COPY sink.
+
+        Args:
+            engine: SQLAlchemy engine (used when write() gets no connection)
+            table: Target table name
+            columns: Columns to write, in COPY order
+            conflict_columns: Unique key used for ON CONFLICT
+            update_columns: Columns refreshed on conflict
+                (default: every non-key column; empty list = DO NOTHING)
+        """
+        self.engine = engine
+        self.table = _check_identifier(table)
+        self.columns = [_check_identifier(c) for c in columns]
+        self.conflict_columns = [_check_identifier(c) for c in conflict_columns]
+        if update_columns is None:
+            update_columns = [c for c in self.columns if c not in self.conflict_columns]
+        self.update_columns = [_check_identifier(c) for c in update_columns]
+
+        missing = set(self.conflict_columns) - set(self.columns)
+        if missing:
+            raise ValueError(f"Conflict columns not in column list: {sorted(missing)}")
+
+        self.stats = {"rows": 0, "batches": 0, "seconds": 0.0}
+        self._stats_lock = threading.Lock()
+
+    def build_statements(self, staging: str) -> Dict[str, str]:
+        """
+        Build the SQL for one staging round.
+
+        Args:
+            staging: Staging table name
+
+        Returns:
+            Dict with 'create', 'copy', 'upsert', 'drop' statements
+        """
+        cols = ", ".join(self.columns)
+        keys = ", ".join(self.conflict_columns)
+
+        if self.update_columns:
+            assignments = ", ".join(f"{c} = EXCLUDED.{c}" for c in self.update_columns)
+            on_conflict = f"ON CONFLICT ({keys}) DO UPDATE SET {assignments}"
+        else:
+            on_conflict = f"ON CONFLICT ({keys}) DO NOTHING"
+
+        return {
+            "create": (
+                f"CREATE TEMP TABLE {staging} AS "
+                f"SELECT {cols} FROM {self.table} WITH NO DATA"
+            ),
+            "copy": f"COPY {staging} ({cols}) FROM STDIN WITH (FORMAT csv)",
+            # DISTINCT ON: ON CONFLICT DO UPDATE cannot touch the same row twice
+            "upsert": (
+                f"INSERT INTO {self.table} ({cols}) "
+                f"SELECT DISTINCT ON ({keys}) {cols} FROM {staging} "
+                f"{on_conflict}"
+            ),
+            "drop": f"DROP TABLE IF EXISTS {staging}",
+        }
+
+    def to_frame(self, data: Any) -> pd.DataFrame:
+        """
+        Normalize input to a DataFrame restricted to the sink columns.
+
+        Args:
+            data: pandas DataFrame, pyarrow Table, or mapping of column -> array
+
+        Returns:
+            DataFrame with exactly self.columns (no copy for NumPy inputs)
+        """
+        if isinstance(data, pd.DataFrame):
+            frame = data
+        elif pa is not None and isinstance(data, pa.Table):
+            frame = data.select(self.columns).to_pandas()
+        elif isinstance(data, Mapping):
+            frame = pd.DataFrame({c: data[c] for c in self.columns if c in data}, copy=False)
+        else:
+            raise TypeError(f"Unsupported batch type: {type(data).__name__}")
+
+        missing = [c for c in self.columns if c not in frame.columns]
+        if missing:
+            raise ValueError(f"Batch is missing columns: {missing}")
+
+        return frame[self.columns]
+
+    def encode_csv(self, frame: pd.DataFrame) -> io.StringIO:
+        """
+        Encode a frame as a headerless CSV buffer for COPY.
+
+        NaN/None are written as unquoted empty fields, which COPY reads as NULL.
+        """
+        buf = io.StringIO()
+        frame.to_csv(buf, index=False, header=False, na_rep="")
+        buf.seek(0)
+        return buf
+
+    def write(self, data: Any, connection: Any = None) -> int:
+        """
+        Write a batch via COPY + staging upsert.
+
+        Args:
+            data: pandas DataFrame, pyarrow Table, or mapping of column -> array
+            connection: Optional DBAPI connection (e.g. session.connection().connection).
+                When given, the caller owns the transaction; otherwise a pooled
+                connection is used and committed here.
+
+        Returns:
+            Number of rows sent to the database
+        """
+        frame = self.to_frame(data)
+        rows = len(frame)
+        if rows == 0:
+            return 0
+
+        start = time.perf_counter()
+        buf = self.encode_csv(frame)
+
+        if connection is not None:
+            self._copy_upsert(connection, buf)
+        else:
+            raw = self.engine.raw_connection()
+            try:
+                self._copy_upsert(raw, buf)
+                raw.commit()
+            except Exception:
+                raw.rollback()
+                raise
+            finally:
+                raw.close()
+
+        elapsed = time.perf_counter() - start
+        with self._stats_lock:
+            self.stats["rows"] += rows
+            self.stats["batches"] += 1
+            self.stats["seconds"] += elapsed
+
+        logger.debug(f"COPY {rows} rows into {self.table} in {elapsed:.3f}s")
+        return rows
+
+    def _copy_upsert(self, dbapi_conn: Any, buf: io.StringIO) -> None:
+        """Run one staging round on a DBAPI (psycopg2) connection."""
+        staging = f"_stg_{self.table.replace('.', '_')}_{uuid.uuid4().hex[:8]}"
+        sql = self.build_statements(staging)
+
+        cursor = dbapi_conn.cursor()
+        try:
+            cursor.execute(sql["create"])
+            cursor.copy_expert(sql["copy"], buf)
+            cursor.execute(sql["upsert"])
+            cursor.execute(sql["drop"])
+        finally:
+            cursor.close()
+
+
+class SymbolCheckpoint:
+    """
+    Per-symbol ingestion progress, persisted as JSON.
+
+    File format:
+        {
+            "AAPL.US": {"last_time": "2024-06-28T00:00:00+00:00", "rows": 5012,
+                        "updated_at": "2024-06-29T01:02:03+00:00"},
+            ...
+        }
+
+    Writes go to a temp file and are renamed into place, so a crash mid-save
+    never leaves a truncated checkpoint.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize checkpoint (loads existing progress if the file exists).
+
+        Args:
+            path: JSON file path
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._state: Dict[str, Dict[str, Any]] = {}
+
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self._state = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable checkpoint {path}: {e}")
+
+    def get(self, symbol: str) -> Optional[str]:
+        """Return the last ingested timestamp (ISO string) for a symbol, or None."""
+        with self._lock:
+            entry = self._state.get(symbol)
+            return entry["last_time"] if entry else None
+
+    def update(self, symbol: str, last_time: str, rows: int) -> None:
+        """
+        Record progress for a symbol (only moves forward).
+
+        Args:
+            symbol: Symbol code
+            last_time: ISO timestamp of the newest row written
+            rows: Rows written in this step
+        """
+        with self._lock:
+            entry = self._state.get(symbol, {"last_time": None, "rows": 0})
+            if entry["last_time"] is None or last_time > entry["last_time"]:
+                entry["last_time"] = last_time
+            entry["rows"] += rows
+            entry["updated_at"] = datetime.now(timezone.utc).isoformat()
+            self._state[symbol] = entry
+
+    def save(self) -> None:
+        """Atomically persist the checkpoint to disk."""
+        with self._lock:
+            payload = json.dumps(self._state, indent=2, sort_keys=True)
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(payload)
+        os.replace(tmp_path, self.path)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._state)
+
+
+FetchFn = Callable[[str, Optional[str]], Awaitable[Optional[pd.DataFrame]]]
+
+
+class ConcurrentIngestor:
+    """
+    Async fetch workers feeding a shared CopyIngestionSink.
+
+    Logic:
+    1. Queue all symbols; spawn `concurrency` worker coroutines
+    2. Each worker takes a token from the shared RateLimiter (awaiting the exact
+       refill time, never busy-sleeping), then calls fetch(symbol, since)
+    3. Frames accumulate until `flush_rows`, then one COPY runs in a thread
+       executor so the event loop keeps fetching
+    4. After each flush, checkpoint records the newest time per flushed symbol
+
+    fetch(symbol, since) receives the checkpointed ISO timestamp (or None) and
+    returns a DataFrame with the sink columns, or None/empty for no new data.
+    It must raise when the fetch itself failed, so the symbol is reported in
+    `failed_symbols` instead of `completed`.
+
+    A symbol is `completed` only once its rows have been flushed (or it had
+    no new rows); symbols whose fetch raised or whose batch failed to flush
+    are listed in `failed_symbols` and their checkpoint is left untouched.
+
+    Summary:
+        {
+            'total_symbols': 100,
+            'total_rows': 250000,
+            'failed': 2,
+            'failed_symbols': ['BAD.US', ...],
+            'completed': ['AAPL.US', ...],
+            'duration_sec': 12.3,
+            'rows_per_sec': 20325.2,
+        }
+    """
+
+    def __init__(
+        self,
+        sink: CopyIngestionSink,
+        fetch: FetchFn,
+        requests_per_second: int = 10,
+        concurrency: int = 5,
+        checkpoint: Optional[SymbolCheckpoint] = None,
+        time_column: str = "time",
+        symbol_column: str = "symbol",
+        flush_rows: int = 50000,
+    ):
+        """
+        Initialize ingestor.
+
+        Args:
+            sink: Destination sink
+            fetch: Async fetch function (symbol, since) -> DataFrame
+            requests_per_second: Token-bucket rate shared by all workers
+            concurrency: Number of worker coroutines
+            checkpoint: Optional progress store for resumable backfills
+            time_column: Column used for checkpoint progress
+            symbol_column: Column holding the symbol code
+            flush_rows: Buffered rows that trigger a COPY
+        """
+        self.sink = sink
+        self.fetch = fetch
+        self.limiter = RateLimiter(requests_per_second)
+        self.concurrency = concurrency
+        self.checkpoint = checkpoint
+        self.time_column = time_column
+        self.symbol_column = symbol_column
+        self.flush_rows = flush_rows
+
+    async def _throttle(self) -> None:
+        """Await a token from the shared bucket."""
+        while not self.limiter.acquire():
+            await asyncio.sleep(self.limiter.time_until_available())
+
+    async def run(self, symbols: Sequence[str]) -> Dict[str, Any]:
+        """
+        Ingest all symbols.
+
+        Args:
+            symbols: Symbols to fetch
+
+        Returns:
+            Summary dictionary (see class docstring)
+        """
+        start = time.perf_counter()
+        loop = asyncio.get_running_loop()
+
+        queue: asyncio.Queue = asyncio.Queue()
+        for symbol in symbols:
+            queue.put_nowait(symbol)
+
+        pending: List[pd.DataFrame] = []
+        pending_symbols: List[str] = []
+        pending_rows = 0
+        total_rows = 0
+        completed: List[str] = []
+        failed_symbols: List[str] = []
+        buffer_lock = asyncio.Lock()
+        flush_lock = asyncio.Lock()
+
+        async def flush(frames: List[pd.DataFrame], batch_symbols: List[str]) -> None:
+            """COPY one batch; its symbols complete only once their rows are stored."""
+            nonlocal total_rows
+            if not frames:
+                return
+            batch = pd.concat(frames, ignore_index=True)
+            try:
+                async with flush_lock:
+                    rows = await loop.run_in_executor(None, self.sink.write, batch)
+            except Exception as e:
+                logger.error(f"Flush failed, {len(batch_symbols)} symbols not stored: {e}")
+                failed_symbols.extend(batch_symbols)
+                return
+            total_rows += rows
+            self._record_progress(batch)
+            completed.extend(batch_symbols)
+
+        async def worker() -> None:
+            nonlocal pending, pending_symbols, pending_rows
+            while True:
+                try:
+                    symbol = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+
+                try:
+                    await self._throttle()
+                    since = self.checkpoint.get(symbol) if self.checkpoint else None
+                    frame = await self.fetch(symbol, since)
+                except Exception as e:
+                    logger.error(f"Error ingesting {symbol}: {e}")
+                    failed_symbols.append(symbol)
+                    queue.task_done()
+                    continue
+
+                ready: List[pd.DataFrame] = []
+                ready_symbols: List[str] = []
+                async with buffer_lock:
+                    if frame is not None and len(frame) > 0:
+                        pending.append(frame)
+                        pending_symbols.append(symbol)
+                        pending_rows += len(frame)
+                    else:
+                        completed.append(symbol)  # Fetched, nothing new to store
+                    if pending_rows >= self.flush_rows:
+                        ready, pending, pending_rows = pending, [], 0
+                        ready_symbols, pending_symbols = pending_symbols, []
+
+                await flush(ready, ready_symbols)
+                queue.task_done()
+
+        workers = [asyncio.create_task(worker()) for _ in range(self.concurrency)]
+        await asyncio.gather(*workers)
+        await flush(pending, pending_symbols)
+
+        elapsed = time.perf_counter() - start
+        summary = {
+            "total_symbols": len(symbols),
+            "total_rows": total_rows,
+            "failed": len(failed_symbols),
+            "failed_symbols": failed_symbols,
+            "completed": completed,
+            "duration_sec": round(elapsed, 1),
+            "rows_per_sec": round(total_rows / elapsed, 1) if elapsed > 0 else 0.0,
+        }
+        logger.info(
+            f"Ingestion complete: {summary['total_rows']} rows, "
+            f"{summary['failed']} failed, {summary['rows_per_sec']} rows/s"
+        )
+        return summary
+
+    def _record_progress(self, batch: pd.DataFrame) -> None:
+        """Advance the checkpoint for every symbol in a flushed batch."""
+        if self.checkpoint is None or batch.empty:
+            return
+
+        times = pd.to_datetime(batch[self.time_column], utc=True)
+        grouped = times.groupby(batch[self.symbol_column].values)
+        latest = grouped.max()
+        counts = grouped.size()
+
+        for symbol, last_time in latest.items():
+            self.checkpoint.update(symbol, last_time.isoformat(), int(counts[symbol]))
+        self.checkpoint.save()
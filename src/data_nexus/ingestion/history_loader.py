@@ -6,22 +6,28 @@ High-performance async loader for historical market data.
 Key Design Principles:
 1. Low Concurrency (5-8 workers): Respects PL0 disk constraints
 2. Aggressive Batching (5000+ rows): Minimizes database round-trips
-3. Cursor-based (Asset.last_synced): Enables resume/pause capability
-4. Error Resilience: Per-asset error handling, exponential backoff
+3. COPY Ingestion (CopyIngestionSink): Staging-table upsert instead of ORM objects
+4. Cursor-based (Asset.last_synced + SymbolCheckpoint): Enables resume/pause capability
+5. Error Resilience: Per-asset error handling, token-bucket rate limiting
 """
 
 import asyncio
 import logging
 from datetime import datetime, timedelta, timezone
-from decimal import Decimal
-from typing import Optional
+from typing import Any, Optional
 
 import aiohttp
-from sqlalchemy.orm import Session
+import pandas as pd
 
 from src.data_nexus.config import DatabaseConfig
 from src.data_nexus.database.connection import PostgresConnection
-from src.data_nexus.models import Asset, MarketData
+from src.data_nexus.ingestion.copy_sink import (
+    MARKET_DATA_COLUMNS,
+    ConcurrentIngestor,
+    CopyIngestionSink,
+    SymbolCheckpoint,
+)
+from src.data_nexus.models import Asset
 
 logger = logging.getLogger(__name__)
 
@@ -38,8 +44,9 @@ class EODHistoryLoader:
     Async OHLCV data loader with batch writing.
 
     Usage:
-        loader = EODHistoryLoader(api_key, db_config)
+        loader = EODHistoryLoader(api_key, db_config, checkpoint_path="var/eod_checkpoint.json")
         loader.concurrency = 5
+        loader.requests_per_second = 10
         summary = await loader.run_cycle(limit=100, days_old=1)
 
     Summary:
@@ -51,19 +58,29 @@ class EODHistoryLoader:
         }
     """
 
-    def __init__(self, api_key: str, db_config: Optional[DatabaseConfig] = None):
+    def __init__(
+        self,
+        api_key: str,
+        db_config: Optional[DatabaseConfig] = None,
+        checkpoint_path: Optional[str] = None,
+    ):
         """
         Initialize history loader.
 
         Args:
             api_key: EODHD API key
             db_config: Database configuration (uses default if None)
+            checkpoint_path: Optional JSON file for per-symbol progress; lets an
+                interrupted cycle resume without refetching flushed symbols
         """
         self.api_key = api_key
         self.db_config = db_config or DatabaseConfig()
+        self.checkpoint = SymbolCheckpoint(checkpoint_path) if checkpoint_path else None
+        self._sink: Optional[CopyIngestionSink] = None
 
         # Tunable parameters
         self.concurrency = 5  # Default: conservative for PL0
+        self.requests_per_second = 10  # Token-bucket rate shared by all workers
         self.batch_size = 100  # Rows to fetch per API call
         self.write_batch_size = 5000  # Rows to accumulate before DB insert
         self.timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
@@ -75,10 +92,10 @@ class EODHistoryLoader:
         Logic:
         1. Query assets to sync: WHERE is_active=True AND (last_synced IS NULL OR last_synced < NOW - {days_old})
         2. Create asyncio.Queue with these assets
-        3. Spawn N worker coroutines (controlled by Semaphore)
+        3. Spawn N worker coroutines (shared token-bucket rate limiter)
         4. Each worker fetches /api/eod/{symbol}.{exchange}
-        5. Accumulate MarketData objects in batch buffer
-        6. When batch reaches write_batch_size, flush to DB via bulk_save_objects()
+        5. Accumulate OHLCV DataFrames in batch buffer
+        6. When batch reaches write_batch_size, COPY to DB via CopyIngestionSink
         7. Update Asset.last_synced = datetime.now()
         8. Return summary
 
@@ -152,13 +169,12 @@ class EODHistoryLoader:
 
     async def _run_workers(self, queue: asyncio.Queue, assets: list[Asset]) -> tuple[int, int]:
         """
-        Spawn worker coroutines to fetch data and batch-write to DB.
+        Fetch data for all queued assets and COPY it into market_data.
 
-        Workers:
-        - Consume assets from queue
-        - Fetch OHLCV data from API
-        - Accumulate in batch buffer
-        - Write batches to DB when buffer reaches write_batch_size
+        Workers (ConcurrentIngestor):
+        - Share one aiohttp session and one token-bucket rate limiter
+        - Fetch OHLCV data from API, resuming from the checkpoint if present
+        - Accumulate DataFrames and flush every write_batch_size rows via COPY
 
         Args:
             queue: Queue of assets to process
@@ -167,92 +183,75 @@ class EODHistoryLoader:
         Returns:
             Tuple of (total_rows_inserted, total_failed)
         """
-        semaphore = asyncio.Semaphore(self.concurrency)
-        batch_buffer = []
-        assets_to_update = []
-        total_rows = 0
-        total_failed = 0
-        lock = asyncio.Lock()  # Protect shared state
-
-        async def worker(session: Session):
-            """Worker coroutine: fetch data and batch-write."""
-            nonlocal batch_buffer, assets_to_update, total_rows, total_failed
-
-            while True:
-                try:
-                    asset = queue.get_nowait()
-                except asyncio.QueueEmpty:
-                    break
-
-                try:
-                    async with semaphore:
-                        logger.info(f"Fetching {asset.symbol}...")
-                        market_data_list = await self._fetch_symbol(asset)
-
-                        if market_data_list:
-                            # Add to batch
-                            async with lock:
-                                batch_buffer.extend(market_data_list)
-                                assets_to_update.append(asset)
-                                logger.info(f"  → {len(market_data_list)} rows for {asset.symbol}")
-
-                                # Flush batch if threshold reached
-                                if len(batch_buffer) >= self.write_batch_size:
-                                    logger.info(f"Flushing {len(batch_buffer)} rows to database...")
-                                    self._flush_batch(session, batch_buffer)
-                                    total_rows += len(batch_buffer)
-                                    batch_buffer.clear()
-                        else:
-                            logger.warning(f"  → No data for {asset.symbol}")
-
-                except Exception as e:
-                    logger.error(f"Error processing {asset.symbol}: {e}")
-                    total_failed += 1
-                    continue
-                finally:
-                    queue.task_done()
-
-        # Create session for batch writing
-        conn = PostgresConnection()
-        with conn.get_session() as session:
-            # Run workers
-            workers = [
-                asyncio.create_task(worker(session))
-                for _ in range(self.concurrency)
-            ]
-
-            await asyncio.gather(*workers)
-
-            # Final flush for remaining rows
-            if batch_buffer:
-                logger.info(f"Final flush: {len(batch_buffer)} rows to database...")
-                self._flush_batch(session, batch_buffer)
-                total_rows += len(batch_buffer)
-
-            # Update asset.last_synced
-            if assets_to_update:
-                logger.info(f"Updating last_synced for {len(assets_to_update)} assets...")
-                for asset in assets_to_update:
-                    asset.last_synced = datetime.now(timezone.utc)
+        by_symbol = {}
+        while not queue.empty():
+            asset = queue.get_nowait()
+            by_symbol[asset.symbol] = asset
+            queue.task_done()
+
+        async with aiohttp.ClientSession(timeout=self.timeout) as http:
+
+            async def fetch(symbol: str, since: Optional[str]) -> pd.DataFrame:
+                logger.info(f"Fetching {symbol}...")
+                frame = await self._fetch_symbol(by_symbol[symbol], since=since, http=http)
+                if frame is None:
+                    # Reported as failed: checkpoint and last_synced stay put for a retry
+                    raise RuntimeError(f"fetch failed for {symbol}")
+                if frame.empty:
+                    logger.warning(f"  → No data for {symbol}")
+                else:
+                    logger.info(f"  → {len(frame)} rows for {symbol}")
+                return frame
+
+            ingestor = ConcurrentIngestor(
+                self._get_sink(),
+                fetch,
+                requests_per_second=self.requests_per_second,
+                concurrency=self.concurrency,
+                checkpoint=self.checkpoint,
+                flush_rows=self.write_batch_size,
+            )
+            summary = await ingestor.run(list(by_symbol))
+
+        # Update asset.last_synced only for assets whose rows were stored
+        # (or that had nothing new); failed fetches and failed flushes retry next cycle
+        completed = summary["completed"]
+        if completed:
+            logger.info(f"Updating last_synced for {len(completed)} assets...")
+            conn = PostgresConnection()
+            with conn.get_session() as session:
+                now = datetime.now(timezone.utc)
+                for symbol in completed:
+                    asset = session.merge(by_symbol[symbol])
+                    asset.last_synced = now
                 session.commit()
 
-        return total_rows, total_failed
+        return summary["total_rows"], summary["failed"]
 
-    async def _fetch_symbol(self, asset: Asset) -> list[MarketData]:
+    async def _fetch_symbol(
+        self,
+        asset: Asset,
+        since: Optional[str] = None,
+        http: Optional[aiohttp.ClientSession] = None,
+    ) -> Optional[pd.DataFrame]:
         """
         Fetch and parse OHLCV data for a single symbol.
 
-        Error Handling:
-        - 404: Symbol not found, log warning, return empty list
-        - 429: Rate limited, back off, return empty list
-        - 5xx: Server error, don't update last_synced (will retry next cycle)
-        - Timeout: Network error, return empty list
+        Error Handling (all return None, so last_synced is not updated and the
+        symbol is retried next cycle):
+        - 404: Symbol not found, log warning
+        - 429: Rate limited, back off
+        - 5xx: Server error
+        - Timeout / API error / unexpected payload: log error
 
         Args:
             asset: Asset to fetch
+            since: Checkpointed ISO timestamp of the newest stored row (resume point)
+            http: Shared aiohttp session (a private one is opened if None)
 
         Returns:
-            List of MarketData objects, or empty list on error
+            DataFrame with MARKET_DATA_COLUMNS (empty when there are no new rows),
+            or None when the fetch failed
         """
         try:
             url = f"{EODHD_API_URL}/eod/{asset.symbol}"
@@ -262,84 +261,112 @@ class EODHistoryLoader:
                 "period": "d",  # Daily data
             }
 
-            # If asset has been synced before, fetch only newer data
-            if asset.last_synced:
-                from_date = (asset.last_synced.date() + timedelta(days=1)).isoformat()
-                params["from"] = from_date
-
-            async with aiohttp.ClientSession(timeout=self.timeout) as session:
-                async with session.get(url, params=params) as resp:
-                    if resp.status == 404:
-                        logger.warning(f"Asset {asset.symbol} not found (404)")
-                        return []
-                    elif resp.status == 429:
-                        logger.warning(f"Rate limited on {asset.symbol}, backing off 60s")
-                        await asyncio.sleep(60)
-                        return []
-                    elif resp.status >= 500:
-                        logger.error(f"Server error {resp.status} for {asset.symbol}")
-                        return []  # Don't update last_synced
-                    elif resp.status != 200:
-                        logger.warning(f"Unexpected status {resp.status} for {asset.symbol}")
-                        return []
-
-                    data = await resp.json()
+            # Fetch only data newer than what is already stored
+            last_stored = asset.last_synced.date() if asset.last_synced else None
+            if since:
+                checkpoint_date = datetime.fromisoformat(since).date()
+                last_stored = max(last_stored, checkpoint_date) if last_stored else checkpoint_date
+            if last_stored:
+                params["from"] = (last_stored + timedelta(days=1)).isoformat()
+
+            if http is None:
+                async with aiohttp.ClientSession(timeout=self.timeout) as session:
+                    data = await self._get_json(session, url, params, asset.symbol)
+            else:
+                data = await self._get_json(http, url, params, asset.symbol)
+
+            if data is None:
+                return None
 
             # Validate response
             if isinstance(data, dict) and "error" in data:
                 logger.error(f"API error for {asset.symbol}: {data['error']}")
-                return []
+                return None
 
             if not isinstance(data, list):
                 logger.error(f"Unexpected response format for {asset.symbol}: {type(data)}")
-                return []
-
-            # Transform to MarketData objects
-            market_data_list = []
-            for row in data:
-                try:
-                    md = MarketData(
-                        time=datetime.fromisoformat(row["date"]).replace(tzinfo=timezone.utc),
-                        symbol=asset.symbol,
-                        open=Decimal(str(row["open"])),
-                        high=Decimal(str(row["high"])),
-                        low=Decimal(str(row["low"])),
-                        close=Decimal(str(row["close"])),
-                        adjusted_close=Decimal(str(row.get("adjusted_close", row["close"]))),
-                        volume=int(row.get("volume", 0)),
-                    )
-                    market_data_list.append(md)
-                except (KeyError, ValueError, TypeError) as e:
-                    logger.error(f"Parse error in {asset.symbol} row: {e}")
-                    continue
-
-            return market_data_list
+                return None
+
+            return self._to_frame(data, asset.symbol)
 
         except asyncio.TimeoutError:
             logger.error(f"Timeout fetching {asset.symbol}")
-            return []
+            return None
         except Exception as e:
             logger.error(f"Unexpected error fetching {asset.symbol}: {e}")
-            return []
-
-    def _flush_batch(self, session: Session, batch: list[MarketData]):
+            return None
+
+    async def _get_json(
+        self, session: aiohttp.ClientSession, url: str, params: dict, symbol: str
+    ) -> Optional[Any]:
+        """GET url and decode JSON; returns None on non-200 responses."""
+        async with session.get(url, params=params) as resp:
+            if resp.status == 404:
+                logger.warning(f"Asset {symbol} not found (404)")
+                return None
+            elif resp.status == 429:
+                logger.warning(f"Rate limited on {symbol}, backing off 60s")
+                await asyncio.sleep(60)
+                return None
+            elif resp.status >= 500:
+                logger.error(f"Server error {resp.status} for {symbol}")
+                return None  # Don't update last_synced
+            elif resp.status != 200:
+                logger.warning(f"Unexpected status {resp.status} for {symbol}")
+                return None
+
+            return await resp.json()
+
+    @staticmethod
+    def _to_frame(rows: list[dict], symbol: str) -> pd.DataFrame:
         """
-        Flush accumulated batch to database.
+        Transform EODHD JSON rows into a market_data frame (vectorized).
 
-        Uses SQLAlchemy bulk_save_objects() for efficiency on large batches.
+        Rows with missing or unparsable OHLC values are dropped.
 
         Args:
-            session: SQLAlchemy session
-            batch: List of MarketData objects
-        """
-        if not batch:
-            return
+            rows: EODHD /eod JSON rows
+            symbol: Symbol code
 
-        try:
-            session.bulk_save_objects(batch)
-            session.commit()
-            logger.debug(f"Flushed {len(batch)} rows to database")
-        except Exception as e:
-            logger.error(f"Batch flush failed: {e}")
-            session.rollback()
-            raise
+        Returns:
+            DataFrame with MARKET_DATA_COLUMNS
+        """
+        raw = pd.DataFrame(rows)
+        required = ["date", "open", "high", "low", "close"]
+        if raw.empty or any(c not in raw.columns for c in required):
+            if not raw.empty:
+                logger.error(f"Parse error in {symbol}: missing columns")
+            return pd.DataFrame(columns=MARKET_DATA_COLUMNS)
+
+        frame = pd.DataFrame({
+            "time": pd.to_datetime(raw["date"], errors="coerce", utc=True),
+            "symbol": symbol,
+        })
+        for col in ("open", "high", "low", "close"):
+            frame[col] = pd.to_numeric(raw[col], errors="coerce")
+
+        adjusted = raw["adjusted_close"] if "adjusted_close" in raw.columns else raw["close"]
+        frame["adjusted_close"] = pd.to_numeric(adjusted, errors="coerce").fillna(frame["close"])
+
+        volume = raw["volume"] if "volume" in raw.columns else 0
+        frame["volume"] = pd.to_numeric(volume, errors="coerce")
+        frame["volume"] = frame["volume"].fillna(0).astype("int64")
+
+        before = len(frame)
+        frame = frame.dropna()
+        if len(frame) < before:
+            logger.error(f"Parse error in {symbol}: dropped {before - len(frame)} rows")
+
+        return frame[MARKET_DATA_COLUMNS]
+
+    def _get_sink(self) -> CopyIngestionSink:
+        """Get or create the COPY sink for market_data."""
+        if self._sink is None:
+            conn = PostgresConnection(self.db_config)
+            self._sink = CopyIngestionSink(
+                conn.engine,
+                table="market_data",
+                columns=MARKET_DATA_COLUMNS,
+                conflict_columns=["time", "symbol"],
+            )
+        return self._sink
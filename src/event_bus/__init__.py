@@ -1,11 +1,12 @@
 """Redis Streams 事件总线模块"""
 from .config import RedisConfig, redis_config
-from .base_producer import BaseEventProducer
+from .base_producer import AsyncEventProducer, BaseEventProducer
 from .base_consumer import BaseEventConsumer
 
 __all__ = [
     'RedisConfig',
     'redis_config',
     'BaseEventProducer',
+    'AsyncEventProducer',
     'BaseEventConsumer',
 ]
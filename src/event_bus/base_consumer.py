@@ -4,7 +4,9 @@ import logging
 import time
 import signal
 import sys
-from typing import Dict, Any, Optional, Callable
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Hashable, List, Optional, Callable, Tuple
 from datetime import datetime
 from abc import ABC, abstractmethod
 import redis
@@ -40,6 +42,19 @@ pending_events_count = Gauge(
     ['stream', 'consumer_group']
 )
 
+consumer_lag = Gauge(
+    'mt5_consumer_lag',
+    'Number of stream entries not yet delivered to the consumer group',
+    ['stream', 'consumer_group']
+)
+
+event_batch_size = Histogram(
+    'mt5_event_batch_size',
+    'Number of events handled per batch',
+    ['stream', 'consumer_group'],
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+)
+
 
 class BaseEventConsumer(ABC):
     """事件消费者基类
@@ -52,8 +67,10 @@ class BaseEventConsumer(ABC):
     5. 错误处理与死信队列
     6. 优雅关闭
     7. Prometheus 监控集成
+    8. 批量处理：整批 XACK / XCLAIM 各一次往返，可选线程池（同 key 保序）
 
-    子类需要实现 process_event() 方法
+    子类需要实现 process_event() 方法；需要整批处理（如批量推理）时
+    可重写 process_batch()
     """
 
     def __init__(
@@ -68,6 +85,9 @@ class BaseEventConsumer(ABC):
         auto_ack: bool = True,
         block_ms: Optional[int] = None,
         batch_size: Optional[int] = None,
+        max_workers: int = 0,
+        ordering_key: Optional[str] = None,
+        lag_interval_s: float = 5.0,
     ):
         """初始化消费者
 
@@ -82,6 +102,9 @@ class BaseEventConsumer(ABC):
             auto_ack: 是否自动 ACK，True 则处理成功后自动确认
             block_ms: 阻塞读取超时（毫秒），None 则使用配置默认值
             batch_size: 批量读取大小，None 则使用配置默认值
+            max_workers: 默认 process_batch 的工作线程数，0 表示在当前线程顺序处理
+            ordering_key: 事件字段名，并行处理时该字段相同的事件保持顺序
+            lag_interval_s: 消费延迟（lag / pending）指标的刷新间隔（秒）
         """
         self.stream_key = stream_key
         self.consumer_group = consumer_group
@@ -98,6 +121,23 @@ class BaseEventConsumer(ABC):
         self.block_ms = block_ms if block_ms is not None else redis_config.block_ms
         self.batch_size = batch_size if batch_size is not None else redis_config.batch_size
 
+        # 批量处理配置
+        self.ordering_key = ordering_key
+        self.lag_interval_s = lag_interval_s
+        self._executor = (
+            ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=self.consumer_name)
+            if max_workers > 0 else None
+        )
+        self._last_lag_check = 0.0
+        self.stats = {
+            'batches': 0,
+            'events': 0,
+            'acked': 0,
+            'failed': 0,
+            'lag': None,
+            'pending': None,
+        }
+
         # 初始化连接池
         self.redis_pool = redis.ConnectionPool(
             host=self.redis_host,
@@ -189,6 +229,62 @@ class BaseEventConsumer(ABC):
         """
         pass
 
+    def process_batch(
+        self,
+        events: List[Tuple[str, Dict[str, Any]]]
+    ) -> List[bool]:
+        """批量处理事件
+
+        默认逐条调用 process_event()；配置了 max_workers 时在线程池中并行处理，
+        ordering_key 相同的事件在同一任务中按到达顺序处理。
+        子类可重写以整批处理（例如一次批量推理）。
+
+        Args:
+            events: [(事件ID, 已解析的事件数据), ...]
+
+        Returns:
+            与 events 一一对应的处理结果，True 表示成功（将被 ACK）
+        """
+        if self._executor is None or len(events) <= 1:
+            return [self._process_one(event_id, event_data) for event_id, event_data in events]
+
+        # 按 ordering key 分组，组内顺序处理，组间并行
+        groups: "OrderedDict[Hashable, List[int]]" = OrderedDict()
+        for index, (_, event_data) in enumerate(events):
+            key = self.ordering_key_for(event_data)
+            groups.setdefault(('key', key) if key is not None else ('index', index), []).append(index)
+
+        results = [False] * len(events)
+
+        def run_group(indices: List[int]):
+            for index in indices:
+                results[index] = self._process_one(*events[index])
+
+        for future in [self._executor.submit(run_group, indices) for indices in groups.values()]:
+            future.result()
+
+        return results
+
+    def ordering_key_for(self, event_data: Dict[str, Any]) -> Optional[Hashable]:
+        """事件的顺序 key（None 表示不需要与其他事件保序）"""
+        if self.ordering_key is None:
+            return None
+        key = event_data.get(self.ordering_key)
+        return key if isinstance(key, Hashable) else json.dumps(key, sort_keys=True)
+
+    def _process_one(self, event_id: str, event_data: Dict[str, Any]) -> bool:
+        """调用 process_event，异常视为处理失败"""
+        try:
+            return bool(self.process_event(event_id, event_data))
+        except Exception as e:
+            event_process_errors.labels(
+                stream=self.stream_key,
+                consumer_group=self.consumer_group,
+                error_type=type(e).__name__
+            ).inc()
+            logger.error(f"Error processing event {event_id}: {e}", exc_info=True)
+            return False
+
     def start(self):
         """启动消费者，开始消费事件"""
         self.running = True
@@ -227,12 +323,11 @@ class BaseEventConsumer(ABC):
             block=self.block_ms,
         )
 
-        if not messages:
-            return
+        if messages:
+            for stream_name, stream_messages in messages:
+                self._handle_batch(stream_messages)
 
-        for stream_name, stream_messages in messages:
-            for message_id, message_data in stream_messages:
-                self._handle_message(message_id, message_data)
+        self._update_lag_metrics()
 
     def _process_pending_messages(self):
         """处理 PEL（Pending Entry List）中的超时消息"""
@@ -254,6 +349,8 @@ class BaseEventConsumer(ABC):
 
             # 处理超时的消息
             min_idle_time = redis_config.min_idle_time_ms
+            retry_ids = []
+            deadletter = []
             for entry in pending:
                 message_id = entry['message_id']
                 idle_time = entry['time_since_delivered']
@@ -265,18 +362,7 @@ class BaseEventConsumer(ABC):
                         f"Reprocessing pending message {message_id}, "
                         f"idle_time={idle_time}ms, delivered={times_delivered} times"
                     )
-
-                    # 重新认领消息
-                    claimed = self.redis_client.xclaim(
-                        name=self.stream_key,
-                        groupname=self.consumer_group,
-                        consumername=self.consumer_name,
-                        min_idle_time=min_idle_time,
-                        message_ids=[message_id],
-                    )
-
-                    for msg_id, msg_data in claimed:
-                        self._handle_message(msg_id, msg_data)
+                    retry_ids.append(message_id)
 
                 elif times_delivered > redis_config.max_retries:
                     # 超过最大重试次数，移到死信队列
@@ -284,76 +370,130 @@ class BaseEventConsumer(ABC):
                         f"Message {message_id} exceeded max retries, "
                         f"moving to dead letter queue"
                     )
-                    self._move_to_deadletter(message_id, entry)
-                    # ACK 掉原消息
-                    self.redis_client.xack(self.stream_key, self.consumer_group, message_id)
+                    deadletter.append(entry)
+
+            if deadletter:
+                # 死信写入与原消息 ACK 一次往返
+                self._move_to_deadletter_batch(deadletter)
+
+            if retry_ids:
+                # 一次 XCLAIM 重新认领整批消息
+                claimed = self.redis_client.xclaim(
+                    name=self.stream_key,
+                    groupname=self.consumer_group,
+                    consumername=self.consumer_name,
+                    min_idle_time=min_idle_time,
+                    message_ids=retry_ids,
+                )
+                # 已被删除的消息 XCLAIM 返回空数据
+                self._handle_batch([(msg_id, msg_data) for msg_id, msg_data in claimed if msg_data])
 
         except RedisError as e:
             logger.error(f"Error processing pending messages: {e}")
 
     def _handle_message(self, message_id: str, message_data: Dict[str, Any]):
         """处理单条消息"""
+        self._handle_batch([(message_id, message_data)])
+
+    @staticmethod
+    def _parse_message(message_data: Dict[str, Any]) -> Dict[str, Any]:
+        """解析消息字段中的 JSON 值"""
+        parsed_data = {}
+        for key, value in message_data.items():
+            try:
+                parsed_data[key] = json.loads(value)
+            except (json.JSONDecodeError, TypeError):
+                parsed_data[key] = value
+        return parsed_data
+
+    def _handle_batch(self, messages: List[Tuple[str, Dict[str, Any]]]):
+        """处理一批消息：整批解析 → process_batch → 一次 XACK"""
+        if not messages:
+            return
+
         start_time = time.time()
+        events = [(message_id, self._parse_message(message_data)) for message_id, message_data in messages]
 
         try:
-            # 解析 JSON 数据
-            parsed_data = {}
-            for key, value in message_data.items():
-                try:
-                    parsed_data[key] = json.loads(value)
-                except (json.JSONDecodeError, TypeError):
-                    parsed_data[key] = value
-
-            # 调用子类实现的处理方法
-            success = self.process_event(message_id, parsed_data)
-
-            duration = time.time() - start_time
-
-            if success:
-                # 处理成功
-                if self.auto_ack:
-                    self.redis_client.xack(self.stream_key, self.consumer_group, message_id)
-
-                events_consumed_total.labels(
-                    stream=self.stream_key,
-                    consumer_group=self.consumer_group,
-                    status='success'
-                ).inc()
-
-                logger.debug(
-                    f"Event processed successfully: id={message_id}, "
-                    f"duration={duration:.3f}s"
-                )
-            else:
-                # 处理失败但不抛异常，记录错误
-                events_consumed_total.labels(
-                    stream=self.stream_key,
-                    consumer_group=self.consumer_group,
-                    status='failed'
-                ).inc()
-
-                logger.warning(
-                    f"Event processing returned False: id={message_id}, "
-                    f"will retry later"
+            results = self.process_batch(events)
+            if len(results) != len(events):
+                raise ValueError(
+                    f"process_batch returned {len(results)} results for {len(events)} events"
                 )
-
-            event_consume_duration.labels(
-                stream=self.stream_key,
-                consumer_group=self.consumer_group
-            ).observe(duration)
-
         except Exception as e:
             event_process_errors.labels(
                 stream=self.stream_key,
                 consumer_group=self.consumer_group,
                 error_type=type(e).__name__
             ).inc()
-
-            logger.error(
-                f"Error processing event {message_id}: {e}",
-                exc_info=True
+            logger.error(f"Error processing batch of {len(events)} events: {e}", exc_info=True)
+            results = [False] * len(events)
+
+        duration = time.time() - start_time
+        succeeded = [event_id for (event_id, _), ok in zip(events, results) if ok]
+        failed = len(events) - len(succeeded)
+
+        if succeeded and self.auto_ack:
+            # XACK 接受多个 ID：整批一次往返
+            self.redis_client.xack(self.stream_key, self.consumer_group, *succeeded)
+            self.stats['acked'] += len(succeeded)
+
+        self.stats['batches'] += 1
+        self.stats['events'] += len(events)
+        self.stats['failed'] += failed
+
+        labels = {'stream': self.stream_key, 'consumer_group': self.consumer_group}
+        if succeeded:
+            events_consumed_total.labels(status='success', **labels).inc(len(succeeded))
+        if failed:
+            events_consumed_total.labels(status='failed', **labels).inc(failed)
+            logger.warning(
+                f"{failed}/{len(events)} events returned False, will retry later"
             )
 
+        # 按事件摊分批处理耗时
+        per_event = duration / len(events)
+        histogram = event_consume_duration.labels(**labels)
+        for _ in events:
+            histogram.observe(per_event)
+        event_batch_size.labels(**labels).observe(len(events))
+
+        logger.debug(
+            f"Batch processed: {len(succeeded)}/{len(events)} succeeded, "
+            f"duration={duration:.3f}s"
+        )
+
+    def _update_lag_metrics(self, force: bool = False):
+        """刷新消费者组的 lag / pending 指标（XINFO GROUPS，按间隔节流）"""
+        now = time.monotonic()
+        if not force and now - self._last_lag_check < self.lag_interval_s:
+            return
+        self._last_lag_check = now
+
+        try:
+            groups = self.redis_client.xinfo_groups(self.stream_key)
+        except RedisError as e:
+            logger.debug(f"XINFO GROUPS failed: {e}")
+            return
+
+        labels = {'stream': self.stream_key, 'consumer_group': self.consumer_group}
+        for group in groups:
+            if group.get('name') != self.consumer_group:
+                continue
+            self.stats['pending'] = group.get('pending')
+            # lag 字段需要 Redis 7+，无法计算时为 None
+            self.stats['lag'] = group.get('lag')
+            if self.stats['pending'] is not None:
+                pending_events_count.labels(**labels).set(self.stats['pending'])
+            if self.stats['lag'] is not None:
+                consumer_lag.labels(**labels).set(self.stats['lag'])
+            break
+
+    def get_lag_metrics(self) -> Dict[str, Any]:
+        """当前消费统计与 lag / pending（立即刷新）"""
+        self._update_lag_metrics(force=True)
+        return dict(self.stats)
+
     def _move_to_deadletter(self, message_id: str, pending_info: Dict[str, Any]):
         """将消息移到死信队列"""
         try:
@@ -376,6 +516,32 @@ class BaseEventConsumer(ABC):
         except RedisError as e:
             logger.error(f"Failed to move message to deadletter: {e}")
 
+    def _move_to_deadletter_batch(self, entries: List[Dict[str, Any]]):
+        """批量移入死信队列并 ACK 原消息（一次 pipeline 往返）"""
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            moved_at = datetime.utcnow().isoformat() + 'Z'
+            for entry in entries:
+                deadletter_data = {
+                    'original_stream': self.stream_key,
+                    'original_message_id': entry['message_id'],
+                    'consumer_group': self.consumer_group,
+                    'consumer_name': self.consumer_name,
+                    'times_delivered': entry.get('times_delivered', 0),
+                    'moved_at': moved_at,
+                }
+                pipe.xadd(
+                    name=redis_config.STREAM_DEADLETTER,
+                    fields={k: json.dumps(v) for k, v in deadletter_data.items()},
+                )
+            pipe.xack(self.stream_key, self.consumer_group, *[entry['message_id'] for entry in entries])
+            pipe.execute()
+
+            logger.info(f"{len(entries)} messages moved to dead letter queue")
+
+        except RedisError as e:
+            logger.error(f"Failed to move messages to deadletter: {e}")
+
     def _signal_handler(self, signum, frame):
         """信号处理器，优雅关闭"""
         logger.info(f"Received signal {signum}, shutting down gracefully...")
@@ -389,6 +555,8 @@ class BaseEventConsumer(ABC):
     def close(self):
         """关闭连接"""
         self.stop()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
         if self.redis_client:
             self.redis_client.close()
             logger.info(f"Consumer '{self.consumer_name}' closed")
@@ -5,6 +5,7 @@ import time
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 import redis
+import redis.asyncio
 from redis.exceptions import RedisError
 from prometheus_client import Counter, Histogram
 
@@ -134,14 +135,8 @@ class BaseEventProducer:
         try:
             self._ensure_connection()
 
-            # 添加元数据
-            enriched_data = self._enrich_event(event_data, event_type)
-
-            # 序列化为字符串
-            payload = {
-                key: json.dumps(value) if not isinstance(value, str) else value
-                for key, value in enriched_data.items()
-            }
+            # 添加元数据并序列化
+            payload = self._build_payload(event_data, event_type)
 
             # 发布到 Stream
             maxlen_value = maxlen if maxlen is not None else redis_config.max_stream_length
@@ -207,26 +202,79 @@ class BaseEventProducer:
         enriched.update(event_data)
         return enriched
 
+    def _build_payload(self, event_data: Dict[str, Any], event_type: str) -> Dict[str, str]:
+        """添加元数据并将非字符串字段序列化为 JSON"""
+        enriched_data = self._enrich_event(event_data, event_type)
+        return {
+            key: json.dumps(value) if not isinstance(value, str) else value
+            for key, value in enriched_data.items()
+        }
+
+    def _xadd_kwargs(self, maxlen: Optional[int], approximate: bool, trim: bool) -> Dict[str, Any]:
+        if not trim:
+            return {}
+        return {
+            'maxlen': maxlen if maxlen is not None else redis_config.max_stream_length,
+            'approximate': approximate,
+        }
+
     def produce_batch(
         self,
         events: List[Dict[str, Any]],
         event_type: str = "unknown",
         maxlen: Optional[int] = None,
+        approximate: bool = True,
+        chunk_size: int = 500,
+        trim: bool = True,
     ) -> List[Optional[str]]:
         """批量发布事件
 
+        每 chunk_size 条事件一个 pipeline（一次往返）；单条事件序列化或
+        XADD 失败不影响同批其他事件
+
         Args:
             events: 事件数据列表
             event_type: 事件类型
-            maxlen: Stream 最大长度
+            maxlen: Stream 最大长度，None 则使用配置默认值
+            approximate: 是否使用近似裁剪（~）
+            chunk_size: 每个 pipeline 的事件数
+            trim: 是否在 XADD 时按 maxlen 裁剪
 
         Returns:
             message_ids: 事件ID列表，失败的为 None
         """
-        message_ids = []
-        for event_data in events:
-            message_id = self.produce(event_data, event_type, maxlen)
-            message_ids.append(message_id)
+        message_ids: List[Optional[str]] = [None] * len(events)
+        if not events:
+            return message_ids
+
+        try:
+            self._ensure_connection()
+        except RedisError as e:
+            self._record_errors(type(e).__name__, len(events))
+            logger.error(f"Failed to produce batch to '{self.stream_key}': {e}")
+            return message_ids
+
+        xadd_kwargs = self._xadd_kwargs(maxlen, approximate, trim)
+
+        for chunk_start in range(0, len(events), chunk_size):
+            start_time = time.time()
+            pipe = self.redis_client.pipeline(transaction=False)
+            indices = self._queue_chunk(
+                pipe, events, chunk_start, chunk_size, event_type, xadd_kwargs
+            )
+            if not indices:
+                continue
+
+            try:
+                results = pipe.execute(raise_on_error=False)
+            except RedisError as e:
+                self._record_errors(type(e).__name__, len(indices))
+                logger.error(
+                    f"Failed to produce {len(indices)} events to '{self.stream_key}': {e}"
+                )
+                continue
+
+            self._collect_results(message_ids, indices, results, event_type, time.time() - start_time)
 
         success_count = sum(1 for mid in message_ids if mid is not None)
         logger.info(
@@ -236,6 +284,62 @@ class BaseEventProducer:
 
         return message_ids
 
+    def _queue_chunk(
+        self,
+        pipe,
+        events: List[Dict[str, Any]],
+        chunk_start: int,
+        chunk_size: int,
+        event_type: str,
+        xadd_kwargs: Dict[str, Any],
+    ) -> List[int]:
+        """将一块事件的 XADD 加入 pipeline，返回已入队事件的下标"""
+        indices = []
+        for index in range(chunk_start, min(chunk_start + chunk_size, len(events))):
+            try:
+                payload = self._build_payload(events[index], event_type)
+            except Exception as e:
+                self._record_errors("SerializationError", 1)
+                logger.error(f"Failed to serialize event #{index} for '{self.stream_key}': {e}")
+                continue
+            pipe.xadd(name=self.stream_key, fields=payload, **xadd_kwargs)
+            indices.append(index)
+        return indices
+
+    def _collect_results(
+        self,
+        message_ids: List[Optional[str]],
+        indices: List[int],
+        results: List[Any],
+        event_type: str,
+        duration: float,
+    ):
+        """将 pipeline 结果写回对应下标并记录指标"""
+        succeeded = 0
+        for index, result in zip(indices, results):
+            if isinstance(result, Exception):
+                self._record_errors(type(result).__name__, 1)
+                logger.error(f"Failed to produce event #{index} to '{self.stream_key}': {result}")
+            else:
+                message_ids[index] = result
+                succeeded += 1
+
+        if succeeded:
+            events_produced_total.labels(
+                stream=self.stream_key,
+                event_type=event_type
+            ).inc(succeeded)
+        # 按事件摊分整块耗时
+        histogram = event_produce_duration.labels(stream=self.stream_key)
+        for _ in indices:
+            histogram.observe(duration / len(indices))
+
+    def _record_errors(self, error_type: str, count: int):
+        event_produce_errors.labels(
+            stream=self.stream_key,
+            error_type=error_type
+        ).inc(count)
+
     def get_stream_info(self) -> Optional[Dict[str, Any]]:
         """获取 Stream 信息
 
@@ -255,3 +359,85 @@ class BaseEventProducer:
         if self.redis_client:
             self.redis_client.close()
             logger.info(f"EventProducer for '{self.stream_key}' closed")
+
+
+class AsyncEventProducer(BaseEventProducer):
+    """基于 redis.asyncio 的异步事件生产者
+
+    与 BaseEventProducer 的元数据、序列化、批量 pipeline 逻辑一致，
+    适合在 asyncio 服务中推送事件突发
+    """
+
+    def _connect(self):
+        """创建异步客户端（连接在首次命令时建立）"""
+        self.redis_pool = redis.asyncio.ConnectionPool(
+            host=self.redis_host,
+            port=self.redis_port,
+            db=self.redis_db,
+            password=self.redis_password,
+            decode_responses=redis_config.decode_responses,
+            max_connections=redis_config.max_connections,
+            socket_timeout=redis_config.socket_timeout,
+            socket_connect_timeout=redis_config.socket_connect_timeout,
+        )
+        self.redis_client = redis.asyncio.Redis(connection_pool=self.redis_pool)
+
+    async def produce(
+        self,
+        event_data: Dict[str, Any],
+        event_type: str = "unknown",
+        maxlen: Optional[int] = None,
+        approximate: bool = True,
+    ) -> Optional[str]:
+        """异步发布单条事件，失败返回 None"""
+        message_ids = await self.produce_batch([event_data], event_type, maxlen, approximate)
+        return message_ids[0]
+
+    async def produce_batch(
+        self,
+        events: List[Dict[str, Any]],
+        event_type: str = "unknown",
+        maxlen: Optional[int] = None,
+        approximate: bool = True,
+        chunk_size: int = 500,
+        trim: bool = True,
+    ) -> List[Optional[str]]:
+        """异步批量发布事件（参数与 BaseEventProducer.produce_batch 相同）"""
+        message_ids: List[Optional[str]] = [None] * len(events)
+        xadd_kwargs = self._xadd_kwargs(maxlen, approximate, trim)
+
+        for chunk_start in range(0, len(events), chunk_size):
+            start_time = time.time()
+            pipe = self.redis_client.pipeline(transaction=False)
+            indices = self._queue_chunk(
+                pipe, events, chunk_start, chunk_size, event_type, xadd_kwargs
+            )
+            if not indices:
+                continue
+
+            try:
+                results = await pipe.execute(raise_on_error=False)
+            except RedisError as e:
+                self._record_errors(type(e).__name__, len(indices))
+                logger.error(
+                    f"Failed to produce {len(indices)} events to '{self.stream_key}': {e}"
+                )
+                continue
+
+            self._collect_results(message_ids, indices, results, event_type, time.time() - start_time)
+
+        return message_ids
+
+    async def get_stream_info(self) -> Optional[Dict[str, Any]]:
+        """获取 Stream 信息"""
+        try:
+            return await self.redis_client.xinfo_stream(self.stream_key)
+        except RedisError as e:
+            logger.error(f"Failed to get stream info for '{self.stream_key}': {e}")
+            return None
+
+    async def close(self):
+        """关闭连接"""
+        if self.redis_client:
+            await self.redis_client.aclose()
+            logger.info(f"AsyncEventProducer for '{self.stream_key}' closed")
@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Idempotency Store
+
+req_id -> (ticket, timestamp) store used by JsonGatewayRouter to deduplicate
+order requests.
+
+Entries are kept in insertion order, so the oldest entry is always at the
+front: TTL expiry pops from the front until it meets a live entry (amortized
+O(1) per request) and the size cap evicts from the same end. A hit does not
+extend an entry's lifetime - the TTL is measured from the original order.
+
+Optional persistence lets idempotency survive gateway restarts:
+- MmapIdempotencyLog: fixed-size ring of records in a memory-mapped file
+- RedisIdempotencyBackend: one key per req_id with EX = TTL
+
+Protocol: MT5-CRS JSON v1.0
+"""
+
+import mmap
+import os
+import struct
+import threading
+import time
+import logging
+from collections import OrderedDict
+from typing import Callable, Dict, Any, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_SIZE = 10000
+DEFAULT_TTL_SECONDS = 3600
+
+
+class IdempotencyStore:
+    """
+    Bounded TTL store of successful order results keyed by req_id.
+
+    Attributes:
+        max_size: Hard cap on cached requests
+        ttl_seconds: Entry lifetime measured from insertion
+        stats: hits / misses / evictions (size cap) / expirations (TTL)
+    """
+
+    def __init__(
+        self,
+        max_size: int = DEFAULT_MAX_SIZE,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        backend=None,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Initialize the store and warm it from the persistence backend.
+
+        Args:
+            max_size: Maximum number of cached requests
+            ttl_seconds: Time-to-live of each entry
+            backend: Optional persistence (MmapIdempotencyLog / RedisIdempotencyBackend)
+            clock: Time source (seconds since epoch)
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.backend = backend
+        self.clock = clock
+
+        self._entries: "OrderedDict[str, Tuple[int, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+
+        if backend is not None:
+            self._warm(backend.load())
+
+    def _warm(self, records: Iterable[Tuple[str, int, float]]):
+        """Load persisted records oldest-first, dropping expired ones."""
+        now = self.clock()
+        loaded = 0
+        for req_id, ticket, timestamp in sorted(records, key=lambda r: r[2]):
+            if now - timestamp <= self.ttl_seconds:
+                self._entries[req_id] = (ticket, timestamp)
+                self._entries.move_to_end(req_id)
+                loaded += 1
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        if loaded:
+            logger.info(f"[IdempotencyStore] Restored {len(self._entries)} req_ids from backend")
+
+    def get(self, req_id: str) -> Optional[Tuple[int, float]]:
+        """
+        Look up a cached result.
+
+        Returns:
+            (ticket, timestamp) or None if unknown / expired
+        """
+        with self._lock:
+            entry = self._entries.get(req_id)
+            if entry is not None and self.clock() - entry[1] > self.ttl_seconds:
+                self._expire(self.clock())
+                entry = None
+
+            if entry is None:
+                self.stats["misses"] += 1
+            else:
+                self.stats["hits"] += 1
+            return entry
+
+    def put(self, req_id: str, ticket: int, timestamp: Optional[float] = None):
+        """Record a successful result, expiring and evicting from the front."""
+        timestamp = self.clock() if timestamp is None else timestamp
+        with self._lock:
+            self._entries[req_id] = (ticket, timestamp)
+            self._entries.move_to_end(req_id)
+
+            self._expire(timestamp)
+            while len(self._entries) > self.max_size:
+                removed_req_id, _ = self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+                logger.warning(
+                    f"[IdempotencyStore] Size cap reached: evicted req_id "
+                    f"{removed_req_id[:8]}... (size: {len(self._entries)})"
+                )
+
+        if self.backend is not None:
+            try:
+                self.backend.append(req_id, ticket, timestamp)
+            except Exception as e:
+                logger.error(f"[IdempotencyStore] Failed to persist req_id {req_id[:8]}...: {e}")
+
+    def _expire(self, now: float) -> int:
+        """Pop expired entries from the front (caller holds the lock)."""
+        entries = self._entries
+        removed = 0
+        while entries:
+            _, (_, timestamp) = next(iter(entries.items()))
+            if now - timestamp <= self.ttl_seconds:
+                break
+            entries.popitem(last=False)
+            removed += 1
+        self.stats["expirations"] += removed
+        return removed
+
+    def expire(self) -> int:
+        """
+        Remove expired entries.
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            return self._expire(self.clock())
+
+    def oldest_timestamp(self) -> Optional[float]:
+        """Insertion time of the oldest entry (O(1))."""
+        with self._lock:
+            if not self._entries:
+                return None
+            return next(iter(self._entries.values()))[1]
+
+    def clear(self):
+        """Drop all entries (and persisted records)."""
+        with self._lock:
+            self._entries.clear()
+        if self.backend is not None:
+            self.backend.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Size, limits, oldest entry age and counters."""
+        oldest = self.oldest_timestamp()
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "oldest_entry_age_seconds": None if oldest is None else self.clock() - oldest,
+            "ttl_seconds": self.ttl_seconds,
+            **self.stats,
+        }
+
+    def close(self):
+        if self.backend is not None:
+            self.backend.close()
+
+    def __contains__(self, req_id: str) -> bool:
+        entry = self._entries.get(req_id)
+        return entry is not None and self.clock() - entry[1] <= self.ttl_seconds
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class MmapIdempotencyLog:
+    """
+    Fixed-capacity ring of (req_id, ticket, timestamp) records in a
+    memory-mapped file. Appends overwrite the oldest slot; the OS flushes
+    pages to disk, so records survive a gateway process restart.
+
+    File layout: header (magic, capacity, next write index) followed by
+    `capacity` records of REQ_ID_BYTES + int64 ticket + float64 timestamp.
+    """
+
+    MAGIC = b"MT5IDEM1"
+    HEADER = struct.Struct("<8sQQ")
+    REQ_ID_BYTES = 64
+    RECORD = struct.Struct(f"<{REQ_ID_BYTES}sqd")
+
+    def __init__(self, path: str, capacity: int = DEFAULT_MAX_SIZE):
+        """
+        Open or create the log file.
+
+        Args:
+            path: File path
+            capacity: Number of record slots (ignored if the file exists)
+        """
+        self.path = path
+        size = self.HEADER.size + capacity * self.RECORD.size
+
+        exists = os.path.exists(path) and os.path.getsize(path) >= self.HEADER.size
+        if exists:
+            with open(path, "rb") as f:
+                magic, stored_capacity, _ = self.HEADER.unpack(f.read(self.HEADER.size))
+            if magic != self.MAGIC:
+                raise ValueError(f"Not an idempotency log: {path}")
+            capacity = stored_capacity
+            size = self.HEADER.size + capacity * self.RECORD.size
+        else:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            with open(path, "wb") as f:
+                f.truncate(size)
+                f.write(self.HEADER.pack(self.MAGIC, capacity, 0))
+
+        self.capacity = capacity
+        self._file = open(path, "r+b")
+        self._map = mmap.mmap(self._file.fileno(), size)
+        self._lock = threading.Lock()
+
+    def _next_index(self) -> int:
+        return self.HEADER.unpack_from(self._map, 0)[2]
+
+    def append(self, req_id: str, ticket: int, timestamp: float):
+        encoded = req_id.encode("utf-8")
+        if len(encoded) > self.REQ_ID_BYTES:
+            raise ValueError(f"req_id longer than {self.REQ_ID_BYTES} bytes")
+        with self._lock:
+            index = self._next_index()
+            offset = self.HEADER.size + (index % self.capacity) * self.RECORD.size
+            self.RECORD.pack_into(self._map, offset, encoded, ticket, timestamp)
+            self.HEADER.pack_into(self._map, 0, self.MAGIC, self.capacity, index + 1)
+
+    def load(self) -> Iterable[Tuple[str, int, float]]:
+        records = []
+        with self._lock:
+            used = min(self._next_index(), self.capacity)
+            for slot in range(used):
+                raw_id, ticket, timestamp = self.RECORD.unpack_from(
+                    self._map, self.HEADER.size + slot * self.RECORD.size
+                )
+                records.append((raw_id.rstrip(b"\0").decode("utf-8"), ticket, timestamp))
+        return records
+
+    def clear(self):
+        with self._lock:
+            self._map[self.HEADER.size:] = bytes(len(self._map) - self.HEADER.size)
+            self.HEADER.pack_into(self._map, 0, self.MAGIC, self.capacity, 0)
+
+    def close(self):
+        self._map.flush()
+        self._map.close()
+        self._file.close()
+
+
+class RedisIdempotencyBackend:
+    """
+    Redis persistence: one string key per req_id holding "ticket:timestamp",
+    expiring with the store TTL, so several gateway instances (or a restarted
+    one) share the same idempotency window.
+    """
+
+    def __init__(self, client, namespace: str = "gateway:idempotency",
+                 ttl_seconds: float = DEFAULT_TTL_SECONDS, max_load: int = DEFAULT_MAX_SIZE):
+        """
+        Args:
+            client: redis-py client (decode_responses may be on or off)
+            namespace: Key prefix
+            ttl_seconds: Key expiry
+            max_load: Maximum records restored on startup
+        """
+        self.client = client
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self.max_load = max_load
+
+    def _key(self, req_id: str) -> str:
+        return f"{self.namespace}:{req_id}"
+
+    def append(self, req_id: str, ticket: int, timestamp: float):
+        self.client.set(self._key(req_id), f"{ticket}:{timestamp!r}", ex=max(int(self.ttl_seconds), 1))
+
+    def load(self) -> Iterable[Tuple[str, int, float]]:
+        keys = []
+        for key in self.client.scan_iter(match=f"{self.namespace}:*", count=1000):
+            keys.append(key.decode() if isinstance(key, bytes) else key)
+            if len(keys) >= self.max_load:
+                break
+        if not keys:
+            return []
+
+        prefix = len(self.namespace) + 1
+        records = []
+        for key, value in zip(keys, self.client.mget(keys)):
+            if value is None:
+                continue
+            if isinstance(value, bytes):
+                value = value.decode()
+            ticket, timestamp = value.split(":", 1)
+            records.append((key[prefix:], int(ticket), float(timestamp)))
+        return records
+
+    def clear(self):
+        keys = list(self.client.scan_iter(match=f"{self.namespace}:*", count=1000))
+        if keys:
+            self.client.delete(*keys)
+
+    def close(self):
+        pass
+
+
+def build_idempotency_store(
+    max_size: int = DEFAULT_MAX_SIZE,
+    ttl_seconds: float = DEFAULT_TTL_SECONDS,
+) -> IdempotencyStore:
+    """
+    Create the gateway idempotency store from environment variables.
+
+    GATEWAY_IDEMPOTENCY_BACKEND: memory (default) | mmap | redis
+    GATEWAY_IDEMPOTENCY_PATH: mmap file (default var/gateway/idempotency.log)
+
+    Falls back to memory-only when the backend cannot be opened.
+    """
+    backend_name = os.getenv("GATEWAY_IDEMPOTENCY_BACKEND", "memory").lower()
+    backend = None
+
+    try:
+        if backend_name == "mmap":
+            path = os.getenv("GATEWAY_IDEMPOTENCY_PATH", "var/gateway/idempotency.log")
+            backend = MmapIdempotencyLog(path, capacity=max_size)
+        elif backend_name == "redis":
+            from src.data_nexus.cache.redis_client import RedisClient
+            backend = RedisIdempotencyBackend(
+                RedisClient().client, ttl_seconds=ttl_seconds, max_load=max_size
+            )
+    except Exception as e:
+        logger.error(f"[IdempotencyStore] {backend_name} backend unavailable, using memory only: {e}")
+        backend = None
+
+    return IdempotencyStore(max_size=max_size, ttl_seconds=ttl_seconds, backend=backend)
@@ -10,10 +10,10 @@ Protocol: MT5-CRS JSON v1.0
 Reference: docs/specs/PROTOCOL_JSON_v1.md
 """
 
-import time
 import logging
 from typing import Optional, Dict, Any
-from collections import OrderedDict
+
+from src.gateway.idempotency import IdempotencyStore, build_idempotency_store
 
 # Import resilience module for @wait_or_die (Protocol v4.4)
 try:
@@ -35,13 +35,13 @@ class JsonGatewayRouter:
 
     Features:
     - UUID-based request deduplication (idempotency)
-    - LRU cache cleanup when size exceeds limit
-    - TTL-based cache expiration
+    - Bounded idempotency store with O(1) TTL expiry and size-cap eviction
+    - Optional mmap / Redis persistence across restarts
     - Full error handling with MT5 return codes
 
     Attributes:
         mt5: MT5 handler instance
-        req_id_ticket_cache: Dict mapping req_id -> (ticket, timestamp)
+        idempotency_store: IdempotencyStore mapping req_id -> (ticket, timestamp)
 
     Example:
         >>> from src.gateway.mt5_service import MT5Service
@@ -64,7 +64,7 @@ class JsonGatewayRouter:
         100234567
     """
 
-    def __init__(self, mt5_handler):
+    def __init__(self, mt5_handler, idempotency_store: Optional[IdempotencyStore] = None):
         """
         Initialize JSON Gateway Router.
 
@@ -73,11 +73,15 @@ class JsonGatewayRouter:
                 - execute_order(payload) -> Dict
                 - get_account_info() -> Dict
                 - etc.
+            idempotency_store: Optional store; defaults to one configured
+                from GATEWAY_IDEMPOTENCY_* environment variables
         """
         self.mt5 = mt5_handler
 
         # Idempotency cache: req_id -> (ticket, timestamp)
-        self.req_id_ticket_cache: OrderedDict[str, tuple] = OrderedDict()
+        if idempotency_store is None:
+            idempotency_store = build_idempotency_store(CACHE_MAX_SIZE, CACHE_TTL_SECONDS)
+        self.idempotency_store = idempotency_store
 
         logger.info("[JsonGatewayRouter] Initialized")
 
@@ -150,11 +154,9 @@ class JsonGatewayRouter:
             # Step 2: Check idempotency cache
             # ================================================================
 
-            if req_id in self.req_id_ticket_cache:
-                cached_ticket, cached_timestamp = self.req_id_ticket_cache[req_id]
-
-                # Move to end (LRU)
-                self.req_id_ticket_cache.move_to_end(req_id)
+            cached = self.idempotency_store.get(req_id)
+            if cached is not None:
+                cached_ticket, cached_timestamp = cached
 
                 logger.info(
                     f"[JsonGatewayRouter] ✓ IDEMPOTENT: "
@@ -191,15 +193,8 @@ class JsonGatewayRouter:
 
             # Cache only successful orders
             if retcode == 10009 and ticket > 0:
-                self.req_id_ticket_cache[req_id] = (ticket, time.time())
-
-                # LRU cleanup if cache exceeds max size
-                if len(self.req_id_ticket_cache) > CACHE_MAX_SIZE:
-                    removed_req_id, _ = self.req_id_ticket_cache.popitem(last=False)
-                    logger.warning(
-                        f"[JsonGatewayRouter] Cache cleanup: removed oldest req_id "
-                        f"{removed_req_id[:8]}... (cache size: {len(self.req_id_ticket_cache)})"
-                    )
+                # Expired / over-cap entries are dropped from the front
+                self.idempotency_store.put(req_id, ticket)
 
             return result
 
@@ -440,27 +435,17 @@ class JsonGatewayRouter:
         """
         Remove cache entries older than TTL.
 
+        Entries are insertion-ordered, so only the expired prefix is touched.
+
         Returns:
             Number of entries removed
         """
-        current_time = time.time()
-        removed_count = 0
-
-        # Create a list of expired keys (can't modify dict during iteration)
-        expired_keys = [
-            req_id
-            for req_id, (ticket, timestamp) in self.req_id_ticket_cache.items()
-            if current_time - timestamp > CACHE_TTL_SECONDS
-        ]
-
-        for req_id in expired_keys:
-            del self.req_id_ticket_cache[req_id]
-            removed_count += 1
+        removed_count = self.idempotency_store.expire()
 
         if removed_count > 0:
             logger.info(
                 f"[JsonGatewayRouter] Cleaned up {removed_count} expired cache entries "
-                f"(cache size now: {len(self.req_id_ticket_cache)})"
+                f"(cache size now: {len(self.idempotency_store)})"
             )
 
         return removed_count
@@ -475,22 +460,16 @@ class JsonGatewayRouter:
                 "size": int,
                 "max_size": int,
                 "oldest_entry_age_seconds": float,
-                "ttl_seconds": int
+                "ttl_seconds": int,
+                "hits": int,
+                "misses": int,
+                "evictions": int,
+                "expirations": int
             }
         """
-        oldest_age = None
-        if self.req_id_ticket_cache:
-            oldest_timestamp = list(self.req_id_ticket_cache.values())[0][1]
-            oldest_age = time.time() - oldest_timestamp
-
-        return {
-            "size": len(self.req_id_ticket_cache),
-            "max_size": CACHE_MAX_SIZE,
-            "oldest_entry_age_seconds": oldest_age,
-            "ttl_seconds": CACHE_TTL_SECONDS
-        }
+        return self.idempotency_store.snapshot()
 
     def clear_cache(self):
         """Clear all cached requests."""
-        self.req_id_ticket_cache.clear()
+        self.idempotency_store.clear()
         logger.info("[JsonGatewayRouter] Cache cleared")
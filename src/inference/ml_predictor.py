@@ -4,19 +4,28 @@ Task #114: ML Predictor (Model Inference Engine)
 
 Loads trained XGBoost model and performs real-time inference.
 
+The model is held by the process-wide ModelRegistry: the predictor reads its
+slot on every tick, so swap_model() replaces the model between two ticks
+without restarting the strategy (and without losing its feature buffers).
+Each predictor serves from a private slot unless the caller names one
+(e.g. CHAMPION), so two predictors in one process never replace each
+other's model.
+
 Protocol: v4.3 (Zero-Trust Edition)
 """
 
 import os
-import hashlib
-import pickle
 import time
+import uuid
+import weakref
 from pathlib import Path
 from typing import Tuple, Optional, Dict
 import logging
 
 import numpy as np
 
+from src.model.registry import KIND_PICKLE, ModelRegistry, ModelVersion, get_model_registry
+
 logger = logging.getLogger(__name__)
 
 # Model integrity check (Task #114 model matching 21-feature schema)
@@ -33,12 +42,15 @@ class MLPredictor:
     - Graceful degradation on errors
     - Confidence-based signal filtering
     - Latency tracking
+    - Hot-swap through a ModelRegistry slot
     """
 
     def __init__(self,
                  model_path: str = DEFAULT_MODEL_PATH,
                  confidence_threshold: float = 0.55,
-                 verify_md5: bool = True):
+                 verify_md5: bool = True,
+                 registry: Optional[ModelRegistry] = None,
+                 slot: Optional[str] = None):
         """
         Initialize ML predictor
 
@@ -46,11 +58,20 @@ class MLPredictor:
             model_path: Path to pickled XGBoost model
             confidence_threshold: Minimum confidence for BUY/SELL signals
             verify_md5: Whether to verify model file integrity
+            registry: Model registry (default: the process-wide registry)
+            slot: Registry slot this predictor serves from. Defaults to a
+                private per-instance slot (cleared when the predictor is
+                garbage collected); pass CHAMPION to publish the model as
+                the process-wide champion.
         """
         self.model_path = model_path
         self.confidence_threshold = confidence_threshold
-        self.model = None
-        self.is_loaded = False
+        self.verify_md5 = verify_md5
+        self.registry = registry or get_model_registry()
+        if slot is None:
+            slot = f"ml_predictor-{uuid.uuid4().hex[:12]}"
+            weakref.finalize(self, self.registry.swap, slot, None)
+        self.slot = slot
         self.load_time_ms = 0.0
 
         # Load model
@@ -62,17 +83,26 @@ class MLPredictor:
 
         logger.info(f"MLPredictor initialized (threshold={confidence_threshold})")
 
-    def _calculate_md5(self, file_path: str) -> str:
-        """Calculate MD5 hash of file"""
-        hash_md5 = hashlib.md5()
-        with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hash_md5.update(chunk)
-        return hash_md5.hexdigest()
+    @property
+    def version(self) -> Optional[ModelVersion]:
+        """Model version currently serving this predictor's slot"""
+        return self.registry.get(self.slot)
+
+    @property
+    def model(self):
+        version = self.registry.get(self.slot)
+        return version.model if version is not None else None
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.registry.get(self.slot) is not None
 
     def _load_model(self, verify_md5: bool = True):
         """
-        Load XGBoost model from disk with integrity check
+        Load XGBoost model through the registry with integrity check
+
+        The registry hashes and deserializes each artifact once per process,
+        warms it up, and this predictor's slot is then pointed at it.
 
         Args:
             verify_md5: Whether to verify MD5 hash
@@ -82,33 +112,56 @@ class MLPredictor:
             ValueError: MD5 mismatch (model corruption)
             Exception: Model loading error
         """
-        start_time = time.time()
+        start_time = time.perf_counter()
 
         # Check file exists
         if not os.path.exists(self.model_path):
             raise FileNotFoundError(f"Model file not found: {self.model_path}")
 
-        # Verify MD5 integrity
+        # Verify MD5 integrity, load pickled model and warm it up
+        version = self.registry.load(
+            self.model_path,
+            expected_md5=EXPECTED_MODEL_MD5 if verify_md5 else None,
+            kind=KIND_PICKLE,
+        )
         if verify_md5:
-            actual_md5 = self._calculate_md5(self.model_path)
-            if actual_md5 != EXPECTED_MODEL_MD5:
-                raise ValueError(
-                    f"Model integrity check FAILED!\n"
-                    f"Expected MD5: {EXPECTED_MODEL_MD5}\n"
-                    f"Actual MD5:   {actual_md5}\n"
-                    f"Model file may be corrupted or tampered."
-                )
-            logger.info(f"Model integrity verified: {actual_md5}")
-
-        # Load pickled model
-        with open(self.model_path, 'rb') as f:
-            self.model = pickle.load(f)
+            logger.info(f"Model integrity verified: {version.md5}")
 
-        self.is_loaded = True
-        self.load_time_ms = (time.time() - start_time) * 1000
+        self.registry.swap(self.slot, version)
+        self.load_time_ms = (time.perf_counter() - start_time) * 1000
 
         logger.info(f"Model loaded successfully (took {self.load_time_ms:.2f}ms)")
 
+    def swap_model(self, model_path: str, expected_md5: Optional[str] = None) -> Dict[str, any]:
+        """
+        Hot-swap the model serving this predictor
+
+        The new model is loaded and warmed up first; the slot switch itself
+        is atomic, so in-flight ticks finish on the old model and the next
+        tick uses the new one.
+
+        The integrity check applies as in the constructor: when the
+        predictor verifies MD5, the new model must match expected_md5
+        (default: EXPECTED_MODEL_MD5) or the swap is rejected and the
+        current model keeps serving.
+
+        Args:
+            model_path: Path to the new pickled model
+            expected_md5: MD5 the new model must match
+
+        Returns:
+            Dictionary with the new version information
+
+        Raises:
+            ValueError: MD5 mismatch (the slot is left unchanged)
+        """
+        if self.verify_md5:
+            expected_md5 = expected_md5 or EXPECTED_MODEL_MD5
+        version = self.registry.deploy(model_path, slot=self.slot,
+                                       expected_md5=expected_md5, kind=KIND_PICKLE)
+        self.model_path = model_path
+        return version.info()
+
     def predict(self,
                 feature_vector: np.ndarray) -> Tuple[int, float, float]:
         """
@@ -123,12 +176,15 @@ class MLPredictor:
             - confidence: Probability [0, 1]
             - latency_ms: Inference latency in milliseconds
         """
-        start_time = time.time()
+        start_time = time.perf_counter()
+
+        # One slot read per tick: a concurrent swap takes effect on the next tick
+        version = self.registry.get(self.slot)
 
         # Degraded mode: model not loaded
-        if not self.is_loaded or self.model is None:
+        if version is None:
             logger.warning("Model not loaded, returning HOLD signal")
-            latency_ms = (time.time() - start_time) * 1000
+            latency_ms = (time.perf_counter() - start_time) * 1000
             return 0, 0.0, latency_ms
 
         try:
@@ -142,17 +198,11 @@ class MLPredictor:
             # Check for NaN or Inf
             if np.any(np.isnan(feature_vector)) or np.any(np.isinf(feature_vector)):
                 logger.warning("Feature vector contains NaN or Inf, returning HOLD")
-                latency_ms = (time.time() - start_time) * 1000
+                latency_ms = (time.perf_counter() - start_time) * 1000
                 return 0, 0.0, latency_ms
 
-            # Reshape for model input: (1, 21)
-            X = feature_vector.reshape(1, -1)
-
-            # Get probability predictions
-            proba = self.model.predict_proba(X)[0]  # [prob_class_0, prob_class_1]
-
             # Class 1 = BUY, Class 0 = SELL/HOLD
-            confidence = proba[1]  # Probability of BUY
+            confidence = version.predict(feature_vector)  # Probability of BUY
 
             # Generate signal based on confidence threshold
             if confidence >= self.confidence_threshold:
@@ -162,7 +212,7 @@ class MLPredictor:
             else:
                 signal = 0  # HOLD (low confidence)
 
-            latency_ms = (time.time() - start_time) * 1000
+            latency_ms = (time.perf_counter() - start_time) * 1000
 
             logger.debug(
                 f"Prediction: signal={signal}, confidence={confidence:.4f}, "
@@ -173,7 +223,7 @@ class MLPredictor:
 
         except Exception as e:
             logger.error(f"Prediction error: {e}", exc_info=True)
-            latency_ms = (time.time() - start_time) * 1000
+            latency_ms = (time.perf_counter() - start_time) * 1000
             return 0, 0.0, latency_ms  # Fail-safe: HOLD
 
     def get_model_info(self) -> Dict[str, any]:
@@ -183,13 +233,16 @@ class MLPredictor:
         Returns:
             Dictionary with model information
         """
+        version = self.version
         return {
             'model_path': self.model_path,
-            'is_loaded': self.is_loaded,
+            'is_loaded': version is not None,
             'expected_md5': EXPECTED_MODEL_MD5,
             'load_time_ms': self.load_time_ms,
             'confidence_threshold': self.confidence_threshold,
-            'model_type': type(self.model).__name__ if self.model else None
+            'model_type': type(version.model).__name__ if version else None,
+            'slot': self.slot,
+            'version': version.info() if version else None
         }
 
     def set_confidence_threshold(self, threshold: float):
@@ -5,33 +5,84 @@ Task #114: Online Feature Calculator
 Real-time streaming feature calculation that maintains parity
 with offline feature engineering (Task #113).
 
+All indicator state is advanced in update() with O(1) work per tick:
+- One bounded deque of per-tick rows; the row leaving each window is read
+  by index instead of re-slicing the window
+- Running sums for SMA / RSI / volume-price trend windows
+- Sliding-window Welford mean/M2 for return volatility
+- Adjusted (pandas adjust=True) EMA numerator/denominator for MACD
+
 Protocol: v4.3 (Zero-Trust Edition)
 """
 
+import math
 import numpy as np
 from collections import deque
-from typing import Dict, Optional, List
+from typing import Dict, Optional, Sequence
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Feature order MUST match Task #113 training data
+FEATURE_NAMES = [
+    'rsi_14', 'rsi_21', 'volatility_10', 'volatility_20',
+    'sma_5', 'sma_10', 'sma_20', 'sma_50',
+    'macd', 'macd_signal', 'macd_hist',
+    'price_lag_1', 'price_lag_5', 'price_lag_10',
+    'return_1d', 'return_5d', 'return_10d',
+    'hl_ratio', 'hl_range',
+    'volume_ratio', 'volume_price_trend'
+]
+
+SMA_PERIODS = (5, 10, 20, 50)
+VOLATILITY_PERIODS = (10, 20)
+LAG_PERIODS = (1, 5, 10)
+HL_PERIOD = 20
+VOLUME_PERIOD = 20
+MACD_FAST, MACD_SLOW, MACD_SIGNAL = 12, 26, 9
+
+# Ticks required before every feature has a full window
+MIN_TICKS = 50
+
+# Recompute running sums from the ring buffers this often to bound float drift
+RESYNC_INTERVAL = 10_000
+
+EPSILON = 1e-10
+
+
+# Fields of each per-tick history row
+CLOSE, HIGH, LOW, VOLUME, GAIN, LOSS, PRICE_VOLUME, RETURN = range(8)
+
 
 class OnlineFeatureCalculator:
     """
     Streaming feature calculator for ML inference
 
     Maintains minimal history buffer and calculates features incrementally.
-    All calculations MUST match offline FeatureEngineer logic exactly.
+    All calculations MUST match offline FeatureEngineer logic exactly
+    (rolling windows with min_periods=1, sample std, ewm(adjust=True)).
     """
 
-    def __init__(self, max_lookback: int = 50):
+    def __init__(self, max_lookback: int = 50,
+                 rsi_periods: Sequence[int] = (14, 21),
+                 rsi_mode: str = 'sma'):
         """
         Initialize online feature calculator
 
         Args:
             max_lookback: Maximum historical periods to retain
+            rsi_periods: RSI periods to maintain (14 and 21 are always
+                included because the model schema uses them)
+            rsi_mode: 'sma' = rolling-mean gains/losses (matches offline
+                FeatureEngineer); 'wilder' = Wilder smoothing seeded with the
+                first full-window mean
         """
+        if rsi_mode not in ('sma', 'wilder'):
+            raise ValueError(f"Unsupported RSI mode: {rsi_mode}")
+
         self.max_lookback = max_lookback
+        self.rsi_mode = rsi_mode
+        self.rsi_periods = tuple(sorted(set(rsi_periods) | {14, 21}))
 
         # Circular buffers for OHLCV data
         self.close_buffer = deque(maxlen=max_lookback)
@@ -39,25 +90,68 @@ class OnlineFeatureCalculator:
         self.low_buffer = deque(maxlen=max_lookback)
         self.volume_buffer = deque(maxlen=max_lookback)
 
-        # EMA tracking for MACD (stateful)
-        self.ema_fast_12 = None  # 12-period EMA
-        self.ema_slow_26 = None  # 26-period EMA
-        self.macd_signal_9 = None  # 9-period EMA of MACD
-
-        # RSI tracking (stateful)
-        self.rsi_gain_14 = None  # 14-period average gain
-        self.rsi_loss_14 = None  # 14-period average loss
-        self.rsi_gain_21 = None  # 21-period average gain
-        self.rsi_loss_21 = None  # 21-period average loss
-
+        # Per-tick rows; must hold the largest window plus the row leaving it
+        self._window_periods = tuple(sorted(
+            set(SMA_PERIODS) | set(VOLATILITY_PERIODS) | set(self.rsi_periods) | {VOLUME_PERIOD}
+        ))
+        self._rows: deque = deque(maxlen=max(self._window_periods[-1], LAG_PERIODS[-1]) + 1)
+
+        # Running window sums
+        self._close_sums = {period: 0.0 for period in SMA_PERIODS}
+        self._volume_sum = 0.0
+        self._pv_sum = 0.0
+        self._gain_sums = {period: 0.0 for period in self.rsi_periods}
+        self._loss_sums = {period: 0.0 for period in self.rsi_periods}
+
+        # Wilder averages (rsi_mode='wilder')
+        self._wilder_gain: Dict[int, Optional[float]] = {p: None for p in self.rsi_periods}
+        self._wilder_loss: Dict[int, Optional[float]] = {p: None for p in self.rsi_periods}
+
+        # Sliding Welford state per volatility window: [count, mean, m2]
+        self._vol_state = {period: [0, 0.0, 0.0] for period in VOLATILITY_PERIODS}
+
+        # ewm(adjust=True): ema = numerator / denominator
+        self._fast_decay = 1.0 - 2.0 / (MACD_FAST + 1)
+        self._slow_decay = 1.0 - 2.0 / (MACD_SLOW + 1)
+        self._signal_decay = 1.0 - 2.0 / (MACD_SIGNAL + 1)
+        self._fast_num = self._fast_den = 0.0
+        self._slow_num = self._slow_den = 0.0
+        self._signal_num = self._signal_den = 0.0
+        self._macd = 0.0
+
+        # Monotonic deques of (tick, value) for the rolling high/low
+        self._max_high: deque = deque()
+        self._min_low: deque = deque()
+
+        self._vector = np.empty(len(FEATURE_NAMES), dtype=np.float64)
         self.tick_count = 0
 
         logger.info(f"OnlineFeatureCalculator initialized (lookback={max_lookback})")
 
+    # ------------------------------------------------------------------
+    # EMA values (read-only views of the adjusted EMA state)
+    # ------------------------------------------------------------------
+
+    @property
+    def ema_fast_12(self) -> Optional[float]:
+        return self._fast_num / self._fast_den if self.tick_count else None
+
+    @property
+    def ema_slow_26(self) -> Optional[float]:
+        return self._slow_num / self._slow_den if self.tick_count else None
+
+    @property
+    def macd_signal_9(self) -> Optional[float]:
+        return self._signal_num / self._signal_den if self.tick_count else None
+
+    # ------------------------------------------------------------------
+    # Streaming update
+    # ------------------------------------------------------------------
+
     def update(self, close: float, high: float, low: float,
                volume: float) -> bool:
         """
-        Update buffers with new tick data
+        Update buffers and indicator state with new tick data
 
         Args:
             close: Close price
@@ -68,91 +162,211 @@ class OnlineFeatureCalculator:
         Returns:
             True if sufficient data for feature calculation
         """
+        close = float(close)
+        high = float(high)
+        low = float(low)
+        volume = float(volume)
+        n = self.tick_count
+
+        rows = self._rows
+        if n:
+            prev = rows[-1][CLOSE]
+            delta = close - prev
+            ret = delta / prev
+            gain = delta if delta > 0 else 0.0
+            loss = -delta if delta < 0 else 0.0
+            price_volume = ret * volume
+        else:
+            # Offline: diff() NaN -> 0 in gains/losses, NaN skipped by rolling sums
+            ret = gain = loss = price_volume = 0.0
+
+        rows.append((close, high, low, volume, gain, loss, price_volume, ret))
         self.close_buffer.append(close)
         self.high_buffer.append(high)
         self.low_buffer.append(low)
         self.volume_buffer.append(volume)
-        self.tick_count += 1
+        n += 1
+        self.tick_count = n
+
+        # Rows leaving each full window (p ticks before the latest)
+        leaving = {p: rows[-1 - p] for p in self._window_periods if n > p}
+
+        # Simple moving averages
+        sums = self._close_sums
+        for period in SMA_PERIODS:
+            row = leaving.get(period)
+            sums[period] += close - row[CLOSE] if row else close
+
+        row = leaving.get(VOLUME_PERIOD)
+        if row:
+            self._volume_sum += volume - row[VOLUME]
+            self._pv_sum += price_volume - row[PRICE_VOLUME]
+        else:
+            self._volume_sum += volume
+            self._pv_sum += price_volume
+
+        # RSI gains / losses
+        wilder = self.rsi_mode == 'wilder'
+        for period in self.rsi_periods:
+            row = leaving.get(period)
+            if row:
+                self._gain_sums[period] += gain - row[GAIN]
+                self._loss_sums[period] += loss - row[LOSS]
+            else:
+                self._gain_sums[period] += gain
+                self._loss_sums[period] += loss
+
+            if wilder and n >= period:
+                if n == period:
+                    self._wilder_gain[period] = self._gain_sums[period] / period
+                    self._wilder_loss[period] = self._loss_sums[period] / period
+                else:
+                    self._wilder_gain[period] = (self._wilder_gain[period] * (period - 1) + gain) / period
+                    self._wilder_loss[period] = (self._wilder_loss[period] * (period - 1) + loss) / period
+
+        # Return volatility (sliding-window Welford, sample std); returns start at tick 2
+        if n > 1:
+            for period, state in self._vol_state.items():
+                count, mean, m2 = state
+                if count < period:
+                    count += 1
+                    d = ret - mean
+                    mean += d / count
+                    m2 += d * (ret - mean)
+                else:
+                    old = leaving[period][RETURN]
+                    new_mean = mean + (ret - old) / period
+                    m2 += (ret - old) * (ret - new_mean + old - mean)
+                    mean = new_mean
+                state[0], state[1], state[2] = count, mean, m2
+
+        # MACD EMAs (pandas ewm adjust=True)
+        self._fast_num = close + self._fast_decay * self._fast_num
+        self._fast_den = 1.0 + self._fast_decay * self._fast_den
+        self._slow_num = close + self._slow_decay * self._slow_num
+        self._slow_den = 1.0 + self._slow_decay * self._slow_den
+        macd = self._fast_num / self._fast_den - self._slow_num / self._slow_den
+        self._signal_num = macd + self._signal_decay * self._signal_num
+        self._signal_den = 1.0 + self._signal_decay * self._signal_den
+        self._macd = macd
+
+        # Rolling high/low (monotonic deques, amortized O(1))
+        max_high, min_low = self._max_high, self._min_low
+        while max_high and max_high[-1][1] <= high:
+            max_high.pop()
+        max_high.append((n, high))
+        if max_high[0][0] <= n - HL_PERIOD:
+            max_high.popleft()
+        while min_low and min_low[-1][1] >= low:
+            min_low.pop()
+        min_low.append((n, low))
+        if min_low[0][0] <= n - HL_PERIOD:
+            min_low.popleft()
+
+        if n % RESYNC_INTERVAL == 0:
+            self._resync()
 
         # Need at least 50 ticks for all features
-        return len(self.close_buffer) >= 50
-
-    def _calculate_rsi_online(self, period: int = 14) -> float:
+        return n >= MIN_TICKS
+
+    def _window(self, period: int, field: int) -> np.ndarray:
+        """Most recent min(period, tick_count) values of one history field"""
+        rows = self._rows
+        start = max(len(rows) - period, 0)
+        return np.array([rows[i][field] for i in range(start, len(rows))], dtype=np.float64)
+
+    def _resync(self) -> None:
+        """Recompute running window sums from the history rows"""
+        for period in SMA_PERIODS:
+            self._close_sums[period] = float(self._window(period, CLOSE).sum())
+        self._volume_sum = float(self._window(VOLUME_PERIOD, VOLUME).sum())
+        self._pv_sum = float(self._window(VOLUME_PERIOD, PRICE_VOLUME).sum())
+        for period in self.rsi_periods:
+            self._gain_sums[period] = float(self._window(period, GAIN).sum())
+            self._loss_sums[period] = float(self._window(period, LOSS).sum())
+        for period, state in self._vol_state.items():
+            # The first tick has no return; it is not part of the volatility window
+            window = self._window(min(period, self.tick_count - 1), RETURN)
+            state[0] = len(window)
+            state[1] = float(window.mean())
+            state[2] = float(((window - state[1]) ** 2).sum())
+
+    # ------------------------------------------------------------------
+    # Feature read-out
+    # ------------------------------------------------------------------
+
+    def rsi(self, period: int) -> float:
         """
-        Calculate RSI using exponential moving average (online version)
+        RSI for any registered period
+
+        Args:
+            period: RSI period (must be in rsi_periods)
 
-        This matches the offline pandas rolling mean calculation
+        Returns:
+            RSI value in [0, 100]
         """
-        if len(self.close_buffer) < period + 1:
-            return 50.0  # Default neutral
-
-        # Get price changes
-        prices = list(self.close_buffer)
-        delta = prices[-1] - prices[-2]
-
-        # Initialize on first calculation
-        if period == 14:
-            if self.rsi_gain_14 is None:
-                gains = [max(prices[i] - prices[i-1], 0)
-                        for i in range(1, min(len(prices), period + 1))]
-                losses = [max(prices[i-1] - prices[i], 0)
-                         for i in range(1, min(len(prices), period + 1))]
-                self.rsi_gain_14 = np.mean(gains) if gains else 0
-                self.rsi_loss_14 = np.mean(losses) if losses else 1e-10
-
-            # Update with exponential smoothing (matches pandas rolling)
-            gain = max(delta, 0)
-            loss = max(-delta, 0)
-            self.rsi_gain_14 = (self.rsi_gain_14 * (period - 1) + gain) / period
-            self.rsi_loss_14 = (self.rsi_loss_14 * (period - 1) + loss) / period
-
-            rs = self.rsi_gain_14 / (self.rsi_loss_14 + 1e-10)
-
-        elif period == 21:
-            if self.rsi_gain_21 is None:
-                gains = [max(prices[i] - prices[i-1], 0)
-                        for i in range(1, min(len(prices), period + 1))]
-                losses = [max(prices[i-1] - prices[i], 0)
-                         for i in range(1, min(len(prices), period + 1))]
-                self.rsi_gain_21 = np.mean(gains) if gains else 0
-                self.rsi_loss_21 = np.mean(losses) if losses else 1e-10
-
-            gain = max(delta, 0)
-            loss = max(-delta, 0)
-            self.rsi_gain_21 = (self.rsi_gain_21 * (period - 1) + gain) / period
-            self.rsi_loss_21 = (self.rsi_loss_21 * (period - 1) + loss) / period
-
-            rs = self.rsi_gain_21 / (self.rsi_loss_21 + 1e-10)
-        else:
+        if period not in self._gain_sums:
             raise ValueError(f"Unsupported RSI period: {period}")
 
-        rsi = 100 - (100 / (1 + rs))
-        return rsi
-
-    def _calculate_ema(self, values: List[float], period: int,
-                      prev_ema: Optional[float] = None) -> float:
-        """Calculate exponential moving average"""
-        if prev_ema is None:
-            return np.mean(values[-period:]) if len(values) >= period else values[-1]
-
-        alpha = 2 / (period + 1)
-        return alpha * values[-1] + (1 - alpha) * prev_ema
-
-    def _calculate_sma(self, values: List[float], period: int) -> float:
-        """Calculate simple moving average"""
-        if len(values) < period:
-            return np.mean(values)
-        return np.mean(values[-period:])
-
-    def _calculate_volatility(self, period: int = 20) -> float:
-        """Calculate rolling volatility (standard deviation of returns)"""
-        if len(self.close_buffer) < period + 1:
+        if self.rsi_mode == 'wilder' and self._wilder_gain[period] is not None:
+            gain, loss = self._wilder_gain[period], self._wilder_loss[period]
+        else:
+            count = min(self.tick_count, period)
+            if count == 0:
+                return 50.0  # Default neutral
+            gain = self._gain_sums[period] / count
+            loss = self._loss_sums[period] / count
+
+        rs = gain / (loss + EPSILON)
+        return 100 - (100 / (1 + rs))
+
+    def volatility(self, period: int) -> float:
+        """Rolling sample standard deviation of returns"""
+        count, _, m2 = self._vol_state[period]
+        if count < 2 or m2 <= 0:
             return 0.0
-
-        prices = list(self.close_buffer)[-period-1:]
-        returns = [(prices[i] - prices[i-1]) / prices[i-1]
-                  for i in range(1, len(prices))]
-        return np.std(returns)
+        return math.sqrt(m2 / (count - 1))
+
+    def _feature_values(self) -> list:
+        """All features in FEATURE_NAMES order"""
+        n = self.tick_count
+        rows = self._rows
+        close = rows[-1][CLOSE]
+        sums = self._close_sums
+
+        macd = self._macd
+        macd_signal = self._signal_num / self._signal_den
+
+        lag_1 = rows[-2][CLOSE] if n > 1 else close
+        lag_5 = rows[-6][CLOSE] if n > 5 else close
+        lag_10 = rows[-11][CLOSE] if n > 10 else close
+
+        highest = self._max_high[0][1]
+        lowest = self._min_low[0][1]
+
+        return [
+            self.rsi(14),
+            self.rsi(21),
+            self.volatility(10),
+            self.volatility(20),
+            sums[5] / min(n, 5),
+            sums[10] / min(n, 10),
+            sums[20] / min(n, 20),
+            sums[50] / min(n, 50),
+            macd,
+            macd_signal,
+            macd - macd_signal,
+            lag_1,
+            lag_5,
+            lag_10,
+            (close - lag_1) / lag_1 if n > 1 else 0.0,
+            (close - lag_5) / lag_5 if n > 5 else 0.0,
+            (close - lag_10) / lag_10 if n > 10 else 0.0,
+            (close - lowest) / (highest - lowest + EPSILON),
+            (highest - lowest) / close,
+            rows[-1][VOLUME] / (self._volume_sum / min(n, VOLUME_PERIOD) + EPSILON),
+            self._pv_sum,
+        ]
 
     def calculate_features(self) -> Optional[Dict[str, float]]:
         """
@@ -162,99 +376,43 @@ class OnlineFeatureCalculator:
             Dictionary of features matching Task #113 schema, or None if
             insufficient data
         """
-        if len(self.close_buffer) < 50:
-            logger.warning(f"Insufficient data: {len(self.close_buffer)}/50")
+        if self.tick_count < MIN_TICKS:
+            logger.warning(f"Insufficient data: {self.tick_count}/{MIN_TICKS}")
             return None
 
-        features = {}
-
-        # Convert buffers to lists for calculation
-        close = list(self.close_buffer)
-        high = list(self.high_buffer)
-        low = list(self.low_buffer)
-        volume = list(self.volume_buffer)
-
         try:
-            # === Momentum features (4) ===
-            features['rsi_14'] = self._calculate_rsi_online(14)
-            features['rsi_21'] = self._calculate_rsi_online(21)
-
-            # MACD calculation (stateful EMA)
-            current_close = close[-1]
-            self.ema_fast_12 = self._calculate_ema(close, 12, self.ema_fast_12)
-            self.ema_slow_26 = self._calculate_ema(close, 26, self.ema_slow_26)
-            macd = self.ema_fast_12 - self.ema_slow_26
-            self.macd_signal_9 = self._calculate_ema([macd], 9, self.macd_signal_9)
-
-            features['macd'] = macd
-            features['macd_signal'] = self.macd_signal_9
-            features['macd_hist'] = macd - self.macd_signal_9
-
-            # === Volatility features (2) ===
-            features['volatility_10'] = self._calculate_volatility(10)
-            features['volatility_20'] = self._calculate_volatility(20)
-
-            # === Moving averages (4) ===
-            features['sma_5'] = self._calculate_sma(close, 5)
-            features['sma_10'] = self._calculate_sma(close, 10)
-            features['sma_20'] = self._calculate_sma(close, 20)
-            features['sma_50'] = self._calculate_sma(close, 50)
-
-            # === Lagged features (3) ===
-            features['price_lag_1'] = close[-2] if len(close) >= 2 else close[-1]
-            features['price_lag_5'] = close[-6] if len(close) >= 6 else close[-1]
-            features['price_lag_10'] = close[-11] if len(close) >= 11 else close[-1]
-
-            # === Return features (3) ===
-            features['return_1d'] = (close[-1] - close[-2]) / close[-2] if len(close) >= 2 else 0
-            features['return_5d'] = (close[-1] - close[-6]) / close[-6] if len(close) >= 6 else 0
-            features['return_10d'] = (close[-1] - close[-11]) / close[-11] if len(close) >= 11 else 0
-
-            # === High-Low features (2) ===
-            highest_20 = max(high[-20:]) if len(high) >= 20 else max(high)
-            lowest_20 = min(low[-20:]) if len(low) >= 20 else min(low)
-            features['hl_ratio'] = (current_close - lowest_20) / (highest_20 - lowest_20 + 1e-10)
-            features['hl_range'] = (highest_20 - lowest_20) / current_close
-
-            # === Volume features (2) ===
-            vol_sma_20 = self._calculate_sma(volume, 20)
-            features['volume_ratio'] = volume[-1] / (vol_sma_20 + 1e-10)
-
-            # Volume-price trend
-            if len(close) >= 20:
-                vpt = sum([(close[i] - close[i-1]) / close[i-1] * volume[i]
-                          for i in range(-20, 0)])
-                features['volume_price_trend'] = vpt
-            else:
-                features['volume_price_trend'] = 0.0
-
-            return features
-
-        except Exception as e:
+            features = dict(zip(FEATURE_NAMES, self._feature_values()))
+        except (ArithmeticError, ValueError) as e:
             logger.error(f"Feature calculation error: {e}", exc_info=True)
             return None
 
-    def get_feature_vector(self) -> Optional[np.ndarray]:
+        for period in self.rsi_periods:
+            features.setdefault(f'rsi_{period}', self.rsi(period))
+        return features
+
+    def get_feature_vector(self, out: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
         """
         Get feature vector as numpy array (for model input)
 
+        Args:
+            out: Optional (21,) float64 array to write into. By default a
+                preallocated internal vector is reused; it is overwritten on
+                the next call, so copy it if it must be kept.
+
         Returns:
-            (24,) array matching Task #113 feature order, or None
+            (21,) array matching Task #113 feature order, or None
         """
-        features = self.calculate_features()
-        if features is None:
+        if self.tick_count < MIN_TICKS:
+            logger.warning(f"Insufficient data: {self.tick_count}/{MIN_TICKS}")
             return None
 
-        # Feature order MUST match Task #113 training data
-        feature_names = [
-            'rsi_14', 'rsi_21', 'volatility_10', 'volatility_20',
-            'sma_5', 'sma_10', 'sma_20', 'sma_50',
-            'macd', 'macd_signal', 'macd_hist',
-            'price_lag_1', 'price_lag_5', 'price_lag_10',
-            'return_1d', 'return_5d', 'return_10d',
-            'hl_ratio', 'hl_range',
-            'volume_ratio', 'volume_price_trend'
-        ]
+        if out is None:
+            out = self._vector
+
+        try:
+            out[:] = self._feature_values()
+        except (ArithmeticError, ValueError) as e:
+            logger.error(f"Feature calculation error: {e}", exc_info=True)
+            return None
 
-        vector = np.array([features[name] for name in feature_names])
-        return vector
+        return out
@@ -9,9 +9,11 @@ Contains the runner and strategy management for concurrent trading systems.
 Modules:
 - runner.py: MultiStrategyRunner for orchestrating multiple strategies
 - strategy_instance.py: StrategyInstance wrapper for isolated execution
+- strategy_worker.py: Inline / thread / process workers with bounded queues
 """
 
 from .runner import MultiStrategyRunner
 from .strategy_instance import StrategyInstance
+from .strategy_worker import StrategyWorker, ProcessStrategyWorker
 
-__all__ = ['MultiStrategyRunner', 'StrategyInstance']
+__all__ = ['MultiStrategyRunner', 'StrategyInstance', 'StrategyWorker', 'ProcessStrategyWorker']
@@ -8,8 +8,13 @@ Task #021.01: Multi-Strategy Orchestration Engine
 Manages multiple StrategyInstance objects running concurrently, routing
 market data by symbol and isolating errors between strategies.
 
+Ticks are routed through a symbol -> workers index and each strategy can run
+inline, on its own thread or in its own process (see strategy_worker.py),
+selected by the global `dispatch_mode` setting or a per-strategy `dispatch`
+block.
+
 Architecture:
-    Market Data (ZMQ) -> MultiStrategyRunner -> [StrategyInstance, StrategyInstance, ...]
+    Market Data (ZMQ) -> MultiStrategyRunner -> [StrategyWorker, StrategyWorker, ...]
                             ^
                             |
                          YAML Config
@@ -20,9 +25,10 @@ import time
 import json
 import yaml
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 
 from src.main.strategy_instance import StrategyInstance
+from src.main.strategy_worker import StrategyWorker, create_worker
 
 # Configure logging
 logging.basicConfig(
@@ -75,6 +81,11 @@ class MultiStrategyRunner:
         Args:
             config_path: Path to strategies.yaml configuration file
 
+        Config keys (global section, overridable per strategy under `dispatch`):
+            dispatch_mode: 'inline' (default) | 'thread' | 'process'
+            worker_queue_size: Bounded queue capacity per strategy (default 1000)
+            overflow_policy: 'drop_oldest' (default) | 'drop_newest' | 'block'
+
         Raises:
             FileNotFoundError: If config file doesn't exist
             ValueError: If config is invalid
@@ -90,18 +101,30 @@ class MultiStrategyRunner:
 
         self.global_config = config.get('global', {})
         self.strategies: List[StrategyInstance] = []
+        self.workers: List[StrategyWorker] = []
 
         # Instantiate enabled strategies
         for strat_config in config.get('strategies', []):
             if strat_config.get('enabled', True):
                 try:
                     instance = StrategyInstance(strat_config)
+                    settings = {**self.global_config, **strat_config.get('dispatch', {})}
+                    worker = create_worker(instance, settings, factory=StrategyInstance)
                     self.strategies.append(instance)
+                    self.workers.append(worker)
                 except Exception as e:
                     logger.error(
                         f"{RED}❌ Failed to initialize strategy {strat_config.get('name')}: {e}{RESET}"
                     )
 
+        # Symbol -> workers routing index
+        self.symbol_index: Dict[str, List[StrategyWorker]] = {}
+        for worker in self.workers:
+            self.symbol_index.setdefault(worker.symbol, []).append(worker)
+
+        self.ticks_received = 0
+        self.ticks_unrouted = 0
+
         logger.info(
             f"{GREEN}✅ MultiStrategyRunner initialized{RESET}"
         )
@@ -109,8 +132,54 @@ class MultiStrategyRunner:
             f"   Loaded {len(self.strategies)} enabled strategies"
         )
 
-        for strat in self.strategies:
-            logger.info(f"   - {strat.name} ({strat.symbol})")
+        for worker in self.workers:
+            logger.info(f"   - {worker.name} ({worker.symbol}, {worker.mode})")
+
+    # ========================================================================
+    # Dispatch
+    # ========================================================================
+
+    @staticmethod
+    def _split_message(frames) -> Tuple[bytes, Any]:
+        """
+        Split a received message into (topic, payload) without copying the payload.
+
+        Accepts multipart [SYMBOL, json] (market_data_feed) as well as the
+        single-frame "SYMBOL json" format.
+
+        Returns:
+            (symbol bytes, payload buffer) or (b'', None) if malformed
+        """
+        if len(frames) >= 2:
+            return frames[0].bytes, frames[-1].buffer
+
+        data = frames[0].bytes
+        sep = data.find(b' ')
+        if sep <= 0:
+            return b'', None
+        return data[:sep], memoryview(data)[sep + 1:]
+
+    def dispatch(self, symbol: str, tick: Dict[str, Any]) -> int:
+        """
+        Route one tick to every worker subscribed to its symbol.
+
+        Args:
+            symbol: Trading symbol
+            tick: Parsed tick
+
+        Returns:
+            Number of workers that accepted the tick
+        """
+        accepted = 0
+        for worker in self.symbol_index.get(symbol, ()):
+            if worker.submit(tick):
+                accepted += 1
+        return accepted
+
+    def start_workers(self):
+        """Start thread / process workers."""
+        for worker in self.workers:
+            worker.start()
 
     def run(self, duration_seconds: int = 60):
         """
@@ -139,10 +208,12 @@ class MultiStrategyRunner:
 
             subscriber.connect(zmq_url)
 
-            # Subscribe to all relevant symbols
-            for strat in self.strategies:
-                subscriber.setsockopt_string(zmq.SUBSCRIBE, strat.symbol)
-                logger.info(f"   ✅ Subscribed to {strat.symbol}")
+            # Subscribe once per symbol
+            for symbol in self.symbol_index:
+                subscriber.setsockopt_string(zmq.SUBSCRIBE, symbol)
+                logger.info(f"   ✅ Subscribed to {symbol}")
+
+            self.start_workers()
 
             logger.info(f"{GREEN}✅ Market data subscription ready{RESET}")
 
@@ -150,9 +221,6 @@ class MultiStrategyRunner:
             logger.info(f"{CYAN}🔄 Entering main loop ({duration_seconds}s)...{RESET}")
             start_time = time.time()
 
-            ticks_received = 0
-            errors_encountered = 0
-
             while True:
                 # Check duration
                 if duration_seconds > 0:
@@ -164,38 +232,26 @@ class MultiStrategyRunner:
                 # Poll for market data (timeout 1 second)
                 try:
                     if subscriber.poll(1000):
-                        message = subscriber.recv_string()
+                        frames = subscriber.recv_multipart(copy=False)
+                        topic, payload = self._split_message(frames)
 
-                        # Parse message: "SYMBOL json_data"
-                        try:
-                            parts = message.split(' ', 1)
-                            if len(parts) != 2:
-                                continue
-
-                            symbol, json_data = parts
-                            tick = json.loads(json_data)
-
-                            ticks_received += 1
-
-                            # Route to matching strategies
-                            for strat in self.strategies:
-                                if strat.symbol == symbol:
-                                    try:
-                                        success = strat.on_tick(tick)
-                                        if not success:
-                                            logger.warning(
-                                                f"{YELLOW}⚠️  {strat.name} failed to process tick{RESET}"
-                                            )
-                                            errors_encountered += 1
-
-                                    except Exception as e:
-                                        logger.error(
-                                            f"{RED}❌ Uncaught error in {strat.name}: {e}{RESET}"
-                                        )
-                                        errors_encountered += 1
+                        # Topic filtering is prefix-based: drop unrouted symbols before parsing
+                        workers = self.symbol_index.get(topic.decode('utf-8', 'replace'))
+                        if not workers:
+                            if payload is not None:
+                                self.ticks_unrouted += 1
+                            continue
 
+                        # Parse once, shared by all strategies on this symbol
+                        try:
+                            tick = json.loads(bytes(payload))
                         except (json.JSONDecodeError, ValueError) as e:
                             logger.warning(f"{YELLOW}⚠️  Failed to parse message: {e}{RESET}")
+                            continue
+
+                        self.ticks_received += 1
+                        for worker in workers:
+                            worker.submit(tick)
 
                 except zmq.Again:
                     # Timeout, continue polling
@@ -206,19 +262,20 @@ class MultiStrategyRunner:
 
         finally:
             self._shutdown_all()
-            logger.info(f"   Ticks received: {ticks_received}")
-            logger.info(f"   Errors encountered: {errors_encountered}")
+            logger.info(f"   Ticks received: {self.ticks_received}")
+            logger.info(f"   Errors encountered: {sum(w.get_metrics()['errors'] for w in self.workers)}")
+            logger.info(f"   Ticks dropped: {sum(w.dropped for w in self.workers)}")
 
     def _shutdown_all(self):
         """Gracefully shutdown all strategies."""
         logger.info(f"{CYAN}🛑 Shutting down all strategies...{RESET}")
 
-        for strat in self.strategies:
+        for worker in self.workers:
             try:
-                strat.shutdown()
+                worker.stop()
             except Exception as e:
                 logger.error(
-                    f"{RED}❌ Shutdown error for {strat.name}: {e}{RESET}"
+                    f"{RED}❌ Shutdown error for {worker.name}: {e}{RESET}"
                 )
 
         logger.info(f"{GREEN}✅ All strategies shut down{RESET}")
@@ -230,11 +287,16 @@ class MultiStrategyRunner:
         Returns:
             Dictionary with:
             - total_strategies: Number of loaded strategies
-            - strategies: List of status dicts for each strategy
+            - ticks_received: Ticks routed to at least one strategy
+            - ticks_unrouted: Ticks for symbols with no strategy
+            - strategies: List of status dicts for each strategy, each with a
+              'dispatch' entry (queue depth, drops, latency)
         """
         return {
-            'total_strategies': len(self.strategies),
-            'strategies': [s.get_status() for s in self.strategies]
+            'total_strategies': len(self.workers),
+            'ticks_received': self.ticks_received,
+            'ticks_unrouted': self.ticks_unrouted,
+            'strategies': [w.get_status() for w in self.workers]
         }
 
     def print_status(self):
@@ -261,6 +323,11 @@ class MultiStrategyRunner:
                   f"HOLD={strat_status['hold_signals']})")
             print(f"  Last Tick: {strat_status['last_tick_time']}")
             print(f"  Errors: {strat_status['error_count']}")
+            dispatch = strat_status['dispatch']
+            print(f"  Dispatch: {dispatch['mode']} "
+                  f"(queue={dispatch['queue_depth']}/{dispatch['queue_capacity']}, "
+                  f"dropped={dispatch['dropped']}, "
+                  f"avg={dispatch['latency_ms_avg']:.2f}ms)")
             print()
 
         print("=" * 80)
@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Strategy Workers - Per-Strategy Execution Isolation
+
+Task #021.01: Multi-Strategy Orchestration Engine
+
+Wraps a StrategyInstance so the runner can hand off ticks without waiting
+for on_tick. Three dispatch modes:
+
+- inline:  on_tick runs on the runner thread (original behaviour)
+- thread:  dedicated worker thread fed by a bounded queue
+- process: dedicated worker process (own GIL) fed by a bounded queue;
+           the StrategyInstance is built inside the child from its config
+
+When a queue is full the overflow policy decides what is lost:
+- drop_oldest: discard the stalest queued tick (default, market data
+               supersedes itself)
+- drop_newest: discard the incoming tick
+- block:       wait for space (backpressure onto the runner)
+
+Every worker reports queue depth, drops, errors and on_tick latency.
+"""
+
+import logging
+import multiprocessing
+import queue
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Color codes
+RED = "\033[91m"
+YELLOW = "\033[93m"
+RESET = "\033[0m"
+
+DISPATCH_MODES = ('inline', 'thread', 'process')
+OVERFLOW_POLICIES = ('drop_oldest', 'drop_newest', 'block')
+
+DEFAULT_QUEUE_SIZE = 1000
+LATENCY_WINDOW = 1024
+
+_STOP = None  # Queue sentinel
+
+
+def _percentile(sorted_values, q: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(q * len(sorted_values)))
+    return sorted_values[index]
+
+
+class StrategyWorker:
+    """
+    Runs one StrategyInstance inline or on its own thread.
+
+    Attributes:
+        strategy: Wrapped StrategyInstance
+        mode: 'inline' or 'thread'
+        queue_size: Capacity of the tick queue (thread mode)
+        overflow_policy: One of OVERFLOW_POLICIES
+    """
+
+    def __init__(
+        self,
+        strategy,
+        mode: str = 'inline',
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        overflow_policy: str = 'drop_oldest',
+    ):
+        """
+        Initialize worker.
+
+        Args:
+            strategy: Object with name, symbol, on_tick(tick) -> bool, get_status(), shutdown()
+            mode: 'inline' or 'thread'
+            queue_size: Bounded queue capacity
+            overflow_policy: 'drop_oldest', 'drop_newest' or 'block'
+
+        Raises:
+            ValueError: If mode or overflow_policy is unknown
+        """
+        if mode not in ('inline', 'thread'):
+            raise ValueError(f"StrategyWorker mode must be 'inline' or 'thread', got {mode!r}")
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow_policy!r}")
+
+        self.strategy = strategy
+        self.name = strategy.name
+        self.symbol = strategy.symbol
+        self.mode = mode
+        self.queue_size = queue_size
+        self.overflow_policy = overflow_policy
+
+        self.processed = 0
+        self.errors = 0
+        self.dropped = 0
+        self._latencies_ms = deque(maxlen=LATENCY_WINDOW)
+
+        self._queue: Optional[queue.Queue] = None
+        self._thread: Optional[threading.Thread] = None
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self):
+        """Start the worker thread (no-op for inline mode)."""
+        if self.mode != 'thread' or self._thread is not None:
+            return
+        self._queue = queue.Queue(maxsize=self.queue_size)
+        self._thread = threading.Thread(
+            target=self._loop, name=f"strategy-{self.name}", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Drain the queue, stop the worker thread and shut the strategy down."""
+        if self._thread is not None:
+            try:
+                self._queue.put(_STOP, timeout=timeout)
+            except queue.Full:
+                pass
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                logger.warning(f"{YELLOW}⚠️  {self.name} worker did not stop within {timeout}s{RESET}")
+            self._thread = None
+        self.strategy.shutdown()
+
+    # ------------------------------------------------------------------
+    # Dispatch
+    # ------------------------------------------------------------------
+
+    def submit(self, tick: Dict[str, Any]) -> bool:
+        """
+        Hand a tick to the strategy.
+
+        Returns:
+            False if the tick (inline: processing) failed or was dropped
+        """
+        if self._thread is None:
+            return self._run_tick(tick)
+        return self._enqueue(self._queue, tick)
+
+    def _enqueue(self, q, tick) -> bool:
+        """Put with the configured overflow policy (single producer)."""
+        if self.overflow_policy == 'block':
+            q.put(tick)
+            return True
+        try:
+            q.put_nowait(tick)
+            return True
+        except queue.Full:
+            pass
+
+        self.dropped += 1
+        if self.overflow_policy == 'drop_newest':
+            return False
+        try:
+            q.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            q.put_nowait(tick)
+        except queue.Full:
+            return False
+        return True
+
+    def _loop(self):
+        while True:
+            tick = self._queue.get()
+            if tick is _STOP:
+                break
+            self._run_tick(tick)
+
+    def _run_tick(self, tick) -> bool:
+        start = time.perf_counter()
+        try:
+            success = self.strategy.on_tick(tick)
+        except Exception as e:
+            logger.error(f"{RED}❌ Uncaught error in {self.name}: {e}{RESET}")
+            success = False
+        self._latencies_ms.append((time.perf_counter() - start) * 1000)
+
+        self.processed += 1
+        if not success:
+            self.errors += 1
+            logger.warning(f"{YELLOW}⚠️  {self.name} failed to process tick{RESET}")
+        return success
+
+    # ------------------------------------------------------------------
+    # Monitoring
+    # ------------------------------------------------------------------
+
+    def queue_depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get dispatch metrics.
+
+        Returns:
+            Dictionary with queue depth/capacity, processed, dropped, errors
+            and on_tick latency (avg / p50 / p99 over the last LATENCY_WINDOW ticks)
+        """
+        latencies = sorted(self._latencies_ms)
+        return {
+            'name': self.name,
+            'symbol': self.symbol,
+            'mode': self.mode,
+            'queue_depth': self.queue_depth(),
+            'queue_capacity': self.queue_size if self.mode != 'inline' else 0,
+            'overflow_policy': self.overflow_policy,
+            'processed': self.processed,
+            'dropped': self.dropped,
+            'errors': self.errors,
+            'latency_ms_avg': sum(latencies) / len(latencies) if latencies else 0.0,
+            'latency_ms_p50': _percentile(latencies, 0.50),
+            'latency_ms_p99': _percentile(latencies, 0.99),
+        }
+
+    def get_status(self) -> Dict[str, Any]:
+        """Strategy status merged with dispatch metrics."""
+        status = self.strategy.get_status()
+        status['dispatch'] = self.get_metrics()
+        return status
+
+
+def _process_main(factory, config, tick_queue, counters, latency_ms, status_conn):
+    """Worker process entry point: build the strategy and drain the queue."""
+    strategy = factory(config)
+    try:
+        while True:
+            tick = tick_queue.get()
+            if tick is _STOP:
+                break
+            start = time.perf_counter()
+            try:
+                success = strategy.on_tick(tick)
+            except Exception as e:
+                logger.error(f"{RED}❌ Uncaught error in {strategy.name}: {e}{RESET}")
+                success = False
+            elapsed_ms = (time.perf_counter() - start) * 1000
+
+            with counters.get_lock():
+                counters[0] += 1
+                if not success:
+                    counters[1] += 1
+            latency_ms[0] += elapsed_ms
+            latency_ms[1] = max(latency_ms[1], elapsed_ms)
+    finally:
+        try:
+            strategy.shutdown()
+            status_conn.send(strategy.get_status())
+        except Exception as e:
+            logger.error(f"{RED}❌ Shutdown error for {config.get('name')}: {e}{RESET}")
+        status_conn.close()
+
+
+class ProcessStrategyWorker(StrategyWorker):
+    """
+    Runs one strategy in a dedicated process.
+
+    The child constructs its own StrategyInstance from config via factory, so
+    the model is loaded (and the GIL held) only in that process. Counters are
+    shared through multiprocessing arrays; the final strategy status is sent
+    back when the worker stops.
+    """
+
+    def __init__(
+        self,
+        strategy,
+        factory: Callable[[Dict[str, Any]], Any],
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        overflow_policy: str = 'drop_oldest',
+    ):
+        """
+        Args:
+            strategy: Parent-side StrategyInstance (config and initial status)
+            factory: Picklable callable config -> StrategyInstance, run in the child
+            queue_size: Bounded queue capacity
+            overflow_policy: 'drop_oldest', 'drop_newest' or 'block'
+        """
+        super().__init__(strategy, 'thread', queue_size, overflow_policy)
+        self.mode = 'process'
+        self.factory = factory
+
+        self._process: Optional[multiprocessing.Process] = None
+        self._counters = multiprocessing.Array('q', 2)      # processed, errors
+        self._latency = multiprocessing.Array('d', 2, lock=False)  # sum_ms, max_ms
+        self._final_status: Optional[Dict[str, Any]] = None
+        self._status_conn = None
+
+    def start(self):
+        if self._process is not None:
+            return
+        self._queue = multiprocessing.Queue(maxsize=self.queue_size)
+        self._status_conn, child_conn = multiprocessing.Pipe(duplex=False)
+        self._process = multiprocessing.Process(
+            target=_process_main,
+            args=(self.factory, self.strategy.config, self._queue,
+                  self._counters, self._latency, child_conn),
+            name=f"strategy-{self.name}",
+            daemon=True,
+        )
+        self._process.start()
+        child_conn.close()
+
+    def submit(self, tick: Dict[str, Any]) -> bool:
+        if self._process is None:
+            self.start()
+        return self._enqueue(self._queue, tick)
+
+    def stop(self, timeout: float = 5.0):
+        if self._process is None:
+            return
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            pass
+        if self._status_conn.poll(timeout):
+            try:
+                self._final_status = self._status_conn.recv()
+            except EOFError:
+                pass
+        self._process.join(timeout)
+        if self._process.is_alive():
+            logger.warning(f"{YELLOW}⚠️  {self.name} worker process did not stop, terminating{RESET}")
+            self._process.terminate()
+            self._process.join()
+        self._queue.close()
+        self._process = None
+
+    def queue_depth(self) -> int:
+        if self._queue is None:
+            return 0
+        try:
+            return self._queue.qsize()
+        except NotImplementedError:  # macOS
+            return -1
+
+    def get_metrics(self) -> Dict[str, Any]:
+        processed, errors = self._counters[0], self._counters[1]
+        return {
+            'name': self.name,
+            'symbol': self.symbol,
+            'mode': self.mode,
+            'queue_depth': self.queue_depth(),
+            'queue_capacity': self.queue_size,
+            'overflow_policy': self.overflow_policy,
+            'processed': processed,
+            'dropped': self.dropped,
+            'errors': errors,
+            'latency_ms_avg': self._latency[0] / processed if processed else 0.0,
+            'latency_ms_max': self._latency[1],
+            'alive': self._process is not None and self._process.is_alive(),
+        }
+
+    def get_status(self) -> Dict[str, Any]:
+        status = dict(self._final_status) if self._final_status else self.strategy.get_status()
+        metrics = self.get_metrics()
+        if self._final_status is None:
+            status['ticks_processed'] = metrics['processed']
+            status['error_count'] = metrics['errors']
+        status['dispatch'] = metrics
+        return status
+
+
+def create_worker(strategy, settings: Dict[str, Any], factory=None) -> StrategyWorker:
+    """
+    Build the worker for a strategy from runner settings.
+
+    Args:
+        strategy: StrategyInstance
+        settings: dispatch_mode, worker_queue_size, overflow_policy
+        factory: Strategy factory for process mode
+
+    Raises:
+        ValueError: If dispatch_mode is unknown
+    """
+    mode = settings.get('dispatch_mode', 'inline')
+    queue_size = int(settings.get('worker_queue_size', DEFAULT_QUEUE_SIZE))
+    policy = settings.get('overflow_policy', 'drop_oldest')
+
+    if mode not in DISPATCH_MODES:
+        raise ValueError(f"Unknown dispatch_mode: {mode!r} (expected one of {DISPATCH_MODES})")
+    if mode == 'process':
+        return ProcessStrategyWorker(strategy, factory or type(strategy), queue_size, policy)
+    return StrategyWorker(strategy, mode, queue_size, policy)
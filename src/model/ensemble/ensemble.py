@@ -9,6 +9,9 @@ Strategies:
 1. Weighted Average (simple): ensemble = w1*lgb + w2*lstm
 2. Stacking (complex): meta-learner trained on base predictions
 
+For live, per-tick inference use EnsembleServingEngine (serving.py), which
+keeps rolling LSTM windows and runs both learners concurrently.
+
 Protocol v4.3 (Zero-Trust Edition)
 """
 
@@ -17,6 +20,8 @@ import logging
 from typing import Tuple, Optional
 from sklearn.linear_model import LogisticRegression
 
+from src.model.ensemble.meta_learner import linear_predict_proba
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -80,7 +85,7 @@ class EnsemblePredictor:
             if self.use_stacking and self.meta_learner is not None:
                 # Stack predictions and pass to meta-learner
                 stacked = np.hstack([lgb_aligned, lstm_aligned])  # (M, 6)
-                ensemble_proba = self.meta_learner.predict_proba(stacked)
+                ensemble_proba = linear_predict_proba(self.meta_learner, stacked)
             else:
                 # Weighted average
                 w_lgb, w_lstm = self.weights
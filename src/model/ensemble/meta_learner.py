@@ -22,6 +22,41 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+def linear_predict_proba(model, X_meta: np.ndarray) -> np.ndarray:
+    """
+    Meta-learner probabilities computed directly from the fitted coefficients
+
+    LogisticRegression.predict_proba validates its input on every call, which
+    dominates the cost for the handful of rows scored per live tick. For a
+    fitted LogisticRegression this evaluates the same softmax / sigmoid with
+    one matrix product; any other model falls back to its predict_proba.
+
+    Args:
+        model: Fitted meta-learner
+        X_meta: (N, n_meta_features) stacked base predictions
+
+    Returns:
+        (N, n_classes) probabilities, classes ordered as model.classes_
+    """
+    if not isinstance(model, LogisticRegression) or not hasattr(model, 'coef_'):
+        return model.predict_proba(X_meta)
+
+    scores = np.asarray(X_meta, dtype=np.float64) @ model.coef_.T + model.intercept_
+    if scores.shape[1] == 1:
+        positive = 1.0 / (1.0 + np.exp(-scores[:, 0]))
+        return np.column_stack([1.0 - positive, positive])
+
+    multi_class = getattr(model, 'multi_class', None)
+    if multi_class == 'ovr' or (multi_class == 'auto' and model.solver == 'liblinear'):
+        proba = 1.0 / (1.0 + np.exp(-scores))
+        return proba / proba.sum(axis=1, keepdims=True)
+
+    scores -= scores.max(axis=1, keepdims=True)
+    np.exp(scores, out=scores)
+    scores /= scores.sum(axis=1, keepdims=True)
+    return scores
+
+
 class StackingMetaLearner:
     """
     Train and use a meta-learner for stacking ensemble
@@ -174,7 +209,7 @@ class StackingMetaLearner:
         X_meta = np.hstack([lgb_proba, lstm_proba])  # (N_windows, 6)
 
         # Predict with meta-learner
-        ensemble_proba = self.meta_model.predict_proba(X_meta)  # (N_windows, 3)
+        ensemble_proba = linear_predict_proba(self.meta_model, X_meta)  # (N_windows, 3)
 
         # Validate output
         assert ensemble_proba.shape[1] == 3, f"Expected 3 classes in output, got {ensemble_proba.shape[1]}"
@@ -8,18 +8,74 @@ cross-validation without data leakage for financial time-series data.
 
 The OOF predictions serve as meta-features for training the stacking meta-learner.
 
+Folds are predicted concurrently (LSTM windows in fixed-size batches), and with
+a cache directory each fold's OOF array is stored under a (model hash, data
+hash, fold spec) key, so retraining only the meta-learner reuses them.
+
 Protocol v4.3 (Zero-Trust Edition)
 """
 
-import numpy as np
+import hashlib
 import logging
-from typing import Tuple, Optional
-import torch
+import os
+import pickle
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import torch
+except ImportError:
+    torch = None
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+DEFAULT_BATCH_SIZE = 4096
+
+
+def hash_array(array) -> str:
+    """Content hash of an array or tensor (shape and dtype included)"""
+    if torch is not None and isinstance(array, torch.Tensor):
+        array = array.detach().cpu().numpy()
+    array = np.ascontiguousarray(array)
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{array.shape}{array.dtype}".encode())
+    digest.update(memoryview(array).cast('B'))
+    return digest.hexdigest()
+
+
+def fingerprint_model(predictor) -> Optional[str]:
+    """
+    Content hash of a base learner's model
+
+    LightGBM / XGBoost boosters hash their serialized model, torch modules
+    their state_dict, anything else its pickle. Returns None if the model
+    cannot be serialized (its OOF is then never cached).
+    """
+    model = getattr(predictor, 'model', predictor)
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(type(predictor).__name__.encode())
+    try:
+        if hasattr(model, 'model_to_string'):  # LightGBM Booster
+            digest.update(model.model_to_string().encode())
+        elif hasattr(model, 'save_raw'):  # XGBoost Booster
+            digest.update(bytes(model.save_raw('json')))
+        elif torch is not None and isinstance(model, torch.nn.Module):
+            for name, tensor in model.state_dict().items():
+                digest.update(name.encode())
+                digest.update(hash_array(tensor).encode())
+        else:
+            digest.update(pickle.dumps(model))
+    except Exception as e:
+        logger.warning(f"Cannot fingerprint {type(model).__name__}, OOF cache disabled for it: {e}")
+        return None
+    return digest.hexdigest()
+
 
 class OOFPredictionGenerator:
     """
@@ -27,7 +83,7 @@ class OOFPredictionGenerator:
 
     OOF predictions are generated by:
     1. Splitting training data into K folds using Purged K-Fold
-    2. For each fold:
+    2. For each fold (folds run concurrently):
        - Train base models on fold's training set
        - Generate predictions on fold's validation set
        - Accumulate predictions into full-coverage arrays
@@ -38,15 +94,32 @@ class OOFPredictionGenerator:
     - LSTM OOF shape: (N_windows, 3) where N_windows = N_samples - 59
     - Valid indices: [59...N-1] - indices where both models can predict
     - No data leakage: Each fold's OOF comes from model trained on other folds
+
+    Caching:
+    With cache_dir set, each fold's OOF array is stored on disk keyed by
+    (model hash, data hash, fold spec). Re-running with the same base models
+    and data (e.g. to retrain only the meta-learner) loads the arrays instead
+    of predicting again; fold_stats reports the time saved per fold.
     """
 
-    def __init__(self, cv_splitter=None, alignment_handler=None):
+    def __init__(
+        self,
+        cv_splitter=None,
+        alignment_handler=None,
+        cache_dir: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ):
         """
         Initialize OOF generator
 
         Args:
             cv_splitter: Cross-validator (e.g., PurgedKFold). If None, will be imported.
             alignment_handler: DataAlignmentHandler for index mapping. If None, will be imported.
+            cache_dir: Directory for per-fold OOF arrays (None disables caching)
+            max_workers: Threads running fold predictions (default: os.cpu_count()).
+                LightGBM and torch release the GIL while predicting.
+            batch_size: LSTM windows per forward pass
         """
         if cv_splitter is None:
             from src.models.validation import PurgedKFold
@@ -60,8 +133,110 @@ class OOFPredictionGenerator:
         else:
             self.alignment = alignment_handler
 
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.fold_stats: List[Dict] = []
+
         logger.info(f"OOFPredictionGenerator initialized with {self.cv.n_splits} splits")
 
+    # ------------------------------------------------------------------
+    # Index mapping
+    # ------------------------------------------------------------------
+
+    def validation_window_indices(self, val_idx: np.ndarray, N_samples: int) -> np.ndarray:
+        """
+        LSTM window indices whose label sample lies in a validation fold
+
+        Window i ends at sample i * stride + (sequence_length - 1), so a
+        validation sample maps to a window when it is past the first window
+        end and on the stride grid.
+
+        Args:
+            val_idx: Validation sample indices
+            N_samples: Total number of samples
+
+        Returns:
+            Window indices (same order as val_idx)
+        """
+        N_windows = self.alignment.create_index_mapping(N_samples)['N_windows']
+        stride = self.alignment.stride
+        offset = np.asarray(val_idx, dtype=np.int64) - (self.alignment.sequence_length - 1)
+        mask = (offset >= 0) & (offset % stride == 0) & (offset // stride < N_windows)
+        return offset[mask] // stride
+
+    # ------------------------------------------------------------------
+    # Fold execution and caching
+    # ------------------------------------------------------------------
+
+    def _cache_path(self, learner: str, model_hash: Optional[str], data_hash: Optional[str],
+                    indices: np.ndarray) -> Optional[Path]:
+        if self.cache_dir is None or model_hash is None or data_hash is None:
+            return None
+        fold_spec = hash_array(np.asarray(indices, dtype=np.int64))
+        key = hashlib.blake2b(f"{model_hash}:{data_hash}:{fold_spec}".encode(), digest_size=16).hexdigest()
+        return self.cache_dir / f"{learner}_{key}.npz"
+
+    @staticmethod
+    def _load_cached(path: Optional[Path]):
+        if path is None or not path.exists():
+            return None
+        try:
+            with np.load(path) as cached:
+                return cached['proba'], float(cached['compute_ms'])
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable OOF cache {path.name}: {e}")
+            return None
+
+    @staticmethod
+    def _store(path: Optional[Path], proba: np.ndarray, compute_ms: float) -> None:
+        if path is None:
+            return
+        tmp = path.with_name(f"{path.stem}.{os.getpid()}.tmp.npz")
+        np.savez(tmp, proba=proba, compute_ms=compute_ms)
+        os.replace(tmp, path)
+
+    def _predict_batched(self, predictor, X, indices: np.ndarray) -> np.ndarray:
+        """Predict rows ``indices`` of X in batches of batch_size (inference mode for torch)"""
+        outputs = []
+        for start in range(0, len(indices), self.batch_size):
+            batch = X[indices[start:start + self.batch_size]]
+            if torch is not None and isinstance(batch, torch.Tensor):
+                with torch.inference_mode():
+                    outputs.append(predictor.predict_proba(batch))
+            else:
+                outputs.append(predictor.predict_proba(batch))
+        return np.concatenate(outputs) if outputs else np.zeros((0, 3), dtype=np.float32)
+
+    def _run_fold_part(self, predictor, X, indices: np.ndarray, cache_path: Optional[Path],
+                       batched: bool) -> Tuple[np.ndarray, float, float, bool]:
+        """
+        One learner on one fold: load from cache or predict and store
+
+        Returns:
+            (proba, elapsed_ms, compute_ms, cached); compute_ms is the original
+            prediction time (from the cache entry on a hit)
+        """
+        start = time.perf_counter()
+        cached = self._load_cached(cache_path)
+        if cached is not None:
+            proba, compute_ms = cached
+            return proba, (time.perf_counter() - start) * 1000, compute_ms, True
+
+        if batched:
+            proba = self._predict_batched(predictor, X, indices)
+        else:
+            proba = predictor.predict_proba(X[indices])
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self._store(cache_path, proba, elapsed_ms)
+        return proba, elapsed_ms, elapsed_ms, False
+
+    # ------------------------------------------------------------------
+    # OOF generation
+    # ------------------------------------------------------------------
+
     def generate_oof_predictions(
         self,
         lgb_predictor,
@@ -77,7 +252,7 @@ class OOFPredictionGenerator:
             lgb_predictor: LGBPredictor instance
             lstm_predictor: LSTMPredictor instance
             X_tabular: (N_samples, 23) features for LightGBM
-            X_sequential: (N_samples, seq_len, 23) or sliding window sequences for LSTM
+            X_sequential: (N_windows, seq_len, 23) sliding window sequences for LSTM
             y_train: (N_samples,) training labels (before windowing)
 
         Returns:
@@ -85,6 +260,7 @@ class OOFPredictionGenerator:
             lstm_oof: (N_windows, 3) LSTM OOF probabilities
             valid_indices: Array of indices [59...N-1] where both models predict
         """
+        total_start = time.perf_counter()
         N_samples = X_tabular.shape[0]
 
         # Initialize OOF arrays
@@ -97,62 +273,70 @@ class OOFPredictionGenerator:
         logger.info(f"Generating OOF predictions for {N_samples} samples")
         logger.info(f"Expected LSTM windows: {N_windows}")
 
-        # Generate OOF for each fold
-        for fold_num, (train_idx, val_idx) in enumerate(
-            self.cv.split(X_tabular, y_train), 1
-        ):
-            logger.info(f"Processing fold {fold_num}/{self.cv.n_splits}")
-            logger.info(f"  Train samples: {len(train_idx)}, Validation samples: {len(val_idx)}")
-
-            # Split tabular data
-            X_tab_train = X_tabular[train_idx]
-            X_tab_val = X_tabular[val_idx]
-
-            # Generate LightGBM OOF for validation fold
-            # No training needed - just predict with pre-trained model
-            fold_lgb_proba = lgb_predictor.predict_proba(X_tab_val)  # (|val_idx|, 3)
-            lgb_oof[val_idx] = fold_lgb_proba
-
-            logger.info(f"  LGB OOF shape: {fold_lgb_proba.shape}")
-
-            # For LSTM: generate OOF predictions on sliding window sequences
-            # X_sequential should contain windows corresponding to validation fold
-            # Map validation indices to corresponding window indices
-            try:
-                # Get window indices corresponding to validation fold indices
-                # Valid indices are [59...N-1], so fold's validation windows are
-                # those windows where (window_idx + 59) in val_idx
-                lstm_val_window_indices = []
-                for i, val_sample_idx in enumerate(val_idx):
-                    # Window index for sample at original index val_sample_idx
-                    # is (val_sample_idx - 59) if val_sample_idx >= 59
-                    if val_sample_idx >= 59:
-                        lstm_val_window_indices.append(val_sample_idx - 59)
-
-                if len(lstm_val_window_indices) > 0:
-                    lstm_val_window_indices = np.array(lstm_val_window_indices)
-
-                    # Extract corresponding sequences from X_sequential
-                    # Assuming X_sequential is (N_windows, seq_len, n_features)
-                    if isinstance(X_sequential, torch.Tensor):
-                        X_seq_val = X_sequential[lstm_val_window_indices]
-                    else:
-                        X_seq_val = X_sequential[lstm_val_window_indices]
-
-                    # Generate LSTM OOF for validation windows
-                    fold_lstm_proba = lstm_predictor.predict_proba(X_seq_val)  # (|windows|, 3)
-
-                    # Map window predictions back to OOF array
-                    # LSTM OOF indices are offset by 59 from original sample indices
-                    lstm_oof[lstm_val_window_indices] = fold_lstm_proba
-
-                    logger.info(f"  LSTM OOF windows: {len(lstm_val_window_indices)}, shape: {fold_lstm_proba.shape}")
+        folds = [
+            (fold_num, np.asarray(val_idx), self.validation_window_indices(val_idx, N_samples))
+            for fold_num, (_, val_idx) in enumerate(self.cv.split(X_tabular, y_train), 1)
+        ]
+
+        # Cache key parts: hashed once per run
+        lgb_hash = lstm_hash = tab_hash = seq_hash = None
+        if self.cache_dir is not None:
+            lgb_hash, lstm_hash = fingerprint_model(lgb_predictor), fingerprint_model(lstm_predictor)
+            tab_hash, seq_hash = hash_array(X_tabular), hash_array(X_sequential)
+
+        # Every fold's LightGBM and LSTM predictions run concurrently
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="oof") as pool:
+            jobs = []
+            for fold_num, val_idx, window_idx in folds:
+                lgb_job = pool.submit(
+                    self._run_fold_part, lgb_predictor, X_tabular, val_idx,
+                    self._cache_path('lgb', lgb_hash, tab_hash, val_idx), False,
+                )
+                lstm_job = None
+                if len(window_idx) > 0:
+                    lstm_job = pool.submit(
+                        self._run_fold_part, lstm_predictor, X_sequential, window_idx,
+                        self._cache_path('lstm', lstm_hash, seq_hash, window_idx), True,
+                    )
+                jobs.append((fold_num, val_idx, window_idx, lgb_job, lstm_job))
+
+            self.fold_stats = []
+            for fold_num, val_idx, window_idx, lgb_job, lstm_job in jobs:
+                logger.info(f"Processing fold {fold_num}/{self.cv.n_splits}")
+                logger.info(f"  Validation samples: {len(val_idx)}, LSTM windows: {len(window_idx)}")
+
+                fold_lgb_proba, lgb_ms, lgb_compute_ms, lgb_cached = lgb_job.result()
+                lgb_oof[val_idx] = fold_lgb_proba
+                stats = {
+                    'fold': fold_num,
+                    'val_samples': len(val_idx),
+                    'val_windows': len(window_idx),
+                    'lgb_ms': lgb_ms,
+                    'lgb_cached': lgb_cached,
+                    'lstm_ms': 0.0,
+                    'lstm_cached': False,
+                    'saved_ms': lgb_compute_ms - lgb_ms if lgb_cached else 0.0,
+                }
+
+                if lstm_job is not None:
+                    try:
+                        fold_lstm_proba, lstm_ms, lstm_compute_ms, lstm_cached = lstm_job.result()
+                    except Exception as e:
+                        logger.error(f"Error processing LSTM OOF for fold {fold_num}: {e}")
+                        raise
+                    lstm_oof[window_idx] = fold_lstm_proba
+                    stats.update(lstm_ms=lstm_ms, lstm_cached=lstm_cached)
+                    if lstm_cached:
+                        stats['saved_ms'] += lstm_compute_ms - lstm_ms
                 else:
                     logger.warning(f"  No valid LSTM windows in fold {fold_num}")
 
-            except Exception as e:
-                logger.error(f"Error processing LSTM OOF for fold {fold_num}: {e}")
-                raise
+                self.fold_stats.append(stats)
+                logger.info(
+                    f"  LGB {stats['lgb_ms']:.1f}ms{' (cached)' if lgb_cached else ''}, "
+                    f"LSTM {stats['lstm_ms']:.1f}ms{' (cached)' if stats['lstm_cached'] else ''}, "
+                    f"saved {stats['saved_ms']:.1f}ms"
+                )
 
         # Verify OOF coverage
         logger.info("Verifying OOF coverage...")
@@ -167,7 +351,9 @@ class OOFPredictionGenerator:
         # Get valid indices where both models have predictions
         valid_indices = self.alignment.get_valid_indices(N_samples)
 
-        logger.info(f"OOF generation complete:")
+        total_saved = sum(stats['saved_ms'] for stats in self.fold_stats)
+        logger.info(f"OOF generation complete in {(time.perf_counter() - total_start) * 1000:.1f}ms "
+                    f"(cache saved {total_saved:.1f}ms):")
         logger.info(f"  LGB OOF shape: {lgb_oof.shape}, dtype: {lgb_oof.dtype}")
         logger.info(f"  LSTM OOF shape: {lstm_oof.shape}, dtype: {lstm_oof.dtype}")
         logger.info(f"  Valid indices: {len(valid_indices)} samples [{valid_indices[0]}...{valid_indices[-1]}]")
@@ -191,17 +377,9 @@ class OOFPredictionGenerator:
         Returns:
             (N_windows, sequence_length, n_features) sliding window sequences
         """
-        N_samples, n_features = X.shape
-        N_windows = (N_samples - sequence_length) // stride + 1
-
-        windows = np.zeros((N_windows, sequence_length, n_features), dtype=np.float32)
-
-        for i in range(N_windows):
-            start_idx = i * stride
-            end_idx = start_idx + sequence_length
-            windows[i] = X[start_idx:end_idx]
-
-        return windows
+        # (N_samples - L + 1, n_features, L) strided view -> one contiguous copy
+        view = np.lib.stride_tricks.sliding_window_view(X, sequence_length, axis=0)[::stride]
+        return np.ascontiguousarray(view.transpose(0, 2, 1), dtype=np.float32)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,385 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ensemble Serving Engine for Live Inference
+
+EnsemblePredictor re-windows the full history, runs LightGBM and the LSTM
+back to back and re-aligns both outputs on every call. In live mode only the
+newest row changes, so EnsembleServingEngine keeps per-symbol state instead:
+
+    tick    -> append one row to the symbol's rolling sequence buffer
+    predict -> LightGBM on the latest rows (worker thread, releases the GIL)
+               || LSTM on the rolling windows (caller thread, inference_mode)
+            -> weighted average or stacking meta-learner (one matrix product)
+
+Alignment is implicit: the latest tabular row and the window ending at it
+refer to the same sample index (N-1). Many symbols are scored in one batch:
+one LightGBM call and one LSTM forward pass.
+
+Per-component latency (gather / lgb / lstm / meta / total) is recorded for
+every call, see latency_stats().
+
+Protocol v4.3 (Zero-Trust Edition)
+"""
+
+import logging
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    import torch
+except ImportError:
+    torch = None
+
+from src.model.ensemble.meta_learner import linear_predict_proba
+
+logger = logging.getLogger(__name__)
+
+LATENCY_WINDOW = 4096
+COMPONENTS = ('gather', 'lgb', 'lstm', 'meta', 'total')
+
+
+class RollingSequenceBuffer:
+    """
+    Per-symbol rolling windows for sequence models
+
+    Each symbol owns a mirrored ring buffer of 2 * sequence_length rows: every
+    row is written at ``pos`` and ``pos + sequence_length``, so the latest
+    window is always the contiguous slice ``[pos + 1, pos + 1 + sequence_length)``.
+    Appending a tick writes two rows; nothing is shifted or re-windowed.
+    """
+
+    def __init__(self, sequence_length: int, n_features: int, capacity: int = 8,
+                 dtype=np.float32):
+        """
+        Args:
+            sequence_length: Window length fed to the sequence model
+            n_features: Features per timestep
+            capacity: Initial number of symbols (grows by doubling)
+            dtype: Buffer dtype (float32 matches torch's default)
+        """
+        self.sequence_length = sequence_length
+        self.n_features = n_features
+        self._data = np.zeros((capacity, 2 * sequence_length, n_features), dtype=dtype)
+        self._pos = np.zeros(capacity, dtype=np.int64)  # Index of the latest row
+        self._count = np.zeros(capacity, dtype=np.int64)
+        self._slots: Dict[str, int] = {}
+        self._offsets = np.arange(1, sequence_length + 1)
+
+    def slot(self, symbol: str) -> int:
+        """Buffer row of a symbol (allocated on first use)."""
+        index = self._slots.get(symbol)
+        if index is None:
+            index = len(self._slots)
+            if index == len(self._data):
+                self._grow()
+            self._slots[symbol] = index
+            self._pos[index] = self.sequence_length - 1
+        return index
+
+    def _grow(self) -> None:
+        capacity = 2 * len(self._data)
+        data = np.zeros((capacity,) + self._data.shape[1:], dtype=self._data.dtype)
+        data[:len(self._data)] = self._data
+        self._data = data
+        self._pos = np.concatenate([self._pos, np.zeros(capacity - len(self._pos), dtype=np.int64)])
+        self._count = np.concatenate([self._count, np.zeros(capacity - len(self._count), dtype=np.int64)])
+
+    def append(self, symbol: str, row) -> bool:
+        """
+        Append one timestep.
+
+        Returns:
+            bool: Whether the symbol has a full window
+        """
+        index = self.slot(symbol)
+        pos = (self._pos[index] + 1) % self.sequence_length
+        self._data[index, pos] = row
+        self._data[index, pos + self.sequence_length] = row
+        self._pos[index] = pos
+        self._count[index] += 1
+        return self._count[index] >= self.sequence_length
+
+    def extend(self, symbol: str, rows) -> bool:
+        """Append several timesteps (only the last sequence_length rows are kept)."""
+        rows = np.asarray(rows)[-self.sequence_length:]
+        ready = False
+        for row in rows:
+            ready = self.append(symbol, row)
+        return ready
+
+    def is_ready(self, symbol: str) -> bool:
+        """Whether the symbol has at least sequence_length rows."""
+        index = self._slots.get(symbol)
+        return index is not None and self._count[index] >= self.sequence_length
+
+    def window(self, symbol: str) -> np.ndarray:
+        """Latest window of one symbol (view, oldest row first)."""
+        index = self._slots[symbol]
+        start = self._pos[index] + 1
+        return self._data[index, start:start + self.sequence_length]
+
+    def windows(self, symbols: Sequence[str]) -> np.ndarray:
+        """
+        Latest windows of several symbols in one gather.
+
+        Returns:
+            np.ndarray: (n_symbols, sequence_length, n_features), contiguous
+        """
+        indexes = np.fromiter((self._slots[s] for s in symbols), dtype=np.int64, count=len(symbols))
+        rows = self._pos[indexes, None] + self._offsets
+        return self._data[indexes[:, None], rows]
+
+    def reset(self, symbol: str) -> None:
+        """Forget a symbol's history (e.g. after a data gap)."""
+        index = self._slots.get(symbol)
+        if index is not None:
+            self._count[index] = 0
+
+
+class EnsembleServingEngine:
+    """
+    Stateful, batched ensemble inference for live trading
+
+    Base learners only need ``predict_proba`` returning (N, 3) probabilities
+    (LGBPredictor / LSTMPredictor). When the sequence learner wraps a torch
+    module, the engine calls the module directly under ``torch.inference_mode``
+    on a tensor sharing memory with the gathered windows.
+
+    Example:
+        >>> engine = EnsembleServingEngine.from_ensemble(ensemble, n_features=23)
+        >>> engine.seed("EURUSD", history)              # (>= 60, 23) recent rows
+        >>> engine.update("EURUSD", row)                # one row per tick
+        >>> proba = engine.predict_proba(["EURUSD", "GBPUSD"])   # (2, 3)
+        >>> engine.latency_stats()["lstm"]["p99_ms"]
+    """
+
+    def __init__(
+        self,
+        lgb_predictor,
+        lstm_predictor,
+        n_features: int,
+        sequence_length: int = 60,
+        weights: Tuple[float, float] = (0.5, 0.5),
+        meta_learner=None,
+        parallel: bool = True,
+        torch_threads: Optional[int] = None,
+    ):
+        """
+        Args:
+            lgb_predictor: Tabular base learner (predict_proba on (N, n_features))
+            lstm_predictor: Sequence base learner (predict_proba on (N, L, n_features))
+            n_features: Features per row
+            sequence_length: LSTM window length (default: 60)
+            weights: (w_lgb, w_lstm) used when no meta-learner is given
+            meta_learner: Fitted stacking model (sklearn estimator or StackingMetaLearner)
+            parallel: Run LightGBM in a worker thread while the LSTM runs
+            torch_threads: torch intra-op threads (None keeps torch's setting)
+        """
+        self.lgb_predictor = lgb_predictor
+        self.lstm_predictor = lstm_predictor
+        self.n_features = n_features
+        self.sequence_length = sequence_length
+        self.weights = weights
+        self.meta_model = getattr(meta_learner, 'meta_model', meta_learner)
+
+        self.sequences = RollingSequenceBuffer(sequence_length, n_features)
+        self._latest = np.zeros((8, n_features), dtype=np.float32)  # Latest tabular row per slot
+
+        self._lstm_module = None
+        lstm_model = getattr(lstm_predictor, 'model', None)
+        if torch is not None and isinstance(lstm_model, torch.nn.Module):
+            lstm_model.eval()
+            self._lstm_module = lstm_model
+            self._device = getattr(lstm_predictor, 'device', 'cpu')
+            if torch_threads is not None:
+                torch.set_num_threads(torch_threads)
+
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ensemble-lgb") if parallel else None
+        self.latencies: Dict[str, deque] = {name: deque(maxlen=LATENCY_WINDOW) for name in COMPONENTS}
+        self.last_timings: Dict[str, float] = {}
+
+        logger.info(
+            f"EnsembleServingEngine initialized: sequence_length={sequence_length}, "
+            f"stacking={self.meta_model is not None}, parallel={parallel}, "
+            f"torch_module={self._lstm_module is not None}"
+        )
+
+    @classmethod
+    def from_ensemble(cls, ensemble, n_features: int, **kwargs) -> 'EnsembleServingEngine':
+        """
+        Build a serving engine from an EnsemblePredictor (same learners, weights,
+        window length and, with use_stacking, meta-learner).
+        """
+        kwargs.setdefault('sequence_length', ensemble.alignment.sequence_length)
+        kwargs.setdefault('weights', ensemble.weights)
+        if ensemble.use_stacking:
+            kwargs.setdefault('meta_learner', ensemble.meta_learner)
+        return cls(ensemble.lgb_predictor, ensemble.lstm_predictor, n_features, **kwargs)
+
+    # ------------------------------------------------------------------
+    # State
+    # ------------------------------------------------------------------
+
+    def _slot(self, symbol: str) -> int:
+        index = self.sequences.slot(symbol)
+        if index >= len(self._latest):
+            latest = np.zeros((2 * len(self._latest), self.n_features), dtype=self._latest.dtype)
+            latest[:len(self._latest)] = self._latest
+            self._latest = latest
+        return index
+
+    def update(self, symbol: str, row, sequence_row=None) -> bool:
+        """
+        Record one tick.
+
+        Args:
+            symbol: Instrument
+            row: (n_features,) tabular features of the new sample
+            sequence_row: Features appended to the LSTM window (default: row)
+
+        Returns:
+            bool: Whether the symbol can be predicted
+        """
+        index = self._slot(symbol)
+        self._latest[index] = row
+        return self.sequences.append(symbol, row if sequence_row is None else sequence_row)
+
+    def seed(self, symbol: str, history, sequence_history=None) -> bool:
+        """
+        Initialize a symbol from recent history (oldest row first).
+
+        Returns:
+            bool: Whether the symbol can be predicted
+        """
+        history = np.asarray(history)
+        index = self._slot(symbol)
+        self._latest[index] = history[-1]
+        return self.sequences.extend(symbol, history if sequence_history is None else sequence_history)
+
+    def is_ready(self, symbol: str) -> bool:
+        """Whether the symbol has a full LSTM window."""
+        return self.sequences.is_ready(symbol)
+
+    def ready_symbols(self) -> List[str]:
+        """Symbols with a full LSTM window."""
+        return [symbol for symbol in self.sequences._slots if self.sequences.is_ready(symbol)]
+
+    # ------------------------------------------------------------------
+    # Inference
+    # ------------------------------------------------------------------
+
+    def _lstm_proba(self, windows: np.ndarray) -> np.ndarray:
+        module = self._lstm_module
+        if module is None:
+            return self.lstm_predictor.predict_proba(windows)
+        with torch.inference_mode():
+            logits = module(torch.from_numpy(windows).to(self._device))
+            return torch.softmax(logits, dim=1).cpu().numpy()
+
+    def _timed_lgb(self, rows: np.ndarray):
+        start = time.perf_counter()
+        proba = self.lgb_predictor.predict_proba(rows)
+        return proba, (time.perf_counter() - start) * 1000
+
+    def combine(self, lgb_proba: np.ndarray, lstm_proba: np.ndarray) -> np.ndarray:
+        """Aligned base probabilities -> ensemble probabilities (same rules as EnsemblePredictor)."""
+        if self.meta_model is not None:
+            return linear_predict_proba(self.meta_model, np.hstack([lgb_proba, lstm_proba]))
+        w_lgb, w_lstm = self.weights
+        proba = w_lgb * lgb_proba + w_lstm * lstm_proba
+        return proba / proba.sum(axis=1, keepdims=True)
+
+    def predict_proba(self, symbols: Optional[Sequence[str]] = None) -> np.ndarray:
+        """
+        Ensemble probabilities for the latest sample of each symbol.
+
+        Args:
+            symbols: Symbols to score in one batch (default: all ready symbols)
+
+        Returns:
+            (n_symbols, 3) probabilities, rows in ``symbols`` order
+
+        Raises:
+            ValueError: A symbol does not have a full window yet
+        """
+        start = time.perf_counter()
+        symbols = self.ready_symbols() if symbols is None else list(symbols)
+        not_ready = [s for s in symbols if not self.sequences.is_ready(s)]
+        if not_ready:
+            raise ValueError(f"Symbols without a full {self.sequence_length}-row window: {not_ready}")
+
+        indexes = [self.sequences._slots[s] for s in symbols]
+        rows = self._latest[indexes]
+        windows = self.sequences.windows(symbols)
+        gathered = time.perf_counter()
+
+        if self._pool is not None:
+            future = self._pool.submit(self._timed_lgb, rows)
+            lstm_start = time.perf_counter()
+            lstm_proba = self._lstm_proba(windows)
+            lstm_ms = (time.perf_counter() - lstm_start) * 1000
+            lgb_proba, lgb_ms = future.result()
+        else:
+            lgb_proba, lgb_ms = self._timed_lgb(rows)
+            lstm_start = time.perf_counter()
+            lstm_proba = self._lstm_proba(windows)
+            lstm_ms = (time.perf_counter() - lstm_start) * 1000
+
+        meta_start = time.perf_counter()
+        proba = self.combine(np.asarray(lgb_proba), np.asarray(lstm_proba))
+        end = time.perf_counter()
+
+        timings = {
+            'gather': (gathered - start) * 1000,
+            'lgb': lgb_ms,
+            'lstm': lstm_ms,
+            'meta': (end - meta_start) * 1000,
+            'total': (end - start) * 1000,
+        }
+        for name, value in timings.items():
+            self.latencies[name].append(value)
+        self.last_timings = timings
+        return proba
+
+    def on_tick(self, symbol: str, row, sequence_row=None) -> Optional[np.ndarray]:
+        """
+        Record a tick and score the symbol.
+
+        Returns:
+            (3,) probabilities, or None while the window is still filling
+        """
+        if not self.update(symbol, row, sequence_row):
+            return None
+        return self.predict_proba([symbol])[0]
+
+    def predict(self, symbols: Optional[Sequence[str]] = None) -> np.ndarray:
+        """Class labels for the latest sample of each symbol."""
+        return np.argmax(self.predict_proba(symbols), axis=1)
+
+    # ------------------------------------------------------------------
+    # Instrumentation
+    # ------------------------------------------------------------------
+
+    def latency_stats(self) -> Dict[str, Dict[str, float]]:
+        """count / mean / p50 / p99 per component (milliseconds, recent calls)."""
+        stats = {}
+        for name, samples in self.latencies.items():
+            values = np.asarray(list(samples))
+            if values.size == 0:
+                stats[name] = {'count': 0, 'mean_ms': 0.0, 'p50_ms': 0.0, 'p99_ms': 0.0}
+                continue
+            p50, p99 = np.percentile(values, [50, 99])
+            stats[name] = {'count': int(values.size), 'mean_ms': round(float(values.mean()), 4),
+                           'p50_ms': round(float(p50), 4), 'p99_ms': round(float(p99), 4)}
+        return stats
+
+    def close(self) -> None:
+        """Stop the LightGBM worker thread."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
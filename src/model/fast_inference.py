@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Compiled XGBoost Inference for Low-Latency Prediction
+
+Per-call DataFrame/DMatrix construction costs far more than evaluating the
+trees for a single tick. CompiledBooster loads a booster once into flat NumPy
+node arrays and evaluates every tree at once, one depth level per step:
+
+    single row  -> flattened node arrays (no DMatrix, no pandas)
+    batch       -> booster.inplace_predict on a contiguous float32 array
+
+Only numerical splits of single-output gbtree models (binary:logistic,
+binary:logitraw, reg:*) are compiled; anything else transparently falls back
+to inplace_predict.
+"""
+
+import json
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+# Objectives whose prediction is sigmoid(margin)
+LOGISTIC_OBJECTIVES = {'binary:logistic', 'reg:logistic'}
+# Objectives whose prediction is the raw margin
+IDENTITY_OBJECTIVES = {'binary:logitraw', 'reg:squarederror', 'reg:linear', 'reg:absoluteerror'}
+
+
+class CompiledBooster:
+    """
+    XGBoost booster flattened into NumPy arrays for single-row inference.
+
+    Trees are concatenated into one node table. Leaves point to themselves
+    and read a trailing NaN slot of the feature buffer, so after ``max_depth``
+    steps every tree has settled on its leaf and the margin is the sum of
+    leaf values plus the base margin.
+
+    Attributes:
+        booster: Underlying xgb.Booster (used for batches and fallback)
+        feature_names: Feature order expected by the model
+        compiled (bool): Whether the flattened tree path is available
+    """
+
+    def __init__(self, booster, feature_names: Optional[Sequence[str]] = None):
+        """
+        Compile a booster.
+
+        Args:
+            booster: Trained xgb.Booster (slice it first to honour best_iteration)
+            feature_names: Feature order; defaults to the booster's own names
+        """
+        self.booster = booster
+        self.feature_names = list(feature_names or booster.feature_names or [])
+        self.num_features = booster.num_features()
+        self.objective = json.loads(booster.save_config())['learner']['objective']['name']
+
+        self.compiled = False
+        self.base_margin = 0.0
+        try:
+            self._compile()
+        except (KeyError, ValueError, NotImplementedError):
+            self.compiled = False
+
+    # ------------------------------------------------------------------
+    # Compilation
+    # ------------------------------------------------------------------
+
+    def _compile(self) -> None:
+        """Flatten all trees into one node table."""
+        if self.objective not in LOGISTIC_OBJECTIVES | IDENTITY_OBJECTIVES:
+            raise NotImplementedError(self.objective)
+
+        learner = json.loads(self.booster.save_raw('json'))['learner']
+        gbm = learner['gradient_booster']
+        if gbm['name'] != 'gbtree' or int(learner['learner_model_param'].get('num_target', 1)) != 1:
+            raise NotImplementedError(gbm['name'])
+
+        features, thresholds, lefts, default_left, leaf_values, roots = [], [], [], [], [], []
+        max_depth = 0
+        offset = 0
+        for tree in gbm['model']['trees']:
+            if any(tree['split_type']):
+                raise NotImplementedError('categorical split')
+            left = np.asarray(tree['left_children'], dtype=np.int64)
+            right = np.asarray(tree['right_children'], dtype=np.int64)
+            split = np.asarray(tree['split_conditions'], dtype=np.float32)
+            is_leaf = left == -1
+            node_ids = np.arange(len(left))
+            if not np.array_equal(right[~is_leaf], left[~is_leaf] + 1):
+                raise ValueError('children are not adjacent')
+
+            roots.append(offset)
+            lefts.append(np.where(is_leaf, node_ids, left) + offset)
+            features.append(np.where(is_leaf, self.num_features, tree['split_indices']))
+            thresholds.append(np.where(is_leaf, np.float32(0), split))
+            default_left.append(np.asarray(tree['default_left'], dtype=bool) | is_leaf)
+            leaf_values.append(np.where(is_leaf, split, np.float32(0)))
+            max_depth = max(max_depth, self._depth(left, right))
+            offset += len(left)
+
+        self._roots = np.asarray(roots, dtype=np.int64)
+        self._left = np.concatenate(lefts).astype(np.int64)
+        self._feature = np.concatenate(features).astype(np.int64)
+        self._threshold = np.concatenate(thresholds).astype(np.float32)
+        self._default_left = np.concatenate(default_left)
+        self._leaf_value = np.concatenate(leaf_values).astype(np.float32)
+        self._max_depth = max_depth
+        self.compiled = True
+
+        # Base margin: calibrate against the booster itself (covers every base_score convention)
+        probe = np.zeros((1, self.num_features), dtype=np.float32)
+        reference = float(self.booster.inplace_predict(probe, predict_type='margin', validate_features=False)[0])
+        self.base_margin = reference - float(self._tree_sum(self._make_row(probe[0])))
+
+    @staticmethod
+    def _depth(left: np.ndarray, right: np.ndarray) -> int:
+        depth = np.zeros(len(left), dtype=np.int64)
+        for node in range(len(left)):  # Children always have larger ids than parents
+            if left[node] != -1:
+                depth[left[node]] = depth[right[node]] = depth[node] + 1
+        return int(depth.max())
+
+    # ------------------------------------------------------------------
+    # Inference
+    # ------------------------------------------------------------------
+
+    def feature_order(self, columns: Sequence[str]) -> np.ndarray:
+        """
+        Precompute the permutation from a caller's column order to the model's.
+
+        Args:
+            columns: Column names of the caller's feature vectors
+
+        Returns:
+            np.ndarray: Indexes such that ``values[order]`` is in model order
+        """
+        position = {name: i for i, name in enumerate(columns)}
+        missing = [name for name in self.feature_names if name not in position]
+        if missing:
+            raise KeyError(f"Missing features: {missing}")
+        return np.asarray([position[name] for name in self.feature_names], dtype=np.int64)
+
+    def _make_row(self, values) -> np.ndarray:
+        # Row buffer per call (safe to share one instance across threads):
+        # features + trailing NaN read by leaves
+        row = np.empty(self.num_features + 1, dtype=np.float32)
+        row[:self.num_features] = values
+        row[self.num_features] = np.nan
+        return row
+
+    def _tree_sum(self, row: np.ndarray) -> float:
+        node = self._roots
+        for _ in range(self._max_depth):
+            value = row[self._feature[node]]
+            go_left = (value < self._threshold[node]) | (np.isnan(value) & self._default_left[node])
+            node = self._left[node] + ~go_left
+        return self._leaf_value[node].sum(dtype=np.float64)
+
+    def _transform(self, margin):
+        if self.objective in LOGISTIC_OBJECTIVES:
+            return 1.0 / (1.0 + np.exp(-margin))
+        return margin
+
+    def predict_row(self, values, order: Optional[np.ndarray] = None) -> float:
+        """
+        Predict a single feature vector.
+
+        Args:
+            values: 1-D sequence of feature values
+            order: Optional permutation from ``feature_order`` (model order if None)
+
+        Returns:
+            float: Prediction (probability for logistic objectives); an array
+            of outputs for uncompiled multi-output models
+        """
+        row = self._make_row(values if order is None else np.asarray(values)[order])
+        if not self.compiled:
+            batch = row[:self.num_features].reshape(1, -1)
+            output = self.booster.inplace_predict(batch, validate_features=False)[0]
+            return float(output) if np.ndim(output) == 0 else output
+        return float(self._transform(np.float32(self.base_margin + float(self._tree_sum(row)))))
+
+    def predict_batch(self, X, order: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Predict a batch of feature vectors.
+
+        Args:
+            X: 2-D array (n_rows, n_features)
+            order: Optional column permutation from ``feature_order``
+
+        Returns:
+            np.ndarray: (n_rows,) predictions
+        """
+        X = np.asarray(X)
+        if order is not None:
+            X = X[:, order]
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        return self.booster.inplace_predict(X, validate_features=False)
+
+    def info(self) -> Dict:
+        """Compilation summary."""
+        return {
+            'compiled': self.compiled,
+            'objective': self.objective,
+            'num_features': self.num_features,
+            'num_trees': len(self._roots) if self.compiled else None,
+            'max_depth': self._max_depth if self.compiled else None,
+        }
@@ -21,8 +21,9 @@ Date: 2026-01-16
 import logging
 import json
 import uuid
+from functools import partial
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Optional, Union
 
 import numpy as np
 import pandas as pd
@@ -33,23 +34,21 @@ from sklearn.metrics import (
     roc_auc_score
 )
 
+from src.model.study_runner import StudyRunner
+
 # ✅ P0 Issue #5 Fix: Import specific exception handlers
 try:
     from scripts.ai_governance.exception_handler import (
         ExceptionHandler,
-        TrialError,
-        ModelFittingError,
-        EvaluationError,
         DataIntegrityError,
     )
     EXCEPTION_HANDLER_AVAILABLE = True
 except ImportError:
+    DataIntegrityError = ValueError
     EXCEPTION_HANDLER_AVAILABLE = False
 
 try:
     import optuna
-    from optuna.samplers import TPESampler
-    from optuna.pruners import MedianPruner
     OPTUNA_AVAILABLE = True
 except ImportError:
     OPTUNA_AVAILABLE = False
@@ -88,6 +87,46 @@ except Exception as e:
     raise
 
 
+def xgboost_search_space(trial: 'optuna.Trial', random_state: int = 42) -> Dict:
+    """
+    XGBoost 超参数搜索空间 (顶层函数, 供 StudyRunner 的 worker 进程导入)
+
+    参数:
+        trial: Optuna Trial 对象
+        random_state: 随机种子
+
+    返回:
+        XGBoost 参数字典 (n_estimators 为 boosting 轮数)
+    """
+    return {
+        'max_depth': trial.suggest_int('max_depth', 3, 10),
+        'learning_rate': trial.suggest_float(
+            'learning_rate', 0.001, 0.3, log=True
+        ),
+        'n_estimators': trial.suggest_int('n_estimators', 50, 500),
+        'subsample': trial.suggest_float('subsample', 0.6, 1.0),
+        'colsample_bytree': trial.suggest_float(
+            'colsample_bytree', 0.6, 1.0
+        ),
+        'colsample_bylevel': trial.suggest_float(
+            'colsample_bylevel', 0.6, 1.0
+        ),
+        'min_child_weight': trial.suggest_int(
+            'min_child_weight', 1, 10
+        ),
+        'gamma': trial.suggest_float('gamma', 0.0, 5.0),
+        'reg_alpha': trial.suggest_float(
+            'reg_alpha', 1e-8, 2.0, log=True
+        ),
+        'reg_lambda': trial.suggest_float(
+            'reg_lambda', 1e-8, 2.0, log=True
+        ),
+        'tree_method': 'hist',
+        'random_state': random_state,
+        'verbosity': 0,
+    }
+
+
 class OptunaOptimizer:
     """
     基于 Optuna 的 XGBoost 超参数优化器
@@ -98,6 +137,7 @@ class OptunaOptimizer:
     - 多目标优化 (F1, Precision, Recall)
     - MLflow 集成
     - 模型保存和评估
+    - 多进程试验 + 每轮剪枝 + 可续跑存储 (StudyRunner)
     """
 
     def __init__(
@@ -108,7 +148,12 @@ class OptunaOptimizer:
         y_test: np.ndarray,
         n_trials: int = 50,
         random_state: int = 42,
-        timeout: Optional[int] = None
+        timeout: Optional[int] = None,
+        n_jobs: int = 1,
+        study_dir: Optional[Union[str, Path]] = None,
+        storage: Optional[str] = None,
+        pruner: str = 'median',
+        study_name: Optional[str] = None
     ):
         """
         初始化优化器
@@ -121,6 +166,11 @@ class OptunaOptimizer:
             n_trials: Optuna 试验次数 (默认 50)
             random_state: 随机种子
             timeout: 优化超时时间 (秒)
+            n_jobs: 试验 worker 进程数
+            study_dir: Study 目录 (共享矩阵 + 存储; 指定后可续跑, 默认临时目录)
+            storage: 'journal' (默认) / 'sqlite' / Optuna 存储 URL
+            pruner: 'median' / 'hyperband' / 'none'
+            study_name: Study 名称 (续跑时与 study_dir 一起指定, 默认按会话 UUID 生成)
         """
         if not OPTUNA_AVAILABLE:
             raise ImportError("Optuna 库未安装")
@@ -132,6 +182,11 @@ class OptunaOptimizer:
         self.n_trials = n_trials
         self.random_state = random_state
         self.timeout = timeout
+        self.n_jobs = n_jobs
+        self.study_dir = study_dir
+        self.storage = storage
+        self.pruner = pruner
+        self.study_name = study_name
 
         # 初始化状态
         self.study = None
@@ -140,6 +195,7 @@ class OptunaOptimizer:
         self.best_trial_number = None
         self.best_model = None
         self.best_model_metrics = None
+        self.run_report = None
 
         # 会话跟踪
         self.session_uuid = str(uuid.uuid4())
@@ -153,19 +209,10 @@ class OptunaOptimizer:
         logger.info(f"   试验次数: {n_trials}")
         logger.info(f"   随机种子: {random_state}")
 
-    def objective(self, trial: 'optuna.Trial') -> float:
+    def _validate_inputs(self) -> None:
         """
-        Optuna 目标函数: 最大化 F1 分数
-
-        ✅ P0 Issue #4 Fix: 在目标函数中添加数据验证
-
-        参数:
-            trial: Optuna Trial 对象
-
-        返回:
-            F1 分数 (0-1)
+        ✅ P0 Issue #4 Fix: 优化开始前验证一次输入数据 (失败只告警, 不中断优化)
         """
-        # ✅ P0 Issue #4 Fix: 验证输入数据
         try:
             from scripts.ai_governance.data_validator import DataValidator
             validator = DataValidator(strict_mode=False)
@@ -178,100 +225,9 @@ class OptunaOptimizer:
         except Exception as e:
             # ✅ P0 Issue #5: Specific exception handling
             if EXCEPTION_HANDLER_AVAILABLE:
-                ExceptionHandler.handle_data_error(e, "objective function")
+                ExceptionHandler.handle_data_error(e, "optimize")
             logger.warning(f"⚠️  未预期的验证错误: {type(e).__name__}")
 
-        # 采样超参数空间
-        params = {
-            'max_depth': trial.suggest_int('max_depth', 3, 10),
-            'learning_rate': trial.suggest_float(
-                'learning_rate', 0.001, 0.3, log=True
-            ),
-            'n_estimators': trial.suggest_int('n_estimators', 50, 500),
-            'subsample': trial.suggest_float('subsample', 0.6, 1.0),
-            'colsample_bytree': trial.suggest_float(
-                'colsample_bytree', 0.6, 1.0
-            ),
-            'colsample_bylevel': trial.suggest_float(
-                'colsample_bylevel', 0.6, 1.0
-            ),
-            'min_child_weight': trial.suggest_int(
-                'min_child_weight', 1, 10
-            ),
-            'gamma': trial.suggest_float('gamma', 0.0, 5.0),
-            'reg_alpha': trial.suggest_float(
-                'reg_alpha', 1e-8, 2.0, log=True
-            ),
-            'reg_lambda': trial.suggest_float(
-                'reg_lambda', 1e-8, 2.0, log=True
-            ),
-            'tree_method': 'hist',
-            'random_state': self.random_state,
-            'verbosity': 0,
-        }
-
-        try:
-            # 使用 TimeSeriesSplit 防止未来数据泄露
-            tscv = TimeSeriesSplit(n_splits=3)
-            f1_scores = []
-
-            for train_idx, val_idx in tscv.split(self.X_train):
-                X_tr = self.X_train[train_idx]
-                X_val = self.X_train[val_idx]
-                y_tr = self.y_train[train_idx]
-                y_val = self.y_train[val_idx]
-
-                # 训练模型
-                model = xgb.XGBClassifier(**params)
-                model.fit(X_tr, y_tr, verbose=False)
-
-                # 预测验证集
-                y_pred = model.predict(X_val)
-
-                # 计算 F1 分数
-                f1 = f1_score(y_val, y_pred, average='weighted', zero_division=0)
-                f1_scores.append(f1)
-
-            # 平均 F1 分数
-            avg_f1 = np.mean(f1_scores)
-
-            # 记录试验
-            trial_record = {
-                'trial_number': trial.number,
-                'params': params,
-                'f1_score': float(avg_f1),
-                'fold_scores': [float(s) for s in f1_scores]
-            }
-            self.trial_history.append(trial_record)
-
-            return avg_f1
-
-        except (ValueError, TypeError, KeyError, IndexError) as e:
-            # ✅ P0 Issue #5: Specific exception handling for data/param errors
-            logger.warning(
-                f"{YELLOW}⚠️  Trial {trial.number} 数据错误 "
-                f"({type(e).__name__}): {e}{RESET}"
-            )
-            return 0.0
-        except (ModelFittingError, TrialError) as e:
-            # Model-specific errors
-            logger.warning(
-                f"{YELLOW}⚠️  Trial {trial.number} 模型错误: {e}{RESET}"
-            )
-            return 0.0
-        except Exception as e:
-            # Catch-all but with proper logging
-            if EXCEPTION_HANDLER_AVAILABLE:
-                ExceptionHandler.handle_model_error(
-                    e, f"Trial {trial.number}"
-                )
-            else:
-                logger.warning(
-                    f"{YELLOW}⚠️  Trial {trial.number} 失败 "
-                    f"({type(e).__name__}){RESET}"
-                )
-            return 0.0
-
     def optimize(self) -> Dict:
         """
         运行超参数优化
@@ -285,32 +241,43 @@ class OptunaOptimizer:
 
         logger.info(f"{CYAN}🚀 启动贝叶斯优化...{RESET}")
         logger.info(f"   采样器: TPESampler (Tree-structured Parzen Estimator)")
-        logger.info(f"   剪枝器: MedianPruner")
-        logger.info(f"   试验次数: {self.n_trials}")
+        logger.info(f"   剪枝器: {self.pruner} (每个 boosting 轮次上报验证集 logloss)")
+        logger.info(f"   试验次数: {self.n_trials} ({self.n_jobs} 个 worker 进程)")
         logger.info(f"   交叉验证: TimeSeriesSplit (3-fold, 防止未来数据泄露)")
         logger.info(f"   目标: 最大化 F1 分数\n")
 
-        # 创建 Optuna Study
-        self.study = optuna.create_study(
-            study_name=f'xgboost_optimization_{self.session_uuid}',
+        self._validate_inputs()
+
+        # 多进程 Study: 训练矩阵共享, 每折 DMatrix 只构建一次
+        with StudyRunner(
+            np.asarray(self.X_train),
+            np.asarray(self.y_train),
+            list(TimeSeriesSplit(n_splits=3).split(self.X_train)),
+            search_space=partial(xgboost_search_space, random_state=self.random_state),
+            scoring='f1',
+            study_name=self.study_name or f'xgboost_optimization_{self.session_uuid}',
+            study_dir=self.study_dir,
+            storage=self.storage,
             direction='maximize',
-            sampler=TPESampler(
-                seed=self.random_state,
-                n_startup_trials=10
-            ),
-            pruner=MedianPruner(
-                n_startup_trials=10,
-                n_warmup_steps=5
-            )
-        )
-
-        # 运行优化
-        self.study.optimize(
-            self.objective,
-            n_trials=self.n_trials,
-            timeout=self.timeout,
-            show_progress_bar=True
-        )
+            pruner=self.pruner,
+            n_jobs=self.n_jobs,
+            max_rounds=500,
+            seed=self.random_state,
+            n_startup_trials=10,
+            n_warmup_steps=5,
+        ) as runner:
+            self.run_report = runner.optimize(self.n_trials, timeout=self.timeout)
+        self.study = runner.study
+        self.trial_history = [
+            {
+                'trial_number': t.number,
+                'params': t.params,
+                'f1_score': float(t.value),
+                'fold_scores': t.user_attrs.get('fold_scores', []),
+            }
+            for t in self.study.trials
+            if t.state == optuna.trial.TrialState.COMPLETE
+        ]
 
         # 提取最佳结果
         self.best_params = self.study.best_params
@@ -320,6 +287,8 @@ class OptunaOptimizer:
         logger.info(f"\n{GREEN}✅ 优化完成{RESET}")
         logger.info(f"   最佳 F1 分数: {self.best_score:.4f}")
         logger.info(f"   最佳试验号: Trial #{self.best_trial_number}")
+        logger.info(f"   吞吐: {self.run_report['trials_per_hour']:.0f} trials/hour "
+                    f"(剪枝 {self.run_report['pruned']} 次)")
         logger.info(f"   Study UUID: {self.session_uuid}\n")
 
         logger.info(f"{MAGENTA}📊 最佳超参数组合:{RESET}")
@@ -5,18 +5,23 @@ Model Inference Script for MT5-CRS Price Prediction
 
 This script loads the trained XGBoost model and performs inference
 on new feature vectors.
+
+Inference goes through CompiledBooster: single feature vectors are evaluated
+on flattened tree arrays (no DataFrame/DMatrix per call), batches use
+inplace_predict and return arrays.
 """
 
 import os
+import sys
 import json
 from pathlib import Path
 import numpy as np
 import pandas as pd
 
-import xgboost as xgb
-
 # Shared feature engineering (prevents training-serving skew)
 from src.features.engineering import compute_features, FeatureConfig
+from src.model.fast_inference import CompiledBooster
+from src.model.registry import KIND_BOOSTER, get_model_registry
 
 
 class PricePredictor:
@@ -45,18 +50,28 @@ class PricePredictor:
         self.model = None
         self.metadata = None
         self.feature_names = None
+        self.compiled = None
+        self.version = None
 
         self._load_model()
         self._load_metadata()
+        self.compiled = self._compile()
 
     def _load_model(self):
-        """Load XGBoost model from disk"""
+        """Load XGBoost model through the shared model registry (loaded once per process)"""
         if not self.model_path.exists():
             raise FileNotFoundError(f"Model not found: {self.model_path}")
 
-        self.model = xgb.Booster()
-        self.model.load_model(str(self.model_path))
-        print(f"[INFO] Loaded model from {self.model_path}")
+        self.version = get_model_registry().load(self.model_path, kind=KIND_BOOSTER)
+        self.model = self.version.model
+        print(f"[INFO] Loaded model from {self.model_path} ({self.version.version})")
+
+    def _compile(self):
+        """Reuse the registry's compiled booster when its feature order matches the metadata"""
+        compiled = self.version.compiled
+        if compiled is not None and compiled.feature_names == list(self.feature_names or []):
+            return compiled
+        return CompiledBooster(self.model, self.feature_names)
 
     def _load_metadata(self):
         """Load model metadata"""
@@ -118,6 +133,17 @@ class PricePredictor:
             # Multiple rows - return batch results
             return self.predict_batch(features_df)
 
+    @staticmethod
+    def _result(probability):
+        """Build a prediction result dict from an UP probability"""
+        prediction = int(probability > 0.5)
+        return {
+            'prediction': prediction,
+            'probability': float(probability),
+            'direction': 'UP' if prediction == 1 else 'DOWN',
+            'confidence': float(abs(probability - 0.5) * 2)  # Scale 0.5-1.0 to 0-1.0
+        }
+
     def predict(self, features):
         """
         Predict price direction
@@ -128,6 +154,11 @@ class PricePredictor:
         Returns:
             dict: Prediction result with probability
         """
+        if isinstance(features, dict) and self.feature_names:
+            # Pull values straight into model order (no DataFrame)
+            values = [features[name] for name in self.feature_names]
+            return self._result(self.compiled.predict_row(values))
+
         # Convert dict to DataFrame if needed
         if isinstance(features, dict):
             features = pd.DataFrame([features])
@@ -137,21 +168,46 @@ class PricePredictor:
             # Reorder columns to match training
             features = features[self.feature_names]
 
-        # Convert to DMatrix
-        dmatrix = xgb.DMatrix(features, feature_names=self.feature_names)
+        return self._result(self.compiled.predict_row(features.to_numpy(dtype=np.float32)[0]))
 
-        # Predict
-        probability = self.model.predict(dmatrix)[0]
-        prediction = int(probability > 0.5)
+    def feature_order(self, columns):
+        """
+        Precompute the column permutation for predict_vector
 
-        result = {
-            'prediction': prediction,
-            'probability': float(probability),
-            'direction': 'UP' if prediction == 1 else 'DOWN',
-            'confidence': float(abs(probability - 0.5) * 2)  # Scale 0.5-1.0 to 0-1.0
-        }
+        Args:
+            columns: Column names of the caller's feature vectors
 
-        return result
+        Returns:
+            np.ndarray: Permutation into the model's feature order
+        """
+        return self.compiled.feature_order(columns)
+
+    def predict_vector(self, values, order=None):
+        """
+        Predict on a raw feature vector (fast single-tick path)
+
+        Args:
+            values: 1-D array of feature values, in feature_names order
+                    unless ``order`` is given
+            order: Optional permutation from feature_order()
+
+        Returns:
+            dict: Prediction result with probability
+        """
+        return self._result(self.compiled.predict_row(values, order))
+
+    def predict_proba(self, X):
+        """
+        Predict UP probabilities for a feature matrix
+
+        Args:
+            X: np.ndarray of shape (n, len(feature_names)), columns already
+               in feature_names order
+
+        Returns:
+            np.ndarray: (n,) probabilities
+        """
+        return self.compiled.predict_batch(X)
 
     def predict_batch(self, features_df):
         """
@@ -167,23 +223,20 @@ class PricePredictor:
         if self.feature_names:
             features_df = features_df[self.feature_names]
 
-        # Convert to DMatrix
-        dmatrix = xgb.DMatrix(features_df, feature_names=self.feature_names)
+        # Predict (arrays end to end, dicts built only at the end)
+        probabilities = self.compiled.predict_batch(features_df.to_numpy(dtype=np.float32))
+        predictions = (probabilities > 0.5).astype(int).tolist()
+        confidences = (np.abs(probabilities - 0.5) * 2).tolist()
 
-        # Predict
-        probabilities = self.model.predict(dmatrix)
-        predictions = (probabilities > 0.5).astype(int)
-
-        results = []
-        for pred, prob in zip(predictions, probabilities):
-            results.append({
-                'prediction': int(pred),
-                'probability': float(prob),
+        return [
+            {
+                'prediction': pred,
+                'probability': prob,
                 'direction': 'UP' if pred == 1 else 'DOWN',
-                'confidence': float(abs(prob - 0.5) * 2)
-            })
-
-        return results
+                'confidence': conf
+            }
+            for pred, prob, conf in zip(predictions, probabilities.tolist(), confidences)
+        ]
 
 
 def main():
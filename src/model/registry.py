@@ -0,0 +1,491 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Versioned In-Process Model Registry with Hot-Swap
+
+Every predictor used to load and verify its own copy of a model, and replacing
+a model meant restarting the process (losing the feature buffers of the live
+strategy). ModelRegistry is shared by all predictors in the process:
+
+    load     -> mmap the artifact, verify its MD5 once per (path, size, mtime),
+                deserialize once and compile it (CompiledBooster) once
+    warm_up  -> run synthetic rows through the new version before it serves
+    swap     -> publish the version into a named slot (RCU: the slot table is
+                copied and rebound under a writer lock; readers never lock)
+    evaluate -> run champion and shadow on the same feature vector
+
+Load, warm-up and swap times and per-version prediction latency are kept for
+status() / to_prometheus().
+
+Loaded versions are cached weakly: a version stays cached while a slot, the
+rollback history or a predictor still holds it, and is released (model
+included) once nothing references it, so repeated hot-swaps do not leak.
+
+Example:
+    >>> registry = get_model_registry()
+    >>> registry.deploy("models/v2.json", slot="shadow")
+    >>> registry.evaluate(features)          # champion vs shadow, same vector
+    >>> registry.promote("shadow")           # shadow becomes champion, no pause
+"""
+
+import hashlib
+import logging
+import mmap
+import pickle
+import threading
+import time
+import weakref
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    import xgboost as xgb
+except ImportError:
+    xgb = None
+
+from src.model.fast_inference import CompiledBooster, LOGISTIC_OBJECTIVES
+
+logger = logging.getLogger(__name__)
+
+CHAMPION = 'champion'
+SHADOW = 'shadow'
+
+# How a file is turned into a model object
+KIND_BOOSTER = 'booster'        # xgb.Booster (.json / .ubj)
+KIND_CLASSIFIER = 'classifier'  # xgb.XGBClassifier (.json / .ubj)
+KIND_PICKLE = 'pickle'          # Any pickled estimator (.pkl)
+
+WARMUP_ROWS = 200
+LATENCY_WINDOW = 2048
+SWAP_HISTORY = 100
+
+
+class ModelIntegrityError(ValueError):
+    """Artifact hash mismatch, empty artifact or failed warm-up."""
+
+
+def compile_model(model) -> Optional[CompiledBooster]:
+    """
+    Compile an XGBoost model for single-row inference.
+
+    Binary classifiers are truncated to best_iteration (as predict_proba does)
+    and only compiled when the compiled output equals P(class 1); boosters are
+    compiled as they are. Other models return None.
+    """
+    classifier = not (xgb is not None and isinstance(model, xgb.Booster))
+    if not classifier:
+        booster = model
+    else:
+        get_booster = getattr(model, 'get_booster', None)
+        if get_booster is None or getattr(model, 'n_classes_', 2) != 2:
+            return None
+        try:
+            booster = get_booster()
+        except Exception:
+            return None
+        best_iteration = getattr(model, 'best_iteration', None)
+        if best_iteration is not None:
+            booster = booster[:best_iteration + 1]
+
+    try:
+        compiled = CompiledBooster(booster)
+    except Exception as e:
+        logger.warning(f"Model compilation skipped: {e}")
+        return None
+    if not compiled.compiled or (classifier and compiled.objective not in LOGISTIC_OBJECTIVES):
+        return None
+    return compiled
+
+
+@dataclass
+class ModelVersion:
+    """
+    One loaded, immutable model version.
+
+    Attributes:
+        version: "<file stem>@<md5 prefix>", unique per artifact content
+        model: Deserialized model object (shared by every holder)
+        compiled: CompiledBooster for single-row inference, if available
+        num_features: Expected feature vector length (None if unknown)
+        load_ms / warmup_ms: Time spent hashing + deserializing / warming up
+    """
+    version: str
+    path: str
+    md5: str
+    kind: str
+    model: Any
+    compiled: Optional[CompiledBooster]
+    num_features: Optional[int]
+    load_ms: float
+    warmup_ms: float = 0.0
+    loaded_at: float = field(default_factory=time.time)
+    latencies_us: deque = field(default_factory=lambda: deque(maxlen=LATENCY_WINDOW), repr=False)
+
+    def score(self, features) -> float:
+        """
+        Score one feature vector without recording latency.
+
+        Returns:
+            float: P(class 1) for classifiers, the booster output otherwise
+        """
+        compiled = self.compiled
+        if compiled is not None:
+            return compiled.predict_row(np.ravel(features))
+        row = np.asarray(features, dtype=np.float32).reshape(1, -1)
+        predict_proba = getattr(self.model, 'predict_proba', None)
+        if predict_proba is not None:
+            return float(predict_proba(row)[0][1])
+        return float(np.ravel(self.model.inplace_predict(row, validate_features=False))[0])
+
+    def predict(self, features) -> float:
+        """Score one feature vector and record its latency."""
+        start = time.perf_counter()
+        output = self.score(features)
+        self.latencies_us.append((time.perf_counter() - start) * 1e6)
+        return output
+
+    def latency_stats(self) -> Dict[str, float]:
+        """count / p50 / p99 / max prediction latency (microseconds, recent window)."""
+        samples = np.asarray(list(self.latencies_us))
+        if samples.size == 0:
+            return {'count': 0, 'p50_us': 0.0, 'p99_us': 0.0, 'max_us': 0.0}
+        p50, p99 = np.percentile(samples, [50, 99])
+        return {'count': int(samples.size), 'p50_us': round(float(p50), 2),
+                'p99_us': round(float(p99), 2), 'max_us': round(float(samples.max()), 2)}
+
+    def info(self) -> Dict[str, Any]:
+        """Version summary."""
+        return {
+            'version': self.version,
+            'path': self.path,
+            'md5': self.md5,
+            'kind': self.kind,
+            'model_type': type(self.model).__name__,
+            'compiled': self.compiled is not None,
+            'num_features': self.num_features,
+            'load_ms': round(self.load_ms, 3),
+            'warmup_ms': round(self.warmup_ms, 3),
+            'loaded_at': self.loaded_at,
+            'latency': self.latency_stats(),
+        }
+
+
+class ModelRegistry:
+    """
+    Process-wide registry of model versions and serving slots.
+
+    Slots (e.g. "champion", "shadow") map to ModelVersion objects. The slot
+    table is never mutated: swap() builds a new dict and rebinds one
+    attribute, so get() on the tick path is a lock-free dict lookup that sees
+    either the old or the new version, never a partial state.
+    """
+
+    def __init__(self, warmup_rows: int = WARMUP_ROWS):
+        """
+        Args:
+            warmup_rows: Synthetic rows scored by warm_up() before a version serves
+        """
+        self.warmup_rows = warmup_rows
+        self._lock = threading.Lock()
+        self._slots: Dict[str, ModelVersion] = {}
+        self._previous: Dict[str, ModelVersion] = {}
+        self._digests: Dict[Tuple[str, int, int], str] = {}
+        # Weak: a version leaves the cache once no slot, _previous or caller holds it
+        self._versions: "weakref.WeakValueDictionary[Tuple[str, int, int, str], ModelVersion]" = (
+            weakref.WeakValueDictionary()
+        )
+        self.swaps: deque = deque(maxlen=SWAP_HISTORY)
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _default_kind(path: Path) -> str:
+        return KIND_PICKLE if path.suffix.lower() in ('.pkl', '.pickle') else KIND_BOOSTER
+
+    @staticmethod
+    def _deserialize(buffer, kind: str):
+        if kind == KIND_PICKLE:
+            return pickle.loads(buffer)
+        if xgb is None:
+            raise ImportError("xgboost is required to load booster artifacts")
+        model = xgb.XGBClassifier() if kind == KIND_CLASSIFIER else xgb.Booster()
+        model.load_model(bytearray(buffer))
+        return model
+
+    @staticmethod
+    def _num_features(model, compiled: Optional[CompiledBooster]) -> Optional[int]:
+        if compiled is not None:
+            return compiled.num_features
+        n_features = getattr(model, 'n_features_in_', None)
+        if n_features is None and hasattr(model, 'num_features'):
+            n_features = model.num_features()
+        return int(n_features) if n_features else None
+
+    def load(self, path, expected_md5: Optional[str] = None, kind: Optional[str] = None,
+             warm_up: bool = True) -> ModelVersion:
+        """
+        Load (or reuse) a model version.
+
+        The file is memory-mapped and hashed once per (path, size, mtime); the
+        same artifact loaded again (by another predictor) returns the same
+        ModelVersion without touching the disk.
+
+        Args:
+            path: Model artifact (.json / .ubj / .pkl)
+            expected_md5: Reject the artifact unless its MD5 matches
+            kind: KIND_BOOSTER / KIND_CLASSIFIER / KIND_PICKLE (default by suffix)
+            warm_up: Run synthetic inference before returning
+
+        Raises:
+            FileNotFoundError: Artifact missing
+            ModelIntegrityError: Hash mismatch, empty file or failed warm-up
+        """
+        path = Path(path).resolve()
+        kind = kind or self._default_kind(path)
+        stat = path.stat()
+        file_key = (str(path), stat.st_size, stat.st_mtime_ns)
+
+        cached = self._versions.get(file_key + (kind,))
+        if cached is not None:
+            if expected_md5 and cached.md5 != expected_md5:
+                raise ModelIntegrityError(self._mismatch(path, expected_md5, cached.md5))
+            return cached
+
+        if stat.st_size == 0:
+            raise ModelIntegrityError(f"Model file is empty: {path}")
+
+        start = time.perf_counter()
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            md5 = self._digests.get(file_key)
+            if md5 is None:
+                md5 = hashlib.md5(mapped).hexdigest()
+            if expected_md5 and md5 != expected_md5:
+                raise ModelIntegrityError(self._mismatch(path, expected_md5, md5))
+            model = self._deserialize(mapped, kind)
+        compiled = compile_model(model)
+        load_ms = (time.perf_counter() - start) * 1000
+
+        version = ModelVersion(
+            version=f"{path.stem}@{md5[:8]}", path=str(path), md5=md5, kind=kind,
+            model=model, compiled=compiled, num_features=self._num_features(model, compiled),
+            load_ms=load_ms,
+        )
+        if warm_up:
+            self.warm_up(version)
+
+        with self._lock:
+            version = self._versions.setdefault(file_key + (kind,), version)
+            live = {key[:3] for key in self._versions.keys()}
+            self._digests = {key: digest for key, digest in self._digests.items() if key in live}
+            self._digests[file_key] = md5
+        logger.info(
+            f"Model version {version.version} loaded in {version.load_ms:.1f}ms "
+            f"(compiled={version.compiled is not None}, warm-up {version.warmup_ms:.1f}ms)"
+        )
+        return version
+
+    @staticmethod
+    def _mismatch(path: Path, expected: str, actual: str) -> str:
+        return (f"Model integrity check FAILED for {path}\n"
+                f"Expected MD5: {expected}\n"
+                f"Actual MD5:   {actual}")
+
+    def warm_up(self, version: ModelVersion, rows: Optional[int] = None) -> float:
+        """
+        Score synthetic rows so the first live tick does not pay first-call costs.
+
+        Returns:
+            float: Warm-up time in milliseconds
+
+        Raises:
+            ModelIntegrityError: The model produced non-finite output
+        """
+        rows = self.warmup_rows if rows is None else rows
+        if not version.num_features or rows <= 0:
+            return 0.0
+        X = np.random.default_rng(0).standard_normal((rows, version.num_features)).astype(np.float32)
+        start = time.perf_counter()
+        outputs = np.asarray([version.score(row) for row in X], dtype=np.float64)
+        version.warmup_ms = (time.perf_counter() - start) * 1000
+        if not np.all(np.isfinite(outputs)):
+            raise ModelIntegrityError(f"Warm-up of {version.version} produced non-finite output")
+        return version.warmup_ms
+
+    # ------------------------------------------------------------------
+    # Slots
+    # ------------------------------------------------------------------
+
+    def get(self, slot: str = CHAMPION) -> Optional[ModelVersion]:
+        """Version currently serving a slot (lock-free)."""
+        return self._slots.get(slot)
+
+    def slots(self) -> Dict[str, ModelVersion]:
+        """Snapshot of the slot table."""
+        return self._slots
+
+    def swap(self, slot: str, version: Optional[ModelVersion]) -> Optional[ModelVersion]:
+        """
+        Atomically publish a version into a slot.
+
+        None releases the slot: it is cleared and its rollback history dropped,
+        so the versions it held can be evicted.
+
+        Returns:
+            The version previously serving the slot (kept for rollback() unless released)
+        """
+        start = time.perf_counter()
+        with self._lock:
+            slots = dict(self._slots)
+            old = slots.pop(slot, None)
+            if version is not None:
+                slots[slot] = version
+            self._slots = slots
+            if version is None:
+                self._previous.pop(slot, None)
+            elif old is not None and old is not version:
+                self._previous[slot] = old
+            swap_us = (time.perf_counter() - start) * 1e6
+            self.swaps.append({
+                'slot': slot,
+                'from': old.version if old else None,
+                'to': version.version if version else None,
+                'swap_us': round(swap_us, 2),
+                'at': time.time(),
+            })
+        logger.info(f"Slot '{slot}': {old.version if old else None} -> "
+                    f"{version.version if version else None} ({swap_us:.1f}us)")
+        return old
+
+    def deploy(self, path, slot: str = CHAMPION, expected_md5: Optional[str] = None,
+               kind: Optional[str] = None) -> ModelVersion:
+        """Load and warm up a new version, then swap it into a slot."""
+        version = self.load(path, expected_md5=expected_md5, kind=kind, warm_up=True)
+        self.swap(slot, version)
+        return version
+
+    def promote(self, source: str = SHADOW, target: str = CHAMPION) -> ModelVersion:
+        """Serve the version of one slot (e.g. the shadow) from another."""
+        version = self.get(source)
+        if version is None:
+            raise KeyError(f"Slot '{source}' is empty")
+        self.swap(target, version)
+        return version
+
+    def rollback(self, slot: str = CHAMPION) -> ModelVersion:
+        """Restore the version a slot served before its last swap."""
+        previous = self._previous.get(slot)
+        if previous is None:
+            raise KeyError(f"No previous version for slot '{slot}'")
+        self.swap(slot, previous)
+        return previous
+
+    # ------------------------------------------------------------------
+    # Inference
+    # ------------------------------------------------------------------
+
+    def predict(self, features, slot: str = CHAMPION) -> float:
+        """Score a feature vector with the version serving a slot."""
+        version = self._slots.get(slot)
+        if version is None:
+            raise KeyError(f"Slot '{slot}' is empty")
+        return version.predict(features)
+
+    def evaluate(self, features, slots: Sequence[str] = (CHAMPION, SHADOW)) -> Dict[str, Dict[str, Any]]:
+        """
+        Score the same feature vector with several slots side by side.
+
+        Slots are resolved from one snapshot of the slot table, so a swap in
+        the middle cannot mix versions. Errors are reported per slot.
+
+        Returns:
+            {slot: {'version', 'prediction', 'latency_us'} or {'version', 'error'}}
+        """
+        table = self._slots
+        results: Dict[str, Dict[str, Any]] = {}
+        for slot in slots:
+            version = table.get(slot)
+            if version is None:
+                continue
+            try:
+                prediction = version.predict(features)
+            except Exception as e:
+                results[slot] = {'version': version.version, 'error': str(e)}
+                continue
+            results[slot] = {'version': version.version, 'prediction': prediction,
+                             'latency_us': version.latencies_us[-1]}
+        return results
+
+    # ------------------------------------------------------------------
+    # Instrumentation
+    # ------------------------------------------------------------------
+
+    def versions(self) -> List[ModelVersion]:
+        """All loaded versions still referenced by a slot, the rollback history or a caller."""
+        with self._lock:
+            return list(self._versions.values())
+
+    def status(self) -> Dict[str, Any]:
+        """Slots, loaded versions (load/warm-up/latency) and recent swaps."""
+        return {
+            'slots': {slot: version.version for slot, version in self._slots.items()},
+            'versions': [version.info() for version in self.versions()],
+            'swaps': list(self.swaps),
+        }
+
+    def to_prometheus(self, prefix: str = 'model_registry') -> str:
+        """
+        Export as Prometheus text format (see PrometheusMetrics.register_collector).
+
+        Returns:
+            str: Load / warm-up / latency gauges per version, serving slots and last swap times
+        """
+        lines = []
+
+        def gauge(name, help_text, samples):
+            lines.append(f'# HELP {prefix}_{name} {help_text}')
+            lines.append(f'# TYPE {prefix}_{name} gauge')
+            for labels, value in samples:
+                lines.append(f'{prefix}_{name}{{{labels}}} {value}')
+
+        versions = [(f'version="{v.version}",kind="{v.kind}"', v) for v in self.versions()]
+        gauge('load_seconds', 'Model load time (hash + deserialize + compile)',
+              [(labels, v.load_ms / 1000) for labels, v in versions])
+        gauge('warmup_seconds', 'Model warm-up time',
+              [(labels, v.warmup_ms / 1000) for labels, v in versions])
+
+        latency = []
+        for labels, v in versions:
+            stats = v.latency_stats()
+            latency.append((f'{labels},quantile="0.5"', stats['p50_us'] / 1e6))
+            latency.append((f'{labels},quantile="0.99"', stats['p99_us'] / 1e6))
+        gauge('predict_latency_seconds', 'Prediction latency per version (recent window)', latency)
+
+        gauge('slot_info', 'Version serving each slot',
+              [(f'slot="{slot}",version="{v.version}"', 1) for slot, v in sorted(self._slots.items())])
+
+        last_swap = {}
+        for swap in self.swaps:
+            last_swap[swap['slot']] = swap['swap_us']
+        gauge('swap_seconds', 'Duration of the last swap per slot',
+              [(f'slot="{slot}"', us / 1e6) for slot, us in sorted(last_swap.items())])
+        return '\n'.join(lines) + '\n'
+
+
+_registry: Optional[ModelRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_model_registry() -> ModelRegistry:
+    """Process-wide ModelRegistry shared by all predictors."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = ModelRegistry()
+    return _registry
@@ -29,6 +29,8 @@ import numpy as np
 import pandas as pd
 import xgboost as xgb
 
+from src.model.registry import KIND_BOOSTER, get_model_registry
+
 # 配置日志
 logging.basicConfig(
     level=logging.INFO,
@@ -64,7 +66,8 @@ class ShadowModeEngine:
         model_path: str,
         shadow_mode: bool = True,
         readonly: bool = True,
-        log_dir: Optional[Path] = None
+        log_dir: Optional[Path] = None,
+        registry_slot: Optional[str] = None
     ):
         """
         初始化影子引擎
@@ -74,12 +77,15 @@ class ShadowModeEngine:
             shadow_mode: 是否启用影子模式 (默认: True)
             readonly: 强制只读模式 (默认: True)
             log_dir: 日志目录
+            registry_slot: 在模型注册表中发布的槽位 (默认 None 不发布; 传入 SHADOW 时
+                           可与 champion 对同一特征向量并行评估, 会替换该槽位原有模型)
         """
         self.model_path = Path(model_path)
         self.shadow_mode = shadow_mode
         self.readonly = readonly  # ✅ 强制注入 readonly=True
         self.log_dir = log_dir or PROJECT_ROOT / "logs"
         self.log_dir.mkdir(parents=True, exist_ok=True)
+        self.registry_slot = registry_slot
 
         # 会话 ID
         self.session_id = str(uuid.uuid4())
@@ -106,10 +112,12 @@ class ShadowModeEngine:
             if not self.model_path.exists():
                 raise FileNotFoundError(f"模型文件不存在: {self.model_path}")
 
-            # 使用 XGBoost 加载器
-            booster = xgb.Booster()
-            booster.load_model(str(self.model_path))
-            self.model = booster
+            # 经模型注册表加载 (进程内只加载、校验、预热一次)
+            registry = get_model_registry()
+            version = registry.load(self.model_path, kind=KIND_BOOSTER)
+            self.model = version.model
+            if self.registry_slot:
+                registry.swap(self.registry_slot, version)
 
             logger.info(f"{GREEN}✅ 模型加载成功{RESET}")
 
@@ -0,0 +1,606 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Optuna 多进程超参数搜索运行器
+============================
+
+三个优化入口 (src/model/optimization.py, src/models/trainer.py,
+src/model_factory/optimizer.py) 共用的 Study 运行器:
+
+- 训练矩阵只落盘一次 (.npy), 各 worker 进程以 mmap_mode='r' 打开, 共享页缓存, 无拷贝
+- 每个进程按折构建一次 XGBoost DMatrix / LightGBM Dataset, 所有试验复用
+  (hist 分桶结果随 DMatrix / Dataset 缓存)
+- 每个 boosting 轮次上报验证集指标, MedianPruner / HyperbandPruner 提前剪枝
+- Study 存于本地 journal 文件或 SQLite, 同一 study_dir + study_name 再次运行即续跑
+- 未指定 study_dir 时使用临时目录, close() / 退出 with 块时删除 (Study 结果转存内存)
+- 报告本次运行的 trials/hour
+
+搜索空间函数 (trial -> 参数字典) 需定义在模块顶层, 以便 spawn 子进程导入。
+"""
+
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+import weakref
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from sklearn.metrics import accuracy_score, f1_score, log_loss, roc_auc_score
+
+try:
+    import optuna
+    from optuna.pruners import HyperbandPruner, MedianPruner, NopPruner
+    from optuna.samplers import TPESampler
+    from optuna.storages import InMemoryStorage, JournalStorage
+    from optuna.trial import TrialState
+except ImportError:
+    optuna = None
+else:
+    try:
+        from optuna.storages.journal import JournalFileBackend
+    except ImportError:  # optuna 3.x
+        from optuna.storages import JournalFileStorage as JournalFileBackend
+
+try:
+    import xgboost as xgb
+except ImportError:
+    xgb = None
+
+try:
+    import lightgbm as lgb
+except ImportError:
+    lgb = None
+
+logger = logging.getLogger(__name__)
+
+BACKEND_XGBOOST = 'xgboost'
+BACKEND_LIGHTGBM = 'lightgbm'
+
+# 越大越好的 XGBoost 评估指标 (其余如 logloss / error 越小越好)
+_XGB_HIGHER_IS_BETTER = ('auc', 'aucpr', 'map', 'ndcg', 'pre')
+
+
+# ============================================================================
+# 评分函数: (y 编码后标签, 概率矩阵 (N, K)) -> 分数, 越大越好
+# ============================================================================
+
+def _score_f1(y, proba):
+    return f1_score(y, proba.argmax(axis=1), average='weighted', zero_division=0)
+
+
+def _score_accuracy(y, proba):
+    return accuracy_score(y, proba.argmax(axis=1))
+
+
+def _score_auc(y, proba):
+    if proba.shape[1] == 2:
+        return roc_auc_score(y, proba[:, 1])
+    return roc_auc_score(y, proba, multi_class='ovr')
+
+
+def _score_logloss(y, proba):
+    return -log_loss(y, proba, labels=np.arange(proba.shape[1]))  # 负号, 因为要最大化
+
+
+SCORERS: Dict[str, Callable] = {
+    'f1': _score_f1,
+    'accuracy': _score_accuracy,
+    'auc': _score_auc,
+    'logloss': _score_logloss,
+}
+
+
+# ============================================================================
+# 共享数据与折划分
+# ============================================================================
+
+def fingerprint_arrays(*arrays: Optional[np.ndarray]) -> str:
+    """数组内容 + 形状 + dtype 的 blake2b 指纹 (None 参与占位)"""
+    h = hashlib.blake2b(digest_size=16)
+    for arr in arrays:
+        if arr is None:
+            h.update(b'none')
+            continue
+        arr = np.ascontiguousarray(arr)
+        h.update(f"{arr.dtype.str}{arr.shape}".encode())
+        h.update(memoryview(arr).cast('B'))
+    return h.hexdigest()
+
+
+def holdout_folds(n_train: int, n_valid: int) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """训练集 + 验证集拼接后的单折划分: 前 n_train 行训练, 后 n_valid 行验证"""
+    return [(np.arange(n_train), np.arange(n_train, n_train + n_valid))]
+
+
+def _as_slice(idx: np.ndarray) -> Union[slice, np.ndarray]:
+    """连续索引转为切片, 对 memmap 取行时不产生整表拷贝"""
+    if len(idx) and idx[-1] - idx[0] == len(idx) - 1 and np.all(np.diff(idx) == 1):
+        return slice(int(idx[0]), int(idx[-1]) + 1)
+    return idx
+
+
+def pack_dataset(X: np.ndarray, y: np.ndarray, sample_weight: Optional[np.ndarray],
+                 folds: Sequence[Tuple[np.ndarray, np.ndarray]]) -> Tuple[str, Dict[str, np.ndarray]]:
+    """整理待共享的数组 (X 为 float32 C 连续), 返回 (数据指纹, {文件名: 数组})"""
+    arrays = {'X': np.ascontiguousarray(X, dtype=np.float32), 'y': np.asarray(y).ravel()}
+    if sample_weight is not None:
+        arrays['weight'] = np.asarray(sample_weight, dtype=np.float32).ravel()
+    for k, (train_idx, valid_idx) in enumerate(folds):
+        arrays[f'train_{k}'] = np.asarray(train_idx, dtype=np.int64)
+        arrays[f'valid_{k}'] = np.asarray(valid_idx, dtype=np.int64)
+    fingerprint = fingerprint_arrays(arrays['X'], arrays['y'], arrays.get('weight'),
+                                     *(arrays[f'{part}_{k}'] for k in range(len(folds))
+                                       for part in ('train', 'valid')))
+    return fingerprint, arrays
+
+
+def share_dataset(study_dir: Path, fingerprint: str, arrays: Dict[str, np.ndarray]) -> None:
+    """
+    将 pack_dataset() 的数组写入 study_dir (.npy + dataset.json)
+
+    worker 以 mmap_mode='r' 打开 X.npy, 各进程共享同一份页缓存; 指纹相同时 (续跑) 不重写。
+    """
+    manifest_path = study_dir / 'dataset.json'
+    if manifest_path.exists():
+        if json.loads(manifest_path.read_text()).get('fingerprint') == fingerprint:
+            return
+
+    for name, arr in arrays.items():
+        tmp = study_dir / f'.{name}.npy.tmp'
+        with open(tmp, 'wb') as f:
+            np.save(f, arr)
+        os.replace(tmp, study_dir / f'{name}.npy')
+
+    manifest = {'fingerprint': fingerprint, 'n_folds': sum(n.startswith('train_') for n in arrays),
+                'has_weight': 'weight' in arrays,
+                'n_samples': int(arrays['X'].shape[0]), 'n_features': int(arrays['X'].shape[1])}
+    tmp = study_dir / '.dataset.json.tmp'
+    tmp.write_text(json.dumps(manifest, indent=2))
+    os.replace(tmp, manifest_path)
+
+
+class FoldMatrices:
+    """单折的训练 / 验证矩阵 (按后端构建一次, 所有试验复用)"""
+
+    def __init__(self, train, valid, X_valid, y_valid):
+        self.train = train
+        self.valid = valid
+        self.X_valid = X_valid
+        self.y_valid = y_valid
+
+
+def _build_folds(study_dir: Path, backend: str, nthread: int) -> Tuple[list, int]:
+    """从共享 .npy 构建各折矩阵, 返回 (折列表, 类别数)"""
+    manifest = json.loads((study_dir / 'dataset.json').read_text())
+    X = np.load(study_dir / 'X.npy', mmap_mode='r')
+    labels = np.load(study_dir / 'y.npy')
+    weight = np.load(study_dir / 'weight.npy', mmap_mode='r') if manifest['has_weight'] else None
+    classes, y = np.unique(labels, return_inverse=True)
+
+    folds = []
+    for k in range(manifest['n_folds']):
+        train_idx = _as_slice(np.load(study_dir / f'train_{k}.npy'))
+        valid_idx = _as_slice(np.load(study_dir / f'valid_{k}.npy'))
+        X_tr, X_val = X[train_idx], X[valid_idx]
+        w_tr = None if weight is None else weight[train_idx]
+        w_val = None if weight is None else weight[valid_idx]
+        if backend == BACKEND_XGBOOST:
+            train = xgb.DMatrix(X_tr, label=y[train_idx], weight=w_tr, nthread=nthread)
+            valid = xgb.DMatrix(X_val, label=y[valid_idx], weight=w_val, nthread=nthread)
+        else:
+            dataset_params = {'feature_pre_filter': False, 'verbose': -1, 'num_threads': nthread}
+            train = lgb.Dataset(X_tr, label=y[train_idx], weight=w_tr,
+                                params=dataset_params, free_raw_data=False).construct()
+            valid = lgb.Dataset(X_val, label=y[valid_idx], weight=w_val, reference=train,
+                                params=dataset_params, free_raw_data=False).construct()
+        folds.append(FoldMatrices(train, valid, X_val, y[valid_idx]))
+    return folds, len(classes)
+
+
+# ============================================================================
+# 每轮上报与剪枝
+# ============================================================================
+
+def _report(trial, value: float, step: int) -> None:
+    trial.report(value, step)
+    if trial.should_prune():
+        raise optuna.TrialPruned(f"step {step}: {value:.6f}")
+
+
+if xgb is not None:
+    class XGBoostPruningCallback(xgb.callback.TrainingCallback):
+        """每个 boosting 轮次上报验证集指标 (已换算为 study 方向), 需要时剪枝"""
+
+        def __init__(self, trial, metric: str, sign: float, step_offset: int, interval: int = 1):
+            super().__init__()
+            self.trial = trial
+            self.metric = metric
+            self.sign = sign
+            self.step_offset = step_offset
+            self.interval = interval
+
+        def after_iteration(self, model, epoch, evals_log):
+            if (epoch + 1) % self.interval == 0:
+                value = evals_log['valid'][self.metric][-1]
+                _report(self.trial, self.sign * float(value), self.step_offset + epoch)
+            return False
+
+
+def lightgbm_pruning_callback(trial, direction: str, step_offset: int, interval: int = 1):
+    """LightGBM 每轮上报回调 (指标方向取自 is_higher_better)"""
+
+    def _callback(env):
+        if (env.iteration - env.begin_iteration + 1) % interval:
+            return
+        for data_name, _, value, higher_is_better in env.evaluation_result_list:
+            if data_name == 'valid':
+                sign = 1.0 if higher_is_better == (direction == 'maximize') else -1.0
+                _report(trial, sign * float(value), step_offset + env.iteration - env.begin_iteration)
+                return
+
+    _callback.order = 25  # 在 early_stopping (order=30) 之前
+    return _callback
+
+
+# ============================================================================
+# 目标函数与 worker
+# ============================================================================
+
+class FoldObjective:
+    """
+    按折训练的 Optuna 目标函数
+
+    每个试验对所有折训练并取评分均值; 第 k 折第 r 轮的上报步号为 k * max_rounds + r,
+    因此不同试验在同一步号上可比 (剪枝器按步号比较中位数)。
+    """
+
+    def __init__(self, config: Dict, fold_cache: Optional[Dict] = None):
+        self.config = config
+        # (数据指纹, 后端, nthread) -> (折列表, 类别数); 进程内运行时由 StudyRunner 持有
+        self.fold_cache = {} if fold_cache is None else fold_cache
+        self.study_dir = Path(config['study_dir'])
+        self.backend = config['backend']
+        self.space = config['search_space']
+        self.scorer = SCORERS[config['scoring']] if isinstance(config['scoring'], str) else config['scoring']
+        self.nthread = config['nthread']
+        self.max_rounds = config['max_rounds']
+        self.early_stopping_rounds = config['early_stopping_rounds']
+        self.direction = config['direction']
+        self.report_interval = config['report_interval']
+        self._folds = None
+        self.n_classes = None
+
+    def folds(self) -> list:
+        """本进程的折矩阵 (首次调用时构建, 之后从 fold_cache 复用)"""
+        if self._folds is None:
+            key = (self.config['fingerprint'], self.backend, self.nthread)
+            if key not in self.fold_cache:
+                start = time.perf_counter()
+                self.fold_cache[key] = _build_folds(self.study_dir, self.backend, self.nthread)
+                logger.info(f"[PID {os.getpid()}] 折矩阵构建完成 ({self.backend}): "
+                            f"{(time.perf_counter() - start) * 1000:.0f} ms")
+            self._folds, self.n_classes = self.fold_cache[key]
+        return self._folds
+
+    def __call__(self, trial) -> float:
+        folds = self.folds()
+        params = dict(self.space(trial))
+        num_rounds = min(int(params.pop('n_estimators', self.max_rounds)), self.max_rounds)
+        scores = []
+        for k, fold in enumerate(folds):
+            if self.backend == BACKEND_XGBOOST:
+                proba = self._fit_xgboost(trial, params, num_rounds, fold, k * self.max_rounds)
+            else:
+                proba = self._fit_lightgbm(trial, params, num_rounds, fold, k * self.max_rounds)
+            scores.append(float(self.scorer(fold.y_valid, proba)))
+        trial.set_user_attr('fold_scores', scores)
+        return float(np.mean(scores))
+
+    def _fit_xgboost(self, trial, params, num_rounds, fold, step_offset):
+        params = {k: v for k, v in params.items() if k not in ('n_jobs', 'nthread')}
+        params['nthread'] = self.nthread
+        if self.n_classes > 2:
+            params.setdefault('objective', 'multi:softprob')
+            params['num_class'] = self.n_classes
+            params.setdefault('eval_metric', 'mlogloss')
+        else:
+            params.setdefault('objective', 'binary:logistic')
+            params.setdefault('eval_metric', 'logloss')
+        metric = params['eval_metric']
+        higher_is_better = metric.split('@')[0] in _XGB_HIGHER_IS_BETTER
+        sign = 1.0 if higher_is_better == (self.direction == 'maximize') else -1.0
+
+        booster = xgb.train(
+            params, fold.train, num_boost_round=num_rounds,
+            evals=[(fold.valid, 'valid')], verbose_eval=False,
+            early_stopping_rounds=self.early_stopping_rounds,
+            callbacks=[XGBoostPruningCallback(trial, metric, sign, step_offset, self.report_interval)],
+        )
+        iteration_range = (0, booster.best_iteration + 1) if self.early_stopping_rounds else (0, 0)
+        proba = booster.predict(fold.valid, iteration_range=iteration_range)
+        return proba if proba.ndim == 2 else np.column_stack([1 - proba, proba])
+
+    def _fit_lightgbm(self, trial, params, num_rounds, fold, step_offset):
+        params = {k: v for k, v in params.items() if k not in ('n_jobs', 'nthread', 'num_threads')}
+        params['num_threads'] = self.nthread
+        params.setdefault('verbose', -1)
+        if self.n_classes > 2:
+            params['objective'] = 'multiclass'
+            params['num_class'] = self.n_classes
+            params['metric'] = 'multi_logloss'
+        callbacks = [lightgbm_pruning_callback(trial, self.direction, step_offset, self.report_interval)]
+        if self.early_stopping_rounds:
+            callbacks.append(lgb.early_stopping(self.early_stopping_rounds, verbose=False))
+
+        booster = lgb.train(params, fold.train, num_boost_round=num_rounds,
+                            valid_sets=[fold.valid], valid_names=['valid'], callbacks=callbacks)
+        proba = booster.predict(fold.X_valid)
+        return proba if proba.ndim == 2 else np.column_stack([1 - proba, proba])
+
+
+def open_storage(storage: str):
+    """'journal:<path>' -> 文件 journal 存储, 其余按 Optuna 存储 URL (如 sqlite:///...) 处理"""
+    if storage.startswith('journal:'):
+        return JournalStorage(JournalFileBackend(storage[len('journal:'):]))
+    return storage
+
+
+def make_pruner(name: str, n_folds: int, max_rounds: int,
+                n_startup_trials: int = 10, n_warmup_steps: int = 5):
+    """'median' / 'hyperband' / 'none'"""
+    if name == 'median':
+        return MedianPruner(n_startup_trials=n_startup_trials, n_warmup_steps=n_warmup_steps)
+    if name == 'hyperband':
+        return HyperbandPruner(min_resource=max(1, n_warmup_steps),
+                               max_resource=n_folds * max_rounds, reduction_factor=3)
+    if name == 'none':
+        return NopPruner()
+    raise ValueError(f"不支持的剪枝器: {name}")
+
+
+def _run_worker(config: Dict, fold_cache: Optional[Dict] = None) -> None:
+    """worker 入口: 打开共享存储中的 study, 运行分配到的试验数"""
+    optuna.logging.set_verbosity(optuna.logging.WARNING)
+    study = optuna.load_study(
+        study_name=config['study_name'],
+        storage=open_storage(config['storage']),
+        sampler=TPESampler(seed=config['seed'], n_startup_trials=config['n_startup_trials']),
+        pruner=make_pruner(config['pruner'], config['n_folds'], config['max_rounds'],
+                           config['n_startup_trials'], config['n_warmup_steps']),
+    )
+    study.optimize(FoldObjective(config, fold_cache), n_trials=config['n_trials'],
+                   timeout=config['timeout'], catch=(Exception,))
+
+
+class StudyRunner:
+    """
+    多进程 Optuna Study 运行器
+
+    用法:
+        with StudyRunner(X, y, folds, search_space=xgboost_space, scoring='f1',
+                         study_name='xgb', study_dir='outputs/optuna', n_jobs=4) as runner:
+            report = runner.optimize(n_trials=100)
+        runner.study.best_params
+
+    n_jobs=1 时折矩阵缓存在 runner 上, 多次 optimize() 复用, close() 时释放。
+    """
+
+    def __init__(
+        self,
+        X: np.ndarray,
+        y: np.ndarray,
+        folds: Sequence[Tuple[np.ndarray, np.ndarray]],
+        search_space: Callable,
+        backend: str = BACKEND_XGBOOST,
+        scoring: Union[str, Callable] = 'f1',
+        sample_weight: Optional[np.ndarray] = None,
+        study_name: str = 'study',
+        study_dir: Optional[Union[str, Path]] = None,
+        storage: Optional[str] = None,
+        direction: str = 'maximize',
+        pruner: str = 'median',
+        n_jobs: int = 1,
+        max_rounds: int = 1000,
+        early_stopping_rounds: Optional[int] = None,
+        seed: int = 42,
+        n_startup_trials: int = 10,
+        n_warmup_steps: int = 5,
+        report_interval: int = 1,
+    ):
+        """
+        参数:
+            X, y: 全部样本 (折划分按行索引引用)
+            folds: [(train_idx, valid_idx), ...], 如 TimeSeriesSplit.split() 或 holdout_folds()
+            search_space: 顶层函数 trial -> 参数字典; n_estimators 作为 boosting 轮数
+            backend: 'xgboost' 或 'lightgbm'
+            scoring: 'f1' / 'accuracy' / 'auc' / 'logloss' 或顶层函数 (y, proba) -> 分数
+            sample_weight: 样本权重 (可选)
+            study_name: Study 名称, 同名 + 同目录再次运行即续跑
+            study_dir: 共享矩阵与存储所在目录 (默认临时目录, close() 时删除, 不可续跑)
+            storage: None / 'journal' -> study_dir/journal.log; 'sqlite' -> study_dir/study.db;
+                     其余视为 Optuna 存储 URL
+            direction: 'maximize' 或 'minimize'
+            pruner: 'median' / 'hyperband' / 'none'
+            n_jobs: worker 进程数 (1 时在当前进程内运行)
+            max_rounds: 单折最大 boosting 轮数 (也是上报步号的折间距)
+            early_stopping_rounds: 验证集早停轮数 (可选)
+            seed: TPE 采样种子 (worker i 使用 seed + i)
+            report_interval: 每隔多少轮上报一次 (每次上报都写存储: journal 约 0.6 ms,
+                             SQLite 约 17 ms, 小数据 + SQLite 时宜调大)
+        """
+        if optuna is None:
+            raise ImportError("Optuna 库未安装。请运行: pip install optuna")
+        if backend == BACKEND_XGBOOST and xgb is None:
+            raise ImportError("xgboost 未安装")
+        if backend == BACKEND_LIGHTGBM and lgb is None:
+            raise ImportError("lightgbm 未安装")
+        if backend not in (BACKEND_XGBOOST, BACKEND_LIGHTGBM):
+            raise ValueError(f"不支持的后端: {backend}")
+        if isinstance(scoring, str) and scoring not in SCORERS:
+            raise ValueError(f"不支持的指标: {scoring}")
+        make_pruner(pruner, 1, 1)  # 提前校验名称
+
+        self.backend = backend
+        self.search_space = search_space
+        self.scoring = scoring
+        self.study_name = study_name
+        self._owns_dir = not study_dir
+        self.study_dir = Path(study_dir) if study_dir else Path(tempfile.mkdtemp(prefix='optuna_study_'))
+        self.study_dir.mkdir(parents=True, exist_ok=True)
+        # 调用方未 close() 时, 回收 runner 也会删除临时目录 (共享矩阵是训练集的完整拷贝)
+        self._cleanup = (weakref.finalize(self, shutil.rmtree, str(self.study_dir), True)
+                         if self._owns_dir else None)
+        self._fold_cache: Dict = {}
+        self.direction = direction
+        self.pruner = pruner
+        self.n_jobs = max(1, int(n_jobs))
+        self.max_rounds = int(max_rounds)
+        self.early_stopping_rounds = early_stopping_rounds
+        self.seed = seed
+        self.n_startup_trials = n_startup_trials
+        self.n_warmup_steps = n_warmup_steps
+        self.report_interval = max(1, int(report_interval))
+        self.n_folds = len(folds)
+
+        if storage in (None, 'journal'):
+            self.storage = f"journal:{self.study_dir / 'journal.log'}"
+        elif storage == 'sqlite':
+            self.storage = f"sqlite:///{self.study_dir / 'study.db'}"
+        else:
+            self.storage = storage
+
+        # 先校验已有 Study 的数据指纹, 再落盘 (数据不符时不覆盖原 Study 的共享矩阵)
+        self.fingerprint, arrays = pack_dataset(X, y, sample_weight, folds)
+        try:
+            self.study = self._create_study()
+            share_dataset(self.study_dir, self.fingerprint, arrays)
+        except BaseException:
+            self.close()
+            raise
+        self.last_report: Optional[Dict] = None
+
+    def __enter__(self) -> 'StudyRunner':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        释放折矩阵缓存; 临时 study_dir 转存 Study 到内存后删除 (调用方指定的目录保留)
+        """
+        self._fold_cache.clear()
+        if self._cleanup is None or not self._cleanup.alive:
+            return
+        study = getattr(self, 'study', None)
+        if study is not None:
+            memory = InMemoryStorage()
+            optuna.copy_study(from_study_name=self.study_name, from_storage=open_storage(self.storage),
+                              to_storage=memory)
+            self.study = optuna.load_study(study_name=self.study_name, storage=memory)
+        self._cleanup()
+
+    def _create_study(self):
+        study = optuna.create_study(
+            study_name=self.study_name,
+            storage=open_storage(self.storage),
+            direction=self.direction,
+            load_if_exists=True,
+        )
+        previous = study.user_attrs.get('dataset')
+        if previous is None:
+            study.set_user_attr('dataset', self.fingerprint)
+        elif previous != self.fingerprint:
+            raise ValueError(
+                f"Study '{self.study_name}' 已存在且数据不同 ({previous} != {self.fingerprint}), "
+                f"请更换 study_name 或 study_dir"
+            )
+        elif study.trials:
+            logger.info(f"续跑 Study '{self.study_name}': 已有 {len(study.trials)} 次试验")
+        return study
+
+    def _worker_config(self, worker_id: int, n_trials: int, timeout: Optional[float]) -> Dict:
+        return {
+            'study_dir': str(self.study_dir),
+            'study_name': self.study_name,
+            'storage': self.storage,
+            'fingerprint': self.fingerprint,
+            'backend': self.backend,
+            'search_space': self.search_space,
+            'scoring': self.scoring,
+            'direction': self.direction,
+            'pruner': self.pruner,
+            'n_folds': self.n_folds,
+            'max_rounds': self.max_rounds,
+            'early_stopping_rounds': self.early_stopping_rounds,
+            'seed': None if self.seed is None else self.seed + worker_id,
+            'n_startup_trials': self.n_startup_trials,
+            'n_warmup_steps': self.n_warmup_steps,
+            'report_interval': self.report_interval,
+            'nthread': max(1, (os.cpu_count() or 1) // self.n_jobs),
+            'n_trials': n_trials,
+            'timeout': timeout,
+        }
+
+    def optimize(self, n_trials: int, timeout: Optional[float] = None) -> Dict:
+        """
+        运行 n_trials 次试验 (均分给 n_jobs 个 worker 进程)
+
+        返回:
+            本次运行报告: 完成 / 剪枝 / 失败数, 耗时, trials/hour, 最佳值与参数
+        """
+        before = {t.number for t in self.study.get_trials(deepcopy=False)}
+        quotas = [n_trials // self.n_jobs + (1 if i < n_trials % self.n_jobs else 0)
+                  for i in range(self.n_jobs)]
+        configs = [self._worker_config(i, q, timeout) for i, q in enumerate(quotas) if q > 0]
+
+        logger.info(f"Study '{self.study_name}': {n_trials} 次试验, {len(configs)} 个 worker, "
+                    f"剪枝器 {self.pruner}, 存储 {self.storage}")
+        start = time.perf_counter()
+        if len(configs) == 1:
+            _run_worker(configs[0], self._fold_cache)
+        else:
+            # spawn: 避免 fork 后继承父进程的 OpenMP 线程池状态
+            ctx = multiprocessing.get_context('spawn')
+            processes = [ctx.Process(target=_run_worker, args=(config,)) for config in configs]
+            for process in processes:
+                process.start()
+            for process in processes:
+                process.join()
+            failed = [p.exitcode for p in processes if p.exitcode != 0]
+            if failed:
+                raise RuntimeError(f"{len(failed)} 个 worker 异常退出 (exitcode {failed})")
+        elapsed = time.perf_counter() - start
+
+        self.study = optuna.load_study(study_name=self.study_name, storage=open_storage(self.storage))
+        self.last_report = self._report(before, elapsed)
+        logger.info(f"完成 {self.last_report['completed']} / 剪枝 {self.last_report['pruned']} / "
+                    f"失败 {self.last_report['failed']}, 耗时 {elapsed:.1f}s, "
+                    f"{self.last_report['trials_per_hour']:.0f} trials/hour")
+        return self.last_report
+
+    def _report(self, before: set, elapsed: float) -> Dict:
+        trials = [t for t in self.study.get_trials(deepcopy=False) if t.number not in before]
+        counts = {state: sum(t.state == state for t in trials)
+                  for state in (TrialState.COMPLETE, TrialState.PRUNED, TrialState.FAIL)}
+        finished = counts[TrialState.COMPLETE] + counts[TrialState.PRUNED]
+        has_best = any(t.state == TrialState.COMPLETE for t in self.study.get_trials(deepcopy=False))
+        return {
+            'study_name': self.study_name,
+            'n_jobs': self.n_jobs,
+            'trials': len(trials),
+            'completed': counts[TrialState.COMPLETE],
+            'pruned': counts[TrialState.PRUNED],
+            'failed': counts[TrialState.FAIL],
+            'total_trials': len(self.study.trials),
+            'elapsed_seconds': elapsed,
+            'trials_per_hour': finished / elapsed * 3600 if elapsed > 0 else 0.0,
+            'best_value': self.study.best_value if has_best else None,
+            'best_params': self.study.best_params if has_best else None,
+        }
@@ -16,7 +16,6 @@ from datetime import datetime, timedelta
 
 import pandas as pd
 import numpy as np
-import requests
 import asyncpg
 
 # Add project root to path
@@ -26,6 +25,8 @@ sys.path.insert(0, str(PROJECT_ROOT))
 from dotenv import load_dotenv
 import os
 
+from src.utils.http_client import get_http_client
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -47,6 +48,7 @@ class APIDataLoader:
     def __init__(self, api_url: str = "http://localhost:8000"):
         """初始化数据加载器"""
         self.api_url = api_url
+        self.http = get_http_client(api_url)
         logger.info(f"{GREEN}✅ APIDataLoader 已初始化{RESET}")
         logger.info(f"   API URL: {api_url}")
 
@@ -92,9 +94,9 @@ class APIDataLoader:
                 "end_date": end_date
             }
 
-            response = requests.post(
-                f"{self.api_url}/features/historical",
-                json=payload,
+            response = self.http.post_json(
+                "/features/historical",
+                payload,
                 timeout=60
             )
 
@@ -11,6 +11,7 @@ XGBoost Hyperparameter Optimizer
 import logging
 import json
 import sys
+from functools import partial
 from pathlib import Path
 from typing import Dict, Optional
 import numpy as np
@@ -21,18 +22,12 @@ from sklearn.metrics import (
     recall_score, f1_score
 )
 
-try:
-    import optuna
-    from optuna.samplers import TPESampler
-    from optuna.pruners import MedianPruner
-except ImportError:
-    print("❌ Optuna 未安装。请运行: pip install optuna")
-    sys.exit(1)
-
 # Add project root to path
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
+from src.model.study_runner import StudyRunner, holdout_folds  # noqa: E402
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -50,6 +45,23 @@ MAGENTA = "\033[95m"
 RESET = "\033[0m"
 
 
+def xgboost_auc_search_space(trial, random_state: int = 42) -> Dict:
+    """XGBoost 搜索空间 (顶层函数, 供 StudyRunner 的 worker 进程导入)"""
+    return {
+        'max_depth': trial.suggest_int('max_depth', 3, 10),
+        'learning_rate': trial.suggest_float('learning_rate', 0.01, 0.3, log=True),
+        'n_estimators': trial.suggest_int('n_estimators', 100, 1000),
+        'subsample': trial.suggest_float('subsample', 0.6, 1.0),
+        'colsample_bytree': trial.suggest_float('colsample_bytree', 0.6, 1.0),
+        'reg_alpha': trial.suggest_float('reg_alpha', 0.0, 2.0),
+        'reg_lambda': trial.suggest_float('reg_lambda', 0.0, 2.0),
+        'objective': 'binary:logistic',
+        'random_state': random_state,
+        'n_jobs': -1,
+        'verbosity': 0
+    }
+
+
 class HyperparameterOptimizer:
     """XGBoost 超参数优化器"""
 
@@ -60,7 +72,11 @@ class HyperparameterOptimizer:
         y_train: pd.Series,
         y_test: pd.Series,
         n_trials: int = 50,
-        random_state: int = 42
+        random_state: int = 42,
+        n_jobs: int = 1,
+        study_dir: Optional[str] = None,
+        storage: Optional[str] = None,
+        pruner: str = 'median'
     ):
         """
         初始化优化器
@@ -72,6 +88,10 @@ class HyperparameterOptimizer:
             y_test: 测试标签
             n_trials: Optuna 试验次数
             random_state: 随机种子
+            n_jobs: 试验 worker 进程数
+            study_dir: Study 目录 (共享矩阵 + 存储; 指定后可续跑, 默认临时目录)
+            storage: 'journal' (默认) / 'sqlite' / Optuna 存储 URL
+            pruner: 剪枝器 ('median' / 'hyperband' / 'none')
         """
         self.X_train = X_train
         self.X_test = X_test
@@ -79,59 +99,22 @@ class HyperparameterOptimizer:
         self.y_test = y_test
         self.n_trials = n_trials
         self.random_state = random_state
+        self.n_jobs = n_jobs
+        self.study_dir = study_dir
+        self.storage = storage
+        self.pruner = pruner
 
         self.study = None
         self.best_params = None
         self.best_model = None
         self.best_score = None
+        self.run_report = None
 
         logger.info(f"{GREEN}✅ HyperparameterOptimizer 已初始化{RESET}")
         logger.info(f"  训练集: {len(X_train)} 样本")
         logger.info(f"  测试集: {len(X_test)} 样本")
         logger.info(f"  试验次数: {n_trials}")
 
-    def objective(self, trial):
-        """
-        Optuna 目标函数
-        
-        参数:
-            trial: Optuna Trial 对象
-            
-        返回:
-            AUC-ROC 分数 (越高越好)
-        """
-        # 采样超参数
-        params = {
-            'max_depth': trial.suggest_int('max_depth', 3, 10),
-            'learning_rate': trial.suggest_float('learning_rate', 0.01, 0.3, log=True),
-            'n_estimators': trial.suggest_int('n_estimators', 100, 1000),
-            'subsample': trial.suggest_float('subsample', 0.6, 1.0),
-            'colsample_bytree': trial.suggest_float('colsample_bytree', 0.6, 1.0),
-            'reg_alpha': trial.suggest_float('reg_alpha', 0.0, 2.0),
-            'reg_lambda': trial.suggest_float('reg_lambda', 0.0, 2.0),
-            'objective': 'binary:logistic',
-            'random_state': self.random_state,
-            'n_jobs': -1,
-            'verbosity': 0
-        }
-
-        try:
-            # 训练模型
-            model = XGBClassifier(**params)
-            model.fit(self.X_train, self.y_train, verbose=False)
-
-            # 预测测试集
-            y_pred_proba = model.predict_proba(self.X_test)[:, 1]
-
-            # 计算 AUC-ROC
-            auc = roc_auc_score(self.y_test, y_pred_proba)
-
-            return auc
-
-        except Exception as e:
-            logger.warning(f"{YELLOW}⚠️  Trial {trial.number} 失败: {e}{RESET}")
-            return 0.0
-
     def optimize(self) -> Dict:
         """
         运行超参数优化
@@ -145,29 +128,32 @@ class HyperparameterOptimizer:
         logger.info("")
 
         logger.info(f"{CYAN}🚀 开始优化...{RESET}")
-        logger.info(f"  试验次数: {self.n_trials}")
+        logger.info(f"  试验次数: {self.n_trials} ({self.n_jobs} 个 worker 进程)")
         logger.info(f"  采样器: TPESampler")
-        logger.info(f"  剪枝器: MedianPruner")
+        logger.info(f"  剪枝器: {self.pruner} (每个 boosting 轮次上报测试集 logloss)")
         logger.info(f"  目标: 最大化 AUC-ROC")
         logger.info("")
 
-        # 创建 Study
-        self.study = optuna.create_study(
+        # 训练集 + 测试集拼接后共享, 单折 holdout, DMatrix 只构建一次
+        X = np.vstack([np.asarray(self.X_train, dtype=np.float32),
+                       np.asarray(self.X_test, dtype=np.float32)])
+        y = np.concatenate([np.asarray(self.y_train), np.asarray(self.y_test)])
+        with StudyRunner(
+            X, y, holdout_folds(len(self.X_train), len(self.X_test)),
+            search_space=partial(xgboost_auc_search_space, random_state=self.random_state),
+            scoring='auc',
             study_name='xgboost_optimization_v1',
+            study_dir=self.study_dir,
+            storage=self.storage,
             direction='maximize',
-            sampler=TPESampler(seed=self.random_state),
-            pruner=MedianPruner(
-                n_startup_trials=10,
-                n_warmup_steps=5
-            )
-        )
-
-        # 运行优化
-        self.study.optimize(
-            self.objective,
-            n_trials=self.n_trials,
-            show_progress_bar=True
-        )
+            pruner=self.pruner,
+            n_jobs=self.n_jobs,
+            seed=self.random_state,
+            n_startup_trials=10,
+            n_warmup_steps=5
+        ) as runner:
+            self.run_report = runner.optimize(self.n_trials)
+        self.study = runner.study
 
         # 获取最佳参数
         self.best_params = self.study.best_params
@@ -177,6 +163,8 @@ class HyperparameterOptimizer:
         logger.info(f"{GREEN}✅ 优化完成{RESET}")
         logger.info(f"  最佳 AUC: {self.best_score:.4f}")
         logger.info(f"  最佳试验: Trial {self.study.best_trial.number}")
+        logger.info(f"  吞吐: {self.run_report['trials_per_hour']:.0f} trials/hour "
+                    f"(剪枝 {self.run_report['pruned']} 次)")
         logger.info(f"  最佳参数:")
         for key, value in self.best_params.items():
             if isinstance(value, float):
@@ -2,6 +2,7 @@
 监控模块
 """
 
-from .dq_score import DQScoreCalculator
+from .dq_score import DQScoreCalculator, FrameProfile
+from .dq_job import DQScoringJob
 
-__all__ = ['DQScoreCalculator']
+__all__ = ['DQScoreCalculator', 'DQScoringJob', 'FrameProfile']
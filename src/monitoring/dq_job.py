@@ -0,0 +1,274 @@
+"""
+后台 DQ 评分任务
+按固定间隔扫描特征目录, 只重新评分有变化的 parquet 文件, 结果保存为内存快照
+
+Prometheus 抓取只读取快照 (O(1)), 不再每次抓取都全量读取 data_lake。
+
+变化检测分两级:
+1. 文件 (mtime, size) 未变 -> 复用上次得分, 仅按缓存的日期范围刷新及时性
+2. 文件被改写但 parquet footer 的行组统计 (行数、各列 min/max/null_count) 未变
+   -> 视为内容未变, 不读取数据
+只有两级都判定为变化时才读取整个文件重新评分。
+"""
+
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:
+    pq = None
+
+from .dq_score import DQScoreCalculator
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FEATURE_DIRS = (
+    "/opt/mt5-crs/data_lake/features_advanced",
+    "/opt/mt5-crs/data_lake/features_daily",
+)
+DEFAULT_INTERVAL_SECONDS = 60.0
+
+SCORE_FIELDS = ('total_score', 'completeness', 'accuracy', 'consistency', 'timeliness', 'validity')
+
+
+def parquet_fingerprint(path: Path) -> Optional[Tuple]:
+    """
+    由 parquet footer 元数据生成内容指纹 (不读取数据页)
+
+    Returns:
+        (行数, 列数, 各行组各列统计) 元组; pyarrow 不可用或读取失败时返回 None
+    """
+    if pq is None:
+        return None
+    try:
+        metadata = pq.ParquetFile(path).metadata
+    except Exception as e:
+        logger.warning(f"读取 parquet 元数据失败 {path}: {e}")
+        return None
+
+    row_groups = []
+    for rg in range(metadata.num_row_groups):
+        group = metadata.row_group(rg)
+        columns = []
+        for col in range(group.num_columns):
+            chunk = group.column(col)
+            stats = chunk.statistics
+            if stats is None or not stats.has_min_max:
+                return None  # 缺少统计信息, 无法判定
+            columns.append((chunk.path_in_schema, stats.min, stats.max, stats.null_count))
+        row_groups.append((group.num_rows, tuple(columns)))
+    return metadata.num_rows, metadata.num_columns, tuple(row_groups)
+
+
+class DQScoringJob:
+    """
+    后台增量 DQ 评分任务
+
+    Attributes:
+        feature_dirs: 候选特征目录, 使用第一个存在的目录
+        interval: 两次扫描之间的间隔 (秒)
+    """
+
+    def __init__(
+        self,
+        calculator: Optional[DQScoreCalculator] = None,
+        feature_dirs: Sequence[str] = DEFAULT_FEATURE_DIRS,
+        interval: float = DEFAULT_INTERVAL_SECONDS,
+    ):
+        """
+        初始化
+
+        Args:
+            calculator: DQ 评分计算器
+            feature_dirs: 候选特征目录 (按顺序取第一个存在的)
+            interval: 扫描间隔 (秒)
+        """
+        self.calculator = calculator or DQScoreCalculator()
+        self.feature_dirs = [Path(d) for d in feature_dirs]
+        self.interval = interval
+
+        # file_path -> {'signature', 'fingerprint', 'result', 'date_range'}
+        self._entries: Dict[str, Dict] = {}
+        self._snapshot: Dict = {'metrics': {}, 'results': [], 'stats': {}}
+        self._run_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # ========================================================================
+    # 扫描与评分
+    # ========================================================================
+
+    def _features_dir(self) -> Optional[Path]:
+        for directory in self.feature_dirs:
+            if directory.exists():
+                return directory
+        return None
+
+    @staticmethod
+    def _symbol_of(file_path: Path) -> str:
+        return file_path.stem.replace('_features_advanced', '').replace('_features', '')
+
+    def _score_file(self, file_path: Path) -> Dict:
+        """全量读取并评分, 同时记录日期范围供之后刷新及时性"""
+        df = pd.read_parquet(file_path)
+        profile = self.calculator.profile(df)
+        result = self.calculator.calculate_dq_score(df, profile=profile)
+        date_range = None
+        if 'date' in df.columns and not df.empty:
+            date_range = profile.date_range
+        return {'result': result, 'date_range': date_range}
+
+    def _refresh_timeliness(self, entry: Dict) -> None:
+        """按缓存的日期范围重新计算及时性与总分 (及时性随当前时间变化)"""
+        date_range = entry.get('date_range')
+        result = entry['result']
+        if date_range is None or result['records_count'] == 0:
+            return
+        timeliness = self.calculator.score_date_range(*date_range)
+        total = self.calculator.weighted_total(
+            result['completeness'], result['accuracy'], result['consistency'],
+            timeliness, result['validity'],
+        )
+        result['timeliness'] = round(timeliness, 2)
+        result['total_score'] = round(total, 2)
+        result['grade'] = self.calculator._get_grade(total)
+
+    def run_once(self) -> Dict:
+        """
+        扫描一次并更新快照
+
+        Returns:
+            本次运行统计: files / rescored / metadata_reused / unchanged / removed / failed / duration_seconds
+        """
+        with self._run_lock:
+            start = time.perf_counter()
+            stats = {'files': 0, 'rescored': 0, 'metadata_reused': 0,
+                     'unchanged': 0, 'removed': 0, 'failed': 0}
+
+            directory = self._features_dir()
+            files = sorted(directory.glob("*.parquet")) if directory else []
+            if directory is None:
+                logger.warning(f"未找到特征目录: {[str(d) for d in self.feature_dirs]}")
+
+            seen = set()
+            for file_path in files:
+                key = str(file_path)
+                seen.add(key)
+                try:
+                    st = file_path.stat()
+                except OSError:
+                    continue
+                signature = (st.st_mtime_ns, st.st_size)
+                entry = self._entries.get(key)
+
+                if entry is not None and entry['signature'] == signature:
+                    stats['unchanged'] += 1
+                else:
+                    fingerprint = parquet_fingerprint(file_path)
+                    if (entry is not None and fingerprint is not None
+                            and entry['fingerprint'] == fingerprint):
+                        entry['signature'] = signature
+                        stats['metadata_reused'] += 1
+                    else:
+                        try:
+                            scored = self._score_file(file_path)
+                        except Exception as e:
+                            logger.error(f"处理 {file_path} 失败: {e}")
+                            stats['failed'] += 1
+                            continue
+                        entry = {'signature': signature, 'fingerprint': fingerprint, **scored}
+                        entry['result']['symbol'] = self._symbol_of(file_path)
+                        entry['result']['file_path'] = key
+                        self._entries[key] = entry
+                        stats['rescored'] += 1
+
+                self._refresh_timeliness(entry)
+
+            for key in list(self._entries):
+                if key not in seen:
+                    del self._entries[key]
+                    stats['removed'] += 1
+
+            stats['files'] = len(self._entries)
+            stats['duration_seconds'] = time.perf_counter() - start
+            stats['finished_at'] = time.time()
+
+            results = [dict(entry['result']) for _, entry in sorted(self._entries.items())]
+            self._snapshot = {
+                'metrics': self._build_metrics(results, stats),
+                'results': results,
+                'stats': stats,
+            }
+            logger.info(
+                f"DQ 评分任务完成: {stats['files']} 个文件, 重新评分 {stats['rescored']}, "
+                f"元数据复用 {stats['metadata_reused']}, 耗时 {stats['duration_seconds']:.3f}s"
+            )
+            return stats
+
+    @staticmethod
+    def _build_metrics(results: List[Dict], stats: Dict) -> Dict[str, float]:
+        """生成 Prometheus 指标字典 (与 PrometheusMetrics 原有命名一致)"""
+        metrics: Dict[str, float] = {}
+        for row in results:
+            symbol = row['symbol']
+            metrics[f'dq_score_total{{symbol="{symbol}"}}'] = row['total_score']
+            for field in SCORE_FIELDS[1:]:
+                metrics[f'dq_score_{field}{{symbol="{symbol}"}}'] = row[field]
+            metrics[f'data_records_count{{symbol="{symbol}"}}'] = row['records_count']
+            metrics[f'data_columns_count{{symbol="{symbol}"}}'] = row['columns_count']
+
+        if results:
+            totals = [row['total_score'] for row in results]
+            metrics['dq_score_avg'] = sum(totals) / len(totals)
+            metrics['dq_score_min'] = min(totals)
+            metrics['dq_score_max'] = max(totals)
+            metrics['assets_count'] = len(results)
+
+        metrics['dq_job_duration_seconds'] = stats['duration_seconds']
+        metrics['dq_job_last_run_timestamp'] = stats['finished_at']
+        metrics['dq_job_files'] = stats['files']
+        metrics['dq_job_files_rescored'] = stats['rescored']
+        metrics['dq_job_files_metadata_reused'] = stats['metadata_reused']
+        metrics['dq_job_files_failed'] = stats['failed']
+        return metrics
+
+    # ========================================================================
+    # 快照与后台线程
+    # ========================================================================
+
+    def snapshot(self) -> Dict:
+        """当前快照 (metrics / results / stats), 整体替换, 读取无需加锁"""
+        return self._snapshot
+
+    def results_frame(self) -> pd.DataFrame:
+        """快照中的评分结果 (与 calculate_feature_dq_scores 的输出列一致)"""
+        return pd.DataFrame(self._snapshot['results'])
+
+    def start(self) -> None:
+        """启动后台线程 (立即执行一次, 之后每 interval 秒一次)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="dq-scoring-job", daemon=True)
+        self._thread.start()
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error(f"DQ 评分任务失败: {e}")
+            self._stop.wait(self.interval)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """停止后台线程"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
@@ -9,11 +9,17 @@ DQ Score = weighted_sum([
     timeliness_score,
     validity_score
 ])
+
+五个维度共用一次列统计 (FrameProfile): 缺失计数、四分位数、无穷值/异常值计数、
+日期间隔与重复记录只计算一次, 且尽量在 numpy 数组上向量化完成。
 """
 
 import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence, Tuple
 from datetime import datetime, timedelta
 
 import pandas as pd
@@ -23,6 +29,199 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+# 四分位数精确选择: 超过该行数时先用抽样确定候选区间, 只对区间内的值做 partition
+_SELECT_MIN_ROWS = 200_000
+_SELECT_SAMPLE_SIZE = 20_000
+
+
+def _lerp_like_numpy(a: float, b: float, gamma: float) -> float:
+    """与 np.percentile(method='linear') 完全相同的插值 (复用 numpy 的实现)"""
+    return np.quantile(np.array([a, b], dtype=np.float64), gamma)
+
+
+def _order_statistics(values: np.ndarray, n_valid: int, ranks: Sequence[Tuple[int, int]]) -> List[Tuple[float, float]]:
+    """
+    返回忽略 NaN 后排序位置为 (r0, r1) 的值对
+
+    大数组先从等距样本中取包含目标位置的候选区间 [lo, hi], 统计小于 lo 的个数,
+    只对区间内的少量值 partition; 区间未覆盖目标位置时回退到全量 partition。
+    """
+    n = len(values)
+    if n >= _SELECT_MIN_ROWS:
+        sample = values[::max(1, n // _SELECT_SAMPLE_SIZE)]
+        sample = np.sort(sample[~np.isnan(sample)])
+        m = len(sample)
+        margin = int(4 * np.sqrt(m)) + 2
+        results = []
+        for r0, r1 in ranks:
+            center = int(r0 / max(n_valid - 1, 1) * (m - 1))
+            lo = sample[max(0, center - margin)]
+            hi = sample[min(m - 1, center + margin)]
+            # NaN 的比较结果均为 False, 不会计入
+            below = np.count_nonzero(values < lo)
+            band = values[(values >= lo) & (values <= hi)]
+            k0, k1 = r0 - below, r1 - below
+            if k0 < 0 or k1 >= len(band):
+                break
+            part = np.partition(band, [k0, k1])
+            results.append((part[k0], part[k1]))
+        else:
+            return results
+
+    valid = values if n_valid == n else values[~np.isnan(values)]
+    flat = sorted({r for pair in ranks for r in pair})
+    part = np.partition(valid, flat)
+    return [(part[r0], part[r1]) for r0, r1 in ranks]
+
+
+def quartiles(values: np.ndarray, n_valid: int) -> Tuple[float, float]:
+    """
+    Q1 / Q3 (忽略 NaN), 与 pandas Series.quantile(0.25 / 0.75) 结果逐位相同
+
+    Args:
+        values: float64 数组 (可含 NaN / inf)
+        n_valid: 非 NaN 元素个数
+    """
+    if n_valid == 0:
+        return np.nan, np.nan
+    positions = [(n_valid - 1) * q for q in (0.25, 0.75)]
+    ranks = [(int(np.floor(h)), min(int(np.floor(h)) + 1, n_valid - 1)) for h in positions]
+    pairs = _order_statistics(values, n_valid, ranks)
+    return tuple(
+        _lerp_like_numpy(a, b, h - np.floor(h)) for (a, b), h in zip(pairs, positions)
+    )
+
+
+class FrameProfile:
+    """
+    DataFrame 列统计, 五个维度共用
+
+    各项统计按需计算并缓存, calculate_dq_score 对同一 DataFrame 只计算一次;
+    数值列的分位数/异常值统计可按列并行 (numpy 在这些运算中释放 GIL)。
+    """
+
+    def __init__(self, df: pd.DataFrame, max_workers: int = 1):
+        """
+        Args:
+            df: 待评分的 DataFrame
+            max_workers: 数值列统计的并行线程数
+        """
+        self.df = df
+        self.n_rows = len(df)
+        self.n_cols = len(df.columns)
+        self.max_workers = max_workers
+        self._values: Dict[str, np.ndarray] = {}
+
+    # ------------------------------------------------------------------
+    # 缺失值
+    # ------------------------------------------------------------------
+
+    @cached_property
+    def _nulls(self) -> Tuple[np.ndarray, np.ndarray]:
+        col_nulls = np.zeros(self.n_cols, dtype=np.int64)
+        row_nulls = np.zeros(self.n_rows, dtype=np.int32)
+        for i in range(self.n_cols):
+            mask = self.df.iloc[:, i].isna().to_numpy()
+            col_nulls[i] = np.count_nonzero(mask)
+            if col_nulls[i]:
+                row_nulls += mask
+        return col_nulls, row_nulls
+
+    @property
+    def null_counts(self) -> np.ndarray:
+        """每列缺失数"""
+        return self._nulls[0]
+
+    @property
+    def row_null_counts(self) -> np.ndarray:
+        """每行缺失数"""
+        return self._nulls[1]
+
+    def null_count(self, col: str) -> int:
+        return int(self.null_counts[self.df.columns.get_loc(col)])
+
+    # ------------------------------------------------------------------
+    # 数值列
+    # ------------------------------------------------------------------
+
+    @cached_property
+    def numeric_columns(self) -> pd.Index:
+        return self.df.select_dtypes(include=[np.number]).columns
+
+    def values(self, col: str) -> np.ndarray:
+        """数值列的 float64 数组 (缺失为 NaN)"""
+        if col not in self._values:
+            self._values[col] = self.df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+        return self._values[col]
+
+    def _column_stats(self, col: str) -> Tuple[int, int]:
+        values = self.values(col)
+        inf_count = np.count_nonzero(np.isinf(values))
+        q1, q3 = quartiles(values, len(values) - self.null_count(col))
+        iqr = q3 - q1
+        outliers = 0
+        if iqr > 0:
+            outliers = np.count_nonzero(values < (q1 - 3 * iqr)) + np.count_nonzero(values > (q3 + 3 * iqr))
+        return int(inf_count), int(outliers)
+
+    @cached_property
+    def numeric_stats(self) -> Dict[str, Tuple[int, int]]:
+        """每个数值列的 (无穷值数, 3×IQR 异常值数)"""
+        columns = list(self.numeric_columns)
+        if self.max_workers > 1 and len(columns) > 1:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(columns))) as pool:
+                stats = list(pool.map(self._column_stats, columns))
+        else:
+            stats = [self._column_stats(col) for col in columns]
+        return dict(zip(columns, stats))
+
+    # ------------------------------------------------------------------
+    # 日期
+    # ------------------------------------------------------------------
+
+    @cached_property
+    def dates(self) -> Optional[pd.Series]:
+        """转换后的 date 列 (无 date 列时为 None)"""
+        if 'date' not in self.df.columns:
+            return None
+        return pd.to_datetime(self.df['date'])
+
+    @cached_property
+    def _native_sorted_dates(self) -> bool:
+        """date 列本身为 (无时区) datetime64 且已升序 (无 NaT), 可跳过排序"""
+        dtype = self.df['date'].dtype
+        return (
+            isinstance(dtype, np.dtype) and dtype.kind == 'M'
+            and self.dates.is_monotonic_increasing
+        )
+
+    @cached_property
+    def date_range(self) -> Tuple:
+        """(最早日期, 最新日期)"""
+        if self._native_sorted_dates and self.n_rows:
+            return self.dates.iloc[0], self.dates.iloc[-1]
+        return self.dates.min(), self.dates.max()
+
+    @cached_property
+    def date_gap_count(self) -> int:
+        """按日期排序后相邻间隔超过 3 天的次数"""
+        threshold = pd.Timedelta(days=1) * 3
+        if self._native_sorted_dates:
+            return int(np.count_nonzero(np.diff(self.dates.to_numpy()) > threshold.to_timedelta64()))
+        dates = pd.to_datetime(self.df['date'].sort_values())
+        return int((dates.diff() > threshold).sum())
+
+    @cached_property
+    def duplicate_count(self) -> int:
+        """(date, symbol) 重复记录数"""
+        symbol = self.df['symbol']
+        if (self._native_sorted_dates and self.n_rows
+                and bool((symbol == symbol.iloc[0]).all())):
+            values = self.dates.to_numpy()
+            return int(np.count_nonzero(values[1:] == values[:-1]))
+        return int(self.df.duplicated(subset=['date', 'symbol']).sum())
+
+
 class DQScoreCalculator:
     """数据质量评分计算器"""
 
@@ -41,11 +240,16 @@ class DQScoreCalculator:
             'timeliness': 0.15,
             'validity': 0.10,
         })
+        self.max_workers = self.config.get('max_workers', os.cpu_count() or 1)
 
         logger.info("初始化 DQScoreCalculator")
         logger.info(f"权重配置: {self.weights}")
 
-    def calculate_completeness_score(self, df: pd.DataFrame) -> float:
+    def profile(self, df: pd.DataFrame) -> FrameProfile:
+        """创建列统计 (各维度共用)"""
+        return FrameProfile(df, max_workers=self.max_workers)
+
+    def calculate_completeness_score(self, df: pd.DataFrame, profile: Optional[FrameProfile] = None) -> float:
         """
         计算完整性得分
 
@@ -56,25 +260,27 @@ class DQScoreCalculator:
 
         Args:
             df: DataFrame
+            profile: 列统计 (可选, 不传则新建)
 
         Returns:
             完整性得分 (0-100)
         """
         if df.empty:
             return 0.0
+        profile = profile or self.profile(df)
 
         # 1. 整体缺失率
         total_cells = df.shape[0] * df.shape[1]
-        missing_cells = df.isnull().sum().sum()
+        missing_cells = profile.null_counts.sum()
         missing_rate = missing_cells / total_cells
 
         # 2. 列级别完整性 (至少 80% 的列完整率 > 95%)
-        col_completeness = (1 - df.isnull().sum() / len(df))
-        good_cols_ratio = (col_completeness > 0.95).sum() / len(df.columns)
+        col_completeness = (1 - profile.null_counts / len(df))
+        good_cols_ratio = np.count_nonzero(col_completeness > 0.95) / len(df.columns)
 
         # 3. 行级别完整性 (至少 90% 的行完整率 > 90%)
-        row_completeness = (1 - df.isnull().sum(axis=1) / len(df.columns))
-        good_rows_ratio = (row_completeness > 0.90).sum() / len(df)
+        row_completeness = (1 - profile.row_null_counts / len(df.columns))
+        good_rows_ratio = np.count_nonzero(row_completeness > 0.90) / len(df)
 
         # 综合得分
         score = (
@@ -85,7 +291,7 @@ class DQScoreCalculator:
 
         return min(100.0, max(0.0, score))
 
-    def calculate_accuracy_score(self, df: pd.DataFrame) -> float:
+    def calculate_accuracy_score(self, df: pd.DataFrame, profile: Optional[FrameProfile] = None) -> float:
         """
         计算准确性得分
 
@@ -96,45 +302,41 @@ class DQScoreCalculator:
 
         Args:
             df: DataFrame
+            profile: 列统计 (可选, 不传则新建)
 
         Returns:
             准确性得分 (0-100)
         """
         if df.empty:
             return 0.0
+        profile = profile or self.profile(df)
 
         score = 100.0
 
         # 1. 检测无穷值
-        numeric_cols = df.select_dtypes(include=[np.number]).columns
+        numeric_cols = profile.numeric_columns
+        stats = profile.numeric_stats
         if len(numeric_cols) > 0:
-            inf_count = np.isinf(df[numeric_cols]).sum().sum()
+            inf_count = sum(stats[col][0] for col in numeric_cols)
             total_numeric_cells = len(df) * len(numeric_cols)
             inf_rate = inf_count / total_numeric_cells if total_numeric_cells > 0 else 0
             score -= inf_rate * 30  # 无穷值扣分
 
         # 2. 检测重复记录
         if 'date' in df.columns and 'symbol' in df.columns:
-            duplicates = df.duplicated(subset=['date', 'symbol']).sum()
+            duplicates = profile.duplicate_count
             dup_rate = duplicates / len(df)
             score -= dup_rate * 30  # 重复记录扣分
 
-        # 3. 检测异常值 (使用 IQR 方法)
-        outlier_count = 0
-        for col in numeric_cols:
-            Q1 = df[col].quantile(0.25)
-            Q3 = df[col].quantile(0.75)
-            IQR = Q3 - Q1
-            if IQR > 0:
-                outliers = ((df[col] < (Q1 - 3 * IQR)) | (df[col] > (Q3 + 3 * IQR))).sum()
-                outlier_count += outliers
+        # 3. 检测异常值 (使用 IQR 方法, 超出 Q1 - 3*IQR ~ Q3 + 3*IQR)
+        outlier_count = sum(stats[col][1] for col in numeric_cols)
 
         outlier_rate = outlier_count / (len(df) * len(numeric_cols)) if len(numeric_cols) > 0 else 0
         score -= outlier_rate * 40  # 异常值扣分
 
         return min(100.0, max(0.0, score))
 
-    def calculate_consistency_score(self, df: pd.DataFrame) -> float:
+    def calculate_consistency_score(self, df: pd.DataFrame, profile: Optional[FrameProfile] = None) -> float:
         """
         计算一致性得分
 
@@ -145,27 +347,21 @@ class DQScoreCalculator:
 
         Args:
             df: DataFrame
+            profile: 列统计 (可选, 不传则新建)
 
         Returns:
             一致性得分 (0-100)
         """
         if df.empty:
             return 0.0
+        profile = profile or self.profile(df)
 
         score = 100.0
 
-        # 1. 时间序列连续性 (如果有 date 列)
+        # 1. 时间序列连续性 (如果有 date 列, 假设日频数据, 间隔超过3天认为不连续)
         if 'date' in df.columns:
-            df_sorted = df.sort_values('date')
-            dates = pd.to_datetime(df_sorted['date'])
-
-            # 检查日期间隔
-            date_diffs = dates.diff()
-            expected_freq = pd.Timedelta(days=1)  # 假设日频数据
-
-            # 计算非连续比例
-            non_continuous = (date_diffs > expected_freq * 3).sum()  # 超过3天认为不连续
-            non_continuous_rate = non_continuous / len(dates) if len(dates) > 1 else 0
+            non_continuous = profile.date_gap_count
+            non_continuous_rate = non_continuous / len(df) if len(df) > 1 else 0
             score -= non_continuous_rate * 40
 
         # 2. 数据类型一致性
@@ -175,13 +371,12 @@ class DQScoreCalculator:
             if df[col].dtype == 'object':
                 # 尝试转换为数值
                 try:
-                    pd.to_numeric(df[col], errors='coerce')
                     # 如果部分可转换,说明类型不一致
-                    null_before = df[col].isnull().sum()
+                    null_before = profile.null_count(col)
                     null_after = pd.to_numeric(df[col], errors='coerce').isnull().sum()
                     if null_after > null_before:
                         mixed_type_cols += 1
-                except:
+                except Exception:
                     pass
 
         mixed_type_rate = mixed_type_cols / len(df.columns)
@@ -199,7 +394,8 @@ class DQScoreCalculator:
 
         return min(100.0, max(0.0, score))
 
-    def calculate_timeliness_score(self, df: pd.DataFrame, expected_update_time: Optional[datetime] = None) -> float:
+    def calculate_timeliness_score(self, df: pd.DataFrame, expected_update_time: Optional[datetime] = None,
+                                   profile: Optional[FrameProfile] = None) -> float:
         """
         计算及时性得分
 
@@ -210,6 +406,7 @@ class DQScoreCalculator:
         Args:
             df: DataFrame
             expected_update_time: 期望的更新时间
+            profile: 列统计 (可选, 不传则新建)
 
         Returns:
             及时性得分 (0-100)
@@ -217,36 +414,51 @@ class DQScoreCalculator:
         if df.empty:
             return 0.0
 
+        if 'date' not in df.columns:
+            return 100.0
+
+        profile = profile or self.profile(df)
+        return self.score_date_range(*profile.date_range)
+
+    def score_date_range(self, earliest_date, latest_date) -> float:
+        """
+        由数据的起止日期计算及时性得分
+
+        只依赖日期范围, 后台任务可以用缓存的范围随时间刷新得分而无需重读文件。
+
+        Args:
+            earliest_date: 最早日期
+            latest_date: 最新日期
+
+        Returns:
+            及时性得分 (0-100)
+        """
         score = 100.0
 
         # 1. 检查最新数据时间
-        if 'date' in df.columns:
-            latest_date = pd.to_datetime(df['date']).max()
-            now = pd.Timestamp.now()
-
-            # 计算数据延迟 (天数)
-            delay_days = (now - latest_date).days
-
-            # 根据延迟扣分
-            if delay_days <= 1:
-                score -= 0  # 1天内不扣分
-            elif delay_days <= 3:
-                score -= 10  # 1-3天扣10分
-            elif delay_days <= 7:
-                score -= 30  # 3-7天扣30分
-            else:
-                score -= 50  # 超过7天扣50分
+        now = pd.Timestamp.now()
+
+        # 计算数据延迟 (天数)
+        delay_days = (now - latest_date).days
+
+        # 根据延迟扣分
+        if delay_days <= 1:
+            score -= 0  # 1天内不扣分
+        elif delay_days <= 3:
+            score -= 10  # 1-3天扣10分
+        elif delay_days <= 7:
+            score -= 30  # 3-7天扣30分
+        else:
+            score -= 50  # 超过7天扣50分
 
         # 2. 检查数据覆盖范围
-        if 'date' in df.columns:
-            earliest_date = pd.to_datetime(df['date']).min()
-            coverage_days = (latest_date - earliest_date).days
+        coverage_days = (latest_date - earliest_date).days
 
-            # 至少应该有 30 天数据
-            if coverage_days < 30:
-                score -= 30
-            elif coverage_days < 90:
-                score -= 10
+        # 至少应该有 30 天数据
+        if coverage_days < 30:
+            score -= 30
+        elif coverage_days < 90:
+            score -= 10
 
         return min(100.0, max(0.0, score))
 
@@ -294,34 +506,31 @@ class DQScoreCalculator:
 
         return min(100.0, max(0.0, score))
 
-    def calculate_dq_score(self, df: pd.DataFrame, expected_update_time: Optional[datetime] = None) -> Dict:
+    def calculate_dq_score(self, df: pd.DataFrame, expected_update_time: Optional[datetime] = None,
+                           profile: Optional[FrameProfile] = None) -> Dict:
         """
         计算综合 DQ Score
 
         Args:
             df: DataFrame
             expected_update_time: 期望更新时间
+            profile: 列统计 (可选, 各维度共用; 调用方可复用其中的日期范围等)
 
         Returns:
             包含各维度得分和总分的字典
         """
         logger.info(f"计算 DQ Score: {len(df)} 行, {len(df.columns)} 列")
+        profile = profile or self.profile(df)
 
-        # 计算各维度得分
-        completeness = self.calculate_completeness_score(df)
-        accuracy = self.calculate_accuracy_score(df)
-        consistency = self.calculate_consistency_score(df)
-        timeliness = self.calculate_timeliness_score(df, expected_update_time)
+        # 计算各维度得分 (共用一次列统计)
+        completeness = self.calculate_completeness_score(df, profile)
+        accuracy = self.calculate_accuracy_score(df, profile)
+        consistency = self.calculate_consistency_score(df, profile)
+        timeliness = self.calculate_timeliness_score(df, expected_update_time, profile)
         validity = self.calculate_validity_score(df)
 
         # 加权计算总分
-        total_score = (
-            completeness * self.weights['completeness'] +
-            accuracy * self.weights['accuracy'] +
-            consistency * self.weights['consistency'] +
-            timeliness * self.weights['timeliness'] +
-            validity * self.weights['validity']
-        )
+        total_score = self.weighted_total(completeness, accuracy, consistency, timeliness, validity)
 
         result = {
             'timestamp': datetime.now().isoformat(),
@@ -339,6 +548,17 @@ class DQScoreCalculator:
         logger.info(f"DQ Score: {result['total_score']:.2f} ({result['grade']})")
         return result
 
+    def weighted_total(self, completeness: float, accuracy: float, consistency: float,
+                       timeliness: float, validity: float) -> float:
+        """按权重合成总分"""
+        return (
+            completeness * self.weights['completeness'] +
+            accuracy * self.weights['accuracy'] +
+            consistency * self.weights['consistency'] +
+            timeliness * self.weights['timeliness'] +
+            validity * self.weights['validity']
+        )
+
     def _get_grade(self, score: float) -> str:
         """根据得分返回等级"""
         if score >= 90:
@@ -2,6 +2,9 @@
 Prometheus 指标导出器
 将数据质量指标导出为 Prometheus 格式
 
+DQ 评分由后台线程 (DQScoringJob) 增量计算, /metrics 抓取只格式化内存中的
+最新快照, 抓取频率不再影响磁盘和 CPU 负载。
+
 用法:
 1. 运行此脚本启动 HTTP 服务器
 2. Prometheus 配置中添加此端点
@@ -9,6 +12,7 @@ Prometheus 指标导出器
 """
 
 import logging
+import threading
 import time
 from pathlib import Path
 from typing import Dict
@@ -16,6 +20,7 @@ from http.server import HTTPServer, BaseHTTPRequestHandler
 from socketserver import ThreadingMixIn
 import json
 
+from .dq_job import DEFAULT_INTERVAL_SECONDS, DQScoringJob
 from .dq_score import DQScoreCalculator
 
 logging.basicConfig(level=logging.INFO)
@@ -25,60 +30,94 @@ logger = logging.getLogger(__name__)
 class PrometheusMetrics:
     """Prometheus 指标管理器"""
 
-    def __init__(self):
+    def __init__(self, dq_job: DQScoringJob = None, refresh_interval: float = DEFAULT_INTERVAL_SECONDS):
+        """
+        Args:
+            dq_job: DQ 评分任务 (默认扫描 data_lake/features_advanced 或 features_daily)
+            refresh_interval: 后台刷新间隔 (秒)
+        """
         self.metrics = {}
         self.dq_calculator = DQScoreCalculator()
+        self.dq_job = dq_job or DQScoringJob(self.dq_calculator, interval=refresh_interval)
+        self.refresh_interval = refresh_interval
         self.strategy_metrics = {}  # Cache for strategy-specific metrics
+        self.collectors = []  # 额外指标源, 需提供 to_prometheus() -> str
+
+        self.scrape_count = 0
+        self.last_scrape_seconds = 0.0
+        self._refresh_thread = None
+        self._refresh_stop = threading.Event()
+        self._refresh_lock = threading.Lock()
+
+    def register_collector(self, collector):
+        """
+        注册额外的指标源 (如交易调度器的 MetricsCollector)
+
+        Args:
+            collector: 提供 to_prometheus() 方法的对象, 返回 Prometheus 文本格式
+        """
+        if collector not in self.collectors:
+            self.collectors.append(collector)
 
     def update_metrics(self):
-        """更新所有指标"""
+        """
+        更新所有指标 (后台线程调用, 不在抓取路径上)
+
+        运行一次增量 DQ 评分, 然后用快照和策略指标构建新的指标字典并整体替换。
+        """
         logger.info("更新 Prometheus 指标...")
+        metrics = {}
 
         try:
-            # 1. 计算特征文件的 DQ Scores
-            features_path = "/opt/mt5-crs/data_lake/features_advanced"
-            if not Path(features_path).exists():
-                features_path = "/opt/mt5-crs/data_lake/features_daily"
-
-            dq_scores_df = self.dq_calculator.calculate_feature_dq_scores(features_path)
-
-            if not dq_scores_df.empty:
-                # 更新指标
-                for _, row in dq_scores_df.iterrows():
-                    symbol = row['symbol']
-
-                    # DQ Score 指标
-                    self.metrics[f'dq_score_total{{symbol="{symbol}"}}'] = row['total_score']
-                    self.metrics[f'dq_score_completeness{{symbol="{symbol}"}}'] = row['completeness']
-                    self.metrics[f'dq_score_accuracy{{symbol="{symbol}"}}'] = row['accuracy']
-                    self.metrics[f'dq_score_consistency{{symbol="{symbol}"}}'] = row['consistency']
-                    self.metrics[f'dq_score_timeliness{{symbol="{symbol}"}}'] = row['timeliness']
-                    self.metrics[f'dq_score_validity{{symbol="{symbol}"}}'] = row['validity']
-
-                    # 记录数和列数
-                    self.metrics[f'data_records_count{{symbol="{symbol}"}}'] = row['records_count']
-                    self.metrics[f'data_columns_count{{symbol="{symbol}"}}'] = row['columns_count']
-
-                # 汇总指标
-                self.metrics['dq_score_avg'] = dq_scores_df['total_score'].mean()
-                self.metrics['dq_score_min'] = dq_scores_df['total_score'].min()
-                self.metrics['dq_score_max'] = dq_scores_df['total_score'].max()
-                self.metrics['assets_count'] = len(dq_scores_df)
+            # 1. 增量 DQ 评分 (只重新评分有变化的文件)
+            self.dq_job.run_once()
+            metrics.update(self.dq_job.snapshot()['metrics'])
 
             # 2. 添加系统指标
-            self.metrics['exporter_last_update_timestamp'] = time.time()
-            self.metrics['exporter_health'] = 1  # 1=健康, 0=不健康
+            metrics['exporter_last_update_timestamp'] = time.time()
+            metrics['exporter_health'] = 1  # 1=健康, 0=不健康
 
             # 3. 添加策略监控指标 (Task #012)
-            self._update_strategy_metrics()
+            self._update_strategy_metrics(metrics)
 
-            logger.info(f"指标更新完成: {len(self.metrics)} 个指标")
+            logger.info(f"指标更新完成: {len(metrics)} 个指标")
 
         except Exception as e:
             logger.error(f"更新指标失败: {e}")
-            self.metrics['exporter_health'] = 0
+            metrics = dict(self.metrics)
+            metrics['exporter_health'] = 0
+
+        self.metrics = metrics
 
-    def _update_strategy_metrics(self):
+    def start_background(self):
+        """启动后台刷新线程 (立即刷新一次, 之后每 refresh_interval 秒一次)"""
+        with self._refresh_lock:
+            if self._refresh_thread is not None and self._refresh_thread.is_alive():
+                return
+            self._refresh_stop.clear()
+            self._refresh_thread = threading.Thread(
+                target=self._refresh_loop, name="prometheus-refresh", daemon=True
+            )
+            self._refresh_thread.start()
+
+    def _refresh_loop(self):
+        while not self._refresh_stop.is_set():
+            self.update_metrics()
+            self._refresh_stop.wait(self.refresh_interval)
+
+    def stop_background(self, timeout: float = 5.0):
+        """停止后台刷新线程"""
+        self._refresh_stop.set()
+        if self._refresh_thread is not None:
+            self._refresh_thread.join(timeout)
+            self._refresh_thread = None
+
+    def record_scrape(self, duration_seconds: float):
+        """记录一次抓取耗时"""
+        self.scrape_count += 1
+        self.last_scrape_seconds = duration_seconds
+
+    def _update_strategy_metrics(self, metrics: Dict):
         """
         更新策略监控指标 (Task #012)
 
@@ -86,6 +125,9 @@ class PrometheusMetrics:
         - strategy_last_tick_timestamp: 最后tick时间戳
         - strategy_signal_confidence: 信号置信度
         - strategy_trades_per_hour: 每小时交易数
+
+        Args:
+            metrics: 写入的目标指标字典
         """
         try:
             # 读取配置文件获取活跃策略
@@ -114,29 +156,29 @@ class PrometheusMetrics:
                     # 1. Last tick timestamp (默认为当前时间)
                     metric_name = f'strategy_last_tick_timestamp{{symbol="{symbol}"}}'
                     if metric_name not in self.strategy_metrics:
-                        self.metrics[metric_name] = time.time()
+                        metrics[metric_name] = time.time()
                     else:
-                        self.metrics[metric_name] = self.strategy_metrics[metric_name]
+                        metrics[metric_name] = self.strategy_metrics[metric_name]
 
                     # 2. Signal confidence (默认为0，等待实际信号)
                     for signal_type in ['BUY', 'SELL', 'HOLD']:
                         metric_name = f'strategy_signal_confidence{{symbol="{symbol}",signal="{signal_type}"}}'
                         if metric_name not in self.strategy_metrics:
-                            self.metrics[metric_name] = 0.0
+                            metrics[metric_name] = 0.0
                         else:
-                            self.metrics[metric_name] = self.strategy_metrics[metric_name]
+                            metrics[metric_name] = self.strategy_metrics[metric_name]
 
                     # 3. Trades per hour (默认为0)
                     metric_name = f'strategy_trades_per_hour{{symbol="{symbol}"}}'
                     if metric_name not in self.strategy_metrics:
-                        self.metrics[metric_name] = 0.0
+                        metrics[metric_name] = 0.0
                     else:
-                        self.metrics[metric_name] = self.strategy_metrics[metric_name]
+                        metrics[metric_name] = self.strategy_metrics[metric_name]
 
                     # 4. Strategy active status
                     is_passive = strategy.get('passive_mode', False)
                     metric_name = f'strategy_passive_mode{{symbol="{symbol}"}}'
-                    self.metrics[metric_name] = 1.0 if is_passive else 0.0
+                    metrics[metric_name] = 1.0 if is_passive else 0.0
 
         except Exception as e:
             logger.error(f"更新策略指标失败: {e}")
@@ -231,11 +273,38 @@ class PrometheusMetrics:
         lines.append('# HELP strategy_passive_mode 策略被动模式状态 (1=passive, 0=active)')
         lines.append('# TYPE strategy_passive_mode gauge')
 
-        # 添加指标值
-        for metric_name, value in sorted(self.metrics.items()):
+        lines.append('# HELP dq_job_duration_seconds 最近一次 DQ 评分任务耗时')
+        lines.append('# TYPE dq_job_duration_seconds gauge')
+
+        lines.append('# HELP dq_job_files_rescored 最近一次任务中重新评分的文件数')
+        lines.append('# TYPE dq_job_files_rescored gauge')
+
+        lines.append('# HELP exporter_scrape_duration_seconds 上一次 /metrics 抓取耗时')
+        lines.append('# TYPE exporter_scrape_duration_seconds gauge')
+
+        lines.append('# HELP exporter_scrapes_total /metrics 抓取次数')
+        lines.append('# TYPE exporter_scrapes_total counter')
+
+        # 添加指标值 (快照 + 外部实时更新的策略指标)
+        metrics = dict(self.metrics)
+        for metric_name, value in self.strategy_metrics.items():
+            if metric_name in metrics:
+                metrics[metric_name] = value
+        metrics['exporter_scrape_duration_seconds'] = self.last_scrape_seconds
+        metrics['exporter_scrapes_total'] = self.scrape_count
+        for metric_name, value in sorted(metrics.items()):
             lines.append(f'{metric_name} {value}')
 
-        return '\n'.join(lines) + '\n'
+        text = '\n'.join(lines) + '\n'
+
+        # 已注册的指标源 (各自带 HELP/TYPE)
+        for collector in self.collectors:
+            try:
+                text += collector.to_prometheus()
+            except Exception as e:
+                logger.error(f"导出指标源失败: {e}")
+
+        return text
 
 
 class MetricsHandler(BaseHTTPRequestHandler):
@@ -246,8 +315,10 @@ class MetricsHandler(BaseHTTPRequestHandler):
     def do_GET(self):
         """处理 GET 请求"""
         if self.path == '/metrics':
-            # 更新指标
-            self.prometheus_metrics.update_metrics()
+            start = time.perf_counter()
+
+            # 指标由后台线程刷新, 抓取只读取快照
+            self.prometheus_metrics.start_background()
 
             # 返回 Prometheus 格式
             metrics_text = self.prometheus_metrics.to_prometheus_format()
@@ -256,6 +327,7 @@ class MetricsHandler(BaseHTTPRequestHandler):
             self.send_header('Content-Type', 'text/plain; charset=utf-8')
             self.end_headers()
             self.wfile.write(metrics_text.encode('utf-8'))
+            self.prometheus_metrics.record_scrape(time.perf_counter() - start)
 
         elif self.path == '/health':
             # 健康检查端点
@@ -302,6 +374,15 @@ class ThreadedHTTPServer(ThreadingMixIn, HTTPServer):
     pass
 
 
+def register_collector(collector):
+    """
+    向导出器注册额外指标源, 例如:
+
+        register_collector(dispatcher.metrics)
+    """
+    MetricsHandler.prometheus_metrics.register_collector(collector)
+
+
 def start_exporter(host: str = '0.0.0.0', port: int = 9090):
     """
     启动 Prometheus 导出器
@@ -312,6 +393,7 @@ def start_exporter(host: str = '0.0.0.0', port: int = 9090):
     """
     server_address = (host, port)
     httpd = ThreadedHTTPServer(server_address, MetricsHandler)
+    MetricsHandler.prometheus_metrics.start_background()
 
     logger.info(f"Prometheus 导出器启动在 http://{host}:{port}")
     logger.info(f"指标端点: http://{host}:{port}/metrics")
@@ -322,6 +404,7 @@ def start_exporter(host: str = '0.0.0.0', port: int = 9090):
         httpd.serve_forever()
     except KeyboardInterrupt:
         logger.info("接收到停止信号,关闭服务器...")
+        MetricsHandler.prometheus_metrics.stop_background()
         httpd.shutdown()
 
 
@@ -156,18 +156,17 @@ class NewsFetcher:
             logger.warning("没有获取到新闻")
             return 0
 
-        success_count = 0
-
-        for news_item in news_list:
-            # 标准化新闻数据
-            event_data = self._normalize_news(news_item)
+        # 标准化新闻数据
+        events = [self._normalize_news(news_item) for news_item in news_list]
 
-            # 发布到事件总线
-            message_id = self.producer.produce(
-                event_data,
-                event_type='news_raw'
-            )
+        # 批量发布到事件总线（pipeline，一次往返）
+        message_ids = self.producer.produce_batch(
+            events,
+            event_type='news_raw'
+        )
 
+        success_count = 0
+        for news_item, message_id in zip(news_list, message_ids):
             if message_id:
                 success_count += 1
             else:
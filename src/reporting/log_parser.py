@@ -9,8 +9,8 @@ Parses trading bot logs into structured DataFrames for visualization.
 """
 
 import re
+import numpy as np
 import pandas as pd
-from datetime import datetime
 from pathlib import Path
 from typing import Optional, List, Dict, Any
 import logging
@@ -18,6 +18,36 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+# Read size for streaming; chunks are cut at the last newline
+CHUNK_SIZE = 8 * 1024 * 1024
+
+
+def _compile_line_regex(patterns: Dict[str, str]) -> "re.Pattern[bytes]":
+    """
+    Combine per-event patterns into one multiline bytes regex
+
+    Groups 1-2 are the timestamp date/time; each pattern's own groups follow
+    in PATTERNS order. Whitespace classes are narrowed so a match never
+    spans two log lines.
+    """
+    alternation = '|'.join(patterns.values()).replace(r'\s', r'[^\S\n]')
+    return re.compile(
+        (r'^(\d{4}-\d{2}-\d{2})[^\S\n]+(\d{2}:\d{2}:\d{2}),\d+.*?(?:' + alternation + ')').encode(),
+        re.MULTILINE,
+    )
+
+
+def _field_group_index(patterns: Dict[str, str]) -> Dict[str, tuple]:
+    """Map each event type to the findall() tuple positions of its fields"""
+    index = {}
+    position = 2  # after the timestamp date/time groups
+    for name, pattern in patterns.items():
+        count = re.compile(pattern).groups
+        index[name] = tuple(range(position, position + count))
+        position += count
+    return index
+
+
 class TradeLogParser:
     """
     Parse trading bot log files into structured data
@@ -28,6 +58,14 @@ class TradeLogParser:
     - Prediction signals (BUY/SELL/HOLD)
     - Order executions
     - Order fills
+
+    The file is streamed in binary chunks and scanned with a single
+    precompiled alternation of PATTERNS via findall(), so lines without an
+    event never reach Python. Each chunk's matches become one NumPy byte
+    matrix that is converted column-wise (timestamps with one fixed-format
+    cast instead of strptime per line). The byte offset of the last complete
+    line is kept in `offset`, so `tail()` (or a new parser created with
+    `start_offset`) only reads lines appended since the previous parse.
     """
 
     # Regex patterns for log parsing
@@ -39,24 +77,49 @@ class TradeLogParser:
         'fill': r'\[FILL\]\s+Order\s+(\d+)\s+filled\s+@\s+([\d.]+)'
     }
 
-    def __init__(self, log_file: str):
+    # Output column and dtype for each capture group of PATTERNS
+    FIELDS = {
+        'tick': [('symbol', str), ('price', float), ('tick_time', str)],
+        'feat': [('feature_count', int), ('symbol', str)],
+        'pred': [('signal', int), ('signal_name', str)],
+        'exec': [('side', str), ('volume', float), ('symbol', str), ('price', float)],
+        'fill': [('ticket', int), ('filled_price', float)],
+    }
+
+    COLUMNS = [
+        'timestamp', 'event_type', 'symbol', 'price', 'tick_time', 'feature_count',
+        'signal', 'signal_name', 'side', 'volume', 'ticket', 'filled_price',
+    ]
+
+    # Timestamp prefix + one alternation over all event patterns
+    LINE_RE = _compile_line_regex(PATTERNS)
+
+    # findall() tuple positions holding each event type's fields
+    GROUP_INDEX = _field_group_index(PATTERNS)
+
+    def __init__(self, log_file: str, start_offset: int = 0):
         """
         Initialize parser
 
         Args:
             log_file: Path to trading.log file
+            start_offset: Byte offset to start parsing from (e.g. a previously
+                saved `offset`); 0 parses the whole file
         """
         self.log_file = Path(log_file)
         if not self.log_file.exists():
             raise FileNotFoundError(f"Log file not found: {log_file}")
 
-        self.log_content = self.log_file.read_text()
-        self.events = []
+        self.offset = start_offset
+        self.events = pd.DataFrame()
 
     def parse_log(self) -> pd.DataFrame:
         """
         Parse log file and return DataFrame with all events
 
+        Parses from the parser's start offset to end of file, including a
+        final line without a trailing newline.
+
         Returns:
             DataFrame with columns:
             - timestamp: datetime
@@ -71,61 +134,153 @@ class TradeLogParser:
         """
         logger.info(f"Parsing log file: {self.log_file}")
 
-        events = []
+        df = self._parse_from(self.offset, consume_partial=True)
+        self.events = df
 
-        for line in self.log_content.splitlines():
-            # Extract timestamp from log line
-            timestamp_match = re.search(r'^(\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2}),\d+', line)
-            if not timestamp_match:
-                continue
+        if df.empty:
+            logger.warning("No events found in log file")
+            return df
 
-            timestamp_str = timestamp_match.group(1)
-            timestamp = datetime.strptime(timestamp_str, '%Y-%m-%d %H:%M:%S')
+        logger.info(f"Parsed {len(df)} events:")
+        for event_type, count in df['event_type'].value_counts(sort=False).items():
+            logger.info(f"  {event_type}: {count}")
 
-            # Try each pattern
-            for event_type, pattern in self.PATTERNS.items():
-                match = re.search(pattern, line)
-                if match:
-                    event = {'timestamp': timestamp, 'event_type': event_type.upper()}
+        return df
 
-                    if event_type == 'tick':
-                        event['symbol'] = match.group(1)
-                        event['price'] = float(match.group(2))
-                        event['tick_time'] = match.group(3)
+    def tail(self) -> pd.DataFrame:
+        """
+        Parse only lines appended since the last parse
 
-                    elif event_type == 'feat':
-                        event['feature_count'] = int(match.group(1))
-                        event['symbol'] = match.group(2)
+        A trailing line without newline is left for the next call (it may
+        still be being written). If the file shrank (rotation/truncation),
+        parsing restarts from the beginning.
 
-                    elif event_type == 'pred':
-                        event['signal'] = int(match.group(1))
-                        event['signal_name'] = match.group(2)  # BUY/SELL/HOLD
+        Returns:
+            DataFrame of new events (same columns as parse_log); the new
+            events are also appended to `events`
+        """
+        if self.log_file.stat().st_size < self.offset:
+            logger.info(f"Log file truncated, re-parsing from start: {self.log_file}")
+            self.offset = 0
+            self.events = pd.DataFrame()
 
-                    elif event_type == 'exec':
-                        event['side'] = match.group(1)  # BUY/SELL
-                        event['volume'] = float(match.group(2))
-                        event['symbol'] = match.group(3)
-                        event['price'] = float(match.group(4))
+        new_events = self._parse_from(self.offset, consume_partial=False)
 
-                    elif event_type == 'fill':
-                        event['ticket'] = int(match.group(1))
-                        event['filled_price'] = float(match.group(2))
+        if not new_events.empty:
+            if self.events.empty:
+                self.events = new_events
+            else:
+                self.events = pd.concat([self.events, new_events], ignore_index=True)
 
-                    events.append(event)
-                    break  # Found a match, no need to check other patterns
+        return new_events
 
-        df = pd.DataFrame(events)
+    def _parse_from(self, start: int, consume_partial: bool) -> pd.DataFrame:
+        """
+        Stream the file from `start` and build the event frame column-wise
 
-        if df.empty:
-            logger.warning("No events found in log file")
-            return df
+        Args:
+            start: Byte offset to seek to
+            consume_partial: Also parse a final line without newline
 
-        logger.info(f"Parsed {len(df)} events:")
-        for event_type in df['event_type'].unique():
-            count = len(df[df['event_type'] == event_type])
-            logger.info(f"  {event_type}: {count}")
+        Returns:
+            Event DataFrame; self.offset is advanced past the consumed lines
+        """
+        findall = self.LINE_RE.findall
+        parts = []
+        pos = start
+        remainder = b''
+
+        with open(self.log_file, 'rb') as f:
+            f.seek(start)
+            while True:
+                block = f.read(CHUNK_SIZE)
+                if not block:
+                    break
+
+                block = remainder + block
+                cut = block.rfind(b'\n') + 1
+                remainder = block[cut:]
+                if cut:
+                    rows = findall(block, 0, cut)
+                    if rows:
+                        parts.append(self._chunk_columns(rows))
+                    pos += cut
+
+        if remainder and consume_partial:
+            rows = findall(remainder)
+            if rows:
+                parts.append(self._chunk_columns(rows))
+            pos += len(remainder)
+
+        self.offset = pos
+        return self._build_frame(parts)
+
+    def _chunk_columns(self, rows: List[tuple]) -> Dict[str, np.ndarray]:
+        """
+        Convert one chunk of findall() tuples into typed column arrays
 
-        return df
+        Args:
+            rows: findall() results (b'' for groups of other event types)
+
+        Returns:
+            Dict column -> array of len(rows); absent fields are NaN
+        """
+        matrix = np.array(rows, dtype=bytes)
+        total = len(matrix)
+
+        # Fixed-format timestamps: one vectorized cast instead of strptime per line
+        stamps = np.char.add(np.char.add(matrix[:, 0], b'T'), matrix[:, 1])
+        columns = {
+            'timestamp': stamps.astype('U19').astype('datetime64[s]').astype('datetime64[ns]'),
+            'event_type': np.full(total, np.nan, dtype=object),
+        }
+
+        for name, positions in self.GROUP_INDEX.items():
+            # Every pattern's first group needs at least one character
+            mask = matrix[:, positions[0]] != b''
+            if not mask.any():
+                continue
+
+            columns['event_type'][mask] = name.upper()
+            for position, (field, kind) in zip(positions, self.FIELDS[name]):
+                if field not in columns:
+                    columns[field] = np.full(total, np.nan, dtype=object if kind is str else np.float64)
+                raw = matrix[mask, position]
+                if kind is str:
+                    columns[field][mask] = np.char.decode(raw, 'utf-8').astype(object)
+                else:
+                    columns[field][mask] = raw.astype(np.float64)
+
+        return columns
+
+    def _build_frame(self, parts: List[Dict[str, np.ndarray]]) -> pd.DataFrame:
+        """Concatenate chunk columns into one DataFrame in log order"""
+        if not parts:
+            return pd.DataFrame()
+
+        kinds = {
+            field: kind for event_fields in self.FIELDS.values() for field, kind in event_fields
+        }
+        data = {}
+        for field in self.COLUMNS:
+            if not any(field in part for part in parts):
+                continue
+
+            pieces = []
+            for part in parts:
+                if field in part:
+                    pieces.append(part[field])
+                else:
+                    size = len(part['timestamp'])
+                    pieces.append(np.full(size, np.nan, dtype=object if kinds[field] is str else np.float64))
+            column = np.concatenate(pieces) if len(pieces) > 1 else pieces[0]
+
+            # Integer fields stay int64 when every event has them (list-of-dicts inference)
+            if kinds.get(field) is int and not np.isnan(column).any():
+                column = column.astype(np.int64)
+            data[field] = column
+
+        return pd.DataFrame(data)
 
     def generate_ohlc(
         self,
@@ -146,10 +301,7 @@ class TradeLogParser:
         logger.info(f"Generating OHLC for {symbol} @ {timeframe}")
 
         # Parse log if not already done
-        if not self.events or len(self.events) == 0:
-            df = self.parse_log()
-        else:
-            df = pd.DataFrame(self.events)
+        df = self.events if not self.events.empty else self.parse_log()
 
         # Filter tick events for symbol
         ticks = df[
@@ -196,10 +348,7 @@ class TradeLogParser:
         logger.info("Extracting trades from log")
 
         # Parse log if not already done
-        if not self.events or len(self.events) == 0:
-            df = self.parse_log()
-        else:
-            df = pd.DataFrame(self.events)
+        df = self.events if not self.events.empty else self.parse_log()
 
         # Get execution events
         execs = df[df['event_type'] == 'EXEC'].copy()
@@ -271,10 +420,7 @@ class TradeLogParser:
             - avg_pnl: float (average % P&L per closed trade)
         """
         # Parse log if not already done
-        if not self.events or len(self.events) == 0:
-            df = self.parse_log()
-        else:
-            df = pd.DataFrame(self.events)
+        df = self.events if not self.events.empty else self.parse_log()
 
         trades = self.extract_trades()
 
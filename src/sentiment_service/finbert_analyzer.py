@@ -2,10 +2,11 @@
 
 使用预训练的 FinBERT 模型进行金融文本情感分析
 """
+import hashlib
 import logging
 import os
+from collections import OrderedDict
 from typing import Dict, List, Tuple, Optional
-from functools import lru_cache
 
 import torch
 from transformers import AutoTokenizer, AutoModelForSequenceClassification
@@ -22,7 +23,7 @@ class FinBERTAnalyzer:
     2. 对金融新闻文本进行情感分析
     3. 返回情感标签和分数（positive/negative/neutral）
     4. 支持批量处理
-    5. 结果缓存（避免重复分析）
+    5. 结果缓存（按文本哈希的 LRU，重复标题无需重新计算）
     """
 
     # 可用的 FinBERT 模型
@@ -38,6 +39,8 @@ class FinBERTAnalyzer:
         model_name: str = 'finbert',
         device: Optional[str] = None,
         cache_dir: Optional[str] = None,
+        cache_size: int = 4096,
+        max_length: int = 512,
     ):
         """初始化分析器
 
@@ -45,6 +48,8 @@ class FinBERTAnalyzer:
             model_name: 模型名称，可选 'finbert' 或 'finbert-tone'
             device: 设备，'cpu' 或 'cuda'，None则自动检测
             cache_dir: 模型缓存目录
+            cache_size: 结果 LRU 缓存条目数（0 关闭缓存）
+            max_length: 最大 token 长度（超出截断）
         """
         if model_name not in self.AVAILABLE_MODELS:
             raise ValueError(
@@ -76,7 +81,13 @@ class FinBERTAnalyzer:
         # 加载模型和分词器
         self._load_model()
 
+        self.cache_size = cache_size
+        self.max_length = max_length
+        self._cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+
         self.analysis_count = 0
+        self.cache_hits = 0
+        self.forward_passes = 0
 
     def _load_model(self):
         """加载模型和分词器"""
@@ -120,7 +131,6 @@ class FinBERTAnalyzer:
             logger.error(f"✗ 模型加载失败: {e}", exc_info=True)
             raise
 
-    @torch.no_grad()
     def analyze(
         self,
         text: str,
@@ -140,70 +150,7 @@ class FinBERTAnalyzer:
                 'all_scores': {'positive': 0.85, 'negative': 0.05, 'neutral': 0.10}  # 可选
             }
         """
-        if not text or not text.strip():
-            return {
-                'sentiment': 'neutral',
-                'score': 0.0,
-                'confidence': 0.0
-            }
-
-        try:
-            # 分词
-            inputs = self.tokenizer(
-                text,
-                return_tensors='pt',
-                truncation=True,
-                max_length=512,
-                padding=True
-            )
-
-            # 移动到设备
-            inputs = {k: v.to(self.device) for k, v in inputs.items()}
-
-            # 推理
-            outputs = self.model(**inputs)
-            logits = outputs.logits
-
-            # 计算概率
-            probs = torch.softmax(logits, dim=1)[0].cpu().numpy()
-
-            # 获取最大概率的标签
-            predicted_class = int(np.argmax(probs))
-            sentiment = self.SENTIMENT_LABELS[predicted_class]
-            confidence = float(probs[predicted_class])
-
-            # 计算情感分数（positive - negative，范围 -1 到 1）
-            score = float(probs[0] - probs[1])  # positive - negative
-
-            self.analysis_count += 1
-
-            result = {
-                'sentiment': sentiment,
-                'score': score,
-                'confidence': confidence
-            }
-
-            if return_all_scores:
-                result['all_scores'] = {
-                    label: float(prob)
-                    for label, prob in zip(self.SENTIMENT_LABELS, probs)
-                }
-
-            logger.debug(
-                f"分析完成: sentiment={sentiment}, score={score:.3f}, "
-                f"confidence={confidence:.3f}"
-            )
-
-            return result
-
-        except Exception as e:
-            logger.error(f"情感分析失败: {e}", exc_info=True)
-            return {
-                'sentiment': 'neutral',
-                'score': 0.0,
-                'confidence': 0.0,
-                'error': str(e)
-            }
+        return self.analyze_batch([text], return_all_scores=return_all_scores)[0]
 
     def analyze_with_ticker_context(
         self,
@@ -223,10 +170,57 @@ class FinBERTAnalyzer:
         Returns:
             情感分析结果
         """
-        # 查找 ticker 在文本中的位置
-        ticker_positions = []
+        return self.analyze_ticker_contexts([(text, ticker)], context_window)[0]
 
-        # 搜索 $TICKER 格式
+    def analyze_ticker_contexts(
+        self,
+        items: List[Tuple[str, str]],
+        context_window: int = 200,
+        batch_size: int = 32
+    ) -> List[Dict[str, any]]:
+        """批量分析多个 (文本, ticker) 的目标级情感
+
+        所有 ticker 上下文窗口合并为一次批量推理（一个事件批次的
+        全部文章 × ticker 只需一轮前向计算）
+
+        Args:
+            items: [(完整文本, ticker), ...]
+            context_window: 上下文窗口大小（字符数）
+            batch_size: 每次前向计算的最大文本数
+
+        Returns:
+            与 items 一一对应的情感分析结果（含 ticker 和 context_used）
+        """
+        windows = [
+            self._extract_ticker_context(text, ticker, context_window)
+            for text, ticker in items
+        ]
+        results = self.analyze_batch(
+            [context for context, _ in windows],
+            batch_size=batch_size,
+            return_all_scores=True
+        )
+
+        for result, (_, ticker), (_, context_used) in zip(results, items, windows):
+            result['ticker'] = ticker
+            result['context_used'] = context_used
+
+        return results
+
+    @staticmethod
+    def _extract_ticker_context(
+        text: str,
+        ticker: str,
+        context_window: int
+    ) -> Tuple[str, bool]:
+        """提取 ticker 相关的文本片段
+
+        按 $TICKER、空格包围等模式依次查找，使用第一个匹配模式的首次出现位置；
+        未找到 ticker 时返回整篇文本
+
+        Returns:
+            (待分析文本, 是否使用了上下文)
+        """
         search_patterns = [
             f'${ticker}',
             f' {ticker} ',
@@ -236,71 +230,169 @@ class FinBERTAnalyzer:
         ]
 
         for pattern in search_patterns:
-            start = 0
-            while True:
-                pos = text.find(pattern, start)
-                if pos == -1:
-                    break
-                ticker_positions.append(pos)
-                start = pos + 1
-
-        # 如果找到 ticker，提取相关片段
-        if ticker_positions:
-            # 使用第一个出现位置
-            pos = ticker_positions[0]
-
-            # 提取上下文
-            start = max(0, pos - context_window)
-            end = min(len(text), pos + len(ticker) + context_window)
-
-            context_text = text[start:end].strip()
-
-            logger.debug(
-                f"提取 ticker '{ticker}' 上下文: "
-                f"{context_text[:100]}..."
-            )
-
-            # 分析上下文
-            result = self.analyze(context_text, return_all_scores=True)
-            result['ticker'] = ticker
-            result['context_used'] = True
+            pos = text.find(pattern)
+            if pos != -1:
+                start = max(0, pos - context_window)
+                end = min(len(text), pos + len(ticker) + context_window)
+                return text[start:end].strip(), True
 
-            return result
-        else:
-            # 如果没有找到 ticker，分析整篇文本
-            logger.debug(f"未找到 ticker '{ticker}'，分析整篇文本")
-
-            result = self.analyze(text, return_all_scores=True)
-            result['ticker'] = ticker
-            result['context_used'] = False
-
-            return result
+        logger.debug(f"未找到 ticker '{ticker}'，分析整篇文本")
+        return text, False
 
     def analyze_batch(
         self,
         texts: List[str],
-        batch_size: int = 8
+        batch_size: int = 32,
+        return_all_scores: bool = False
     ) -> List[Dict[str, any]]:
         """批量分析文本
 
+        重复文本和最近分析过的文本（LRU 缓存）不会重复计算；
+        其余文本按 token 长度分桶后动态 padding，每个桶一次前向计算
+
         Args:
             texts: 文本列表
-            batch_size: 批处理大小
+            batch_size: 每次前向计算的最大文本数
+            return_all_scores: 是否返回所有标签的分数
 
         Returns:
             分析结果列表
         """
-        results = []
+        valid = [text for text in texts if text and text.strip()]
+
+        try:
+            probs = self._predict_probs(valid, batch_size)
+        except Exception as e:
+            logger.error(f"情感分析失败: {e}", exc_info=True)
+            return [
+                {'sentiment': 'neutral', 'score': 0.0, 'confidence': 0.0, 'error': str(e)}
+                if text and text.strip() else self._empty_result()
+                for text in texts
+            ]
 
-        for i in range(0, len(texts), batch_size):
-            batch_texts = texts[i:i + batch_size]
+        self.analysis_count += len(valid)
 
-            for text in batch_texts:
-                result = self.analyze(text)
-                results.append(result)
+        results = []
+        for text in texts:
+            if not text or not text.strip():
+                results.append(self._empty_result())
+            else:
+                results.append(self._build_result(probs[text], return_all_scores))
 
         return results
 
+    @staticmethod
+    def _empty_result() -> Dict[str, any]:
+        return {
+            'sentiment': 'neutral',
+            'score': 0.0,
+            'confidence': 0.0
+        }
+
+    def _build_result(
+        self,
+        probs: np.ndarray,
+        return_all_scores: bool
+    ) -> Dict[str, any]:
+        """概率向量 → 情感结果"""
+        # 获取最大概率的标签
+        predicted_class = int(np.argmax(probs))
+        sentiment = self.SENTIMENT_LABELS[predicted_class]
+        confidence = float(probs[predicted_class])
+
+        # 计算情感分数（positive - negative，范围 -1 到 1）
+        score = float(probs[0] - probs[1])  # positive - negative
+
+        result = {
+            'sentiment': sentiment,
+            'score': score,
+            'confidence': confidence
+        }
+
+        if return_all_scores:
+            result['all_scores'] = {
+                label: float(prob)
+                for label, prob in zip(self.SENTIMENT_LABELS, probs)
+            }
+
+        return result
+
+    @staticmethod
+    def _cache_key(text: str) -> str:
+        return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+    def _predict_probs(
+        self,
+        texts: List[str],
+        batch_size: int
+    ) -> Dict[str, np.ndarray]:
+        """计算文本的标签概率（带 LRU 缓存）
+
+        Returns:
+            {text: 概率向量}
+        """
+        probs = {}
+        misses = []
+        for text in dict.fromkeys(texts):
+            key = self._cache_key(text)
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                probs[text] = cached
+                self.cache_hits += 1
+            else:
+                misses.append(text)
+
+        if not misses:
+            return probs
+
+        for text, row in zip(misses, self._forward(misses, batch_size)):
+            probs[text] = row
+            if self.cache_size > 0:
+                self._cache[self._cache_key(text)] = row
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        return probs
+
+    @torch.inference_mode()
+    def _forward(
+        self,
+        texts: List[str],
+        batch_size: int
+    ) -> np.ndarray:
+        """长度分桶 + 动态 padding 的批量前向计算
+
+        Returns:
+            (len(texts), 3) 概率矩阵，行顺序与 texts 一致
+        """
+        # 一次分词（不 padding），按 token 长度排序后切批，
+        # 每批只 padding 到批内最长序列
+        encoded = self.tokenizer(
+            texts,
+            truncation=True,
+            max_length=self.max_length
+        )
+        order = sorted(range(len(texts)), key=lambda i: len(encoded['input_ids'][i]))
+
+        output = np.empty((len(texts), len(self.SENTIMENT_LABELS)), dtype=np.float32)
+        for start in range(0, len(order), batch_size):
+            chunk = order[start:start + batch_size]
+            inputs = self.tokenizer.pad(
+                {key: [values[i] for i in chunk] for key, values in encoded.items()},
+                return_tensors='pt'
+            )
+
+            # 移动到设备
+            inputs = {k: v.to(self.device) for k, v in inputs.items()}
+
+            # 推理
+            logits = self.model(**inputs).logits
+            output[chunk] = torch.softmax(logits, dim=1).cpu().numpy()
+            self.forward_passes += 1
+
+        return output
+
     def get_stats(self) -> Dict[str, any]:
         """获取统计信息"""
         return {
@@ -308,6 +400,9 @@ class FinBERTAnalyzer:
             'model_path': self.model_path,
             'device': self.device,
             'analysis_count': self.analysis_count,
+            'cache_hits': self.cache_hits,
+            'cache_entries': len(self._cache),
+            'forward_passes': self.forward_passes,
         }
 
 
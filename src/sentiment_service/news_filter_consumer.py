@@ -7,7 +7,7 @@
 import logging
 import sys
 import os
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple
 import json
 
 # 添加父目录到路径
@@ -27,7 +27,7 @@ class NewsFilterConsumer(BaseEventConsumer):
 
     功能：
     1. 从 mt5:events:news_raw 消费原始新闻
-    2. 使用 FinBERT 对每个 ticker 进行目标级情感分析
+    2. 使用 FinBERT 对每个 ticker 进行目标级情感分析（整批一次推理）
     3. 根据情感强度阈值过滤
     4. 发布过滤后的新闻到 mt5:events:news_filtered
     """
@@ -92,61 +92,109 @@ class NewsFilterConsumer(BaseEventConsumer):
         Returns:
             处理是否成功
         """
-        try:
-            self.processed_count += 1
+        return self.process_batch([(event_id, event_data)])[0]
 
-            logger.info(f"\n处理新闻: {event_id}")
-            logger.info(f"  标题: {event_data.get('title', 'N/A')}")
+    def process_batch(
+        self,
+        events: List[Tuple[str, Dict[str, Any]]]
+    ) -> List[bool]:
+        """批量处理新闻事件
 
-            # 1. 提取 tickers
-            tickers = self._extract_tickers(event_data)
+        整批新闻的全部 (文章, ticker) 上下文只做一次 FinBERT 批量推理
 
-            if not tickers:
-                logger.info(f"  跳过：没有提取到 ticker")
-                return True  # 成功但不发布
+        Args:
+            events: [(事件ID, 新闻数据), ...]
 
-            logger.info(f"  提取到 {len(tickers)} 个 tickers: {tickers}")
+        Returns:
+            与 events 一一对应的处理结果
+        """
+        results = [True] * len(events)
 
-            # 2. 对每个 ticker 进行情感分析
-            ticker_sentiments = self._analyze_ticker_sentiments(
-                event_data,
-                tickers
-            )
+        # 1. 提取 tickers
+        pending = []
+        for index, (event_id, event_data) in enumerate(events):
+            try:
+                self.processed_count += 1
 
-            if not ticker_sentiments:
-                logger.info(f"  跳过：没有符合阈值的 ticker")
-                self.filtered_count += 1
-                return True
+                logger.info(f"\n处理新闻: {event_id}")
+                logger.info(f"  标题: {event_data.get('title', 'N/A')}")
 
-            logger.info(f"  过滤后保留 {len(ticker_sentiments)} 个 tickers")
+                tickers = self._extract_tickers(event_data)
 
-            # 3. 构造过滤后的新闻数据
-            filtered_news = self._build_filtered_news(
-                event_data,
-                ticker_sentiments
-            )
+                if not tickers:
+                    logger.info(f"  跳过：没有提取到 ticker")
+                    continue  # 成功但不发布
+
+                logger.info(f"  提取到 {len(tickers)} 个 tickers: {tickers}")
+                pending.append((index, event_data, tickers))
+
+            except Exception as e:
+                logger.error(f"处理新闻失败: {e}", exc_info=True)
+                results[index] = False
 
-            # 4. 发布到输出 stream
-            message_id = self.output_producer.produce(
-                filtered_news,
-                event_type='news_filtered'
+        if not pending:
+            return results
+
+        # 2. 对整批的每个 ticker 进行情感分析
+        try:
+            batch_sentiments = self._analyze_ticker_sentiments_batch(
+                [(event_data, tickers) for _, event_data, tickers in pending]
             )
+        except Exception as e:
+            logger.error(f"批量情感分析失败: {e}", exc_info=True)
+            for index, _, _ in pending:
+                results[index] = False
+            return results
+
+        # 3. 过滤并发布
+        for (index, event_data, _), ticker_sentiments in zip(pending, batch_sentiments):
+            try:
+                self._publish_filtered(event_data, ticker_sentiments)
+            except Exception as e:
+                logger.error(f"处理新闻失败: {e}", exc_info=True)
+                results[index] = False
+
+        return results
+
+    def _publish_filtered(
+        self,
+        event_data: Dict[str, Any],
+        ticker_sentiments: List[Dict[str, Any]]
+    ):
+        """发布通过阈值过滤的新闻
+
+        Args:
+            event_data: 新闻数据
+            ticker_sentiments: 符合阈值的 ticker 情感列表
+        """
+        if not ticker_sentiments:
+            logger.info(f"  跳过：没有符合阈值的 ticker")
+            self.filtered_count += 1
+            return
 
-            if message_id:
-                self.published_count += 1
-                logger.info(f"  ✓ 已发布到 filtered stream: {message_id}")
-            else:
-                logger.warning(f"  ✗ 发布失败")
+        logger.info(f"  过滤后保留 {len(ticker_sentiments)} 个 tickers")
 
-            # 5. 每处理10条打印统计
-            if self.processed_count % 10 == 0:
-                self._log_stats()
+        # 构造过滤后的新闻数据
+        filtered_news = self._build_filtered_news(
+            event_data,
+            ticker_sentiments
+        )
 
-            return True
+        # 发布到输出 stream
+        message_id = self.output_producer.produce(
+            filtered_news,
+            event_type='news_filtered'
+        )
 
-        except Exception as e:
-            logger.error(f"处理新闻失败: {e}", exc_info=True)
-            return False
+        if message_id:
+            self.published_count += 1
+            logger.info(f"  ✓ 已发布到 filtered stream: {message_id}")
+        else:
+            logger.warning(f"  ✗ 发布失败")
+
+        # 每处理10条打印统计
+        if self.processed_count % 10 == 0:
+            self._log_stats()
 
     def _extract_tickers(self, event_data: Dict[str, Any]) -> List[str]:
         """提取 tickers
@@ -184,53 +232,71 @@ class NewsFilterConsumer(BaseEventConsumer):
         Returns:
             符合阈值的 ticker 情感列表
         """
-        title = event_data.get('title', '')
-        content = event_data.get('content', '')
-        full_text = f"{title}. {content}"
-
-        ticker_sentiments = []
-
-        for ticker in tickers:
-            # 分析该 ticker 的情感
-            result = self.analyzer.analyze_with_ticker_context(
-                full_text,
-                ticker,
-                context_window=200
-            )
-
-            sentiment = result['sentiment']
-            score = result['score']
-            confidence = result['confidence']
+        return self._analyze_ticker_sentiments_batch([(event_data, tickers)])[0]
 
-            logger.debug(
-                f"    Ticker {ticker}: {sentiment} "
-                f"(score={score:.3f}, conf={confidence:.3f})"
-            )
+    def _analyze_ticker_sentiments_batch(
+        self,
+        events: List[Tuple[Dict[str, Any], List[str]]]
+    ) -> List[List[Dict[str, Any]]]:
+        """对一批新闻的全部 (文章, ticker) 做一次批量情感分析
 
-            # 应用过滤条件
-            if (abs(score) >= self.sentiment_threshold and
-                confidence >= self.min_confidence):
+        Args:
+            events: [(新闻数据, ticker 列表), ...]
 
-                ticker_sentiments.append({
-                    'ticker': ticker,
-                    'sentiment': sentiment,
-                    'score': score,
-                    'confidence': confidence,
-                    'context_used': result.get('context_used', False)
-                })
+        Returns:
+            与 events 一一对应的、符合阈值的 ticker 情感列表
+        """
+        items = []
+        for event_data, tickers in events:
+            title = event_data.get('title', '')
+            content = event_data.get('content', '')
+            full_text = f"{title}. {content}"
+            items.extend((full_text, ticker) for ticker in tickers)
+
+        # 所有 ticker 上下文窗口一次前向计算
+        results = iter(self.analyzer.analyze_ticker_contexts(items, context_window=200))
+
+        batch_sentiments = []
+        for _, tickers in events:
+            ticker_sentiments = []
+            for ticker in tickers:
+                result = next(results)
+
+                sentiment = result['sentiment']
+                score = result['score']
+                confidence = result['confidence']
 
-                logger.info(
-                    f"    ✓ {ticker}: {sentiment} "
-                    f"(score={score:.3f}, conf={confidence:.3f})"
-                )
-            else:
                 logger.debug(
-                    f"    ✗ {ticker}: 不符合阈值 "
-                    f"(|{score:.3f}| < {self.sentiment_threshold} or "
-                    f"{confidence:.3f} < {self.min_confidence})"
+                    f"    Ticker {ticker}: {sentiment} "
+                    f"(score={score:.3f}, conf={confidence:.3f})"
                 )
 
-        return ticker_sentiments
+                # 应用过滤条件
+                if (abs(score) >= self.sentiment_threshold and
+                    confidence >= self.min_confidence):
+
+                    ticker_sentiments.append({
+                        'ticker': ticker,
+                        'sentiment': sentiment,
+                        'score': score,
+                        'confidence': confidence,
+                        'context_used': result.get('context_used', False)
+                    })
+
+                    logger.info(
+                        f"    ✓ {ticker}: {sentiment} "
+                        f"(score={score:.3f}, conf={confidence:.3f})"
+                    )
+                else:
+                    logger.debug(
+                        f"    ✗ {ticker}: 不符合阈值 "
+                        f"(|{score:.3f}| < {self.sentiment_threshold} or "
+                        f"{confidence:.3f} < {self.min_confidence})"
+                    )
+
+            batch_sentiments.append(ticker_sentiments)
+
+        return batch_sentiments
 
     def _build_filtered_news(
         self,
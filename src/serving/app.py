@@ -11,15 +11,20 @@ Feature Serving API (FastAPI)
     python3 -m uvicorn src.serving.app:app --host 0.0.0.0 --port 8000 --reload
 """
 
+import asyncio
+import io
+import json
 import logging
+import os
 import sys
 from pathlib import Path
 from datetime import datetime
-from typing import List
+from typing import List, Optional, Tuple
 
-from fastapi import FastAPI, HTTPException, status
+import numpy as np
+from fastapi import FastAPI, HTTPException, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from pydantic import ValidationError
 
 # Add project root to path
@@ -29,9 +34,24 @@ sys.path.insert(0, str(PROJECT_ROOT))
 from src.serving.models import (
     HistoricalRequest, LatestRequest,
     HistoricalResponse, LatestResponse, ErrorResponse, HealthResponse,
-    FeatureDataPoint, InvocationRequest, InvocationResponse
+    InvocationRequest, InvocationResponse, VALID_FEATURES, VALID_SYMBOLS
 )
 from src.serving.handlers import FeatureService
+from src.serving.feature_map import SENTINEL_DIM, FeatureMapper
+from src.serving.online_store import build_online_store
+from src.serving.serializers import (
+    ARROW_STREAM_MEDIA_TYPE, NDJSON_MEDIA_TYPE,
+    historical_json_bytes, iter_arrow_stream, iter_ndjson
+)
+from src.serving.concurrency import (
+    BoundedExecutor, ExecutorSaturatedError, MicroBatcher, SingleFlight
+)
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+except ImportError:  # Arrow IPC payloads unavailable
+    pa = None
 
 # Configure logging
 logging.basicConfig(
@@ -40,6 +60,29 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Read once at import; toggling mock mode requires a restart
+ENABLE_MOCK_INFERENCE = os.getenv("ENABLE_MOCK_INFERENCE", "false").lower() == "true"
+
+# Binary /invocations payloads (skip JSON parsing)
+NPY_CONTENT_TYPE = "application/x-npy"
+ARROW_CONTENT_TYPES = ("application/vnd.apache.arrow.stream", "application/vnd.apache.arrow.file")
+
+# Blocking Feast / model work runs on bounded thread pools, not the event loop.
+# Separate pools so slow offline queries never queue in front of inference.
+FEATURE_WORKERS = int(os.getenv("SERVING_FEATURE_WORKERS", str(min(32, (os.cpu_count() or 1) + 4))))
+INFERENCE_WORKERS = int(os.getenv("SERVING_INFERENCE_WORKERS", str(min(8, os.cpu_count() or 1))))
+EXECUTOR_QUEUE = int(os.getenv("SERVING_EXECUTOR_QUEUE", "256"))
+# Concurrent /invocations requests arriving within this window share one model call
+BATCH_WINDOW_MS = float(os.getenv("INVOCATION_BATCH_WINDOW_MS", "2"))
+BATCH_MAX_ROWS = int(os.getenv("INVOCATION_BATCH_MAX_ROWS", "8192"))
+# Rows per NDJSON / Arrow chunk for streamed /features/historical responses
+HISTORICAL_CHUNK_ROWS = int(os.getenv("HISTORICAL_CHUNK_ROWS", "65536"))
+# JSON bodies larger than this are parsed on the executor
+OFFLOAD_PARSE_BYTES = 256 * 1024
+# Seconds between refreshes of the online store from Feast (0 disables the job)
+MATERIALIZE_INTERVAL_S = float(os.getenv("FEATURE_MATERIALIZE_INTERVAL_S", "60"))
+MATERIALIZE_LOOKBACK_DAYS = int(os.getenv("FEATURE_MATERIALIZE_LOOKBACK_DAYS", "7"))
+
 # Color codes
 GREEN = "\033[92m"
 RED = "\033[91m"
@@ -73,6 +116,8 @@ app.add_middleware(
 
 feature_service = None
 model_predictor = None  # Global model instance
+feature_mapper = None   # Cached Sentinel -> model index map
+materialize_task = None  # Periodic online-store refresh
 
 
 def get_feature_service() -> FeatureService:
@@ -80,7 +125,10 @@ def get_feature_service() -> FeatureService:
     global feature_service
     if feature_service is None:
         try:
-            feature_service = FeatureService(repo_path="src/feature_store")
+            feature_service = FeatureService(
+                repo_path="src/feature_store",
+                online_store=build_online_store()
+            )
         except Exception as e:
             logger.error(f"{RED}❌ 无法初始化特征服务: {e}{RESET}")
             raise
@@ -93,11 +141,8 @@ def get_model_predictor():
     if model_predictor is None:
         # Import here to avoid circular dependencies
         from src.model.predict import PricePredictor
-        import os
-
-        enable_mock = os.getenv("ENABLE_MOCK_INFERENCE", "false").lower() == "true"
 
-        if enable_mock:
+        if ENABLE_MOCK_INFERENCE:
             logger.warning(f"{RED}⚠️ [MOCK MODE ENABLED] Using mock predictions{RESET}")
             return None  # Signal mock mode
         else:
@@ -116,6 +161,64 @@ def get_model_predictor():
     return model_predictor
 
 
+def get_feature_mapper(model_features: Optional[List[str]]) -> FeatureMapper:
+    """获取与模型特征顺序匹配的 FeatureMapper (索引映射只构建一次)"""
+    global feature_mapper
+    if feature_mapper is None or (model_features and feature_mapper.model_features != list(model_features)):
+        feature_mapper = FeatureMapper(list(model_features) if model_features else None)
+    return feature_mapper
+
+
+def _predict_batch(matrix: np.ndarray) -> np.ndarray:
+    """(n, 23) Sentinel 矩阵 → (n,) 概率; 在执行器线程中运行"""
+    predictor = get_model_predictor()
+    if predictor is None:
+        raise RuntimeError("Model predictor not available")
+    # Map Sentinel's 23 features to the model's features in one gather, one model call
+    mapper = get_feature_mapper(predictor.feature_names)
+    return np.asarray(predictor.predict_proba(mapper.map_batch(matrix)), dtype=np.float64)
+
+
+feature_executor = BoundedExecutor(max_workers=FEATURE_WORKERS, max_queue=EXECUTOR_QUEUE, name="features")
+inference_executor = BoundedExecutor(max_workers=INFERENCE_WORKERS, max_queue=EXECUTOR_QUEUE, name="inference")
+feature_flights = SingleFlight()
+invocation_batcher = MicroBatcher(
+    _predict_batch, inference_executor, max_wait_ms=BATCH_WINDOW_MS, max_batch_rows=BATCH_MAX_ROWS
+)
+
+
+def _saturated(e: ExecutorSaturatedError) -> HTTPException:
+    logger.warning(f"{RED}⚠️ 执行器已满, 拒绝请求: {e}{RESET}")
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail={
+            "status": "error",
+            "message": str(e),
+            "error_code": "OVERLOADED"
+        }
+    )
+
+
+async def materialize_online_store(service: FeatureService) -> int:
+    """将全部有效符号 × 特征的最新一行从 Feast 物化到在线存储 (在执行器线程中运行)"""
+    return await feature_executor.run(
+        service.materialize_latest,
+        sorted(VALID_SYMBOLS),
+        sorted(VALID_FEATURES),
+        MATERIALIZE_LOOKBACK_DAYS
+    )
+
+
+async def _materialize_loop(service: FeatureService) -> None:
+    """启动时立即物化一次, 之后每 MATERIALIZE_INTERVAL_S 秒刷新; 失败只记录, 下一轮重试"""
+    while True:
+        try:
+            await materialize_online_store(service)
+        except Exception as e:
+            logger.error(f"{RED}❌ 在线特征物化失败: {e}{RESET}")
+        await asyncio.sleep(MATERIALIZE_INTERVAL_S)
+
+
 # ============================================================================
 # 启动和关闭事件
 # ============================================================================
@@ -124,13 +227,18 @@ def get_model_predictor():
 async def startup_event():
     """应用启动事件"""
     logger.info(f"{CYAN}🚀 Feature Serving API 启动中...{RESET}")
+    global materialize_task
     try:
-        get_feature_service()
+        service = get_feature_service()
         logger.info(f"{GREEN}✅ 特征服务已初始化{RESET}")
 
+        # Keep the online store warm so /features/latest does not miss into Feast
+        if service.online_store is not None and MATERIALIZE_INTERVAL_S > 0:
+            materialize_task = asyncio.create_task(_materialize_loop(service))
+            logger.info(f"{GREEN}✅ 在线特征物化任务已启动 (每 {MATERIALIZE_INTERVAL_S:g}s){RESET}")
+
         # Task #080: Load model at startup
-        import os
-        if os.getenv("ENABLE_MOCK_INFERENCE", "false").lower() != "true":
+        if not ENABLE_MOCK_INFERENCE:
             logger.info(f"{CYAN}📦 加载实时模型 (Task #080)...{RESET}")
             get_model_predictor()
             logger.info(f"{GREEN}✅ 实时模型已加载{RESET}")
@@ -146,6 +254,10 @@ async def startup_event():
 async def shutdown_event():
     """应用关闭事件"""
     logger.info(f"{CYAN}🛑 Feature Serving API 关闭中...{RESET}")
+    if materialize_task is not None:
+        materialize_task.cancel()
+    feature_executor.shutdown(wait=False)
+    inference_executor.shutdown(wait=False)
 
 
 # ============================================================================
@@ -191,14 +303,20 @@ async def health_check():
     "/features/historical",
     response_model=HistoricalResponse,
     responses={
+        200: {"content": {
+            NDJSON_MEDIA_TYPE: {"schema": {"type": "string"}},
+            ARROW_STREAM_MEDIA_TYPE: {"schema": {"type": "string", "format": "binary"}},
+        }},
         400: {"model": ErrorResponse, "description": "无效的请求参数"},
+        406: {"model": ErrorResponse, "description": "不支持的响应格式"},
         500: {"model": ErrorResponse, "description": "服务器内部错误"}
     },
     tags=["Features"],
     summary="历史特征检索 (离线)",
-    description="获取历史特征数据用于模型训练 (批量离线检索)"
+    description="获取历史特征数据用于模型训练 (批量离线检索); "
+                "Accept: application/x-ndjson 或 application/vnd.apache.arrow.stream 时分块流式返回"
 )
-async def get_historical_features(request: HistoricalRequest):
+async def get_historical_features(request: HistoricalRequest, http_request: Request):
     """
     历史特征检索端点
 
@@ -216,6 +334,12 @@ async def get_historical_features(request: HistoricalRequest):
         - row_count: 返回的数据行数
         - execution_time_ms: 执行时间
 
+    流式格式 (按 Accept 头选择, 训练任务拉取大量数据时使用):
+        - application/x-ndjson: 每行一个 {symbol, time, values} 数据点
+        - application/vnd.apache.arrow.stream: Arrow IPC 流,
+          列为 symbol, event_timestamp 与各特征
+        行数与执行时间在 X-Row-Count / X-Execution-Time-Ms 响应头中返回
+
     示例:
         ```json
         {
@@ -235,34 +359,49 @@ async def get_historical_features(request: HistoricalRequest):
         # 获取特征服务
         service = get_feature_service()
 
-        # 调用特征服务
-        data, execution_time = service.get_historical_features(
+        # 调用特征服务 (执行器线程中运行; 相同的在途请求合并为一次查询)
+        key = ("historical", tuple(request.symbols), tuple(request.features),
+               request.start_date, request.end_date)
+        frame, execution_time = await feature_flights.do(key, lambda: feature_executor.run(
+            service.get_historical_frame,
             symbols=request.symbols,
             features=request.features,
             start_date=request.start_date,
             end_date=request.end_date
-        )
+        ))
 
-        # 格式化响应
-        feature_data_points = []
-        for record in data:
-            point = FeatureDataPoint(
-                symbol=record['symbol'],
-                time=record['time'],
-                values=record['values']
-            )
-            feature_data_points.append(point)
+        # 格式化响应 (按列序列化; 结果表在合并的请求间共享, 不可原地修改)
+        accept = http_request.headers.get("accept", "")
+        headers = {"X-Row-Count": str(len(frame)), "X-Execution-Time-Ms": f"{execution_time:.3f}"}
 
-        response = HistoricalResponse(
-            status="success",
-            data=feature_data_points,
-            row_count=len(feature_data_points),
-            execution_time_ms=execution_time
-        )
+        if NDJSON_MEDIA_TYPE in accept:
+            body = iter_ndjson(frame, request.features, HISTORICAL_CHUNK_ROWS)
+            response = StreamingResponse(body, media_type=NDJSON_MEDIA_TYPE, headers=headers)
+        elif any(media_type in accept for media_type in ARROW_CONTENT_TYPES):
+            if pa is None:
+                raise HTTPException(
+                    status_code=status.HTTP_406_NOT_ACCEPTABLE,
+                    detail={
+                        "status": "error",
+                        "message": "Arrow responses require pyarrow",
+                        "error_code": "NOT_ACCEPTABLE"
+                    }
+                )
+            body = iter_arrow_stream(frame, request.features, HISTORICAL_CHUNK_ROWS)
+            response = StreamingResponse(body, media_type=ARROW_STREAM_MEDIA_TYPE, headers=headers)
+        else:
+            body = await feature_executor.run(historical_json_bytes, frame, request.features, execution_time)
+            response = Response(content=body, media_type="application/json", headers=headers)
 
-        logger.info(f"{GREEN}✅ 历史特征检索成功: {len(feature_data_points)} 行{RESET}")
+        logger.info(f"{GREEN}✅ 历史特征检索成功: {len(frame)} 行{RESET}")
         return response
 
+    except HTTPException:
+        raise
+
+    except ExecutorSaturatedError as e:
+        raise _saturated(e)
+
     except ValidationError as e:
         logger.error(f"{RED}❌ 请求验证失败: {e}{RESET}")
         raise HTTPException(
@@ -334,11 +473,13 @@ async def get_latest_features(request: LatestRequest):
         # 获取特征服务
         service = get_feature_service()
 
-        # 调用特征服务
-        data, execution_time = service.get_latest_features(
+        # 调用特征服务 (执行器线程中运行; 相同的在途请求合并为一次查询)
+        key = ("latest", tuple(request.symbols), tuple(request.features))
+        data, execution_time = await feature_flights.do(key, lambda: feature_executor.run(
+            service.get_latest_features,
             symbols=request.symbols,
             features=request.features
-        )
+        ))
 
         response = LatestResponse(
             status="success",
@@ -349,6 +490,9 @@ async def get_latest_features(request: LatestRequest):
         logger.info(f"{GREEN}✅ 实时特征检索成功: {len(data)} 个符号{RESET}")
         return response
 
+    except ExecutorSaturatedError as e:
+        raise _saturated(e)
+
     except ValidationError as e:
         logger.error(f"{RED}❌ 请求验证失败: {e}{RESET}")
         raise HTTPException(
@@ -376,14 +520,98 @@ async def get_latest_features(request: LatestRequest):
 # 模型推理端点
 # ============================================================================
 
+def _decode_binary_payload(body: bytes, content_type: str) -> np.ndarray:
+    """解码二进制推理载荷 (.npy 或 Arrow IPC) 为 (n, 23) 矩阵"""
+    if content_type == NPY_CONTENT_TYPE:
+        matrix = np.load(io.BytesIO(body), allow_pickle=False)
+    else:
+        if pa is None:
+            raise ValueError("pyarrow not installed, Arrow IPC payloads unsupported")
+        reader = (pa.ipc.open_stream if content_type.endswith("stream") else pa.ipc.open_file)(body)
+        table = reader.read_all()
+        # One column per Sentinel feature, in Sentinel order
+        matrix = np.column_stack([column.to_numpy() for column in table.columns]) \
+            if table.num_columns else np.empty((0, 0))
+
+    if matrix.ndim == 1:
+        matrix = matrix.reshape(1, -1)
+    if matrix.ndim != 2 or matrix.shape[1] != SENTINEL_DIM:
+        raise ValueError(f"Expected (n, {SENTINEL_DIM}) feature matrix, got shape {matrix.shape}")
+    return matrix
+
+
+def _parse_json_payload(body: bytes) -> Tuple[np.ndarray, List[dict], str]:
+    """解析 JSON 推理请求为 (n, 23) 矩阵、逐行错误与格式名"""
+    request = InvocationRequest.model_validate(json.loads(body))
+    instances, format_used = _extract_json_instances(request)
+    if not instances:
+        raise ValueError("No data instances provided")
+    matrix, errors = _stack_instances(instances)
+    return matrix, errors, format_used
+
+
+def _extract_json_instances(request: InvocationRequest) -> Tuple[list, str]:
+    """提取 JSON 请求中的实例列表 (支持多种 MLflow 格式)"""
+    if request.dataframe_split is not None:
+        return request.dataframe_split.get("data", []), "dataframe_split"
+    if request.instances is not None:
+        return request.instances, "instances"
+    if request.inputs is not None:
+        return request.inputs, "inputs"
+    raise ValueError("Missing 'dataframe_split', 'instances', or 'inputs' field")
+
+
+def _stack_instances(instances: list) -> Tuple[np.ndarray, List[dict]]:
+    """将 Sentinel 实例 [[X_tabular, X_sequential], ...] 的 X_tabular 堆叠为 (n, 23) 矩阵
+
+    出错的行填 NaN 并记录到错误列表, 不影响其他行。
+    """
+    try:
+        # Fast path: all rows well-formed
+        matrix = np.array([instance[0] for instance in instances], dtype=np.float64)
+        if matrix.shape == (len(instances), SENTINEL_DIM):
+            return matrix, []
+    except (TypeError, ValueError, IndexError, KeyError):
+        pass
+
+    matrix = np.full((len(instances), SENTINEL_DIM), np.nan)
+    errors = []
+    for i, instance_data in enumerate(instances):
+        try:
+            # Sentinel sends: [[X_tabular, X_sequential]] where X_tabular is (23,)
+            if not isinstance(instance_data, list) or len(instance_data) < 1:
+                raise ValueError(
+                    f"Invalid instance format: expected list with >=1 elements, "
+                    f"got {type(instance_data)}"
+                )
+            row = np.asarray(instance_data[0], dtype=np.float64).ravel()
+            if row.shape[0] != SENTINEL_DIM:
+                raise ValueError(f"Expected {SENTINEL_DIM} features from Sentinel, got {row.shape[0]}")
+            matrix[i] = row
+        except Exception as e:
+            errors.append({"index": i, "error": str(e)})
+    return matrix, errors
+
+
 @app.post(
     "/invocations",
     response_model=InvocationResponse,
+    response_model_exclude_none=True,
     tags=["Inference"],
     summary="模型推理 (MLflow Compatible)",
-    description="接收特征数据并返回模型预测结果 (兼容 MLflow serving API)"
+    description="接收特征数据并返回模型预测结果 (兼容 MLflow serving API)",
+    openapi_extra={
+        "requestBody": {
+            "content": {
+                "application/json": {"schema": InvocationRequest.model_json_schema()},
+                NPY_CONTENT_TYPE: {"schema": {"type": "string", "format": "binary"}},
+                ARROW_CONTENT_TYPES[0]: {"schema": {"type": "string", "format": "binary"}},
+            },
+            "required": True,
+        }
+    },
 )
-async def invocations(request: InvocationRequest):
+async def invocations(http_request: Request):
     """
     MLflow兼容的推理端点
 
@@ -391,95 +619,83 @@ async def invocations(request: InvocationRequest):
     1. dataframe_split (Sentinel发送格式)
     2. instances (标准 MLflow)
     3. inputs (替代格式)
+    4. 二进制 (n, 23) 矩阵: application/x-npy 或 Arrow IPC
+       (application/vnd.apache.arrow.stream / .file), 跳过 JSON 解析
+
+    所有行一次映射为 float32 矩阵, 模型只调用一次; 出错的行返回中性
+    预测 0.5, 错误信息在 errors 字段中逐行返回。窗口期内并发到达的请求
+    合并为一次模型调用, 推理在执行器线程中运行, 不阻塞事件循环。
     """
     try:
-        logger.info(f"📥 收到推理请求")
-
-        # Extract input data (support multiple MLflow formats)
-        instances = None
-        format_used = "unknown"
-
-        if request.dataframe_split is not None:
-            instances = request.dataframe_split.get("data", [])
-            format_used = "dataframe_split"
-        elif request.instances is not None:
-            instances = request.instances
-            format_used = "instances"
-        elif request.inputs is not None:
-            instances = request.inputs
-            format_used = "inputs"
+        body = await http_request.body()
+        content_type = http_request.headers.get("content-type", "application/json").split(";")[0].strip()
+
+        errors: List[dict] = []
+        if content_type == NPY_CONTENT_TYPE or content_type in ARROW_CONTENT_TYPES:
+            matrix = _decode_binary_payload(body, content_type)
+            format_used = content_type
+        elif len(body) > OFFLOAD_PARSE_BYTES:
+            matrix, errors, format_used = await inference_executor.run(_parse_json_payload, body)
         else:
-            raise ValueError("Missing 'dataframe_split', 'instances', or 'inputs' field")
+            matrix, errors, format_used = _parse_json_payload(body)
 
-        if not instances:
+        n_rows = len(matrix)
+        if n_rows == 0:
             raise ValueError("No data instances provided")
 
-        logger.info(f"  Format: {format_used}, Input count: {len(instances)}")
-
-        # Check if mock mode is enabled
-        import os
-        use_mock = os.getenv("ENABLE_MOCK_INFERENCE", "false").lower() == "true"
+        logger.info(f"📥 收到推理请求 Format: {format_used}, Input count: {n_rows}")
 
-        predictions = []
-
-        if use_mock:
+        if ENABLE_MOCK_INFERENCE:
             # Mock mode enabled - for integration testing only
             logger.warning(f"{RED}⚠️ [MOCK MODE] Generating random predictions - NOT FOR PRODUCTION{RESET}")
-            import random
-            for _ in instances:
-                prob = random.uniform(0.4, 0.8)
-                predictions.append([prob])
+            probabilities = np.random.uniform(0.4, 0.8, n_rows)
         else:
-            # Real model inference (Task #080)
-            from src.serving.feature_map import map_sentinel_to_model
-
-            predictor = get_model_predictor()
-            if predictor is None:
+            # Real model inference (Task #080), micro-batched with concurrent requests
+            if get_model_predictor() is None:
                 raise HTTPException(
                     status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
                     detail="Model predictor not available"
                 )
+            probabilities = (await invocation_batcher.submit(matrix)).copy()
 
-            # Process each instance
-            for instance_data in instances:
-                try:
-                    # Extract features from Sentinel's format
-                    # Sentinel sends: [[X_tabular, X_sequential]] where X_tabular is (23,)
-                    if isinstance(instance_data, list) and len(instance_data) >= 1:
-                        # Get tabular features (first element)
-                        sentinel_features = instance_data[0]  # Should be (23,) array
-
-                        # Map Sentinel's 23 features to model's 15 features
-                        mapped_features = map_sentinel_to_model(
-                            sentinel_features,
-                            model_features=predictor.feature_names
-                        )
-
-                        if mapped_features is None:
-                            logger.error("Feature mapping failed")
-                            raise ValueError("Feature mapping returned None")
-
-                        # Run model inference
-                        result = predictor.predict(mapped_features)
-
-                        # Extract probability (model returns dict with 'probability' key)
-                        probability = result.get('probability', 0.5)
-                        predictions.append([probability])
-
-                    else:
-                        raise ValueError(
-                            f"Invalid instance format: expected list with >=1 elements, "
-                            f"got {type(instance_data)}"
-                        )
-
-                except Exception as e:
-                    logger.error(f"Instance processing error: {e}")
-                    # Fail gracefully with neutral prediction
-                    predictions.append([0.5])
+        if errors:
+            logger.error(f"Instance processing errors: {len(errors)}/{n_rows} rows")
+            # Fail gracefully with neutral prediction
+            probabilities[[error["index"] for error in errors]] = 0.5
 
+        predictions = probabilities.reshape(-1, 1).tolist()
         logger.info(f"{GREEN}✅ 推理完成: {len(predictions)} predictions{RESET}")
 
-        return InvocationResponse(predictions=predictions)
+        return InvocationResponse(predictions=predictions, errors=errors or None)
+
+    except HTTPException:
+        raise
+
+    except ExecutorSaturatedError as e:
+        raise _saturated(e)
+
+    except json.JSONDecodeError as e:
+        logger.error(f"{RED}❌ 请求 JSON 解析失败: {e}{RESET}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "status": "error",
+                "message": f"Malformed JSON body: {e}",
+                "error_code": "INVALID_JSON"
+            }
+        )
+
+    except ValidationError as e:
+        logger.error(f"{RED}❌ 请求验证失败: {e}{RESET}")
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail={
+                "status": "error",
+                "message": "Invalid invocation request",
+                "error_code": "VALIDATION_ERROR",
+                "details": json.loads(e.json())
+            }
+        )
 
     except Exception as e:
         logger.error(f"{RED}❌ 推理失败: {e}{RESET}")
@@ -490,6 +706,26 @@ async def invocations(request: InvocationRequest):
         )
 
 
+# ============================================================================
+# 服务指标端点
+# ============================================================================
+
+@app.get(
+    "/metrics/serving",
+    tags=["Health"],
+    summary="服务并发指标",
+    description="执行器队列深度、请求合并与微批处理统计"
+)
+async def serving_metrics():
+    """服务并发指标"""
+    return {
+        "feature_executor": feature_executor.metrics(),
+        "inference_executor": inference_executor.metrics(),
+        "singleflight": {**feature_flights.stats, "inflight": feature_flights.inflight},
+        "invocation_batcher": invocation_batcher.metrics(),
+    }
+
+
 # ============================================================================
 # 根端点
 # ============================================================================
@@ -511,7 +747,8 @@ async def root():
             "health": "GET /health",
             "historical_features": "POST /features/historical",
             "latest_features": "POST /features/latest",
-            "invocations": "POST /invocations"
+            "invocations": "POST /invocations",
+            "serving_metrics": "GET /metrics/serving"
         }
     }
 
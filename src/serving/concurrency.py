@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Serving Concurrency Primitives
+
+让 FastAPI 事件循环只做调度, 阻塞工作 (Feast 查询、模型推理) 交给有界线程池:
+
+- BoundedExecutor: 有界线程池 + 队列深度指标, 队列满时快速失败 (503)
+- SingleFlight: 相同的在途请求只执行一次, 其余请求共享结果
+- MicroBatcher: 时间窗口内并发到达的小推理请求合并为一次模型调用
+
+协议: v2.2 (本地存储，文档优先)
+"""
+
+import asyncio
+import functools
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class ExecutorSaturatedError(RuntimeError):
+    """执行器排队已满, 请求被拒绝"""
+
+
+class BoundedExecutor:
+    """有界线程池执行器 (带队列深度指标)"""
+
+    def __init__(self, max_workers: int = 8, max_queue: int = 256, name: str = "serving"):
+        """
+        初始化执行器
+
+        参数:
+            max_workers: 工作线程数
+            max_queue: 最大排队任务数 (不含正在执行的任务), 超出时拒绝
+            name: 线程名前缀
+        """
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self._pending = 0   # 已提交未完成 (排队 + 执行中), 仅在事件循环线程修改
+        self._running = 0   # 执行中, 工作线程修改
+        self.stats = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "rejected": 0,
+            "max_queue_depth": 0,
+        }
+
+    @property
+    def queue_depth(self) -> int:
+        """排队中 (尚未开始执行) 的任务数"""
+        return max(self._pending - self._running, 0)
+
+    def _call(self, fn: Callable, args: tuple, kwargs: dict) -> Any:
+        with self._lock:
+            self._running += 1
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._running -= 1
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """
+        在线程池中执行 fn(*args, **kwargs) 并等待结果
+
+        异常:
+            ExecutorSaturatedError: 排队任务数已达上限
+        """
+        if self._pending - self._running >= self.max_queue:
+            self.stats["rejected"] += 1
+            raise ExecutorSaturatedError(
+                f"Executor saturated: {self.queue_depth} queued, {self._running} running"
+            )
+
+        self._pending += 1
+        self.stats["submitted"] += 1
+        depth = self.queue_depth
+        if depth > self.stats["max_queue_depth"]:
+            self.stats["max_queue_depth"] = depth
+
+        loop = asyncio.get_running_loop()
+        try:
+            result = await loop.run_in_executor(
+                self._pool, functools.partial(self._call, fn, args, kwargs)
+            )
+            self.stats["completed"] += 1
+            return result
+        except Exception:
+            self.stats["failed"] += 1
+            raise
+        finally:
+            self._pending -= 1
+
+    def metrics(self) -> Dict[str, int]:
+        """当前指标快照"""
+        return {
+            **self.stats,
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "running": self._running,
+            "queue_depth": self.queue_depth,
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._pool.shutdown(wait=wait)
+
+
+class SingleFlight:
+    """合并相同 key 的在途请求 (single-flight)
+
+    调用方拿到的是同一个结果对象, 不应原地修改。
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.stats = {"leaders": 0, "coalesced": 0}
+
+    @property
+    def inflight(self) -> int:
+        return len(self._inflight)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable]) -> Any:
+        """
+        执行 fn() 或等待相同 key 的在途调用
+
+        参数:
+            key: 请求的可哈希标识
+            fn: 返回协程的无参函数 (仅 leader 调用)
+        """
+        future = self._inflight.get(key)
+        if future is not None:
+            self.stats["coalesced"] += 1
+        else:
+            self.stats["leaders"] += 1
+            future = asyncio.ensure_future(fn())
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+
+        # shield: 某个调用方取消 (客户端断开) 不影响其他等待者
+        return await asyncio.shield(future)
+
+
+class MicroBatcher:
+    """推理微批处理
+
+    窗口期内并发提交的 (n_i, d) 矩阵拼接后调用一次 process,
+    再按行数拆分结果返回给各自的调用方。
+    """
+
+    def __init__(
+        self,
+        process: Callable[[np.ndarray], np.ndarray],
+        executor: BoundedExecutor,
+        max_wait_ms: float = 2.0,
+        max_batch_rows: int = 8192,
+    ):
+        """
+        初始化微批处理器
+
+        参数:
+            process: 批处理函数 (在执行器线程中调用), 输入 (N, d) 返回长度 N 的数组
+            executor: 执行 process 的线程池
+            max_wait_ms: 首个请求到达后最长等待时间 (毫秒)
+            max_batch_rows: 累计行数达到该值时立即执行
+        """
+        self.process = process
+        self.executor = executor
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_batch_rows = max_batch_rows
+
+        self._pending: List[Tuple[np.ndarray, asyncio.Future]] = []
+        self._rows = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self.stats = {"requests": 0, "batches": 0, "rows": 0, "max_batch_requests": 0}
+
+    async def submit(self, matrix: np.ndarray) -> np.ndarray:
+        """提交一个请求的输入矩阵, 返回对应行的结果"""
+        self.stats["requests"] += 1
+
+        if len(matrix) >= self.max_batch_rows:
+            # 单个大请求无需等待合并
+            self.stats["batches"] += 1
+            self.stats["rows"] += len(matrix)
+            return await self.executor.run(self.process, matrix)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((matrix, future))
+        self._rows += len(matrix)
+
+        if self._rows >= self.max_batch_rows:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending, self._rows = self._pending, [], 0
+        if batch:
+            asyncio.ensure_future(self._run(batch))
+
+    async def _run(self, batch: List[Tuple[np.ndarray, asyncio.Future]]) -> None:
+        matrices = [matrix for matrix, _ in batch]
+        self.stats["batches"] += 1
+        self.stats["rows"] += sum(len(matrix) for matrix in matrices)
+        self.stats["max_batch_requests"] = max(self.stats["max_batch_requests"], len(batch))
+
+        try:
+            merged = matrices[0] if len(matrices) == 1 else np.concatenate(matrices)
+            output = np.asarray(await self.executor.run(self.process, merged))
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        offsets = np.cumsum([len(matrix) for matrix in matrices])[:-1]
+        for (_, future), part in zip(batch, np.split(output, offsets)):
+            if not future.done():
+                future.set_result(part)
+
+    def metrics(self) -> Dict[str, Any]:
+        """当前指标快照"""
+        batches = self.stats["batches"]
+        return {
+            **self.stats,
+            "pending_requests": len(self._pending),
+            "avg_batch_rows": round(self.stats["rows"] / batches, 2) if batches else 0.0,
+        }
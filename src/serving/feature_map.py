@@ -15,6 +15,9 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Sentinel FeatureBuilder output dimension
+SENTINEL_DIM = 23
+
 
 class FeatureMapper:
     """
@@ -77,6 +80,14 @@ class FeatureMapper:
             # Features 15-22 are reserved for future expansion or time-based features
         }
 
+        # Vectorized index map: Sentinel position of each model feature (-1 = unmapped)
+        self.index_map = np.array(
+            [self.sentinel_feature_map.get(name, -1) for name in self.model_features],
+            dtype=np.intp
+        )
+        self._unmapped = self.index_map < 0
+        self._gather_index = np.where(self._unmapped, 0, self.index_map)
+
         logger.info(f"FeatureMapper initialized with {len(self.model_features)} model features")
 
     def map_from_sentinel(
@@ -110,7 +121,7 @@ class FeatureMapper:
             raise ValueError(f"Unsupported input type: {type(sentinel_features)}")
 
         # Validate dimension
-        if features_array.shape[0] != 23:
+        if features_array.shape[0] != SENTINEL_DIM:
             raise ValueError(
                 f"Expected 23 features from Sentinel, got {features_array.shape[0]}. "
                 f"Shape: {features_array.shape}"
@@ -151,6 +162,49 @@ class FeatureMapper:
 
         return mapped_df
 
+    def map_batch(
+        self,
+        sentinel_matrix: np.ndarray,
+        out: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Map a batch of Sentinel vectors to model input in one gather.
+
+        Unmapped features and non-finite values become 0.0, which is what
+        map_sentinel_to_model produces for a single row (forward fill is a
+        no-op on one row, then zero fill).
+
+        Args:
+            sentinel_matrix: Array of shape (n, 23)
+            out: Optional preallocated (n, len(model_features)) float32 array
+
+        Returns:
+            np.ndarray of shape (n, len(model_features)), float32, in
+            model_features order
+
+        Raises:
+            ValueError: If input shape is invalid
+        """
+        matrix = np.asarray(sentinel_matrix)
+        if matrix.ndim != 2 or matrix.shape[1] != SENTINEL_DIM:
+            raise ValueError(
+                f"Expected (n, {SENTINEL_DIM}) Sentinel feature matrix, got shape {matrix.shape}"
+            )
+
+        if out is None:
+            out = np.empty((len(matrix), len(self.model_features)), dtype=np.float32)
+        out[...] = matrix[:, self._gather_index]
+
+        if self._unmapped.any():
+            out[:, self._unmapped] = 0.0
+
+        non_finite = ~np.isfinite(out)
+        if non_finite.any():
+            logger.warning(f"Mapped batch contains {int(non_finite.sum())} non-finite values, using zero fill")
+            out[non_finite] = 0.0
+
+        return out
+
     def handle_nans(
         self,
         features_df: pd.DataFrame,
@@ -181,7 +235,7 @@ class FeatureMapper:
 
         elif strategy == "forward_fill":
             # Forward fill, then backward fill for leading NaNs
-            result = features_df.fillna(method='ffill').fillna(method='bfill')
+            result = features_df.ffill().bfill()
             if result.isna().any().any():
                 logger.warning("Forward fill did not eliminate all NaNs, using zero fill")
                 result = result.fillna(0)
@@ -12,6 +12,7 @@ import logging
 import time
 from typing import List, Dict, Optional, Tuple
 from datetime import datetime, timedelta
+import numpy as np
 import pandas as pd
 from pathlib import Path
 import sys
@@ -20,6 +21,9 @@ import sys
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
+from src.serving.online_store import OnlineFeatureStore
+from src.serving.serializers import frame_to_records
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -38,8 +42,16 @@ RESET = "\033[0m"
 class FeatureService:
     """特征服务 - 封装 Feast FeatureStore 交互"""
 
-    def __init__(self, repo_path: str = "src/feature_store"):
-        """初始化特征服务"""
+    def __init__(self, repo_path: str = "src/feature_store",
+                 online_store: Optional[OnlineFeatureStore] = None):
+        """
+        初始化特征服务
+
+        参数:
+            repo_path: Feast 仓库路径
+            online_store: 在线特征存储; 配置后 /features/latest 优先从中读取
+        """
+        self.online_store = online_store
         try:
             from feast import FeatureStore
             self.store = FeatureStore(repo_path=repo_path)
@@ -77,7 +89,24 @@ class FeatureService:
                 ...
             ]
         """
+        frame, elapsed_ms = self.get_historical_frame(symbols, features, start_date, end_date)
+        return frame_to_records(frame, features), elapsed_ms
+
+    def get_historical_frame(
+        self,
+        symbols: List[str],
+        features: List[str],
+        start_date: str,
+        end_date: str
+    ) -> Tuple[pd.DataFrame, float]:
+        """
+        获取历史特征表 (按列格式, 供 JSON / NDJSON / Arrow 序列化)
+
+        返回:
+            (DataFrame[symbol, event_timestamp, *features], 执行时间毫秒)
+        """
         start_time = time.time()
+        columns = ['symbol', 'event_timestamp'] + list(features)
 
         try:
             # 1. 解析日期
@@ -87,23 +116,12 @@ class FeatureService:
             logger.info(f"查询历史特征: {len(symbols)} 个符号, {len(features)} 个特征")
             logger.info(f"  时间范围: {start_date} 到 {end_date}")
 
-            # 2. 构建 entity_df (Feast 需要的输入格式)
-            # 为每个日期-符号组合创建一行
-            date_range = pd.date_range(start=start, end=end, freq='1D')
-            entity_data = []
-
-            for date in date_range:
-                for symbol in symbols:
-                    entity_data.append({
-                        'symbol': symbol,
-                        'event_timestamp': date
-                    })
-
-            if not entity_data:
+            # 2. 构建 entity_df (Feast 需要的输入格式): 日期 × 符号
+            entity_df = self._build_entity_df(symbols, start, end)
+            if entity_df.empty:
                 logger.warning("没有创建任何 entity 数据")
-                return [], 0
+                return pd.DataFrame(columns=columns), 0
 
-            entity_df = pd.DataFrame(entity_data)
             logger.info(f"  构建了 {len(entity_df)} 个 entity 数据点")
 
             # 3. 构建特征引用列表
@@ -118,47 +136,39 @@ class FeatureService:
 
             logger.info(f"{GREEN}✅ 获取 {len(features_df)} 行特征数据{RESET}")
 
-            # 5. 格式化为响应格式
-            result = []
-            for _, row in features_df.iterrows():
-                symbol = row.get('symbol')
-                time_val = row.get('event_timestamp')
-
-                # 提取特征值
-                values = {}
-                for feat in features:
-                    feat_col = feat  # Feast 返回的列名通常是特征名
-                    if feat_col in row:
-                        values[feat] = float(row[feat_col]) if pd.notna(row[feat_col]) else None
-                    else:
-                        values[feat] = None
-
-                result.append({
-                    'symbol': symbol,
-                    'time': time_val,
-                    'values': values
-                })
+            # 5. 只保留响应需要的列 (Feast 未返回的特征列为 NaN)
+            frame = features_df.reindex(columns=columns)
+            frame[list(features)] = frame[list(features)].astype(float)
 
             elapsed_ms = (time.time() - start_time) * 1000
             logger.info(f"执行时间: {elapsed_ms:.2f} ms")
 
-            return result, elapsed_ms
+            return frame, elapsed_ms
 
         except Exception as e:
             elapsed_ms = (time.time() - start_time) * 1000
             logger.error(f"{RED}❌ 历史特征查询失败: {e}{RESET}")
             raise
 
+    @staticmethod
+    def _build_entity_df(symbols: List[str], start, end) -> pd.DataFrame:
+        """日期 × 符号的 entity_df (向量化笛卡尔积, 按日期再按符号排序)"""
+        date_range = pd.date_range(start=start, end=end, freq='1D')
+        return pd.DataFrame({
+            'symbol': np.tile(np.asarray(symbols, dtype=object), len(date_range)),
+            'event_timestamp': date_range.repeat(len(symbols)),
+        })
+
     def get_latest_features(
         self,
         symbols: List[str],
         features: List[str]
     ) -> Tuple[Dict[str, Dict[str, Optional[float]]], float]:
         """
-        获取最新特征（实时模拟）
+        获取最新特征（实时）
 
-        注意: 这是一个模拟实现。真实的在线服务会使用 Feast 的在线存储或
-             直接查询最新的 market_features 表。
+        已配置在线存储时从中批量读取 (LRU + 单次 pipeline); 在线存储中
+        尚未物化的符号回退到 Feast 离线检索。
 
         参数:
             symbols: 交易对列表 ['EURUSD', 'GBPUSD']
@@ -178,38 +188,13 @@ class FeatureService:
         try:
             logger.info(f"查询最新特征: {len(symbols)} 个符号, {len(features)} 个特征")
 
-            # 使用昨天的数据作为"最新"（模拟）
-            # 真实场景下会使用 Feast Online Store 或直接查询 market_features
-            today = datetime.now().date()
-            yesterday = today - timedelta(days=1)
-
-            entity_df = pd.DataFrame({
-                'symbol': symbols,
-                'event_timestamp': [yesterday] * len(symbols)
-            })
-
-            # 构建特征引用
-            feature_refs = [f"market_features:{feat}" for feat in features]
-
-            # 调用 Feast 获取特征
-            logger.info(f"调用 Feast 获取最新特征...")
-            features_df = self.store.get_historical_features(
-                entity_df=entity_df,
-                feature_refs=feature_refs
-            ).to_df()
-
-            # 格式化为响应格式
-            result = {}
-            for _, row in features_df.iterrows():
-                symbol = row.get('symbol')
-                if symbol not in result:
-                    result[symbol] = {}
-
-                for feat in features:
-                    if feat in row:
-                        result[symbol][feat] = float(row[feat]) if pd.notna(row[feat]) else None
-                    else:
-                        result[symbol][feat] = None
+            if self.online_store is not None:
+                result, missing = self.online_store.get_latest(symbols, features)
+                if missing:
+                    logger.warning(f"{YELLOW}⚠️  在线存储缺少 {len(missing)} 个符号, 回退到 Feast: {missing}{RESET}")
+                    result.update(self._get_latest_from_feast(missing, features))
+            else:
+                result = self._get_latest_from_feast(symbols, features)
 
             elapsed_ms = (time.time() - start_time) * 1000
             logger.info(f"{GREEN}✅ 获取 {len(result)} 个符号的最新特征{RESET}")
@@ -222,6 +207,79 @@ class FeatureService:
             logger.error(f"{RED}❌ 最新特征查询失败: {e}{RESET}")
             raise
 
+    def _get_latest_from_feast(
+        self,
+        symbols: List[str],
+        features: List[str]
+    ) -> Dict[str, Dict[str, Optional[float]]]:
+        """
+        从 Feast 离线存储获取"最新"特征（模拟）
+
+        使用昨天的数据作为"最新"; 仅作为在线存储未命中时的回退。
+        """
+        today = datetime.now().date()
+        yesterday = today - timedelta(days=1)
+
+        entity_df = pd.DataFrame({
+            'symbol': symbols,
+            'event_timestamp': [yesterday] * len(symbols)
+        })
+
+        # 构建特征引用
+        feature_refs = [f"market_features:{feat}" for feat in features]
+
+        # 调用 Feast 获取特征
+        logger.info(f"调用 Feast 获取最新特征...")
+        features_df = self.store.get_historical_features(
+            entity_df=entity_df,
+            feature_refs=feature_refs
+        ).to_df()
+
+        # 格式化为响应格式 (按列取值, 缺失特征为 None)
+        features_df = features_df.reindex(columns=['symbol'] + features)
+        values = features_df[features].astype(float)
+        values = values.astype(object).where(values.notna(), None)
+        return {
+            symbol: dict(zip(features, row))
+            for symbol, row in zip(features_df['symbol'], values.itertuples(index=False, name=None))
+        }
+
+    def materialize_latest(
+        self,
+        symbols: List[str],
+        features: List[str],
+        lookback_days: int = 7
+    ) -> int:
+        """
+        物化任务: 从 Feast 取最近 lookback_days 天的特征, 将每个符号最新一行写入在线存储
+
+        参数:
+            symbols: 交易对列表
+            features: 特征名称列表
+            lookback_days: 回溯天数
+
+        返回:
+            写入的符号数
+        """
+        if self.online_store is None:
+            raise RuntimeError("未配置在线特征存储")
+
+        end = pd.Timestamp.now().normalize()
+        entity_df = self._build_entity_df(symbols, end - pd.Timedelta(days=lookback_days), end)
+
+        features_df = self.store.get_historical_features(
+            entity_df=entity_df,
+            feature_refs=[f"market_features:{feat}" for feat in features]
+        ).to_df()
+
+        # 只保留有特征值的行, 避免用空行覆盖较早的有效值
+        features_df = features_df.reindex(columns=['symbol', 'event_timestamp'] + features)
+        features_df = features_df.dropna(subset=features, how='all')
+
+        count = self.online_store.materialize(features_df, features)
+        logger.info(f"{GREEN}✅ 物化完成: {count} 个符号{RESET}")
+        return count
+
     def health_check(self) -> Dict[str, str]:
         """
         健康检查
@@ -8,7 +8,7 @@ Data Models for Feature Serving API
 协议: v2.2 (本地存储，文档优先)
 """
 
-from typing import List, Dict, Optional
+from typing import Any, List, Dict, Optional
 from pydantic import BaseModel, Field, field_validator
 from datetime import datetime
 import re
@@ -373,6 +373,11 @@ class InvocationResponse(BaseModel):
         description="预测值列表"
     )
 
+    errors: Optional[List[Dict[str, Any]]] = Field(
+        None,
+        description="逐行错误 [{index, error}], 出错行预测值为中性 0.5"
+    )
+
     class Config:
         schema_extra = {
             "example": {
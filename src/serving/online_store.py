@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Online Feature Store
+
+/features/latest 的低延迟在线特征存储。
+
+- 物化: 每个符号最新的一行特征写入 Redis 哈希 features:latest:{symbol}
+- 读取: 进程内 LRU (短 TTL) → 未命中的符号用一次 pipeline 批量 HGETALL
+- 未配置 Redis 时退化为进程内字典存储 (单进程/测试用)
+- 线程安全: LRU 与统计计数由锁保护, 可在执行器线程中并发读取;
+  Redis 写入在 MULTI/EXEC 中替换整个哈希, 读者不会看到键短暂缺失
+
+协议: v2.2 (本地存储，文档优先)
+"""
+
+import logging
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_NAMESPACE = "features:latest"
+TIMESTAMP_FIELD = "_event_timestamp"
+
+
+class OnlineFeatureStore:
+    """最新特征向量在线存储 (Redis 哈希 + 进程内 LRU)"""
+
+    def __init__(
+        self,
+        redis_client=None,
+        namespace: str = DEFAULT_NAMESPACE,
+        lru_size: int = 1024,
+        lru_ttl: float = 1.0,
+        key_ttl: Optional[int] = None,
+    ):
+        """
+        初始化在线存储
+
+        参数:
+            redis_client: RedisClient (src.data_nexus.cache); None 表示进程内存储
+            namespace: Redis 键前缀
+            lru_size: 进程内 LRU 最多缓存的符号数 (0 关闭)
+            lru_ttl: LRU 条目有效期 (秒), 即读取允许的最大陈旧度
+            key_ttl: Redis 哈希过期时间 (秒), None 表示不过期
+        """
+        self.redis = redis_client
+        self.namespace = namespace
+        self.lru_size = lru_size
+        self.lru_ttl = lru_ttl
+        self.key_ttl = key_ttl
+
+        self._memory: Dict[str, Dict[str, Optional[float]]] = {}
+        self._lru: "OrderedDict[str, Tuple[float, Dict[str, Optional[float]]]]" = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0, "round_trips": 0}
+        self._lock = threading.Lock()
+
+    def _key(self, symbol: str) -> str:
+        return f"{self.namespace}:{symbol}"
+
+    # ------------------------------------------------------------------
+    # 写入 (物化)
+    # ------------------------------------------------------------------
+
+    def materialize(
+        self,
+        df: pd.DataFrame,
+        features: Optional[List[str]] = None,
+        symbol_column: str = "symbol",
+        time_column: str = "event_timestamp",
+    ) -> int:
+        """
+        将每个符号最新的一行特征写入在线存储
+
+        参数:
+            df: 特征数据 (多符号、多时间点)
+            features: 要写入的特征列; None 表示除符号/时间外的全部数值列
+            symbol_column: 符号列名
+            time_column: 时间列名 (不存在时按行顺序取最后一行)
+
+        返回:
+            写入的符号数
+        """
+        if df.empty:
+            return 0
+
+        if features is None:
+            features = [
+                c for c in df.select_dtypes("number").columns if c not in (symbol_column, time_column)
+            ]
+
+        if time_column in df.columns:
+            df = df.sort_values(time_column, kind="stable")
+        latest = df.drop_duplicates(symbol_column, keep="last")
+
+        symbols = latest[symbol_column].astype(str).tolist()
+        values = latest.reindex(columns=features).to_numpy(dtype=float).tolist()
+        timestamps = (
+            latest[time_column].astype(str).tolist() if time_column in latest.columns
+            else [None] * len(symbols)
+        )
+
+        rows = {
+            symbol: (dict(zip(features, row)), ts)
+            for symbol, row, ts in zip(symbols, values, timestamps)
+        }
+        self._write(rows)
+        logger.info(f"物化最新特征: {len(rows)} 个符号 × {len(features)} 个特征")
+        return len(rows)
+
+    def write_latest(self, symbol: str, values: Dict[str, Optional[float]],
+                     event_timestamp=None) -> None:
+        """写入单个符号的最新特征 (流式生产者使用)"""
+        self._write({symbol: (values, None if event_timestamp is None else str(event_timestamp))})
+
+    def _write(self, rows: Dict[str, Tuple[Dict[str, Optional[float]], Optional[str]]]) -> None:
+        if self.redis is None:
+            for symbol, (values, ts) in rows.items():
+                row = {k: _clean(v) for k, v in values.items()}
+                if ts is not None:
+                    row[TIMESTAMP_FIELD] = ts
+                self._memory[symbol] = row
+        else:
+            # MULTI/EXEC: delete + hset apply atomically, readers never see the key missing
+            pipe = self.redis.pipeline(transaction=True)
+            for symbol, (values, ts) in rows.items():
+                mapping = {k: _encode(v) for k, v in values.items()}
+                if ts is not None:
+                    mapping[TIMESTAMP_FIELD] = ts
+                key = self._key(symbol)
+                pipe.delete(key)
+                pipe.hset(key, mapping=mapping)
+                if self.key_ttl:
+                    pipe.expire(key, self.key_ttl)
+            pipe.execute()
+            with self._lock:
+                self.stats["round_trips"] += 1
+
+        self.invalidate(rows)
+
+    # ------------------------------------------------------------------
+    # 读取
+    # ------------------------------------------------------------------
+
+    def get_latest(
+        self,
+        symbols: List[str],
+        features: List[str],
+    ) -> Tuple[Dict[str, Dict[str, Optional[float]]], List[str]]:
+        """
+        批量读取最新特征
+
+        参数:
+            symbols: 交易对列表
+            features: 特征名称列表 (存储中没有的特征返回 None)
+
+        返回:
+            ({symbol: {feature: value}}, 在线存储中不存在的符号列表)
+        """
+        rows = self._lookup(symbols)
+
+        result = {}
+        missing = []
+        for symbol in symbols:
+            row = rows.get(symbol)
+            if row is None:
+                missing.append(symbol)
+            else:
+                result[symbol] = {feat: row.get(feat) for feat in features}
+        return result, missing
+
+    def _lookup(self, symbols: Iterable[str]) -> Dict[str, Dict[str, Optional[float]]]:
+        """LRU → 后端, 返回 {symbol: 全部特征} (不存在的符号不出现)"""
+        now = time.monotonic()
+        lru = self._lru
+        rows = {}
+        misses = []
+
+        with self._lock:
+            for symbol in dict.fromkeys(symbols):
+                entry = lru.get(symbol)
+                if entry is not None and entry[0] > now:
+                    lru.move_to_end(symbol)
+                    rows[symbol] = entry[1]
+                else:
+                    misses.append(symbol)
+
+            self.stats["hits"] += len(rows)
+            self.stats["misses"] += len(misses)
+        if not misses:
+            return rows
+
+        if self.redis is None:
+            fetched = [self._memory.get(symbol) for symbol in misses]
+        else:
+            # 单次 pipeline: 所有未命中符号一个往返
+            pipe = self.redis.pipeline()
+            for symbol in misses:
+                pipe.hgetall(self._key(symbol))
+            fetched = [_decode_hash(raw) for raw in pipe.execute()]
+            with self._lock:
+                self.stats["round_trips"] += 1
+
+        expires = now + self.lru_ttl
+        with self._lock:
+            for symbol, row in zip(misses, fetched):
+                if row is None:
+                    continue
+                rows[symbol] = row
+                if self.lru_size > 0:
+                    lru[symbol] = (expires, row)
+                    lru.move_to_end(symbol)
+                    if len(lru) > self.lru_size:
+                        lru.popitem(last=False)
+
+        return rows
+
+    def invalidate(self, symbols: Optional[Iterable[str]] = None) -> None:
+        """清除进程内 LRU (None 表示全部)"""
+        with self._lock:
+            if symbols is None:
+                self._lru.clear()
+                return
+            for symbol in symbols:
+                self._lru.pop(symbol, None)
+
+    def health_check(self) -> bool:
+        """后端是否可用"""
+        return True if self.redis is None else self.redis.health_check()
+
+
+def _clean(value) -> Optional[float]:
+    if value is None:
+        return None
+    value = float(value)
+    return None if math.isnan(value) else value
+
+
+def _encode(value) -> str:
+    value = _clean(value)
+    return "" if value is None else repr(value)
+
+
+def _decode_hash(raw: Dict) -> Optional[Dict[str, Optional[float]]]:
+    """Redis 哈希 → {feature: float|None}; 空哈希 (键不存在) 返回 None"""
+    if not raw:
+        return None
+    row = {}
+    for field, value in raw.items():
+        if isinstance(field, bytes):
+            field = field.decode()
+        if isinstance(value, bytes):
+            value = value.decode()
+        if field == TIMESTAMP_FIELD:
+            row[field] = value
+        else:
+            row[field] = float(value) if value != "" else None
+    return row
+
+
+def build_online_store() -> Optional[OnlineFeatureStore]:
+    """
+    按环境变量创建在线存储
+
+    FEATURE_ONLINE_STORE: redis (默认) | memory | none
+    FEATURE_ONLINE_LRU_TTL: LRU 有效期秒数 (默认 1.0)
+
+    Redis 不可用时返回 None (/features/latest 回退到 Feast)。
+    """
+    backend = os.getenv("FEATURE_ONLINE_STORE", "redis").lower()
+    lru_ttl = float(os.getenv("FEATURE_ONLINE_LRU_TTL", "1.0"))
+
+    if backend == "none":
+        return None
+    if backend == "memory":
+        return OnlineFeatureStore(lru_ttl=lru_ttl)
+
+    try:
+        from src.data_nexus.cache.redis_client import RedisClient
+        client = RedisClient()
+        if not client.health_check():
+            raise ConnectionError(f"Redis 不可达: {client.config.connection_url()}")
+    except Exception as e:
+        logger.warning(f"在线特征存储不可用, /features/latest 将回退到 Feast: {e}")
+        return None
+
+    return OnlineFeatureStore(client, lru_ttl=lru_ttl)
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Historical Feature Serializers
+
+/features/historical 的按列序列化:
+
+- frame_to_records: 特征表 → [{'symbol', 'time', 'values'}] (按列取值, 不使用 iterrows)
+- historical_json_bytes: 完整 JSON 响应体 (与 HistoricalResponse 结构一致)
+- iter_ndjson: 分块 NDJSON, 每行一个数据点
+- iter_arrow_stream: 分块 Arrow IPC 流 (symbol, event_timestamp, 各特征列)
+
+流式输出按块生成, 服务端不会一次性持有全部行的 Python 字典。
+
+协议: v2.2 (本地存储，文档优先)
+"""
+
+import io
+import json
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+except ImportError:  # Arrow 流式输出不可用
+    pa = None
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+DEFAULT_CHUNK_ROWS = 65536
+
+
+def _value_rows(frame: pd.DataFrame, features: List[str]) -> List[List[Optional[float]]]:
+    """特征值矩阵 → 行列表 (NaN 转为 None)"""
+    values = frame.reindex(columns=features).to_numpy(dtype=float)
+    rows = values.astype(object)
+    rows[np.isnan(values)] = None
+    return rows.tolist()
+
+
+def _iso_times(times: pd.Series) -> List[str]:
+    """时间列 → ISO 8601 字符串 (与 pydantic 的 datetime 序列化一致)"""
+    times = pd.to_datetime(times)
+    suffix = ""
+    if times.dt.tz is not None:
+        times = times.dt.tz_convert("UTC").dt.tz_localize(None)
+        suffix = "Z"
+    text = np.datetime_as_string(times.to_numpy(dtype="datetime64[s]"), unit="s")
+    return np.char.add(text, suffix).tolist() if suffix else text.tolist()
+
+
+def frame_to_records(frame: pd.DataFrame, features: List[str], iso_time: bool = False) -> List[Dict]:
+    """
+    特征表转换为数据点列表
+
+    参数:
+        frame: 含 symbol、event_timestamp 与特征列的表 (缺失的特征列视为 None)
+        features: 特征名称列表
+        iso_time: True 时 time 为 ISO 8601 字符串 (可直接 JSON 序列化)
+
+    返回:
+        [{'symbol': str, 'time': Timestamp|str, 'values': {feature: float|None}}]
+    """
+    times = frame["event_timestamp"]
+    times = _iso_times(times) if iso_time else times.tolist()
+    return [
+        {"symbol": symbol, "time": ts, "values": dict(zip(features, row))}
+        for symbol, ts, row in zip(frame["symbol"].tolist(), times, _value_rows(frame, features))
+    ]
+
+
+def historical_json_bytes(frame: pd.DataFrame, features: List[str], execution_time_ms: float) -> bytes:
+    """完整的 HistoricalResponse JSON 响应体"""
+    return json.dumps({
+        "status": "success",
+        "data": frame_to_records(frame, features, iso_time=True),
+        "row_count": len(frame),
+        "execution_time_ms": execution_time_ms,
+    }, separators=(",", ":")).encode()
+
+
+def iter_ndjson(frame: pd.DataFrame, features: List[str],
+                chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Iterator[bytes]:
+    """按块生成 NDJSON, 每行一个 {'symbol', 'time', 'values'} 数据点"""
+    for start in range(0, len(frame), chunk_rows):
+        points = frame_to_records(frame.iloc[start:start + chunk_rows], features, iso_time=True)
+        yield ("\n".join(json.dumps(p, separators=(",", ":")) for p in points) + "\n").encode()
+
+
+def iter_arrow_stream(frame: pd.DataFrame, features: List[str],
+                      chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Iterator[bytes]:
+    """
+    按块生成 Arrow IPC 流
+
+    列: symbol (string), event_timestamp (timestamp), 各特征 (float64);
+    每块一个 record batch, 空结果也输出 schema。
+    """
+    if pa is None:
+        raise ImportError("pyarrow is required for Arrow responses")
+
+    columns = ["symbol", "event_timestamp"] + list(features)
+    table = frame.reindex(columns=columns)
+    table[features] = table[features].astype(float)
+    table["event_timestamp"] = pd.to_datetime(table["event_timestamp"])
+    # 显式 schema: 空的 object 列会被推断为 null 类型
+    schema = pa.schema(
+        [("symbol", pa.string()),
+         ("event_timestamp", pa.Array.from_pandas(table["event_timestamp"].iloc[:0]).type)]
+        + [(feat, pa.float64()) for feat in features]
+    )
+
+    sink = io.BytesIO()
+    writer = pa.ipc.new_stream(sink, schema)
+    for start in range(0, len(table), chunk_rows):
+        batch = pa.RecordBatch.from_pandas(
+            table.iloc[start:start + chunk_rows], schema=schema, preserve_index=False
+        )
+        writer.write_batch(batch)
+        yield _drain(sink)
+    writer.close()
+    yield _drain(sink)
+
+
+def _drain(sink: io.BytesIO) -> bytes:
+    data = sink.getvalue()
+    sink.seek(0)
+    sink.truncate()
+    return data
@@ -180,6 +180,79 @@ class FeatureBuilder:
 
         return macd_line, signal_line, histogram
 
+    def _time_features(self, df_clean: pd.DataFrame):
+        """Hour / day-of-week from the timestamp column (0 if unavailable)."""
+        if 'timestamp' not in df_clean.columns:
+            return 0, 0
+
+        timestamps = df_clean['timestamp'].tolist()
+        try:
+            # Try to parse as datetime string first (from EODHD API)
+            dt = pd.to_datetime(timestamps)
+        except (ValueError, TypeError):
+            try:
+                # Fall back to Unix timestamp interpretation
+                dt = pd.to_datetime(timestamps, unit='s')
+            except (ValueError, TypeError):
+                logger.warning("Could not parse timestamps, using defaults")
+                return 0, 0
+
+        return dt.hour, dt.dayofweek
+
+    def _indicator_columns(self, close, high, low, volume, hour, day_of_week) -> Dict[str, object]:
+        """
+        Compute the ordered feature columns.
+
+        Works on Series (one symbol) or on wide DataFrames with one column per
+        symbol (every pandas op used here is column-wise), so single-symbol and
+        batch paths share exactly the same formulas.
+        """
+        features = {}
+
+        # 1. Returns (3 features)
+        features['return_1'] = self.calculate_returns(close, periods=1)
+        features['return_5'] = self.calculate_returns(close, periods=5)
+        features['return_10'] = self.calculate_returns(close, periods=10)
+
+        # 2. Moving Averages (4 features)
+        features['sma_10'] = self.calculate_sma(close, window=10)
+        features['sma_20'] = self.calculate_sma(close, window=20)
+        features['ema_10'] = self.calculate_ema(close, span=10)
+        features['ema_20'] = self.calculate_ema(close, span=20)
+
+        # 3. Volatility (2 features)
+        returns = self.calculate_returns(close)
+        features['volatility_10'] = self.calculate_volatility(returns, window=10)
+        features['volatility_20'] = self.calculate_volatility(returns, window=20)
+
+        # 4. RSI (1 feature)
+        features['rsi_14'] = self.calculate_rsi(close, period=14)
+
+        # 5. MACD (3 features)
+        macd, signal, hist = self.calculate_macd(close)
+        features['macd'] = macd
+        features['macd_signal'] = signal
+        features['macd_hist'] = hist
+
+        # 6. Price position (3 features)
+        features['high_low_ratio'] = high / low
+        features['close_high_ratio'] = close / high
+        features['close_low_ratio'] = close / low
+
+        # 7. Volume features (2 features)
+        features['volume_sma'] = self.calculate_sma(volume, window=20)
+        features['volume_ratio'] = volume / features['volume_sma']
+
+        # 8. Time-based
+        features['hour'] = hour
+        features['day_of_week'] = day_of_week
+
+        # 9. Additional features to reach 23
+        features['price_momentum'] = close.diff(5)
+        features['price_acceleration'] = close.diff(5).diff(5)
+
+        return features
+
     def build_features(
         self,
         df: pd.DataFrame,
@@ -258,69 +331,8 @@ class FeatureBuilder:
         logger.info(f"  Data: {len(df_clean)} rows, price range: {close.min():.5f} - {close.max():.5f}")
 
         # Build features (vectorized operations on entire series)
-        features = {}
-
-        # 1. Returns (3 features)
-        features['return_1'] = self.calculate_returns(close, periods=1)
-        features['return_5'] = self.calculate_returns(close, periods=5)
-        features['return_10'] = self.calculate_returns(close, periods=10)
-
-        # 2. Moving Averages (4 features)
-        features['sma_10'] = self.calculate_sma(close, window=10)
-        features['sma_20'] = self.calculate_sma(close, window=20)
-        features['ema_10'] = self.calculate_ema(close, span=10)
-        features['ema_20'] = self.calculate_ema(close, span=20)
-
-        # 3. Volatility (2 features)
-        returns = self.calculate_returns(close)
-        features['volatility_10'] = self.calculate_volatility(returns, window=10)
-        features['volatility_20'] = self.calculate_volatility(returns, window=20)
-
-        # 4. RSI (1 feature)
-        features['rsi_14'] = self.calculate_rsi(close, period=14)
-
-        # 5. MACD (3 features)
-        macd, signal, hist = self.calculate_macd(close)
-        features['macd'] = macd
-        features['macd_signal'] = signal
-        features['macd_hist'] = hist
-
-        # 6. Price position (3 features)
-        features['high_low_ratio'] = high / low
-        features['close_high_ratio'] = close / high
-        features['close_low_ratio'] = close / low
-
-        # 7. Volume features (2 features)
-        features['volume_sma'] = self.calculate_sma(volume, window=20)
-        features['volume_ratio'] = volume / features['volume_sma']
-
-        # 8. Time-based (if timestamp available)
-        if 'timestamp' in df_clean.columns:
-            timestamps = df_clean['timestamp'].tolist()
-            try:
-                # Try to parse as datetime string first (from EODHD API)
-                dt = pd.to_datetime(timestamps)
-            except (ValueError, TypeError):
-                try:
-                    # Fall back to Unix timestamp interpretation
-                    dt = pd.to_datetime(timestamps, unit='s')
-                except (ValueError, TypeError):
-                    logger.warning("Could not parse timestamps, using defaults")
-                    dt = None
-
-            if dt is not None:
-                features['hour'] = dt.hour
-                features['day_of_week'] = dt.dayofweek
-            else:
-                features['hour'] = 0
-                features['day_of_week'] = 0
-        else:
-            features['hour'] = 0
-            features['day_of_week'] = 0
-
-        # 9. Additional features to reach 23
-        features['price_momentum'] = close.diff(5)
-        features['price_acceleration'] = close.diff(5).diff(5)
+        hour, day_of_week = self._time_features(df_clean)
+        features = self._indicator_columns(close, high, low, volume, hour, day_of_week)
 
         # Combine into DataFrame
         feature_df = pd.DataFrame(features)
@@ -399,6 +411,81 @@ class FeatureBuilder:
 
         return sequence_array
 
+    def build_features_batch(
+        self,
+        frames: Dict[str, pd.DataFrame],
+        sequence_length: int = 60
+    ) -> Tuple[List[str], Optional[np.ndarray], Optional[np.ndarray]]:
+        """
+        Build tabular + sequential features for many symbols in one pass
+
+        Bars are aligned into wide (bars x symbols) frames, right-aligned on the
+        latest bar and front-padded with NaN, and every indicator is computed
+        once across all symbols. Leading NaNs behave exactly like a shorter
+        history, so each symbol's output equals build_features() /
+        build_sequence() on its own frame.
+
+        Args:
+            frames: Symbol -> OHLCV DataFrame
+            sequence_length: Length of sequential window
+
+        Returns:
+            (symbols, tabular (N, 23), sequential (N, sequence_length, 23));
+            symbols with missing columns or too little history are skipped
+        """
+        min_required = sequence_length + self.lookback_period
+        required_cols = ['close', 'high', 'low', 'volume']
+
+        symbols: List[str] = []
+        columns: Dict[str, list] = {k: [] for k in ('close', 'high', 'low', 'volume', 'hour', 'day_of_week')}
+
+        for symbol, df in frames.items():
+            if df is None or any(c not in df.columns for c in required_cols):
+                logger.error(f"Missing columns for {symbol}")
+                continue
+            if len(df) < min_required:
+                logger.error(f"Insufficient data for {symbol}: {len(df)} < {min_required} required")
+                continue
+
+            df_clean = df.loc[:, ~df.columns.duplicated()]
+            hour, day_of_week = self._time_features(df_clean)
+            n = len(df_clean)
+
+            symbols.append(symbol)
+            for key in required_cols:
+                columns[key].append(df_clean[key].to_numpy(dtype=float))
+            columns['hour'].append(np.broadcast_to(np.asarray(hour, dtype=float), (n,)))
+            columns['day_of_week'].append(np.broadcast_to(np.asarray(day_of_week, dtype=float), (n,)))
+
+        if not symbols:
+            return [], None, None
+
+        length = max(len(values) for values in columns['close'])
+
+        def wide(key: str) -> pd.DataFrame:
+            arr = np.full((length, len(symbols)), np.nan)
+            for j, values in enumerate(columns[key]):
+                arr[length - len(values):, j] = values
+            return pd.DataFrame(arr)
+
+        features = self._indicator_columns(
+            wide('close'), wide('high'), wide('low'), wide('volume'),
+            wide('hour'), wide('day_of_week')
+        )
+
+        # (bars, symbols, features), NaN handling per symbol as in the single path
+        stacked = np.zeros((length, len(symbols), 23))
+        for k, frame in enumerate(list(features.values())[:23]):
+            stacked[:, :, k] = frame.bfill().fillna(0).to_numpy(dtype=float)
+
+        tabular = stacked[-1]
+        sequential = stacked[-sequence_length:].transpose(1, 0, 2).astype(np.float32)
+
+        logger.info(f"  ✓ Batch features built: {len(symbols)} symbols, "
+                    f"tabular {tabular.shape}, sequential {sequential.shape}")
+
+        return symbols, tabular, sequential
+
 
 def main():
     """Test feature builder with synthetic data"""
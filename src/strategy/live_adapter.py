@@ -18,6 +18,11 @@ Workflow:
     3. Apply threshold logic
     4. Return numeric signal: 1 (BUY), -1 (SELL), 0 (HOLD)
 
+Models are loaded through the process-wide ModelRegistry: each artifact is
+hashed, deserialized and compiled once per process (CompiledBooster), so a
+single feature vector of the expected length skips predict_proba entirely.
+With a registry slot, the adapter follows hot-swaps of that slot.
+
 Protocol: v2.2 (Unified Adapter)
 """
 
@@ -34,6 +39,13 @@ try:
 except ImportError:
     XGBClassifier = None
 
+try:
+    from src.model.fast_inference import CompiledBooster
+    from src.model.registry import KIND_CLASSIFIER, KIND_PICKLE, get_model_registry
+except ImportError:  # Imported as top-level "strategy" without the repo root on sys.path
+    CompiledBooster = None
+    get_model_registry = None
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
@@ -80,7 +92,8 @@ class LiveStrategyAdapter:
         self,
         model_path: Optional[str] = None,
         threshold: float = 0.5,
-        risk_config: Optional[Dict[str, float]] = None
+        risk_config: Optional[Dict[str, float]] = None,
+        slot: Optional[str] = None
     ):
         """
         Initialize Unified Strategy Adapter.
@@ -97,6 +110,9 @@ class LiveStrategyAdapter:
                     'stop_loss_atr_multiple': 2.0, # SL = entry ± 2*ATR
                     'take_profit_risk_reward': 2.0 # TP at 2x risk
                 }
+            slot: ModelRegistry slot to serve from (default: None, no hot-swap).
+                  The loaded model is published to the slot and later swaps
+                  of the slot are picked up on the next signal.
 
         Safety:
             - If model file is missing, adapter returns 0 (HOLD)
@@ -106,6 +122,9 @@ class LiveStrategyAdapter:
         self.threshold = threshold
         self.model = None
         self.model_type = None
+        self.compiled: Optional["CompiledBooster"] = None
+        self.slot = slot
+        self._version = None
 
         # Determine model path
         if model_path is None:
@@ -186,15 +205,21 @@ class LiveStrategyAdapter:
                     self.model = None
                     return
 
-                self.model = XGBClassifier()
-                self.model.load_model(str(self.model_path))
+                if get_model_registry is not None:
+                    self._bind(get_model_registry().load(self.model_path, kind=KIND_CLASSIFIER))
+                else:
+                    self.model = XGBClassifier()
+                    self.model.load_model(str(self.model_path))
                 self.model_type = "XGBoost-JSON"
                 logger.info(f"✅ Model loaded: {self.model_path.name} (XGBoost JSON)")
 
             elif suffix == '.pkl':
                 # Load from pickle
-                with open(self.model_path, 'rb') as f:
-                    self.model = pickle.load(f)
+                if get_model_registry is not None:
+                    self._bind(get_model_registry().load(self.model_path, kind=KIND_PICKLE))
+                else:
+                    with open(self.model_path, 'rb') as f:
+                        self.model = pickle.load(f)
                 self.model_type = "Pickle"
                 logger.info(f"✅ Model loaded: {self.model_path.name} (Pickle)")
 
@@ -211,6 +236,23 @@ class LiveStrategyAdapter:
             logger.error(f"❌ Model loading failed: {e}")
             self.model = None
             self.model_type = "ERROR"
+            return
+
+        if self.compiled is not None:
+            logger.info(f"   Compiled: {self.compiled.info()['num_trees']} trees")
+        if self.slot is not None and self._version is not None:
+            get_model_registry().swap(self.slot, self._version)
+
+    def _bind(self, version):
+        """
+        Serve a registry ModelVersion.
+
+        The version carries the shared model and its CompiledBooster (binary
+        logistic classifiers only, truncated to best_iteration).
+        """
+        self._version = version
+        self.model = version.model
+        self.compiled = version.compiled
 
     # ========================================================================
     # Signal Generation
@@ -248,11 +290,30 @@ class LiveStrategyAdapter:
             >>> signal = adapter.generate_signal(features)
             >>> print(signal)  # 1 (BUY), -1 (SELL), or 0 (HOLD)
         """
+        # One consistent (model, compiled) pair per call, following slot swaps
+        model, compiled = self.model, self.compiled
+        if self.slot is not None and get_model_registry is not None:
+            version = get_model_registry().get(self.slot)
+            if version is not None:
+                model, compiled = version.model, version.compiled
+                if version is not self._version:
+                    self._bind(version)
+                    self.model_path = Path(version.path)
+
         # Safety check: No model loaded
-        if self.model is None:
+        if model is None:
             logger.warning("⚠️  No model loaded - returning HOLD (0)")
             return 0
 
+        # Fast path: one vector of the expected length through the compiled trees
+        if compiled is not None and isinstance(features, np.ndarray) and features.size == compiled.num_features:
+            try:
+                p_buy = np.float32(compiled.predict_row(features.reshape(-1)))
+                return self._apply_threshold(np.float32(1.0) - p_buy, p_buy)
+            except Exception as e:
+                logger.error(f"❌ Model prediction error: {e}")
+                return 0
+
         try:
             # Convert Series to array if needed
             if isinstance(features, pd.Series):
@@ -279,7 +340,7 @@ class LiveStrategyAdapter:
 
             # Run prediction
             try:
-                proba = self.model.predict_proba(features)
+                proba = model.predict_proba(features)
 
                 # Extract probabilities
                 if len(proba) == 0 or len(proba[0]) < 2:
@@ -287,22 +348,7 @@ class LiveStrategyAdapter:
                     return 0
 
                 p_sell, p_buy = proba[0][0], proba[0][1]
-
-                # Apply threshold and convert to signal
-                if p_buy > self.threshold:
-                    signal = 1  # BUY
-                elif p_sell > self.threshold:
-                    signal = -1  # SELL
-                else:
-                    signal = 0  # HOLD
-
-                logger.debug(
-                    f"📊 Signal: {signal:2d} | "
-                    f"P(SELL)={p_sell:.3f}, P(BUY)={p_buy:.3f} | "
-                    f"Threshold={self.threshold:.2f}"
-                )
-
-                return signal
+                return self._apply_threshold(p_sell, p_buy)
 
             except Exception as e:
                 logger.error(f"❌ Model prediction error: {e}")
@@ -312,6 +358,24 @@ class LiveStrategyAdapter:
             logger.error(f"❌ Signal generation error: {e}")
             return 0
 
+    def _apply_threshold(self, p_sell: float, p_buy: float) -> int:
+        """Convert class probabilities to a numeric signal."""
+        if p_buy > self.threshold:
+            signal = 1  # BUY
+        elif p_sell > self.threshold:
+            signal = -1  # SELL
+        else:
+            signal = 0  # HOLD
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                f"📊 Signal: {signal:2d} | "
+                f"P(SELL)={p_sell:.3f}, P(BUY)={p_buy:.3f} | "
+                f"Threshold={self.threshold:.2f}"
+            )
+
+        return signal
+
     def predict(self, tick_data: Dict[str, Any]) -> str:
         """
         Legacy method for backward compatibility.
@@ -482,6 +546,9 @@ class LiveStrategyAdapter:
             "model_type": self.model_type,
             "model_loaded": self.is_model_loaded(),
             "model_class": type(self.model).__name__ if self.model else None,
+            "compiled": self.compiled.info() if self.compiled else None,
+            "version": self._version.version if self._version else None,
+            "slot": self.slot,
             "threshold": self.threshold,
             "feature_count": len(self.feature_names)
         }
@@ -15,6 +15,13 @@ Critical Design Principles:
 - Robust error handling (never crash the loop)
 - Scheduled execution (runs every minute at :58 seconds)
 
+Multi-symbol mode (symbols=[...] with more than one symbol):
+- All symbols fetched concurrently over one shared aiohttp session,
+  throttled by a token-bucket RateLimiter and a concurrency semaphore
+- Incremental fetches: only bars newer than the last seen bar per symbol
+- Features for all symbols built in one vectorized pass
+- One batched /invocations call for all symbols
+
 Execution Node: INF Server (172.19.141.250)
 Protocol: v4.3 (Zero-Trust Edition)
 """
@@ -23,10 +30,11 @@ import os
 import sys
 import time
 import json
+import asyncio
 import logging
 import traceback
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
 import schedule
 import requests
@@ -34,11 +42,22 @@ import zmq
 import numpy as np
 import pandas as pd
 
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
 # Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from strategy.feature_builder import FeatureBuilder
 from strategy.metrics_exporter import get_metrics_exporter
+from utils.http_client import get_http_client
+from src.trading.core.limiter import RateLimiter
+
+EODHD_BASE_URL = "https://eodhistoricaldata.com/api"
+SEQUENCE_LENGTH = 60
 
 # Configure logging
 logging.basicConfig(
@@ -70,7 +89,11 @@ class SentinelDaemon:
         threshold: float = 0.6,
         lookback_bars: int = 200,  # Increased from 100 to fix data starvation (Task #077.5)
         dry_run: bool = True,
-        metrics_port: int = 8000  # Prometheus metrics endpoint (Task #085)
+        metrics_port: int = 8000,  # Prometheus metrics endpoint (Task #085)
+        symbols: Optional[List[str]] = None,
+        max_concurrency: int = 8,
+        requests_per_second: int = 10,
+        eodhd_base_url: Optional[str] = None
     ):
         """
         Initialize Sentinel Daemon
@@ -86,6 +109,10 @@ class SentinelDaemon:
             lookback_bars: Number of historical bars to fetch
             dry_run: If True, don't send actual trades
             metrics_port: Port for Prometheus metrics endpoint (Task #085)
+            symbols: Symbols for multi-symbol mode (defaults to [symbol])
+            max_concurrency: Concurrent EODHD requests in multi-symbol mode
+            requests_per_second: EODHD request rate shared by all symbols
+            eodhd_base_url: EODHD API base URL (env EODHD_BASE_URL)
         """
         self.hub_host = hub_host
         self.hub_port = hub_port
@@ -93,14 +120,27 @@ class SentinelDaemon:
         self.gtw_port = gtw_port
         self.eodhd_api_key = eodhd_api_key or os.getenv('EODHD_API_TOKEN')
         self.symbol = symbol
+        self.symbols = list(symbols) if symbols else [symbol]
         self.threshold = threshold
         self.lookback_bars = lookback_bars
         self.dry_run = dry_run
         self.metrics_port = metrics_port
 
         self.hub_url = f"http://{hub_host}:{hub_port}"
+        self.eodhd_base_url = (eodhd_base_url or os.getenv("EODHD_BASE_URL", EODHD_BASE_URL)).rstrip("/")
         self.start_time = time.time()
 
+        # Multi-symbol mode: shared session/limiter and per-symbol bar buffers
+        self.max_concurrency = max_concurrency
+        self.rate_limiter = RateLimiter(requests_per_second)
+        self._bars: Dict[str, List[Dict[str, Any]]] = {}
+        self._last_bar_ts: Dict[str, int] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._http_session = None
+
+        # Keep-alive connection pool to HUB (reused every cycle)
+        self.hub_client = get_http_client(self.hub_url)
+
         # Initialize feature builder
         self.feature_builder = FeatureBuilder(lookback_period=60)
 
@@ -115,13 +155,31 @@ class SentinelDaemon:
         logger.info("=" * 80)
         logger.info(f"HUB: {self.hub_url}")
         logger.info(f"GTW: tcp://{gtw_host}:{gtw_port}")
-        logger.info(f"Symbol: {symbol}")
+        logger.info(f"Symbol(s): {', '.join(self.symbols)}")
         logger.info(f"Threshold: {threshold}")
         logger.info(f"Dry Run: {dry_run}")
         logger.info(f"Metrics Port: {metrics_port}")
         logger.info(f"API Key: {'SET' if self.eodhd_api_key else 'NOT SET'}")
         logger.info("=" * 80)
 
+    @staticmethod
+    def _bars_to_frame(records: List[Dict[str, Any]]) -> pd.DataFrame:
+        """Convert EODHD intraday records to the DataFrame FeatureBuilder expects."""
+        df = pd.DataFrame(records)
+
+        # Standardize column names
+        if 'datetime' in df.columns:
+            df.rename(columns={'datetime': 'timestamp'}, inplace=True)
+
+        return df
+
+    @staticmethod
+    def _bar_time(record: Dict[str, Any]) -> int:
+        """Unix time of an intraday bar ('timestamp' field, else 'datetime')."""
+        if record.get('timestamp') is not None:
+            return int(record['timestamp'])
+        return int(pd.Timestamp(record['datetime'], tz='UTC').timestamp())
+
     def fetch_market_data(self) -> Optional[pd.DataFrame]:
         """
         Fetch market data from EODHD API
@@ -140,7 +198,7 @@ class SentinelDaemon:
 
         try:
             # EODHD Intraday API
-            url = f"https://eodhistoricaldata.com/api/intraday/{self.symbol}.FOREX"
+            url = f"{self.eodhd_base_url}/intraday/{self.symbol}.FOREX"
             params = {
                 'api_token': self.eodhd_api_key,
                 'interval': '1h',
@@ -165,11 +223,7 @@ class SentinelDaemon:
                 return None
 
             # Convert to DataFrame
-            df = pd.DataFrame(data)
-
-            # Standardize column names
-            if 'datetime' in df.columns:
-                df.rename(columns={'datetime': 'timestamp'}, inplace=True)
+            df = self._bars_to_frame(data)
 
             logger.info(f"✓ Fetched {len(df)} bars")
             logger.info(f"  Latest: {df.iloc[-1]['timestamp'] if len(df) > 0 else 'N/A'}")
@@ -221,12 +275,11 @@ class SentinelDaemon:
                 }
             }
 
-            url = f"{self.hub_url}/invocations"
             headers = {"Content-Type": "application/json"}
 
-            response = requests.post(
-                url,
-                json=data,
+            response = self.hub_client.post_json(
+                "/invocations",
+                data,
                 headers=headers,
                 timeout=1  # 1 second timeout as specified
             )
@@ -276,7 +329,8 @@ class SentinelDaemon:
     def send_trading_signal(
         self,
         action: str,
-        confidence: float
+        confidence: float,
+        symbol: Optional[str] = None
     ) -> bool:
         """
         Send trading signal to GTW via ZMQ
@@ -284,6 +338,7 @@ class SentinelDaemon:
         Args:
             action: Trading action (BUY/SELL/HOLD)
             confidence: Signal confidence (0-1)
+            symbol: Symbol to trade (defaults to self.symbol)
 
         Returns:
             True if successful
@@ -314,7 +369,7 @@ class SentinelDaemon:
             # Prepare trading command
             command = {
                 "action": "place_order" if action != "HOLD" else "check_connection",
-                "symbol": self.symbol,
+                "symbol": symbol or self.symbol,
                 "signal": action,
                 "confidence": float(confidence),
                 "timestamp": datetime.now().isoformat()
@@ -461,6 +516,256 @@ class SentinelDaemon:
             logger.error("Daemon continues running...")
             self.metrics.record_cycle_end(cycle_start, success=False)
 
+    # ========================================================================
+    # Multi-symbol mode
+    # ========================================================================
+
+    async def _throttle(self):
+        """Await a token from the shared bucket (exact refill time, no busy wait)."""
+        while not self.rate_limiter.acquire():
+            await asyncio.sleep(self.rate_limiter.time_until_available())
+
+    async def _fetch_symbol_bars(self, session, semaphore: asyncio.Semaphore, symbol: str) -> int:
+        """
+        Fetch bars newer than the last seen bar for one symbol
+
+        Returns:
+            Number of new bars (-1 on error)
+        """
+        fetch_start = time.time()
+        params = {
+            'api_token': self.eodhd_api_key,
+            'interval': '1h',
+            'fmt': 'json'
+        }
+        last_ts = self._last_bar_ts.get(symbol)
+        if last_ts is not None:
+            params['from'] = last_ts + 1
+
+        try:
+            async with semaphore:
+                await self._throttle()
+                url = f"{self.eodhd_base_url}/intraday/{symbol}.FOREX"
+                async with session.get(url, params=params) as response:
+                    if response.status != 200:
+                        logger.error(f"API error for {symbol}: {response.status}")
+                        self.metrics.record_data_fetch(time.time() - fetch_start, success=False)
+                        self.metrics.record_api_error('eodhd', str(response.status))
+                        return -1
+                    data = await response.json(content_type=None)
+
+            new_bars = [bar for bar in (data or []) if last_ts is None or self._bar_time(bar) > last_ts]
+            if new_bars:
+                bars = self._bars.setdefault(symbol, [])
+                bars.extend(new_bars)
+                del bars[:-self.lookback_bars]
+                self._last_bar_ts[symbol] = self._bar_time(bars[-1])
+
+            self.metrics.record_data_fetch(time.time() - fetch_start, success=True)
+            return len(new_bars)
+
+        except asyncio.TimeoutError:
+            logger.error(f"API request timeout for {symbol}")
+            self.metrics.record_data_fetch(time.time() - fetch_start, success=False)
+            self.metrics.record_api_error('eodhd', 'timeout')
+            return -1
+        except Exception as e:
+            logger.error(f"Error fetching data for {symbol}: {e}")
+            self.metrics.record_data_fetch(time.time() - fetch_start, success=False)
+            self.metrics.record_api_error('eodhd', 'exception')
+            return -1
+
+    async def fetch_all_market_data(self) -> Dict[str, pd.DataFrame]:
+        """
+        Fetch all symbols concurrently over the shared aiohttp session
+
+        Returns:
+            Symbol -> OHLCV DataFrame (last lookback_bars bars) for symbols with data
+        """
+        if aiohttp is None:
+            raise RuntimeError("aiohttp is required for multi-symbol mode")
+        if not self.eodhd_api_key:
+            logger.error("EODHD API key not set")
+            self.metrics.record_api_error('eodhd', 'no_api_key')
+            return {}
+
+        if self._http_session is None or self._http_session.closed:
+            self._http_session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=10),
+                connector=aiohttp.TCPConnector(limit=self.max_concurrency)
+            )
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        results = await asyncio.gather(
+            *[self._fetch_symbol_bars(self._http_session, semaphore, s) for s in self.symbols]
+        )
+        new_bars = sum(n for n in results if n > 0)
+        logger.info(f"✓ Fetched {new_bars} new bars for {len(self.symbols)} symbols")
+
+        return {s: self._bars_to_frame(self._bars[s]) for s in self.symbols if self._bars.get(s)}
+
+    def request_predictions_batch(
+        self,
+        features_tabular: np.ndarray,
+        features_sequential: np.ndarray
+    ) -> Optional[np.ndarray]:
+        """
+        Request predictions for many symbols in one HUB call
+
+        Args:
+            features_tabular: (N, 23) tabular features
+            features_sequential: (N, 60, 23) sequential features
+
+        Returns:
+            (N, 3) prediction probabilities or None
+        """
+        n = len(features_tabular)
+        pred_start = time.time()
+
+        try:
+            data = {
+                "dataframe_split": {
+                    "columns": ["X_tabular", "X_sequential"],
+                    "data": [
+                        [features_tabular[i:i + 1].tolist(), features_sequential[i].tolist()]
+                        for i in range(n)
+                    ]
+                }
+            }
+
+            response = self.hub_client.post_json(
+                "/invocations",
+                data,
+                headers={"Content-Type": "application/json"},
+                timeout=5
+            )
+
+            if response.status_code != 200:
+                logger.error(f"Batch inference error: {response.status_code}")
+                self.metrics.record_prediction(time.time() - pred_start, success=False)
+                self.metrics.record_api_error('hub', str(response.status_code))
+                return None
+
+            predictions = response.json()
+            if isinstance(predictions, dict) and 'predictions' in predictions:
+                predictions = predictions['predictions']
+            pred_array = np.asarray(predictions, dtype=float)
+
+            if pred_array.ndim != 2 or len(pred_array) != n:
+                logger.error(f"Batch inference returned shape {pred_array.shape}, expected ({n}, 3)")
+                self.metrics.record_prediction(time.time() - pred_start, success=False)
+                self.metrics.record_api_error('hub', 'shape')
+                return None
+
+            self.metrics.record_prediction(
+                time.time() - pred_start,
+                success=True,
+                confidence=float(pred_array.max(axis=1).mean())
+            )
+            return pred_array
+
+        except requests.exceptions.Timeout:
+            logger.error("HUB batch request timeout")
+            self.metrics.record_prediction(time.time() - pred_start, success=False)
+            self.metrics.record_api_error('hub', 'timeout')
+            return None
+        except Exception as e:
+            logger.error(f"Batch prediction error: {e}")
+            self.metrics.record_prediction(time.time() - pred_start, success=False)
+            self.metrics.record_api_error('hub', 'exception')
+            return None
+
+    async def _multi_symbol_cycle(self) -> Dict[str, Any]:
+        fetch_start = time.time()
+        frames = await self.fetch_all_market_data()
+        fetch_sec = time.time() - fetch_start
+
+        feat_start = time.time()
+        symbols, tabular, sequential = self.feature_builder.build_features_batch(
+            frames, sequence_length=SEQUENCE_LENGTH
+        )
+        self.metrics.record_feature_build(time.time() - feat_start)
+
+        decisions = {}
+        if symbols:
+            predictions = self.request_predictions_batch(tabular, sequential)
+            if predictions is not None:
+                actions = ['SELL', 'HOLD', 'BUY']
+                for symbol, probs in zip(symbols, predictions):
+                    action_idx = int(np.argmax(probs))
+                    decisions[symbol] = (actions[action_idx], float(probs[action_idx]))
+
+        return {
+            'symbols': len(self.symbols),
+            'fetched': len(frames),
+            'featured': len(symbols),
+            'decisions': decisions,
+            'fetch_sec': fetch_sec,
+        }
+
+    def execute_multi_symbol_cycle(self) -> Optional[Dict[str, Any]]:
+        """
+        Execute one trading cycle for all symbols
+
+        1. Fetch new bars for every symbol concurrently (rate limited)
+        2. Build features for all symbols in one vectorized pass
+        3. One batched prediction request
+        4. Execute trades above threshold
+
+        Returns:
+            Cycle summary (symbols, fetched, featured, decisions, fetch_sec,
+            signals, duration_sec) or None on error
+        """
+        logger.info("=" * 80)
+        logger.info(f"MULTI-SYMBOL CYCLE START: {datetime.now().isoformat()} ({len(self.symbols)} symbols)")
+        logger.info("=" * 80)
+
+        cycle_start = time.time()
+
+        try:
+            self.metrics.set_uptime(time.time() - self.start_time)
+
+            if self._loop is None or self._loop.is_closed():
+                self._loop = asyncio.new_event_loop()
+            summary = self._loop.run_until_complete(self._multi_symbol_cycle())
+
+            success = len(summary['decisions']) == len(self.symbols)
+            signals = 0
+            for symbol, (action, confidence) in summary['decisions'].items():
+                logger.info(f"{symbol}: {action} (confidence: {confidence:.4f})")
+                if confidence > self.threshold and action != 'HOLD':
+                    signals += 1
+                    if not self.send_trading_signal(action, confidence, symbol=symbol):
+                        logger.error(f"✗ Trade execution failed for {symbol}")
+                        success = False
+
+            summary['signals'] = signals
+            summary['duration_sec'] = time.time() - cycle_start
+
+            logger.info(
+                f"MULTI-SYMBOL CYCLE COMPLETE: {len(summary['decisions'])}/{len(self.symbols)} "
+                f"decisions, {signals} signals in {summary['duration_sec']:.2f}s"
+            )
+            self.metrics.record_cycle_end(cycle_start, success=success)
+            return summary
+
+        except Exception as e:
+            # NEVER crash the daemon
+            logger.error(f"!!! CYCLE ERROR: {e}")
+            logger.error(traceback.format_exc())
+            logger.error("Daemon continues running...")
+            self.metrics.record_cycle_end(cycle_start, success=False)
+            return None
+
+    def close(self):
+        """Close the shared aiohttp session and event loop"""
+        if self._loop is not None and not self._loop.is_closed():
+            if self._http_session is not None and not self._http_session.closed:
+                self._loop.run_until_complete(self._http_session.close())
+            self._loop.close()
+        self._http_session = None
+        self._loop = None
+
     def start(self):
         """
         Start the sentinel daemon
@@ -480,7 +785,8 @@ class SentinelDaemon:
             raise
 
         # Schedule job to run every minute at :58 seconds
-        schedule.every(1).minutes.at(":58").do(self.execute_trading_cycle)
+        cycle = self.execute_multi_symbol_cycle if len(self.symbols) > 1 else self.execute_trading_cycle
+        schedule.every(1).minutes.at(":58").do(cycle)
 
         logger.info("Schedule configured: Every 1 minute at :58 seconds")
         logger.info("Press Ctrl+C to stop daemon")
@@ -488,7 +794,7 @@ class SentinelDaemon:
 
         # Run immediately on start
         logger.info("Running initial cycle...")
-        self.execute_trading_cycle()
+        cycle()
 
         # Main loop
         try:
@@ -500,6 +806,7 @@ class SentinelDaemon:
             logger.info("\n" + "=" * 80)
             logger.info("Daemon stopped by user (Ctrl+C)")
             logger.info("=" * 80)
+            self.close()
             # Shutdown metrics server
             try:
                 self.metrics.shutdown()
@@ -543,6 +850,11 @@ def main():
         default="EURUSD",
         help="Trading symbol"
     )
+    parser.add_argument(
+        "--symbols",
+        default=None,
+        help="Comma-separated symbols for concurrent multi-symbol mode"
+    )
     parser.add_argument(
         "--threshold",
         type=float,
@@ -576,6 +888,7 @@ def main():
         gtw_host=args.gtw_host,
         gtw_port=args.gtw_port,
         symbol=args.symbol,
+        symbols=args.symbols.split(",") if args.symbols else None,
         threshold=args.threshold,
         dry_run=not args.live,  # Dry run unless --live specified
         metrics_port=args.metrics_port  # Prometheus metrics port (Task #085)
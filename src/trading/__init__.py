@@ -20,6 +20,8 @@ from .models import (
 from .core import (
     RateLimiter,
     ConcurrencyLimiter,
+    AsyncRateLimiter,
+    AsyncConcurrencyLimiter,
     TradeTrack,
     TrackDispatcher,
 )
@@ -44,6 +46,8 @@ __all__ = [
     # Core
     'RateLimiter',
     'ConcurrencyLimiter',
+    'AsyncRateLimiter',
+    'AsyncConcurrencyLimiter',
     'TradeTrack',
     'TrackDispatcher',
     # Utils
@@ -4,13 +4,20 @@
 包含轨道、调度器和速率限制等核心组件。
 """
 
-from .limiter import RateLimiter, ConcurrencyLimiter
+from .limiter import (
+    RateLimiter,
+    ConcurrencyLimiter,
+    AsyncRateLimiter,
+    AsyncConcurrencyLimiter,
+)
 from .track import TradeTrack
 from .dispatcher import TrackDispatcher
 
 __all__ = [
     'RateLimiter',
     'ConcurrencyLimiter',
+    'AsyncRateLimiter',
+    'AsyncConcurrencyLimiter',
     'TradeTrack',
     'TrackDispatcher',
 ]
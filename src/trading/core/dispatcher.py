@@ -11,7 +11,7 @@ import logging
 from src.trading.models import Order, OrderResult, AssetType, DispatcherConfig
 from src.trading.utils import MetricsCollector
 from .track import TradeTrack
-from .limiter import ConcurrencyLimiter
+from .limiter import AsyncConcurrencyLimiter
 
 logger = logging.getLogger(__name__)
 
@@ -32,8 +32,8 @@ class TrackDispatcher:
         """
         self.config = config or DispatcherConfig()
 
-        # 全局并发限制
-        self.global_limiter = ConcurrencyLimiter(
+        # 全局并发限制 (asyncio 原生, 各轨道 FIFO 排队)
+        self.global_limiter = AsyncConcurrencyLimiter(
             global_limit=self.config.global_max_concurrent,
             track_limits={
                 asset_type: track_config.max_concurrent
@@ -101,7 +101,9 @@ class TrackDispatcher:
         if result.success:
             self.metrics.record_order_success(result.execution_time_ms, result.track_id)
         else:
-            self.metrics.record_order_failure(result.track_id, result.error_code)
+            self.metrics.record_order_failure(
+                result.track_id, result.error_code, result.execution_time_ms or None
+            )
 
         return result
 
@@ -126,7 +128,8 @@ class TrackDispatcher:
                 'track_id': track.get_track_id(),
                 'active_orders': track.get_active_count(),
                 'max_concurrent': track.config.max_concurrent,
-                'concurrency_usage': self.global_limiter.get_track_usage(track.track_id)
+                'concurrency_usage': self.global_limiter.get_track_usage(track.track_id),
+                'rate_limiter': track.get_limiter_metrics(),
             }
 
         return status
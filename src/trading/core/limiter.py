@@ -2,11 +2,17 @@
 速率限制和并发控制模块
 
 提供流量控制和并发管理的机制。
+
+- RateLimiter / ConcurrencyLimiter: 线程安全版本, 供线程调用方使用
+- AsyncRateLimiter / AsyncConcurrencyLimiter: asyncio 原生版本, 按精确时长
+  await, 不阻塞事件循环; 等待者按 FIFO 顺序获得令牌/许可
 """
 
+import asyncio
 import threading
 import time
-from typing import Dict
+from collections import deque
+from typing import Any, Deque, Dict
 from src.trading.utils.atomic import AtomicCounter
 
 
@@ -57,6 +63,26 @@ class RateLimiter:
                 return True
             return False
 
+    def time_until_available(self, tokens: int = 1) -> float:
+        """
+        计算距离可获取指定令牌数还需等待的秒数 (不消耗令牌)
+
+        供异步调用方使用: 按精确时长 await asyncio.sleep(), 避免忙等。
+
+        Args:
+            tokens: 所需令牌数
+
+        Returns:
+            float: 需等待的秒数, 0 表示当前即可获取
+        """
+        with self._lock:
+            elapsed = time.time() - self.last_update
+            available = min(self.rate, self.tokens + elapsed * self.rate)
+            deficit = tokens - available
+            if deficit <= 0:
+                return 0.0
+            return deficit / self.rate
+
     def wait_and_acquire(self, tokens: int = 1) -> None:
         """
         等待直到获取令牌
@@ -65,7 +91,7 @@ class RateLimiter:
             tokens: 所需令牌数
         """
         while not self.acquire(tokens):
-            time.sleep(0.01)  # 短暂等待后重试
+            time.sleep(self.time_until_available(tokens) or 0.001)  # 按精确时长等待补充
 
 
 class ConcurrencyLimiter:
@@ -172,3 +198,275 @@ class ConcurrencyLimiter:
             return self.track_counters[track_id].get() < self.track_limits[track_id]
 
         return True
+
+
+class AsyncRateLimiter:
+    """
+    asyncio 原生速率限制器
+
+    令牌桶 + 预约: 令牌不足时先扣减 (允许为负) 再 await 欠额对应的时长,
+    因此等待者严格按调用顺序 (FIFO) 获得令牌, 且不会忙等或阻塞事件循环。
+    仅在单个事件循环内使用, 无需加锁 (扣减与计算之间没有 await)。
+    """
+
+    def __init__(self, requests_per_second: int):
+        """
+        初始化速率限制器
+
+        Args:
+            requests_per_second: 每秒允许的最大请求数 (同时也是桶容量)
+        """
+        self.rate = requests_per_second
+        self.tokens = float(requests_per_second)
+        self.last_update = time.monotonic()
+        self._created = self.last_update
+
+        self.waiting = 0
+        self.acquired = 0
+        self.waited = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.rate, self.tokens + (now - self.last_update) * self.rate)
+        self.last_update = now
+
+    def try_acquire(self, tokens: int = 1) -> bool:
+        """
+        非阻塞获取令牌 (有等待者时不插队)
+
+        Returns:
+            bool: 是否成功获取
+        """
+        self._refill()
+        if self.waiting == 0 and self.tokens >= tokens:
+            self.tokens -= tokens
+            self.acquired += tokens
+            return True
+        return False
+
+    async def acquire(self, tokens: int = 1) -> float:
+        """
+        获取令牌, 不足时 await 精确等待时长
+
+        Args:
+            tokens: 所需令牌数
+
+        Returns:
+            float: 实际等待秒数
+        """
+        self._refill()
+        self.tokens -= tokens
+        if self.tokens >= 0:
+            self.acquired += tokens
+            return 0.0
+
+        delay = -self.tokens / self.rate
+        self.waiting += 1
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.tokens += tokens  # 归还预约
+            raise
+        finally:
+            self.waiting -= 1
+
+        self.acquired += tokens
+        self.waited += 1
+        self.total_wait += delay
+        self.max_wait = max(self.max_wait, delay)
+        return delay
+
+    def time_until_available(self, tokens: int = 1) -> float:
+        """距离可获取指定令牌数还需等待的秒数 (不消耗令牌)"""
+        elapsed = time.monotonic() - self.last_update
+        available = min(self.rate, self.tokens + elapsed * self.rate)
+        return max(0.0, (tokens - available) / self.rate)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        获取限流指标
+
+        Returns:
+            Dict: 速率、可用令牌、等待数、累计获取数、等待耗时与利用率
+                  (utilization = 实际吞吐 / 限额)
+        """
+        self._refill()
+        elapsed = max(time.monotonic() - self._created, 1e-9)
+        return {
+            'rate': self.rate,
+            'available_tokens': max(0.0, self.tokens),
+            'waiting': self.waiting,
+            'acquired': self.acquired,
+            'waited': self.waited,
+            'avg_wait_ms': self.total_wait / self.waited * 1000 if self.waited else 0.0,
+            'max_wait_ms': self.max_wait * 1000,
+            'utilization': min(1.0, self.acquired / (elapsed * self.rate)),
+        }
+
+
+class _FifoSlots:
+    """固定容量的 FIFO 许可池 (单事件循环)"""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_use = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    def try_take(self) -> bool:
+        if self.in_use < self.limit and not self._waiters:
+            self.in_use += 1
+            return True
+        return False
+
+    async def take(self) -> None:
+        if self.try_take():
+            return
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.give()  # 许可已转交但调用方被取消, 转交给下一位
+            else:
+                self._waiters.remove(future)
+            raise
+
+    def give(self) -> None:
+        while self._waiters:
+            future = self._waiters.popleft()
+            if not future.done():
+                future.set_result(None)  # 许可直接转交, in_use 不变
+                return
+        self.in_use -= 1
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+
+class AsyncConcurrencyLimiter:
+    """
+    asyncio 原生并发限制器
+
+    与 ConcurrencyLimiter 接口兼容 (查询方法相同), 但 acquire 为协程:
+    许可不足时按轨道 FIFO 排队, 释放时直接转交给队首等待者。
+    先占轨道许可再占全局许可, 一个轨道排满不会占用其他轨道的轨道许可。
+    """
+
+    def __init__(self, global_limit: int, track_limits: Dict[str, int] = None):
+        """
+        初始化并发限制器
+
+        Args:
+            global_limit: 全局最大并发数
+            track_limits: 每个轨道的并发限制
+        """
+        self.global_limit = global_limit
+        self.track_limits = track_limits or {}
+        self._global = _FifoSlots(global_limit)
+        self._tracks: Dict[str, _FifoSlots] = {
+            track_id: _FifoSlots(limit) for track_id, limit in self.track_limits.items()
+        }
+        self.acquired: Dict[str, int] = {}
+        self.total_wait: Dict[str, float] = {}
+
+    def try_acquire(self, track_id: str) -> bool:
+        """
+        非阻塞获取并发许可
+
+        Returns:
+            bool: 是否成功获取
+        """
+        track = self._tracks.get(track_id)
+        if track is not None and not track.try_take():
+            return False
+        if not self._global.try_take():
+            if track is not None:
+                track.give()
+            return False
+        self.acquired[track_id] = self.acquired.get(track_id, 0) + 1
+        return True
+
+    async def acquire(self, track_id: str) -> float:
+        """
+        获取并发许可, 不足时排队等待 (可被外层 asyncio.timeout 取消)
+
+        Args:
+            track_id: 轨道ID
+
+        Returns:
+            float: 实际等待秒数
+        """
+        start = time.monotonic()
+        track = self._tracks.get(track_id)
+        if track is not None:
+            await track.take()
+        try:
+            await self._global.take()
+        except asyncio.CancelledError:
+            if track is not None:
+                track.give()
+            raise
+
+        waited = time.monotonic() - start
+        self.acquired[track_id] = self.acquired.get(track_id, 0) + 1
+        self.total_wait[track_id] = self.total_wait.get(track_id, 0.0) + waited
+        return waited
+
+    def release(self, track_id: str) -> None:
+        """
+        释放并发许可
+
+        Args:
+            track_id: 轨道ID
+        """
+        self._global.give()
+        if track_id in self._tracks:
+            self._tracks[track_id].give()
+
+    def get_global_usage(self) -> int:
+        """获取全局并发使用数"""
+        return self._global.in_use
+
+    def get_track_usage(self, track_id: str) -> int:
+        """获取轨道并发使用数"""
+        track = self._tracks.get(track_id)
+        return track.in_use if track is not None else 0
+
+    def is_track_available(self, track_id: str) -> bool:
+        """检查轨道是否有可用并发槽位"""
+        if self._global.in_use >= self.global_limit:
+            return False
+        track = self._tracks.get(track_id)
+        return track is None or track.in_use < track.limit
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        获取并发指标
+
+        Returns:
+            Dict: 全局与各轨道的使用数、限额、排队数、利用率和平均等待
+        """
+        tracks = {}
+        for track_id, slots in self._tracks.items():
+            acquired = self.acquired.get(track_id, 0)
+            tracks[track_id] = {
+                'in_use': slots.in_use,
+                'limit': slots.limit,
+                'waiting': slots.waiting,
+                'utilization': slots.in_use / slots.limit,
+                'acquired': acquired,
+                'avg_wait_ms': self.total_wait.get(track_id, 0.0) / acquired * 1000 if acquired else 0.0,
+            }
+        return {
+            'global': {
+                'in_use': self._global.in_use,
+                'limit': self.global_limit,
+                'waiting': self._global.waiting,
+                'utilization': self._global.in_use / self.global_limit,
+            },
+            'tracks': tracks,
+        }
@@ -6,12 +6,12 @@
 
 import asyncio
 import time
-from typing import Optional
+from typing import Any, Dict, Optional, Union
 from concurrent.futures import ThreadPoolExecutor
 
 from src.trading.models import Order, OrderResult, OrderStatus, TrackConfig
 from src.trading.utils import AtomicCounter, MetricsCollector
-from .limiter import RateLimiter, ConcurrencyLimiter
+from .limiter import AsyncConcurrencyLimiter, AsyncRateLimiter, ConcurrencyLimiter
 
 
 class TradeTrack:
@@ -22,13 +22,18 @@ class TradeTrack:
     实现了资源隔离和并发控制。
     """
 
-    def __init__(self, config: TrackConfig, global_limiter: ConcurrencyLimiter = None):
+    def __init__(
+        self,
+        config: TrackConfig,
+        global_limiter: Union[AsyncConcurrencyLimiter, ConcurrencyLimiter] = None,
+    ):
         """
         初始化交易轨道
 
         Args:
             config: 轨道配置
-            global_limiter: 全局并发限制器
+            global_limiter: 全局并发限制器 (AsyncConcurrencyLimiter 时排队等待,
+                            ConcurrencyLimiter 时满额直接拒绝)
         """
         self.config = config
         self.track_id = config.track_id
@@ -40,8 +45,8 @@ class TradeTrack:
             thread_name_prefix=f"track-{self.track_id}"
         )
 
-        # 速率限制器
-        self.rate_limiter = RateLimiter(config.rate_limit_per_second)
+        # 速率限制器 (asyncio 原生, 等待时不阻塞其他轨道)
+        self.rate_limiter = AsyncRateLimiter(config.rate_limit_per_second)
 
         # 本地并发限制
         self.local_semaphore = asyncio.Semaphore(config.max_concurrent)
@@ -90,7 +95,9 @@ class TradeTrack:
                 async with asyncio.timeout(self.config.timeout_seconds):
                     async with self.local_semaphore:
                         # 尝试获取全局并发许可
-                        if self.global_limiter:
+                        if isinstance(self.global_limiter, AsyncConcurrencyLimiter):
+                            await self.global_limiter.acquire(self.track_id)
+                        elif self.global_limiter:
                             if not self.global_limiter.acquire(self.track_id):
                                 error_msg = "Global concurrency limit exceeded"
                                 self.metrics.record_order_rejected(self.track_id)
@@ -103,16 +110,18 @@ class TradeTrack:
                                     error_code="GLOBAL_LIMIT"
                                 )
 
+                        processing = False
                         try:
                             # 更新订单状态为已入队
                             order.update_status(OrderStatus.QUEUED)
 
-                            # 应用速率限制
-                            self.rate_limiter.wait_and_acquire()
+                            # 应用速率限制 (超时取消时令牌预约自动归还)
+                            await self.rate_limiter.acquire()
 
                             # 更新订单状态为处理中
                             order.update_status(OrderStatus.PROCESSING)
                             self.active_orders.increment()
+                            processing = True
 
                             # 执行订单
                             result = await self._process_order(order)
@@ -124,18 +133,21 @@ class TradeTrack:
                             if result.success:
                                 self.metrics.record_order_success(execution_time, self.track_id)
                             else:
-                                self.metrics.record_order_failure(self.track_id, result.error_code)
+                                self.metrics.record_order_failure(self.track_id, result.error_code, execution_time)
 
                             return result
 
                         finally:
-                            self.active_orders.decrement()
+                            if processing:
+                                self.active_orders.decrement()
                             if self.global_limiter:
                                 self.global_limiter.release(self.track_id)
 
             except asyncio.TimeoutError:
                 error_msg = f"Order processing timeout after {self.config.timeout_seconds}s"
-                self.metrics.record_order_failure(self.track_id, "TIMEOUT")
+                self.metrics.record_order_failure(
+                    self.track_id, "TIMEOUT", (time.time() - start_time) * 1000
+                )
                 return OrderResult(
                     order_id=order.order_id,
                     success=False,
@@ -195,6 +207,10 @@ class TradeTrack:
         """获取当前活跃订单数"""
         return self.active_orders.get()
 
+    def get_limiter_metrics(self) -> Dict[str, Any]:
+        """获取速率限制器指标"""
+        return self.rate_limiter.get_metrics()
+
     def get_track_id(self) -> str:
         """获取轨道ID"""
         return self.track_id
@@ -2,12 +2,60 @@
 指标收集模块
 
 提供系统性能和交易指标的收集和统计功能。
+
+记录路径不加全局锁: 每个线程写自己的分片 (计数器 + 延迟直方图),
+只有读取 (get_summary / to_prometheus) 时才合并所有分片。
+延迟直方图使用固定的对数桶 (每个 2 倍区间 4 个桶, 相对误差 ≤ 19%),
+可以给出每个轨道、每个错误码的 p50/p95/p99。
 """
 
 import threading
+from bisect import bisect_left
 from datetime import datetime
-from typing import Dict, Any
-from .atomic import AtomicCounter
+from typing import Any, Dict, List, Optional, Tuple
+
+# 延迟桶上界 (毫秒): 2^(k/4), 约 0.01ms ~ 65s
+LATENCY_BUCKETS_MS: Tuple[float, ...] = tuple(2 ** (k / 4) for k in range(-28, 65))
+# 导出到 Prometheus 的桶 (每个 2 倍区间取一个, 与内部桶边界对齐)
+EXPORT_BUCKET_INDEXES: Tuple[int, ...] = tuple(range(0, len(LATENCY_BUCKETS_MS), 4))
+
+SUCCESS_CODE = 'OK'
+UNKNOWN_CODE = 'UNKNOWN'
+
+_N_BUCKETS = len(LATENCY_BUCKETS_MS) + 1  # 含 +Inf 桶
+
+
+class _Shard:
+    """
+    单个线程的指标分片 (仅由所属线程写入)
+
+    slots[(track_id, code)] 为 [桶计数 ... +Inf 桶计数, 延迟总和],
+    成功/失败数由直方图计数得出, 记录时只需一次字典查找。
+    """
+
+    __slots__ = ('counters', 'slots')
+
+    def __init__(self):
+        self.counters: Dict[Tuple[Optional[str], str], int] = {}
+        self.slots: Dict[Tuple[str, str], List[float]] = {}
+
+
+def _percentile(buckets: List[int], q: float) -> float:
+    """由桶计数估算分位数 (桶内线性插值)"""
+    total = sum(buckets)
+    if total == 0:
+        return 0.0
+    rank = q * total
+    seen = 0
+    for index, count in enumerate(buckets):
+        if count and seen + count >= rank:
+            if index >= len(LATENCY_BUCKETS_MS):
+                return LATENCY_BUCKETS_MS[-1]
+            upper = LATENCY_BUCKETS_MS[index]
+            lower = LATENCY_BUCKETS_MS[index - 1] if index else 0.0
+            return lower + (upper - lower) * (rank - seen) / count
+        seen += count
+    return LATENCY_BUCKETS_MS[-1]
 
 
 class MetricsCollector:
@@ -17,24 +65,46 @@ class MetricsCollector:
     收集系统运行过程中的关键指标，包括：
     - 订单处理数量
     - 成功/失败率
-    - 平均执行时间
+    - 平均执行时间与延迟分位数 (按轨道、按错误码)
     - 轨道级别指标
     """
 
     def __init__(self):
         """初始化指标收集器"""
-        self._total_orders = AtomicCounter(0)
-        self._successful_orders = AtomicCounter(0)
-        self._failed_orders = AtomicCounter(0)
-        self._rejected_orders = AtomicCounter(0)
-        self._total_execution_time = 0.0
-        self._track_metrics: Dict[str, Dict[str, Any]] = {}
-        self._lock = threading.Lock()
+        self._lock = threading.Lock()  # 仅用于分片注册
+        self._local = threading.local()
+        self._shards: List[_Shard] = []
         self._start_time = datetime.utcnow()
 
+    def _shard(self) -> _Shard:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = _Shard()
+            with self._lock:
+                self._shards.append(shard)
+            self._local.shard = shard
+            return shard
+
+    def _count(self, track_id: Optional[str], name: str) -> None:
+        counters = self._shard().counters
+        key = (track_id, name)
+        counters[key] = counters.get(key, 0) + 1
+
+    def _observe(self, track_id: str, code: str, value_ms: float) -> None:
+        try:
+            slots = self._local.shard.slots
+        except AttributeError:
+            slots = self._shard().slots
+        slot = slots.get((track_id, code))
+        if slot is None:
+            slot = slots[(track_id, code)] = [0] * _N_BUCKETS + [0.0]
+        slot[bisect_left(LATENCY_BUCKETS_MS, value_ms)] += 1
+        slot[-1] += value_ms
+
     def record_order_submitted(self) -> None:
         """记录提交的订单"""
-        self._total_orders.increment()
+        self._count(None, 'submitted')
 
     def record_order_success(self, execution_time_ms: float, track_id: str) -> None:
         """
@@ -44,25 +114,36 @@ class MetricsCollector:
             execution_time_ms: 执行时间（毫秒）
             track_id: 轨道ID
         """
-        self._successful_orders.increment()
-        with self._lock:
-            self._total_execution_time += execution_time_ms
-            self._update_track_metric(track_id, 'successful', 1)
-            self._update_track_metric(track_id, 'total_execution_time', execution_time_ms)
+        # 热路径: 手动内联 _observe
+        try:
+            slots = self._local.shard.slots
+        except AttributeError:
+            slots = self._shard().slots
+        slot = slots.get((track_id, SUCCESS_CODE))
+        if slot is None:
+            slot = slots[(track_id, SUCCESS_CODE)] = [0] * _N_BUCKETS + [0.0]
+        slot[bisect_left(LATENCY_BUCKETS_MS, execution_time_ms)] += 1
+        slot[-1] += execution_time_ms
 
-    def record_order_failure(self, track_id: str, error_code: str = None) -> None:
+    def record_order_failure(self, track_id: str, error_code: str = None,
+                             execution_time_ms: float = None) -> None:
         """
         记录失败的订单
 
         Args:
             track_id: 轨道ID
             error_code: 错误代码
+            execution_time_ms: 执行时间（毫秒, 可选, 记入该错误码的延迟直方图）
         """
-        self._failed_orders.increment()
-        with self._lock:
-            self._update_track_metric(track_id, 'failed', 1)
-            if error_code:
-                self._update_track_metric(track_id, f'error_{error_code}', 1)
+        if execution_time_ms is not None:
+            self._observe(track_id, error_code or UNKNOWN_CODE, execution_time_ms)
+            return
+        counters = self._shard().counters
+        key = (track_id, 'failed')
+        counters[key] = counters.get(key, 0) + 1
+        if error_code:
+            key = (track_id, f'error_{error_code}')
+            counters[key] = counters.get(key, 0) + 1
 
     def record_order_rejected(self, track_id: str) -> None:
         """
@@ -71,26 +152,55 @@ class MetricsCollector:
         Args:
             track_id: 轨道ID
         """
-        self._rejected_orders.increment()
-        with self._lock:
-            self._update_track_metric(track_id, 'rejected', 1)
+        self._count(track_id, 'rejected')
 
-    def _update_track_metric(self, track_id: str, metric_name: str, value: float) -> None:
+    # ------------------------------------------------------------------
+    # 读取 (合并分片)
+    # ------------------------------------------------------------------
+
+    def _merge(self):
         """
-        更新轨道级别指标
+        合并所有分片
 
-        Args:
-            track_id: 轨道ID
-            metric_name: 指标名称
-            value: 指标值（增量）
+        Returns:
+            (counters, histograms, sums): 计数器已包含由直方图得出的
+            successful / failed / error_<code> 计数
         """
-        if track_id not in self._track_metrics:
-            self._track_metrics[track_id] = {}
+        with self._lock:
+            shards = list(self._shards)
+
+        counters: Dict[Tuple[Optional[str], str], int] = {}
+        histograms: Dict[Tuple[str, str], List[int]] = {}
+        sums: Dict[Tuple[str, str], float] = {}
+        for shard in shards:
+            for key, value in dict(shard.counters).items():
+                counters[key] = counters.get(key, 0) + value
+            for key, slot in dict(shard.slots).items():
+                slot = list(slot)
+                merged = histograms.setdefault(key, [0] * _N_BUCKETS)
+                for index in range(_N_BUCKETS):
+                    merged[index] += slot[index]
+                sums[key] = sums.get(key, 0.0) + slot[-1]
 
-        if metric_name not in self._track_metrics[track_id]:
-            self._track_metrics[track_id][metric_name] = 0.0
+        for (track_id, code), buckets in histograms.items():
+            count = sum(buckets)
+            names = ['successful'] if code == SUCCESS_CODE else ['failed']
+            if code not in (SUCCESS_CODE, UNKNOWN_CODE):
+                names.append(f'error_{code}')
+            for name in names:
+                counters[(track_id, name)] = counters.get((track_id, name), 0) + count
+        return counters, histograms, sums
 
-        self._track_metrics[track_id][metric_name] += value
+    @staticmethod
+    def _track_metrics(counters, sums) -> Dict[str, Dict[str, float]]:
+        tracks: Dict[str, Dict[str, float]] = {}
+        for (track_id, name), value in counters.items():
+            if track_id is not None:
+                tracks.setdefault(track_id, {})[name] = float(value)
+        for (track_id, code), total in sums.items():
+            if code == SUCCESS_CODE:
+                tracks.setdefault(track_id, {})['total_execution_time'] = total
+        return tracks
 
     def get_summary(self) -> Dict[str, Any]:
         """
@@ -99,13 +209,19 @@ class MetricsCollector:
         Returns:
             Dict: 包含所有关键指标的摘要
         """
-        total = self._total_orders.get()
-        successful = self._successful_orders.get()
-        failed = self._failed_orders.get()
-        rejected = self._rejected_orders.get()
+        counters, histograms, sums = self._merge()
+
+        def total_of(name):
+            return sum(v for (track_id, n), v in counters.items() if n == name)
+
+        total = counters.get((None, 'submitted'), 0)
+        successful = total_of('successful')
+        failed = total_of('failed')
+        rejected = total_of('rejected')
 
         success_rate = (successful / total * 100) if total > 0 else 0.0
-        avg_execution_time = (self._total_execution_time / successful) if successful > 0 else 0.0
+        success_time = sum(v for (_, code), v in sums.items() if code == SUCCESS_CODE)
+        avg_execution_time = (success_time / successful) if successful > 0 else 0.0
 
         uptime = datetime.utcnow() - self._start_time
 
@@ -118,9 +234,41 @@ class MetricsCollector:
             'success_rate_percent': round(success_rate, 2),
             'avg_execution_time_ms': round(avg_execution_time, 2),
             'uptime_seconds': uptime.total_seconds(),
-            'track_metrics': dict(self._track_metrics)
+            'track_metrics': self._track_metrics(counters, sums),
+            'latency_ms': {
+                f'{track_id}/{code}': self._latency_stats(buckets, sums[(track_id, code)])
+                for (track_id, code), buckets in sorted(histograms.items())
+            },
         }
 
+    @staticmethod
+    def _latency_stats(buckets: List[int], total_ms: float) -> Dict[str, float]:
+        count = sum(buckets)
+        return {
+            'count': count,
+            'avg': round(total_ms / count, 3) if count else 0.0,
+            'p50': round(_percentile(buckets, 0.50), 3),
+            'p95': round(_percentile(buckets, 0.95), 3),
+            'p99': round(_percentile(buckets, 0.99), 3),
+        }
+
+    def get_latency_percentiles(self, track_id: str, error_code: str = SUCCESS_CODE) -> Dict[str, float]:
+        """
+        获取轨道 (及错误码) 的延迟分位数
+
+        Args:
+            track_id: 轨道ID
+            error_code: 错误码, 默认 'OK' 为成功订单
+
+        Returns:
+            Dict: count / avg / p50 / p95 / p99 (毫秒)
+        """
+        _, histograms, sums = self._merge()
+        key = (track_id, error_code)
+        if key not in histograms:
+            return self._latency_stats([0], 0.0)
+        return self._latency_stats(histograms[key], sums[key])
+
     def get_track_summary(self, track_id: str) -> Dict[str, Any]:
         """
         获取特定轨道的指标摘要
@@ -131,20 +279,67 @@ class MetricsCollector:
         Returns:
             Dict: 轨道的指标信息
         """
-        with self._lock:
-            metrics = self._track_metrics.get(track_id, {})
-            return {
-                'track_id': track_id,
-                'metrics': dict(metrics)
-            }
+        counters, histograms, sums = self._merge()
+        return {
+            'track_id': track_id,
+            'metrics': self._track_metrics(counters, sums).get(track_id, {}),
+            'latency_ms': {
+                code: self._latency_stats(buckets, sums[(tid, code)])
+                for (tid, code), buckets in histograms.items() if tid == track_id
+            },
+        }
+
+    def to_prometheus(self, prefix: str = 'trading') -> str:
+        """
+        导出为 Prometheus 文本格式
+
+        Args:
+            prefix: 指标名前缀
+
+        Returns:
+            str: orders_total 计数器与 order_latency_seconds 直方图
+        """
+        counters, histograms, sums = self._merge()
+        lines = [
+            f'# HELP {prefix}_orders_total 订单计数 (按轨道与结果)',
+            f'# TYPE {prefix}_orders_total counter',
+        ]
+        for (track_id, name), value in sorted(counters.items(), key=lambda item: (item[0][0] or '', item[0][1])):
+            if name.startswith('error_'):
+                continue
+            track = track_id or 'all'
+            lines.append(f'{prefix}_orders_total{{track="{track}",outcome="{name}"}} {value}')
+
+        lines.append(f'# HELP {prefix}_order_errors_total 失败订单计数 (按轨道与错误码)')
+        lines.append(f'# TYPE {prefix}_order_errors_total counter')
+        for (track_id, name), value in sorted(counters.items(), key=lambda item: (item[0][0] or '', item[0][1])):
+            if name.startswith('error_'):
+                lines.append(
+                    f'{prefix}_order_errors_total{{track="{track_id}",error_code="{name[6:]}"}} {value}'
+                )
+
+        metric = f'{prefix}_order_latency_seconds'
+        lines.append(f'# HELP {metric} 订单执行延迟 (按轨道与错误码)')
+        lines.append(f'# TYPE {metric} histogram')
+        for (track_id, code), buckets in sorted(histograms.items()):
+            labels = f'track="{track_id}",code="{code}"'
+            cumulative = 0
+            exported = 0
+            for index in EXPORT_BUCKET_INDEXES:
+                cumulative += sum(buckets[exported:index + 1])
+                exported = index + 1
+                le = LATENCY_BUCKETS_MS[index] / 1000
+                lines.append(f'{metric}_bucket{{{labels},le="{le:g}"}} {cumulative}')
+            count = sum(buckets)
+            lines.append(f'{metric}_bucket{{{labels},le="+Inf"}} {count}')
+            lines.append(f'{metric}_sum{{{labels}}} {sums[(track_id, code)] / 1000}')
+            lines.append(f'{metric}_count{{{labels}}} {count}')
+
+        return '\n'.join(lines) + '\n'
 
     def reset(self) -> None:
         """重置所有指标"""
-        self._total_orders.set(0)
-        self._successful_orders.set(0)
-        self._failed_orders.set(0)
-        self._rejected_orders.set(0)
-        self._total_execution_time = 0.0
         with self._lock:
-            self._track_metrics.clear()
+            self._local = threading.local()
+            self._shards = []
         self._start_time = datetime.utcnow()
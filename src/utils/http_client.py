@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HTTP Client Module - 连接池复用的 HTTP 客户端 + 特征快照缓存
+
+热路径 (tick -> 特征 -> 推理 -> 下单) 上每次 requests.post 都要重新建立
+TCP 连接; 本模块提供按 base_url 共享的 keep-alive 客户端:
+
+  - 同步: requests.Session + HTTPAdapter 连接池 (不自动重试, 由调用方决定)
+  - 异步: aiohttp.ClientSession + TCPConnector (懒创建, 可选依赖)
+  - 每个路径记录请求延迟 (count / errors / avg / p50 / p99 / max)
+
+FeatureSnapshotCache 按 (symbol, bar) 缓存特征, 同一根 K 线内的 tick
+不再重复请求 Feature API。
+
+用法:
+  client = get_http_client("http://localhost:8000")
+  response = client.post_json("/features/latest", {"symbol": "EURUSD"}, timeout=2)
+  print(client.get_stats())
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+logger = logging.getLogger(__name__)
+
+# 配置常量
+DEFAULT_POOL_SIZE = 16  # 每个 host 的 keep-alive 连接数
+DEFAULT_CONNECT_TIMEOUT = 0.5  # 秒，建连超时 (连接复用后极少触发)
+DEFAULT_READ_TIMEOUT = 2.0  # 秒，读超时
+LATENCY_WINDOW = 1024  # 每个路径保留的最近延迟样本数
+
+Timeout = Union[float, Tuple[float, float]]
+
+
+class LatencyTracker:
+    """单个端点的延迟统计 (最近 LATENCY_WINDOW 次请求)"""
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.max_ms = 0.0
+        self._samples = deque(maxlen=LATENCY_WINDOW)
+        self._lock = threading.Lock()
+
+    def record(self, elapsed_ms: float, success: bool = True):
+        with self._lock:
+            self.count += 1
+            if not success:
+                self.errors += 1
+            self.max_ms = max(self.max_ms, elapsed_ms)
+            self._samples.append(elapsed_ms)
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            samples = sorted(self._samples)
+            count, errors, max_ms = self.count, self.errors, self.max_ms
+
+        def pct(q):
+            return samples[min(len(samples) - 1, int(q * len(samples)))] if samples else 0.0
+
+        return {
+            "count": count,
+            "errors": errors,
+            "avg_ms": sum(samples) / len(samples) if samples else 0.0,
+            "p50_ms": pct(0.50),
+            "p99_ms": pct(0.99),
+            "max_ms": max_ms,
+        }
+
+
+class PooledHTTPClient:
+    """
+    keep-alive 连接池 HTTP 客户端 (同步 + 异步)
+
+    同一个 base_url 的所有调用复用连接, 省去每次请求的 TCP (及 TLS) 握手。
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        timeout: Timeout = (DEFAULT_CONNECT_TIMEOUT, DEFAULT_READ_TIMEOUT),
+    ):
+        """
+        初始化客户端
+
+        Args:
+            base_url: 服务地址, 如 http://localhost:8000
+            pool_size: 连接池大小
+            timeout: 默认超时 (秒, 或 (connect, read) 元组)
+        """
+        self.base_url = base_url.rstrip("/")
+        self.pool_size = pool_size
+        self.timeout = timeout
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({"Connection": "keep-alive"})
+
+        self._async_session = None
+        self._latency: Dict[str, LatencyTracker] = {}
+        self._latency_lock = threading.Lock()
+
+    def _url(self, path: str) -> str:
+        return path if path.startswith("http") else f"{self.base_url}/{path.lstrip('/')}"
+
+    def _tracker(self, path: str) -> LatencyTracker:
+        tracker = self._latency.get(path)
+        if tracker is None:
+            with self._latency_lock:
+                tracker = self._latency.setdefault(path, LatencyTracker())
+        return tracker
+
+    # ========================================================================
+    # 同步接口
+    # ========================================================================
+
+    def request(self, method: str, path: str, timeout: Optional[Timeout] = None, **kwargs) -> requests.Response:
+        """
+        发送请求并记录延迟 (异常照常抛出, 如 requests.Timeout)
+
+        Returns:
+            requests.Response
+        """
+        start = time.perf_counter()
+        success = False
+        try:
+            response = self.session.request(
+                method, self._url(path), timeout=timeout or self.timeout, **kwargs
+            )
+            success = response.status_code < 500
+            return response
+        finally:
+            self._tracker(path).record((time.perf_counter() - start) * 1000, success)
+
+    def get(self, path: str, timeout: Optional[Timeout] = None, **kwargs) -> requests.Response:
+        return self.request("GET", path, timeout=timeout, **kwargs)
+
+    def post_json(self, path: str, payload: Any, timeout: Optional[Timeout] = None, **kwargs) -> requests.Response:
+        return self.request("POST", path, timeout=timeout, json=payload, **kwargs)
+
+    # ========================================================================
+    # 异步接口
+    # ========================================================================
+
+    def _get_async_session(self):
+        if aiohttp is None:
+            raise RuntimeError("aiohttp 未安装，异步 HTTP 客户端不可用")
+        if self._async_session is None or self._async_session.closed:
+            self._async_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit_per_host=self.pool_size, keepalive_timeout=60)
+            )
+        return self._async_session
+
+    def _async_timeout(self, timeout: Optional[Timeout]):
+        timeout = timeout or self.timeout
+        if isinstance(timeout, tuple):
+            return aiohttp.ClientTimeout(sock_connect=timeout[0], sock_read=timeout[1])
+        return aiohttp.ClientTimeout(total=timeout)
+
+    async def apost_json(self, path: str, payload: Any, timeout: Optional[Timeout] = None) -> Tuple[int, Any]:
+        """
+        异步 POST JSON
+
+        Returns:
+            (status_code, 解析后的 JSON 或 None)
+        """
+        session = self._get_async_session()
+        start = time.perf_counter()
+        success = False
+        try:
+            async with session.post(
+                self._url(path), json=payload, timeout=self._async_timeout(timeout)
+            ) as response:
+                data = await response.json(content_type=None) if response.status == 200 else None
+                success = response.status < 500
+                return response.status, data
+        finally:
+            self._tracker(path).record((time.perf_counter() - start) * 1000, success)
+
+    async def aclose(self):
+        """关闭异步会话"""
+        if self._async_session is not None and not self._async_session.closed:
+            await self._async_session.close()
+        self._async_session = None
+
+    # ========================================================================
+    # 监控 / 生命周期
+    # ========================================================================
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        """各路径延迟统计"""
+        return {path: tracker.snapshot() for path, tracker in list(self._latency.items())}
+
+    def close(self):
+        """关闭同步连接池"""
+        self.session.close()
+
+
+_clients: Dict[str, PooledHTTPClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_http_client(base_url: str, **kwargs) -> PooledHTTPClient:
+    """
+    获取 base_url 对应的共享客户端 (首次调用时创建)
+
+    Args:
+        base_url: 服务地址
+        **kwargs: 首次创建时传给 PooledHTTPClient
+    """
+    key = base_url.rstrip("/")
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = PooledHTTPClient(key, **kwargs)
+            _clients[key] = client
+        return client
+
+
+def close_http_clients():
+    """关闭所有共享客户端的同步连接池"""
+    with _clients_lock:
+        for client in _clients.values():
+            client.close()
+        _clients.clear()
+
+
+# ============================================================================
+# 特征快照缓存
+# ============================================================================
+
+def to_epoch_seconds(timestamp: Any) -> float:
+    """
+    将 tick 时间戳转换为 epoch 秒
+
+    支持: int/float epoch, 数字字符串, ISO-8601 字符串 (含 'Z'), datetime, None (当前时间)
+    """
+    if timestamp is None:
+        return time.time()
+    if isinstance(timestamp, (int, float)):
+        return float(timestamp)
+    if isinstance(timestamp, datetime):
+        return timestamp.timestamp()
+    try:
+        return float(timestamp)
+    except (TypeError, ValueError):
+        return datetime.fromisoformat(str(timestamp).replace("Z", "+00:00")).timestamp()
+
+
+class FeatureSnapshotCache:
+    """
+    按 (symbol, bar) 缓存最近一根 K 线的特征
+
+    每个 symbol 只保留最新 bar 的快照, 新 bar 到来自动失效旧值,
+    内存占用与 symbol 数量成正比。
+    """
+
+    def __init__(self, bar_seconds: int = 60):
+        """
+        Args:
+            bar_seconds: K 线周期 (秒)
+        """
+        self.bar_seconds = bar_seconds
+        self._snapshots: Dict[str, Tuple[int, Any]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def bar_of(self, timestamp: Any) -> int:
+        """时间戳所在 K 线编号"""
+        return int(to_epoch_seconds(timestamp) // self.bar_seconds)
+
+    def get(self, symbol: str, bar: int) -> Optional[Any]:
+        with self._lock:
+            snapshot = self._snapshots.get(symbol)
+            if snapshot is not None and snapshot[0] == bar:
+                self.hits += 1
+                return snapshot[1]
+            self.misses += 1
+            return None
+
+    def put(self, symbol: str, bar: int, features: Any):
+        with self._lock:
+            current = self._snapshots.get(symbol)
+            if current is None or bar >= current[0]:
+                self._snapshots[symbol] = (bar, features)
+
+    def invalidate(self, symbol: Optional[str] = None):
+        with self._lock:
+            if symbol is None:
+                self._snapshots.clear()
+            else:
+                self._snapshots.pop(symbol, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "symbols": len(self._snapshots),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
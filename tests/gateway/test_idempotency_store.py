@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+幂等缓存测试 (TTL 过期、容量淘汰、mmap / Redis 持久化、网关集成)
+"""
+
+import pytest
+from unittest.mock import MagicMock
+
+pytest.importorskip("dotenv")
+
+from src.gateway.idempotency import (  # noqa: E402
+    IdempotencyStore,
+    MmapIdempotencyLog,
+    RedisIdempotencyBackend,
+)
+from src.gateway.json_gateway import JsonGatewayRouter  # noqa: E402
+
+
+class _Clock:
+    """可手动推进的时钟"""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class TestIdempotencyStore:
+    """IdempotencyStore 测试"""
+
+    def test_ttl_expiry(self):
+        """测试条目按插入时间过期, 命中不延长寿命"""
+        clock = _Clock()
+        store = IdempotencyStore(max_size=10, ttl_seconds=60, clock=clock)
+        store.put("a", 1)
+        clock.now += 30
+        store.put("b", 2)
+
+        clock.now += 40
+        assert store.get("a") is None
+        assert store.get("b") == (2, 1030.0)
+        assert store.stats["expirations"] == 1
+
+        clock.now += 30
+        assert store.expire() == 1
+        assert len(store) == 0
+
+    def test_size_cap_evicts_oldest(self):
+        """测试超出容量时淘汰最早条目并计数"""
+        store = IdempotencyStore(max_size=3, ttl_seconds=60, clock=_Clock())
+        for i in range(5):
+            store.put(f"req-{i}", i + 1)
+
+        assert len(store) == 3
+        assert "req-0" not in store and "req-1" not in store
+        assert store.get("req-4") == (5, 1000.0)
+        assert store.stats["evictions"] == 2
+
+    def test_snapshot(self):
+        """测试统计信息包含原有字段与命中计数"""
+        clock = _Clock()
+        store = IdempotencyStore(max_size=3, ttl_seconds=60, clock=clock)
+        assert store.snapshot()["oldest_entry_age_seconds"] is None
+
+        store.put("a", 1)
+        clock.now += 5
+        store.get("a")
+        store.get("missing")
+        stats = store.snapshot()
+
+        assert stats["size"] == 1 and stats["max_size"] == 3 and stats["ttl_seconds"] == 60
+        assert stats["oldest_entry_age_seconds"] == 5
+        assert stats["hits"] == 1 and stats["misses"] == 1
+
+
+class TestPersistence:
+    """持久化后端测试"""
+
+    def test_mmap_round_trip(self, tmp_path):
+        """测试 mmap 环形日志重启后恢复, 过期记录被丢弃"""
+        path = str(tmp_path / "idempotency.log")
+        clock = _Clock()
+        store = IdempotencyStore(max_size=4, ttl_seconds=60, clock=clock,
+                                 backend=MmapIdempotencyLog(path, capacity=4))
+        store.put("old", 1, timestamp=900.0)
+        for i in range(5):
+            store.put(f"req-{i}", 100 + i)
+        store.close()
+
+        restored = IdempotencyStore(max_size=4, ttl_seconds=60, clock=clock,
+                                    backend=MmapIdempotencyLog(path, capacity=4))
+
+        assert len(restored) == 4
+        assert "old" not in restored and "req-0" not in restored
+        assert restored.get("req-4") == (104, 1000.0)
+        restored.clear()
+        assert restored.backend.load() == []
+        restored.close()
+
+    def test_redis_backend(self):
+        """测试 Redis 后端写穿与启动加载"""
+        fakeredis = pytest.importorskip("fakeredis")
+        client = fakeredis.FakeRedis()
+        clock = _Clock()
+        backend = RedisIdempotencyBackend(client, ttl_seconds=60)
+        store = IdempotencyStore(ttl_seconds=60, clock=clock, backend=backend)
+        store.put("a", 11)
+        store.put("b", 22)
+
+        assert 0 < client.ttl("gateway:idempotency:a") <= 60
+
+        restored = IdempotencyStore(ttl_seconds=60, clock=clock, backend=backend)
+        assert restored.get("a") == (11, 1000.0)
+        assert restored.get("b") == (22, 1000.0)
+
+        restored.clear()
+        assert client.keys("gateway:idempotency:*") == []
+
+
+class TestRouterIdempotency:
+    """JsonGatewayRouter 幂等集成测试"""
+
+    def _request(self, req_id):
+        return {
+            "action": "ORDER_SEND",
+            "req_id": req_id,
+            "payload": {"symbol": "EURUSD", "type": "OP_BUY", "volume": 0.01},
+        }
+
+    def test_duplicate_req_id_not_reexecuted(self):
+        """测试重复 req_id 返回缓存 Ticket, 不再下单"""
+        mt5 = MagicMock()
+        mt5.execute_order.return_value = {
+            "error": False, "ticket": 123456, "msg": "Order placed", "retcode": 10009
+        }
+        router = JsonGatewayRouter(
+            mt5_handler=mt5, idempotency_store=IdempotencyStore(max_size=10, ttl_seconds=60)
+        )
+
+        first = router.process_json_request(self._request("req-1"))
+        second = router.process_json_request(self._request("req-1"))
+
+        assert first["ticket"] == second["ticket"] == 123456
+        assert mt5.execute_order.call_count == 1
+        stats = router.get_cache_stats()
+        assert stats["size"] == 1 and stats["hits"] == 1
+
+        router.clear_cache()
+        assert router.get_cache_stats()["size"] == 0
@@ -0,0 +1,147 @@
+"""资产审计增量扫描测试 (SQLite 元数据索引、线程池探测、--since 模式)"""
+
+import csv
+import os
+import time
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from src.audit.asset_auditor import AssetAuditor  # noqa: E402
+
+
+def _write_csv(path, days, start=datetime(2024, 1, 1)):
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Date', 'Open', 'High', 'Low', 'Close', 'Volume'])
+        for i in range(days):
+            writer.writerow([(start + timedelta(days=i)).strftime('%Y-%m-%d'), 1.1, 1.2, 1.0, 1.15, 1000])
+
+
+def _write_parquet(path, rows, freq='h', volume=1.0):
+    df = pd.DataFrame({
+        'timestamp': pd.date_range('2024-01-01', periods=rows, freq=freq),
+        'close': 1.0,
+        'volume': volume,
+    })
+    df.to_parquet(path, row_group_size=max(1, rows // 4))
+
+
+def _set_mtime(path, when):
+    ts = when.timestamp()
+    os.utime(path, (ts, ts))
+
+
+@pytest.fixture
+def data_root(tmp_path):
+    root = tmp_path / 'data'
+    (root / 'raw').mkdir(parents=True)
+    (root / 'lake' / 'features').mkdir(parents=True)
+    (root / '.git').mkdir()
+    _write_csv(root / 'raw' / 'EURUSD_d.csv', 40)
+    _write_parquet(root / 'lake' / 'features' / 'GBPUSD_h1.parquet', 5000)
+    _write_parquet(root / '.git' / 'ignored.parquet', 10)
+    return root
+
+
+def _auditor(tmp_path, **kwargs):
+    return AssetAuditor(index_path=str(tmp_path / 'index.db'), max_workers=4, **kwargs)
+
+
+class TestProbing:
+    """探测结果测试"""
+
+    def test_csv_and_parquet_metadata(self, data_root, tmp_path):
+        """测试 CSV 末行日期、行数与 parquet 统计信息得到的日期范围和时间周期"""
+        auditor = _auditor(tmp_path)
+        results = auditor.scan_all([str(data_root)])
+
+        assert len(results) == 2
+        csv_meta = results[str(data_root / 'raw' / 'EURUSD_d.csv')]
+        assert (csv_meta.status, csv_meta.row_count, csv_meta.timeframe) == ('healthy', 40, 'D1')
+        assert (csv_meta.start_date, csv_meta.end_date) == ('2024-01-01', '2024-02-09')
+
+        pq_meta = results[str(data_root / 'lake' / 'features' / 'GBPUSD_h1.parquet')]
+        assert (pq_meta.status, pq_meta.row_count, pq_meta.timeframe) == ('healthy', 5000, 'H1')
+        assert (pq_meta.start_date, pq_meta.end_date) == ('2024-01-01', '2024-07-27')
+        assert not pq_meta.has_nan and not pq_meta.has_zero_volume
+        assert auditor.scan_stats['probed'] == 2
+
+    def test_zero_volume_beyond_sample(self, tmp_path):
+        """测试采样之外的零成交量由列统计发现"""
+        root = tmp_path / 'data'
+        root.mkdir()
+        df = pd.DataFrame({
+            'time': pd.date_range('2024-01-01', periods=4000, freq='min'),
+            'volume': [5.0] * 3999 + [0.0],
+        })
+        df.to_parquet(root / 'XAUUSD_m1.parquet', row_group_size=1000)
+
+        meta = AssetAuditor(max_workers=2).scan_all([str(root)])[str(root / 'XAUUSD_m1.parquet')]
+        assert meta.timeframe == 'M1' and meta.has_zero_volume
+
+
+class TestIncrementalIndex:
+    """持久化索引增量扫描测试"""
+
+    def test_unchanged_files_not_reprobed(self, data_root, tmp_path):
+        """测试第二次扫描 (新实例) 完全复用索引, 只探测新增与修改的文件"""
+        first = _auditor(tmp_path)
+        expected = first.scan_all([str(data_root)])
+        first.close()
+
+        second = _auditor(tmp_path)
+        assert second.scan_all([str(data_root)]) == expected
+        assert second.scan_stats['reused'] == 2 and second.scan_stats['probed'] == 0
+        second.close()
+
+        _write_csv(data_root / 'raw' / 'EURUSD_d.csv', 50)
+        _write_parquet(data_root / 'raw' / 'USDJPY_h1.parquet', 100)
+        third = _auditor(tmp_path)
+        results = third.scan_all([str(data_root)])
+        assert third.scan_stats['probed'] == 2 and third.scan_stats['reused'] == 1
+        assert results[str(data_root / 'raw' / 'EURUSD_d.csv')].row_count == 50
+
+    def test_touched_file_reused_by_hash_prefix(self, data_root, tmp_path):
+        """测试仅 mtime 变化 (大小与内容前缀不变) 时复用元数据"""
+        _auditor(tmp_path).scan_all([str(data_root)])
+        path = data_root / 'raw' / 'EURUSD_d.csv'
+        _set_mtime(path, datetime.now() + timedelta(minutes=5))
+
+        auditor = _auditor(tmp_path)
+        auditor.scan_all([str(data_root)])
+        assert auditor.scan_stats['hash_reused'] == 1 and auditor.scan_stats['probed'] == 0
+
+    def test_removed_files_dropped_from_index(self, data_root, tmp_path):
+        """测试已删除的文件从索引中移除"""
+        _auditor(tmp_path).scan_all([str(data_root)])
+        (data_root / 'raw' / 'EURUSD_d.csv').unlink()
+
+        auditor = _auditor(tmp_path)
+        assert len(auditor.scan_all([str(data_root)])) == 1
+        assert auditor.scan_stats['removed'] == 1
+        assert len(auditor.index.load()) == 1
+
+    def test_since_mode(self, data_root, tmp_path):
+        """测试 --since 模式: 旧文件不检查 (有索引则沿用), 只探测新文件"""
+        old = datetime.now() - timedelta(days=30)
+        _set_mtime(data_root / 'raw' / 'EURUSD_d.csv', old)
+        _auditor(tmp_path).scan_all([str(data_root)])
+
+        # 旧文件被改写但 mtime 仍早于 since: 不检查, 沿用索引中的元数据
+        _write_csv(data_root / 'raw' / 'EURUSD_d.csv', 60)
+        _set_mtime(data_root / 'raw' / 'EURUSD_d.csv', old)
+        time.sleep(0.01)
+        _write_csv(data_root / 'raw' / 'AUDUSD_d.csv', 5)
+
+        auditor = _auditor(tmp_path)
+        results = auditor.scan_all([str(data_root)], since=datetime.now() - timedelta(days=1))
+        assert results[str(data_root / 'raw' / 'EURUSD_d.csv')].row_count == 40
+        assert auditor.scan_stats['probed'] == 1
+
+        no_index = AssetAuditor(max_workers=2)
+        no_index.scan_all([str(data_root)], since=datetime.now() - timedelta(days=1))
+        assert no_index.scan_stats['skipped'] == 1
@@ -0,0 +1,343 @@
+"""COPY 批量写入管道测试 (CopyIngestionSink / SymbolCheckpoint / ConcurrentIngestor)"""
+
+import asyncio
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data_nexus.ingestion.bulk_loader import BulkEODLoader
+from src.data_nexus.ingestion.copy_sink import (
+    MARKET_DATA_COLUMNS,
+    ConcurrentIngestor,
+    CopyIngestionSink,
+    SymbolCheckpoint,
+)
+from src.data_nexus.ingestion.history_loader import EODHistoryLoader
+from src.data_nexus.models import Asset
+from src.trading.core.limiter import RateLimiter
+
+
+class FakeCursor:
+    def __init__(self, log):
+        self.log = log
+
+    def execute(self, sql):
+        self.log.append(("execute", sql))
+
+    def copy_expert(self, sql, buf):
+        self.log.append(("copy", sql, buf.read()))
+
+    def close(self):
+        pass
+
+
+class FakeDBAPIConnection:
+    """记录 SQL 的假 DBAPI 连接"""
+
+    def __init__(self):
+        self.log = []
+        self.commits = 0
+
+    def cursor(self):
+        return FakeCursor(self.log)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class FakeEngine:
+    def __init__(self):
+        self.conn = FakeDBAPIConnection()
+
+    def raw_connection(self):
+        return self.conn
+
+
+def _frame(symbol, days, start="2024-01-01"):
+    times = pd.date_range(start, periods=days, freq="D", tz="UTC")
+    return pd.DataFrame({
+        "time": times,
+        "symbol": symbol,
+        "open": np.linspace(1.0, 2.0, days),
+        "high": np.linspace(1.1, 2.1, days),
+        "low": np.linspace(0.9, 1.9, days),
+        "close": np.linspace(1.0, 2.0, days),
+        "adjusted_close": np.linspace(1.0, 2.0, days),
+        "volume": np.arange(days, dtype=np.int64),
+    })
+
+
+def _sink(engine=None):
+    return CopyIngestionSink(
+        engine or FakeEngine(),
+        table="market_data",
+        columns=MARKET_DATA_COLUMNS,
+        conflict_columns=["time", "symbol"],
+    )
+
+
+class TestCopyIngestionSink:
+    """CopyIngestionSink 单元测试"""
+
+    def test_statements_upsert(self):
+        """测试 staging upsert SQL"""
+        sql = _sink().build_statements("_stg_x")
+        assert "WITH NO DATA" in sql["create"]
+        assert sql["copy"].startswith("COPY _stg_x (time, symbol")
+        assert "DISTINCT ON (time, symbol)" in sql["upsert"]
+        assert "ON CONFLICT (time, symbol) DO UPDATE SET open = EXCLUDED.open" in sql["upsert"]
+
+    def test_statements_do_nothing(self):
+        """测试 update_columns=[] 时使用 DO NOTHING"""
+        sink = CopyIngestionSink(
+            FakeEngine(), "market_data", MARKET_DATA_COLUMNS, ["time", "symbol"], update_columns=[]
+        )
+        assert sink.build_statements("_stg_x")["upsert"].endswith("DO NOTHING")
+
+    def test_invalid_identifier(self):
+        """测试拒绝非法标识符"""
+        with pytest.raises(ValueError):
+            CopyIngestionSink(FakeEngine(), "market_data; DROP", ["a"], ["a"])
+
+    def test_write_dataframe(self):
+        """测试 DataFrame 一次 COPY 写入并提交"""
+        engine = FakeEngine()
+        sink = _sink(engine)
+
+        rows = sink.write(_frame("AAPL.US", 3))
+
+        assert rows == 3
+        assert engine.conn.commits == 1
+        copies = [entry for entry in engine.conn.log if entry[0] == "copy"]
+        assert len(copies) == 1
+        lines = copies[0][2].strip().splitlines()
+        assert len(lines) == 3
+        assert lines[0].split(",")[1] == "AAPL.US"
+        assert sink.stats["rows"] == 3
+
+    def test_write_numpy_columns(self):
+        """测试 NumPy 列字典输入, NaN 写为 NULL"""
+        engine = FakeEngine()
+        data = {c: v.to_numpy() for c, v in _frame("MSFT.US", 2).items()}
+        data["volume"] = np.array([1.0, np.nan])
+
+        assert _sink(engine).write(data) == 2
+        payload = [entry for entry in engine.conn.log if entry[0] == "copy"][0][2]
+        assert payload.splitlines()[1].endswith(",")
+
+    def test_external_connection_not_committed(self):
+        """测试传入连接时由调用方管理事务"""
+        engine = FakeEngine()
+        external = FakeDBAPIConnection()
+        _sink(engine).write(_frame("AAPL.US", 2), connection=external)
+        assert external.commits == 0
+        assert engine.conn.log == []
+
+    def test_missing_columns(self):
+        """测试缺失列报错"""
+        with pytest.raises(ValueError, match="missing columns"):
+            _sink().write(pd.DataFrame({"time": [1]}))
+
+    def test_empty_batch(self):
+        """测试空批次不访问数据库"""
+        engine = FakeEngine()
+        assert _sink(engine).write(_frame("AAPL.US", 0)) == 0
+        assert engine.conn.log == []
+
+
+class TestSymbolCheckpoint:
+    """SymbolCheckpoint 单元测试"""
+
+    def test_roundtrip(self, tmp_path):
+        """测试保存后重新加载"""
+        path = tmp_path / "ckpt.json"
+        ckpt = SymbolCheckpoint(str(path))
+        ckpt.update("AAPL.US", "2024-01-05T00:00:00+00:00", 5)
+        ckpt.save()
+
+        reloaded = SymbolCheckpoint(str(path))
+        assert reloaded.get("AAPL.US") == "2024-01-05T00:00:00+00:00"
+        assert json.loads(path.read_text())["AAPL.US"]["rows"] == 5
+
+    def test_only_moves_forward(self, tmp_path):
+        """测试进度不会回退"""
+        ckpt = SymbolCheckpoint(str(tmp_path / "ckpt.json"))
+        ckpt.update("AAPL.US", "2024-01-05T00:00:00+00:00", 5)
+        ckpt.update("AAPL.US", "2024-01-03T00:00:00+00:00", 1)
+        assert ckpt.get("AAPL.US") == "2024-01-05T00:00:00+00:00"
+
+    def test_corrupt_file_ignored(self, tmp_path):
+        """测试损坏的检查点文件被忽略"""
+        path = tmp_path / "ckpt.json"
+        path.write_text("{not json")
+        assert len(SymbolCheckpoint(str(path))) == 0
+
+
+class TestConcurrentIngestor:
+    """ConcurrentIngestor 单元测试"""
+
+    def test_run_and_resume(self, tmp_path):
+        """测试中断后按检查点续传"""
+        engine = FakeEngine()
+        ckpt_path = str(tmp_path / "ckpt.json")
+        calls = []
+
+        async def fetch(symbol, since):
+            calls.append((symbol, since))
+            if since is not None:
+                return None
+            return _frame(symbol, 4)
+
+        ingestor = ConcurrentIngestor(
+            _sink(engine), fetch, requests_per_second=1000, concurrency=2,
+            checkpoint=SymbolCheckpoint(ckpt_path), flush_rows=5,
+        )
+        summary = asyncio.run(ingestor.run(["A", "B", "C"]))
+
+        assert summary["total_rows"] == 12
+        assert summary["failed"] == 0
+        assert sorted(summary["completed"]) == ["A", "B", "C"]
+
+        resumed = ConcurrentIngestor(
+            _sink(engine), fetch, requests_per_second=1000,
+            checkpoint=SymbolCheckpoint(ckpt_path),
+        )
+        summary = asyncio.run(resumed.run(["A"]))
+        assert summary["total_rows"] == 0
+        assert calls[-1] == ("A", "2024-01-04T00:00:00+00:00")
+
+    def test_failed_symbol_counted(self):
+        """测试单个品种失败不影响其他品种"""
+        async def fetch(symbol, since):
+            if symbol == "BAD":
+                raise RuntimeError("boom")
+            return _frame(symbol, 2)
+
+        ingestor = ConcurrentIngestor(_sink(), fetch, requests_per_second=1000)
+        summary = asyncio.run(ingestor.run(["OK", "BAD"]))
+        assert summary["failed"] == 1
+        assert summary["total_rows"] == 2
+        assert summary["failed_symbols"] == ["BAD"]
+        assert summary["completed"] == ["OK"]
+
+    def test_failed_flush_keeps_symbols_pending(self, tmp_path):
+        """测试批次写入失败时该批所有品种计入失败, 检查点不前移; 无新数据的品种仍算完成"""
+        ckpt = SymbolCheckpoint(str(tmp_path / "ckpt.json"))
+        sink = _sink()
+        write = sink.write
+
+        def flaky_write(batch):
+            if "A" in set(batch["symbol"]):
+                raise RuntimeError("COPY failed")
+            return write(batch)
+
+        sink.write = flaky_write
+
+        async def fetch(symbol, since):
+            return None if symbol == "EMPTY" else _frame(symbol, 3)
+
+        ingestor = ConcurrentIngestor(sink, fetch, requests_per_second=1000, concurrency=1,
+                                      checkpoint=ckpt, flush_rows=6)
+        summary = asyncio.run(ingestor.run(["A", "B", "EMPTY", "C"]))
+
+        assert sorted(summary["failed_symbols"]) == ["A", "B"]
+        assert summary["failed"] == 2
+        assert sorted(summary["completed"]) == ["C", "EMPTY"]
+        assert summary["total_rows"] == 3
+        assert ckpt.get("A") is None and ckpt.get("B") is None
+        assert ckpt.get("C") is not None
+
+
+class TestEODFrameParsing:
+    """EODHistoryLoader._to_frame 测试"""
+
+    def test_to_frame(self):
+        """测试 JSON 行向量化转换"""
+        rows = [
+            {"date": "2024-01-02", "open": 1, "high": 2, "low": 0.5, "close": 1.5, "volume": 10},
+            {"date": "2024-01-03", "open": 1, "high": 2, "low": 0.5, "close": 1.6,
+             "adjusted_close": 1.55, "volume": 12},
+            {"date": "bad", "open": 1, "high": 2, "low": 0.5, "close": 1.6},
+        ]
+        frame = EODHistoryLoader._to_frame(rows, "AAPL.US")
+
+        assert list(frame.columns) == MARKET_DATA_COLUMNS
+        assert len(frame) == 2
+        assert frame["adjusted_close"].tolist() == [1.5, 1.55]
+        assert frame["volume"].dtype == np.int64
+
+
+class FakeResponse:
+    def __init__(self, status, payload=None):
+        self.status = status
+        self.payload = payload
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def json(self):
+        return self.payload
+
+
+class FakeHTTP:
+    """按固定状态码 / JSON 响应的假 aiohttp 会话"""
+
+    def __init__(self, status, payload=None):
+        self.status = status
+        self.payload = payload
+
+    def get(self, url, params=None):
+        return FakeResponse(self.status, self.payload)
+
+
+class TestEODFetchFailures:
+    """EODHistoryLoader._fetch_symbol 失败与无新数据区分测试"""
+
+    @pytest.mark.parametrize("status,payload", [
+        (404, None), (503, None), (200, {"error": "bad token"}), (200, "oops"),
+    ])
+    def test_failures_return_none(self, status, payload):
+        """测试 404 / 5xx / API 错误 / 异常格式返回 None (品种计入失败, 不更新 last_synced)"""
+        loader = EODHistoryLoader("key")
+        asset = Asset(symbol="AAPL.US")
+        frame = asyncio.run(loader._fetch_symbol(asset, http=FakeHTTP(status, payload)))
+        assert frame is None
+
+    def test_no_new_rows_is_empty_frame(self):
+        """测试无新数据时返回空表 (品种正常完成)"""
+        loader = EODHistoryLoader("key")
+        frame = asyncio.run(loader._fetch_symbol(Asset(symbol="AAPL.US"), http=FakeHTTP(200, [])))
+        assert frame is not None and frame.empty
+
+
+def test_bulk_prepare_casts_volume():
+    """测试批量回填的 volume 转为 int64 (BigInteger 列 COPY 不接受 "123.0")"""
+    df = pd.DataFrame({
+        "date": ["2024-01-02", "2024-01-03"], "code": ["AAPL", "AAPL"],
+        "open": [1.0, 1.1], "high": [1.2, 1.3], "low": [0.9, 1.0], "close": [1.1, 1.2],
+        "volume": [123.0, np.nan],
+    })
+    frame = BulkEODLoader._prepare_market_data(df)
+    assert frame["volume"].dtype == np.int64
+    assert frame["volume"].tolist() == [123, 0]
+
+
+def test_rate_limiter_time_until_available():
+    """测试令牌桶等待时间计算"""
+    limiter = RateLimiter(10)
+    assert limiter.time_until_available() == 0.0
+    for _ in range(10):
+        limiter.acquire()
+    wait = limiter.time_until_available()
+    assert 0 < wait <= 0.1
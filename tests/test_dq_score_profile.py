@@ -0,0 +1,108 @@
+"""DQ 评分共用列统计 (FrameProfile) 测试: 各项统计与 pandas 逐位一致"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.monitoring import dq_score
+from src.monitoring.dq_score import DQScoreCalculator, FrameProfile, quartiles
+
+
+def _pandas_quartiles(values):
+    series = pd.Series(values)
+    return series.quantile(0.25), series.quantile(0.75)
+
+
+class TestQuartiles:
+    """四分位数精确选择测试"""
+
+    @pytest.mark.parametrize('kind', ['normal', 'ties', 'sorted', 'nan_inf', 'small'])
+    def test_matches_pandas_quantile(self, kind, monkeypatch):
+        """测试抽样区间选择与 pandas quantile 结果完全相同"""
+        monkeypatch.setattr(dq_score, '_SELECT_MIN_ROWS', 1000)
+        monkeypatch.setattr(dq_score, '_SELECT_SAMPLE_SIZE', 200)
+        rng = np.random.default_rng(7)
+        values = {
+            'normal': rng.standard_normal(50_001),
+            'ties': rng.integers(0, 5, 40_000).astype(float),
+            'sorted': np.cumsum(rng.random(30_000)),
+            'nan_inf': np.where(rng.random(20_000) < 0.3, np.nan, rng.standard_normal(20_000)),
+            'small': np.array([3.0, 1.0, 2.0]),
+        }[kind]
+        if kind == 'nan_inf':
+            values[:50] = np.inf
+            values[50:60] = -np.inf
+
+        n_valid = int(np.count_nonzero(~np.isnan(values)))
+        assert quartiles(values, n_valid) == _pandas_quartiles(values)
+
+    def test_band_miss_falls_back(self, monkeypatch):
+        """测试样本区间未覆盖目标位置时回退到全量 partition"""
+        monkeypatch.setattr(dq_score, '_SELECT_MIN_ROWS', 100)
+        monkeypatch.setattr(dq_score, '_SELECT_SAMPLE_SIZE', 10)
+        # 等距抽样只会取到 0, 真实分位数落在区间外
+        values = np.zeros(10_000)
+        values[1::2] = np.arange(5_000)
+
+        assert quartiles(values, len(values)) == _pandas_quartiles(values)
+
+    def test_all_nan(self):
+        """测试全为 NaN 时返回 NaN"""
+        q1, q3 = quartiles(np.full(10, np.nan), 0)
+        assert np.isnan(q1) and np.isnan(q3)
+
+
+class TestFrameProfile:
+    """列统计与逐维度 pandas 计算一致性测试"""
+
+    @staticmethod
+    def _frame(native_dates=True, symbols=('EURUSD',)):
+        rng = np.random.default_rng(3)
+        n = 3000
+        dates = pd.date_range('2024-01-01', periods=n // 2, freq='D').repeat(2)
+        df = pd.DataFrame({
+            'date': dates if native_dates else dates.strftime('%Y-%m-%d'),
+            'symbol': rng.choice(symbols, n),
+            'close': rng.standard_normal(n),
+            'volume': rng.integers(0, 100, n),
+            'mixed': pd.Series(rng.choice(['1', 'x', None], n), dtype=object),
+        })
+        df.loc[rng.random(n) < 0.05, 'close'] = np.nan
+        df.loc[rng.random(n) < 0.01, 'close'] = 40.0
+        df.loc[:4, 'close'] = np.inf
+        return df.drop(index=range(100, 140)).reset_index(drop=True)
+
+    @pytest.mark.parametrize('native_dates', [True, False])
+    @pytest.mark.parametrize('symbols', [('EURUSD',), ('EURUSD', 'BTCUSD')])
+    def test_stats_match_pandas(self, native_dates, symbols):
+        """测试缺失、无穷值、异常值、日期间隔与重复记录统计"""
+        df = self._frame(native_dates, symbols)
+        profile = FrameProfile(df, max_workers=2)
+
+        assert profile.null_counts.tolist() == df.isnull().sum().tolist()
+        assert profile.row_null_counts.tolist() == df.isnull().sum(axis=1).tolist()
+        assert profile.duplicate_count == df.duplicated(subset=['date', 'symbol']).sum()
+
+        dates = pd.to_datetime(df.sort_values('date')['date'])
+        assert profile.date_gap_count == (dates.diff() > pd.Timedelta(days=3)).sum()
+        assert profile.date_range == (dates.min(), dates.max())
+
+        close = df['close']
+        q1, q3 = close.quantile(0.25), close.quantile(0.75)
+        iqr = q3 - q1
+        outliers = ((close < q1 - 3 * iqr) | (close > q3 + 3 * iqr)).sum()
+        assert profile.numeric_stats['close'] == (5, outliers)
+        assert list(profile.numeric_columns) == ['close', 'volume']
+
+    def test_calculate_dq_score_shares_profile(self):
+        """测试传入的列统计被各维度复用, 结果与单独调用相同"""
+        df = self._frame()
+        calculator = DQScoreCalculator({'max_workers': 1})
+        profile = calculator.profile(df)
+
+        result = calculator.calculate_dq_score(df, profile=profile)
+
+        assert 'numeric_stats' in vars(profile) and 'duplicate_count' in vars(profile)
+        assert result['accuracy'] == round(calculator.calculate_accuracy_score(df), 2)
+        assert result['consistency'] == round(calculator.calculate_consistency_score(df), 2)
+        assert result['completeness'] == round(calculator.calculate_completeness_score(df), 2)
@@ -0,0 +1,113 @@
+"""后台增量 DQ 评分任务测试 (变化检测、元数据复用、抓取不触发评分)"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from src.monitoring import dq_job as dq_job_module  # noqa: E402
+from src.monitoring.dq_job import DQScoringJob  # noqa: E402
+from src.monitoring.dq_score import DQScoreCalculator  # noqa: E402
+
+
+def _features(n=200, shift=0.0):
+    rng = np.random.default_rng(0)
+    close = 100 + rng.standard_normal(n).cumsum() + shift
+    return pd.DataFrame({
+        'date': pd.date_range(end=pd.Timestamp.now().normalize(), periods=n, freq='D'),
+        'open': close, 'high': close + 1, 'low': close - 1, 'close': close,
+        'volume': rng.integers(1000, 5000, n),
+    })
+
+
+@pytest.fixture
+def feature_dir(tmp_path):
+    for symbol in ("EURUSD", "GBPUSD", "USDJPY"):
+        _features().to_parquet(tmp_path / f"{symbol}_features.parquet")
+    return tmp_path
+
+
+@pytest.fixture
+def read_counter(monkeypatch):
+    calls = []
+    original = pd.read_parquet
+
+    def counting(path, *args, **kwargs):
+        calls.append(str(path))
+        return original(path, *args, **kwargs)
+
+    monkeypatch.setattr(dq_job_module.pd, "read_parquet", counting)
+    return calls
+
+
+class TestDQScoringJob:
+    """DQScoringJob 测试"""
+
+    def test_only_changed_files_rescored(self, feature_dir, read_counter):
+        """测试首次全量评分, 之后只重新评分改动的文件, 删除的文件移出快照"""
+        job = DQScoringJob(feature_dirs=[str(feature_dir)])
+
+        assert job.run_once()['rescored'] == 3
+        assert job.run_once()['unchanged'] == 3
+        assert len(read_counter) == 3
+
+        _features(shift=50.0).iloc[:150].to_parquet(feature_dir / "GBPUSD_features.parquet")
+        (feature_dir / "USDJPY_features.parquet").unlink()
+        stats = job.run_once()
+
+        assert stats['rescored'] == 1 and stats['removed'] == 1 and stats['files'] == 2
+        assert read_counter[-1].endswith("GBPUSD_features.parquet")
+        results = job.results_frame().set_index('symbol')
+        assert results.loc['GBPUSD', 'records_count'] == 150
+        assert 'dq_score_total{symbol="EURUSD"}' in job.snapshot()['metrics']
+
+    def test_rewrite_with_same_content_uses_metadata(self, feature_dir, read_counter):
+        """测试文件被重写但行组统计不变时不读取数据"""
+        job = DQScoringJob(feature_dirs=[str(feature_dir)])
+        job.run_once()
+
+        path = feature_dir / "EURUSD_features.parquet"
+        _features().to_parquet(path)
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        stats = job.run_once()
+        assert stats['metadata_reused'] == 1 and stats['rescored'] == 0
+        assert len(read_counter) == 3
+
+    def test_scores_match_direct_calculation(self, feature_dir):
+        """测试快照得分与直接计算一致"""
+        job = DQScoringJob(feature_dirs=[str(feature_dir)])
+        job.run_once()
+
+        expected = DQScoreCalculator().calculate_dq_score(
+            pd.read_parquet(feature_dir / "EURUSD_features.parquet")
+        )
+        row = job.results_frame().set_index('symbol').loc['EURUSD']
+        for field in ('total_score', 'completeness', 'accuracy', 'consistency', 'timeliness', 'validity'):
+            assert row[field] == expected[field]
+
+
+class TestExporterSnapshot:
+    """Prometheus 导出器快照测试"""
+
+    def test_scrape_serves_snapshot(self, feature_dir, read_counter):
+        """测试抓取只格式化快照, 不触发评分, 并导出任务与抓取耗时"""
+        from src.monitoring.prometheus_exporter import PrometheusMetrics
+
+        exporter = PrometheusMetrics(dq_job=DQScoringJob(feature_dirs=[str(feature_dir)]))
+        exporter.update_metrics()
+        assert len(read_counter) == 3
+
+        for _ in range(20):
+            text = exporter.to_prometheus_format()
+            exporter.record_scrape(0.001)
+
+        assert len(read_counter) == 3
+        assert 'dq_score_total{symbol="USDJPY"}' in text
+        assert 'dq_job_duration_seconds ' in text
+        assert 'exporter_scrapes_total 19' in text
+        assert 'exporter_health 1' in text
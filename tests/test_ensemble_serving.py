@@ -0,0 +1,148 @@
+"""集成模型实时推理测试 (滚动序列缓冲、多品种批量、并行基学习器、向量化元学习器)"""
+
+import numpy as np
+import pytest
+from sklearn.linear_model import LogisticRegression
+
+from src.model.ensemble.alignment import DataAlignmentHandler
+from src.model.ensemble.ensemble import EnsemblePredictor
+from src.model.ensemble.meta_learner import linear_predict_proba
+from src.model.ensemble.serving import EnsembleServingEngine, RollingSequenceBuffer
+
+N_FEATURES = 5
+SEQ_LEN = 8
+
+
+def _softmax(z):
+    z = z - z.max(axis=1, keepdims=True)
+    e = np.exp(z)
+    return e / e.sum(axis=1, keepdims=True)
+
+
+class TabularLearner:
+    """表格基学习器: 线性打分 + softmax, (N, F) -> (N, 3)"""
+
+    def __init__(self, seed=0):
+        self.w = np.random.default_rng(seed).normal(size=(N_FEATURES, 3))
+        self.calls = 0
+
+    def predict_proba(self, X):
+        self.calls += 1
+        return _softmax(np.asarray(X, dtype=np.float64) @ self.w)
+
+
+class SequenceLearner:
+    """序列基学习器: 按时间加权求和后线性打分, (N, L, F) -> (N, 3)"""
+
+    def __init__(self, seed=1):
+        rng = np.random.default_rng(seed)
+        self.time_weights = rng.random(SEQ_LEN)
+        self.w = rng.normal(size=(N_FEATURES, 3))
+
+    def predict_proba(self, X):
+        pooled = np.einsum('nlf,l->nf', np.asarray(X, dtype=np.float64), self.time_weights)
+        return _softmax(pooled @ self.w)
+
+
+def _history(n=40, seed=0):
+    return np.random.default_rng(seed).normal(size=(n, N_FEATURES)).astype(np.float32)
+
+
+def _windows(history):
+    return np.stack([history[i:i + SEQ_LEN] for i in range(len(history) - SEQ_LEN + 1)])
+
+
+@pytest.fixture
+def ensemble():
+    return EnsemblePredictor(TabularLearner(), SequenceLearner(),
+                             DataAlignmentHandler(sequence_length=SEQ_LEN), weights=(0.3, 0.7))
+
+
+class TestRollingSequenceBuffer:
+    """滚动窗口缓冲测试"""
+
+    def test_window_matches_sliding_window(self):
+        """测试每次追加一行后的窗口与重新切片结果一致, 并支持品种扩容"""
+        history = _history(30)
+        buffer = RollingSequenceBuffer(SEQ_LEN, N_FEATURES, capacity=1)
+        for i, row in enumerate(history):
+            ready = buffer.append("EURUSD", row)
+            buffer.append("GBPUSD", -row)
+            assert ready == (i + 1 >= SEQ_LEN)
+            if ready:
+                np.testing.assert_array_equal(buffer.window("EURUSD"), history[i + 1 - SEQ_LEN:i + 1])
+
+        batch = buffer.windows(["GBPUSD", "EURUSD"])
+        assert batch.shape == (2, SEQ_LEN, N_FEATURES) and batch.flags.c_contiguous
+        np.testing.assert_array_equal(batch[0], -history[-SEQ_LEN:])
+        np.testing.assert_array_equal(batch[1], history[-SEQ_LEN:])
+
+        buffer.reset("EURUSD")
+        assert not buffer.is_ready("EURUSD") and buffer.is_ready("GBPUSD")
+
+
+class TestEnsembleServingEngine:
+    """与 EnsemblePredictor 逐 tick 一致性及批量推理测试"""
+
+    @pytest.mark.parametrize("parallel", [True, False])
+    def test_streaming_matches_ensemble(self, ensemble, parallel):
+        """测试逐 tick 推理结果等于 EnsemblePredictor 在完整历史上的对齐输出"""
+        history = _history()
+        expected = ensemble.predict_proba(history, _windows(history))  # (N - L + 1, 3)
+
+        engine = EnsembleServingEngine.from_ensemble(ensemble, N_FEATURES, parallel=parallel)
+        got = [engine.on_tick("EURUSD", row) for row in history]
+        engine.close()
+
+        assert all(p is None for p in got[:SEQ_LEN - 1])
+        np.testing.assert_allclose(np.stack(got[SEQ_LEN - 1:]), expected, rtol=1e-6)
+
+    def test_batch_of_symbols(self, ensemble):
+        """测试多品种一次批量推理 (表格模型只调用一次) 与逐个推理一致"""
+        engine = EnsembleServingEngine.from_ensemble(ensemble, N_FEATURES)
+        histories = {f"SYM{i}": _history(SEQ_LEN + i, seed=i) for i in range(5)}
+        for symbol, history in histories.items():
+            assert engine.seed(symbol, history)
+
+        calls = engine.lgb_predictor.calls
+        batch = engine.predict_proba(list(histories))
+        assert engine.lgb_predictor.calls == calls + 1
+
+        for row, (symbol, history) in zip(batch, histories.items()):
+            single = ensemble.predict_proba(history[-SEQ_LEN:], history[None, -SEQ_LEN:])[0]
+            np.testing.assert_allclose(row, single, rtol=1e-6)
+
+        engine.update("NEW", histories["SYM0"][0])
+        with pytest.raises(ValueError):
+            engine.predict_proba(["SYM0", "NEW"])
+        assert "NEW" not in engine.ready_symbols()
+        engine.close()
+
+    def test_stacking_and_latency_report(self, ensemble):
+        """测试堆叠元学习器结果一致, 且按组件记录延迟"""
+        rng = np.random.default_rng(3)
+        meta = LogisticRegression(max_iter=1000).fit(rng.random((300, 6)), rng.integers(-1, 2, 300))
+        ensemble.use_stacking = True
+        ensemble.meta_learner = meta
+        history = _history()
+        expected = ensemble.predict_proba(history, _windows(history))[-1]
+
+        engine = EnsembleServingEngine.from_ensemble(ensemble, N_FEATURES)
+        engine.seed("EURUSD", history)
+        np.testing.assert_allclose(engine.predict_proba(["EURUSD"])[0], expected, rtol=1e-9)
+        engine.predict_proba()
+
+        stats = engine.latency_stats()
+        assert set(stats) == {'gather', 'lgb', 'lstm', 'meta', 'total'}
+        assert all(s['count'] == 2 for s in stats.values())
+        assert stats['total']['p50_ms'] >= stats['meta']['p50_ms']
+        engine.close()
+
+
+def test_linear_predict_proba_matches_sklearn():
+    """测试向量化元学习器概率与 LogisticRegression.predict_proba 一致 (二分类与多分类)"""
+    rng = np.random.default_rng(0)
+    X = rng.random((200, 6))
+    for y in (rng.integers(-1, 2, 200), rng.integers(0, 2, 200)):
+        model = LogisticRegression(max_iter=1000).fit(X, y)
+        np.testing.assert_allclose(linear_predict_proba(model, X), model.predict_proba(X), atol=1e-12)
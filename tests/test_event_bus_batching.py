@@ -0,0 +1,138 @@
+"""事件总线批量消费测试 (整批 XACK / XCLAIM、线程池保序、lag 指标)"""
+
+import os
+import random
+import sys
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("prometheus_client")
+fakeredis = pytest.importorskip("fakeredis")
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from event_bus.base_consumer import BaseEventConsumer  # noqa: E402
+from event_bus.config import redis_config  # noqa: E402
+
+STREAM = "test:events"
+GROUP = "test-group"
+
+
+class _Consumer(BaseEventConsumer):
+    """记录处理顺序的消费者; n % 5 == 0 的事件处理失败"""
+
+    def __init__(self, server, delay=0.0, **kwargs):
+        self._server = server
+        self.delay = delay
+        self.seen = []
+        self.commands = []
+        self._lock = threading.Lock()
+        super().__init__(
+            stream_key=STREAM, consumer_group=GROUP, consumer_name="c1",
+            block_ms=10, batch_size=100, **kwargs
+        )
+
+    def _connect(self):
+        client = fakeredis.FakeRedis(server=self._server, decode_responses=True)
+        execute = client.execute_command
+
+        def counting(*args, **kwargs):
+            self.commands.append(str(args[0]).upper())
+            return execute(*args, **kwargs)
+
+        client.execute_command = counting
+        self.redis_client = client
+
+    def process_event(self, event_id, event_data):
+        if self.delay:
+            time.sleep(random.random() * self.delay)
+        with self._lock:
+            self.seen.append((event_data.get("symbol"), event_data["n"]))
+        return event_data["n"] % 5 != 0
+
+
+@pytest.fixture
+def server():
+    return fakeredis.FakeServer()
+
+
+def _publish(server, n, symbols=("EURUSD",)):
+    client = fakeredis.FakeRedis(server=server, decode_responses=True)
+    for i in range(n):
+        client.xadd(STREAM, {"n": str(i), "symbol": f'"{symbols[i % len(symbols)]}"'})
+    return client
+
+
+def _pending(client):
+    return client.xpending(STREAM, GROUP)["pending"]
+
+
+class TestBatchConsumer:
+    """BaseEventConsumer 批量处理测试"""
+
+    def test_one_xack_per_batch(self, server):
+        """测试整批处理后只发一次 XACK, 失败事件留在 PEL"""
+        consumer = _Consumer(server)
+        client = _publish(server, 20)
+        consumer.commands.clear()
+
+        consumer._consume_new_messages()
+
+        assert [n for _, n in consumer.seen] == list(range(20))
+        assert consumer.commands.count("XACK") == 1
+        assert _pending(client) == 4
+        assert consumer.stats["acked"] == 16 and consumer.stats["failed"] == 4
+
+    def test_worker_pool_preserves_key_order(self, server):
+        """测试线程池并行处理时同 key 事件保持顺序"""
+        consumer = _Consumer(server, delay=0.002, max_workers=4, ordering_key="symbol")
+        _publish(server, 60, symbols=("EURUSD", "GBPUSD", "USDJPY"))
+
+        consumer._consume_new_messages()
+
+        assert len(consumer.seen) == 60
+        for symbol in ("EURUSD", "GBPUSD", "USDJPY"):
+            ordered = [n for s, n in consumer.seen if s == symbol]
+            assert ordered == sorted(ordered) and len(ordered) == 20
+        consumer.close()
+
+    def test_pending_claimed_in_one_call(self, server, monkeypatch):
+        """测试超时消息一次 XCLAIM 重新认领"""
+        monkeypatch.setattr(redis_config, "min_idle_time_ms", 0)
+        consumer = _Consumer(server)
+        client = _publish(server, 20)
+        consumer._consume_new_messages()
+        consumer.seen.clear()
+        consumer.commands.clear()
+
+        consumer._process_pending_messages()
+
+        assert consumer.commands.count("XCLAIM") == 1
+        assert sorted(n for _, n in consumer.seen) == [0, 5, 10, 15]
+        assert _pending(client) == 4
+
+    def test_deadletter_batch(self, server, monkeypatch):
+        """测试超过重试次数的消息批量进入死信队列并 ACK"""
+        monkeypatch.setattr(redis_config, "max_retries", 0)
+        monkeypatch.setattr(redis_config, "min_idle_time_ms", 10 ** 9)
+        consumer = _Consumer(server)
+        client = _publish(server, 10)
+        consumer._consume_new_messages()
+
+        consumer._process_pending_messages()
+
+        assert client.xlen(redis_config.STREAM_DEADLETTER) == 2
+        assert _pending(client) == 0
+
+    def test_lag_metrics(self, server):
+        """测试 pending 指标"""
+        consumer = _Consumer(server)
+        _publish(server, 10)
+        consumer._consume_new_messages()
+
+        metrics = consumer.get_lag_metrics()
+
+        assert metrics["pending"] == 2
+        assert metrics["events"] == 10 and metrics["batches"] == 1
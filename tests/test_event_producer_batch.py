@@ -0,0 +1,117 @@
+"""事件生产者批量发布测试 (pipeline 分块、逐事件失败、异步变体)"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+pytest.importorskip("prometheus_client")
+fakeredis = pytest.importorskip("fakeredis")
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from event_bus.base_producer import AsyncEventProducer, BaseEventProducer  # noqa: E402
+
+STREAM = "test:produced"
+
+
+class _Producer(BaseEventProducer):
+    """fakeredis 后端, 统计 pipeline 数"""
+
+    def __init__(self, server, stream_key=STREAM):
+        self._server = server
+        self.pipelines = 0
+        super().__init__(stream_key=stream_key)
+
+    def _connect(self):
+        client = fakeredis.FakeRedis(server=self._server, decode_responses=True)
+        pipeline = client.pipeline
+
+        def counting(*args, **kwargs):
+            self.pipelines += 1
+            return pipeline(*args, **kwargs)
+
+        client.pipeline = counting
+        self.redis_client = client
+
+
+class _AsyncProducer(AsyncEventProducer):
+    def __init__(self, server):
+        self._server = server
+        super().__init__(stream_key=STREAM)
+
+    def _connect(self):
+        self.redis_client = fakeredis.FakeAsyncRedis(server=self._server, decode_responses=True)
+
+
+@pytest.fixture
+def server():
+    return fakeredis.FakeServer()
+
+
+def _events(n):
+    return [{"n": i, "title": f"news {i}"} for i in range(n)]
+
+
+class TestProduceBatch:
+    """BaseEventProducer.produce_batch 测试"""
+
+    def test_one_pipeline_per_chunk(self, server):
+        """测试按块使用 pipeline, ID 按输入顺序返回"""
+        producer = _Producer(server)
+
+        ids = producer.produce_batch(_events(250), event_type="news_raw", chunk_size=100)
+
+        assert producer.pipelines == 3
+        entries = producer.redis_client.xrange(STREAM)
+        assert [entry_id for entry_id, _ in entries] == ids
+        assert [int(fields["n"]) for _, fields in entries] == list(range(250))
+        assert entries[0][1]["event_type"] == "news_raw"
+
+    def test_per_event_failures(self, server):
+        """测试单条序列化失败只影响该事件"""
+        producer = _Producer(server)
+        events = _events(3)
+        events[1]["bad"] = object()
+
+        ids = producer.produce_batch(events)
+
+        assert ids[1] is None and ids[0] is not None and ids[2] is not None
+        assert producer.redis_client.xlen(STREAM) == 2
+
+    def test_xadd_errors_reported(self, server):
+        """测试 XADD 失败 (键类型错误) 返回 None"""
+        producer = _Producer(server, stream_key="not-a-stream")
+        producer.redis_client.set("not-a-stream", "x")
+
+        assert producer.produce_batch(_events(3)) == [None, None, None]
+
+    def test_maxlen_trim(self, server):
+        """测试 MAXLEN 裁剪与关闭裁剪"""
+        producer = _Producer(server)
+        producer.produce_batch(_events(50), maxlen=10, approximate=False)
+        assert producer.redis_client.xlen(STREAM) == 10
+
+        producer.produce_batch(_events(50), maxlen=10, trim=False)
+        assert producer.redis_client.xlen(STREAM) == 60
+
+
+class TestAsyncProducer:
+    """AsyncEventProducer 测试"""
+
+    def test_async_produce_batch(self, server):
+        """测试异步批量发布与单条发布"""
+        producer = _AsyncProducer(server)
+
+        async def main():
+            ids = await producer.produce_batch(_events(120), chunk_size=50)
+            single = await producer.produce({"n": 120})
+            length = await producer.redis_client.xlen(STREAM)
+            await producer.close()
+            return ids, single, length
+
+        ids, single, length = asyncio.run(main())
+
+        assert len(ids) == 120 and all(ids) and single is not None
+        assert length == 121
@@ -0,0 +1,115 @@
+"""编译树单行推理测试 (CompiledBooster / PricePredictor / LiveStrategyAdapter)"""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+xgb = pytest.importorskip("xgboost")
+
+from src.model.fast_inference import CompiledBooster  # noqa: E402
+from src.model.predict import PricePredictor  # noqa: E402
+from src.strategy.live_adapter import LiveStrategyAdapter  # noqa: E402
+
+NAMES = [f"f{i}" for i in range(8)]
+
+
+def _data(n=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, len(NAMES))).astype(np.float32)
+    X[rng.random(X.shape) < 0.05] = np.nan
+    y = (np.nan_to_num(X[:, 0]) - np.nan_to_num(X[:, 3]) > 0).astype(int)
+    return X, y
+
+
+@pytest.fixture(scope="module")
+def predictor(tmp_path_factory):
+    path = tmp_path_factory.mktemp("model")
+    X, y = _data()
+    booster = xgb.train({"objective": "binary:logistic", "max_depth": 5},
+                        xgb.DMatrix(X, label=y, feature_names=NAMES), num_boost_round=60)
+    booster.save_model(str(path / "model.json"))
+    (path / "meta.json").write_text(json.dumps({"features": NAMES}))
+    return PricePredictor(path / "model.json", path / "meta.json")
+
+
+class TestCompiledBooster:
+    """扁平化树结构与原生预测一致性测试"""
+
+    @pytest.mark.parametrize("objective", ["binary:logistic", "binary:logitraw", "reg:squarederror"])
+    def test_matches_booster_predict(self, objective):
+        """测试单行结果 (含缺失值默认方向) 与 Booster.predict 一致"""
+        X, y = _data()
+        booster = xgb.train({"objective": objective, "max_depth": 6, "eta": 0.3},
+                            xgb.DMatrix(X, label=y), num_boost_round=40)
+        compiled = CompiledBooster(booster)
+
+        expected = booster.predict(xgb.DMatrix(X[:300]))
+        got = np.array([compiled.predict_row(row) for row in X[:300]])
+
+        assert compiled.compiled
+        np.testing.assert_allclose(got, expected, rtol=1e-5, atol=1e-5)
+        np.testing.assert_array_equal(compiled.predict_batch(X[:300]), expected)
+
+    def test_unsupported_model_falls_back(self):
+        """测试多分类模型不编译, 单行预测回退到 inplace_predict"""
+        X, y = _data()
+        booster = xgb.train({"objective": "multi:softprob", "num_class": 3, "max_depth": 3},
+                            xgb.DMatrix(X, label=y + (X[:, 1] > 1)), num_boost_round=5)
+        compiled = CompiledBooster(booster)
+
+        assert not compiled.compiled
+        np.testing.assert_allclose(compiled.predict_row(X[0]), booster.inplace_predict(X[:1])[0])
+
+    def test_feature_order(self, predictor):
+        """测试预先计算的列顺序映射"""
+        columns = list(reversed(NAMES)) + ["extra"]
+        order = predictor.feature_order(columns)
+        row = np.arange(len(NAMES), dtype=np.float32)
+        caller_row = np.append(row[::-1], 99.0)
+
+        assert predictor.predict_vector(caller_row, order) == predictor.predict_vector(row)
+        with pytest.raises(KeyError):
+            predictor.feature_order(NAMES[1:])
+
+
+class TestPricePredictor:
+    """PricePredictor 快速路径测试"""
+
+    def test_dict_vector_and_batch_agree(self, predictor):
+        """测试 dict、原始向量、批量三种入口结果一致且与 DMatrix 参考一致"""
+        X, _ = _data(200, seed=1)
+        reference = predictor.model.predict(xgb.DMatrix(X, feature_names=NAMES))
+
+        batch = predictor.predict_batch(pd.DataFrame(X, columns=NAMES))
+        for i in (0, 7, 199):
+            by_dict = predictor.predict(dict(zip(NAMES, X[i])))
+            by_vector = predictor.predict_vector(X[i])
+            assert by_dict == by_vector
+            assert by_dict["probability"] == pytest.approx(float(reference[i]), abs=1e-6)
+            assert batch[i]["prediction"] == by_dict["prediction"]
+        np.testing.assert_array_equal(predictor.predict_proba(X), reference)
+
+
+class TestLiveStrategyAdapter:
+    """LiveStrategyAdapter 编译路径测试"""
+
+    def test_compiled_signals_match_predict_proba(self, tmp_path):
+        """测试编译路径与 predict_proba 路径信号一致, 并遵循 best_iteration"""
+        X, y = _data()
+        clf = xgb.XGBClassifier(n_estimators=80, max_depth=4, early_stopping_rounds=5)
+        clf.fit(X[:1500], y[:1500], eval_set=[(X[1500:], y[1500:])], verbose=False)
+        clf.save_model(str(tmp_path / "clf.json"))
+
+        adapter = LiveStrategyAdapter(str(tmp_path / "clf.json"), threshold=0.55)
+        assert adapter.compiled is not None
+        assert adapter.compiled.info()["num_trees"] == adapter.model.best_iteration + 1
+
+        fast = [adapter.generate_signal(row) for row in X[:300]]
+        compiled, adapter.compiled = adapter.compiled, None
+        slow = [adapter.generate_signal(row) for row in X[:300]]
+        adapter.compiled = compiled
+
+        assert fast == slow
+        assert set(fast) == {-1, 1}
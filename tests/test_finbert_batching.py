@@ -0,0 +1,86 @@
+"""FinBERT 批量推理测试 (长度分桶 + 动态 padding + LRU 缓存)"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+torch = pytest.importorskip("torch")
+transformers = pytest.importorskip("transformers")
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from sentiment_service.finbert_analyzer import FinBERTAnalyzer  # noqa: E402
+
+VOCAB = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]", ".", ",", "$",
+         "stock", "surge", "fall", "earnings", "beat", "miss", "aapl", "tsla", "record", "delay"]
+
+
+@pytest.fixture(scope="module")
+def model_dir(tmp_path_factory):
+    """随机初始化的微型 BERT, 放在分析器的本地模型路径下"""
+    cache_dir = tmp_path_factory.mktemp("finbert")
+    path = cache_dir / "ProsusAI--finbert"
+    path.mkdir()
+    (path / "vocab.txt").write_text("\n".join(VOCAB))
+    transformers.BertTokenizerFast(vocab_file=str(path / "vocab.txt")).save_pretrained(str(path))
+    torch.manual_seed(0)
+    config = transformers.BertConfig(
+        vocab_size=len(VOCAB), hidden_size=32, num_hidden_layers=1, num_attention_heads=2,
+        intermediate_size=64, num_labels=3,
+    )
+    transformers.BertForSequenceClassification(config).save_pretrained(str(path))
+    return str(cache_dir)
+
+
+def _texts():
+    rng = np.random.default_rng(0)
+    words = VOCAB[8:]
+    return [" ".join(rng.choice(words, size=int(n))) for n in rng.integers(2, 60, size=20)]
+
+
+class TestFinBERTBatching:
+    """FinBERTAnalyzer 批量推理测试"""
+
+    def test_batched_matches_single(self, model_dir):
+        """测试分桶批量结果与逐条结果一致"""
+        analyzer = FinBERTAnalyzer(device="cpu", cache_dir=model_dir, cache_size=0)
+        texts = _texts()
+
+        batched = analyzer.analyze_batch(texts, batch_size=8, return_all_scores=True)
+        assert analyzer.forward_passes <= 3
+        single = [analyzer.analyze(text, return_all_scores=True) for text in texts]
+
+        for b, s in zip(batched, single):
+            assert b["sentiment"] == s["sentiment"]
+            for label in FinBERTAnalyzer.SENTIMENT_LABELS:
+                assert b["all_scores"][label] == pytest.approx(s["all_scores"][label], abs=1e-5)
+
+    def test_cache_and_duplicates(self, model_dir):
+        """测试重复文本只计算一次, 缓存命中不再前向计算"""
+        analyzer = FinBERTAnalyzer(device="cpu", cache_dir=model_dir, cache_size=16)
+        texts = ["stock surge", "stock surge", "earnings miss", ""]
+
+        first = analyzer.analyze_batch(texts)
+        passes = analyzer.forward_passes
+        second = analyzer.analyze_batch(texts[:3])
+
+        assert first[0] == first[1] and first[:3] == second
+        assert first[3] == {"sentiment": "neutral", "score": 0.0, "confidence": 0.0}
+        assert analyzer.forward_passes == passes == 1
+        assert analyzer.cache_hits == 2
+
+    def test_ticker_contexts_match_single(self, model_dir):
+        """测试批量 ticker 上下文分析与逐个调用一致"""
+        analyzer = FinBERTAnalyzer(device="cpu", cache_dir=model_dir, cache_size=0)
+        text = "stock surge record $AAPL beat " + "delay " * 80 + "fall $TSLA miss"
+        items = [(text, "AAPL"), (text, "TSLA"), (text, "MSFT")]
+
+        batched = analyzer.analyze_ticker_contexts(items, context_window=40)
+        single = [analyzer.analyze_with_ticker_context(t, k, context_window=40) for t, k in items]
+
+        assert [r["ticker"] for r in batched] == ["AAPL", "TSLA", "MSFT"]
+        assert [r["context_used"] for r in batched] == [True, True, False]
+        for b, s in zip(batched, single):
+            assert b["score"] == pytest.approx(s["score"], abs=1e-5)
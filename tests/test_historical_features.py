@@ -0,0 +1,179 @@
+"""历史特征检索测试 (向量化 entity_df + 按列序列化 + 流式响应)"""
+
+import importlib
+import io
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from src.serving.handlers import FeatureService
+from src.serving.serializers import frame_to_records, iter_arrow_stream, iter_ndjson
+
+# src.serving 包导出了同名的 app 对象, 需按模块路径取模块本身
+serving_app = importlib.import_module("src.serving.app")
+
+FEATURES = ["sma_20", "rsi_14", "atr_14"]  # atr_14 不在模拟 Feast 结果中
+
+
+class _FakeJob:
+    def __init__(self, df):
+        self.df = df
+
+    def to_df(self):
+        return self.df
+
+
+class _FakeStore:
+    """模拟 Feast: 对每个 entity 行返回确定性特征值 (rsi_14 首行为 NaN)"""
+
+    def __init__(self):
+        self.entity_rows = 0
+
+    def get_historical_features(self, entity_df, feature_refs):
+        self.entity_rows = len(entity_df)
+        df = entity_df.copy()
+        df["event_timestamp"] = df["event_timestamp"].dt.tz_localize("UTC")
+        df["sma_20"] = np.arange(len(df), dtype=float)
+        df["rsi_14"] = df["sma_20"] / 2
+        df.loc[0, "rsi_14"] = np.nan
+        df["extra"] = "ignored"
+        return _FakeJob(df)
+
+
+def _service():
+    service = FeatureService.__new__(FeatureService)
+    service.online_store = None
+    service.store = _FakeStore()
+    return service
+
+
+def _legacy_records(features_df, features):
+    """原 iterrows 实现"""
+    result = []
+    for _, row in features_df.iterrows():
+        values = {}
+        for feat in features:
+            if feat in row:
+                values[feat] = float(row[feat]) if pd.notna(row[feat]) else None
+            else:
+                values[feat] = None
+        result.append({"symbol": row.get("symbol"), "time": row.get("event_timestamp"), "values": values})
+    return result
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(serving_app, "feature_service", _service())
+    return TestClient(serving_app.app)
+
+
+# 请求模型会对符号去重 (顺序不定), 端点测试只用一个符号
+PAYLOAD = {
+    "symbols": ["EURUSD"],
+    "features": FEATURES,
+    "start_date": "2024-01-01",
+    "end_date": "2024-01-20",
+}
+
+
+class TestHistoricalFrame:
+    """FeatureService 历史特征测试"""
+
+    def test_records_match_legacy(self):
+        """测试按列格式化与原 iterrows 实现一致"""
+        service = _service()
+
+        data, _ = service.get_historical_features(["EURUSD", "GBPUSD"], FEATURES, "2024-01-01", "2024-01-05")
+
+        raw = service.store.get_historical_features(
+            FeatureService._build_entity_df(["EURUSD", "GBPUSD"], "2024-01-01", "2024-01-05"), []
+        ).to_df()
+        assert service.store.entity_rows == 10
+        assert data == _legacy_records(raw, FEATURES)
+        assert data[0]["values"]["rsi_14"] is None and data[0]["values"]["atr_14"] is None
+
+    def test_empty_range(self):
+        """测试结束日期早于开始日期时返回空结果"""
+        data, elapsed = _service().get_historical_features(["EURUSD"], FEATURES, "2024-01-05", "2024-01-01")
+        assert data == [] and elapsed == 0
+
+
+class TestSerializers:
+    """流式序列化测试"""
+
+    def _frame(self, n=7):
+        return pd.DataFrame({
+            "symbol": ["EURUSD"] * n,
+            "event_timestamp": pd.date_range("2024-01-01", periods=n, freq="D"),
+            "sma_20": np.arange(n, dtype=float),
+        })
+
+    def test_ndjson_chunks(self):
+        """测试 NDJSON 分块且每行一个数据点"""
+        chunks = list(iter_ndjson(self._frame(), ["sma_20", "rsi_14"], chunk_rows=3))
+
+        assert len(chunks) == 3
+        lines = b"".join(chunks).decode().splitlines()
+        assert len(lines) == 7
+        assert json.loads(lines[1]) == {
+            "symbol": "EURUSD", "time": "2024-01-02T00:00:00", "values": {"sma_20": 1.0, "rsi_14": None},
+        }
+
+    def test_arrow_round_trip(self):
+        """测试 Arrow 流可完整读回 (含空结果的 schema)"""
+        pa = pytest.importorskip("pyarrow")
+        frame = self._frame()
+
+        table = pa.ipc.open_stream(b"".join(iter_arrow_stream(frame, ["sma_20"], chunk_rows=3))).read_all()
+        empty = pa.ipc.open_stream(b"".join(iter_arrow_stream(frame.iloc[:0], ["sma_20"]))).read_all()
+
+        assert table.num_rows == 7 and table.column_names == ["symbol", "event_timestamp", "sma_20"]
+        assert table.column("sma_20").to_pylist() == frame["sma_20"].tolist()
+        assert empty.num_rows == 0 and empty.schema.field("symbol").type == pa.string()
+
+    def test_records_keep_timestamps(self):
+        """测试默认保留 Timestamp 对象"""
+        records = frame_to_records(self._frame(1), ["sma_20"])
+        assert records == [{"symbol": "EURUSD", "time": pd.Timestamp("2024-01-01"), "values": {"sma_20": 0.0}}]
+
+
+class TestHistoricalEndpoint:
+    """/features/historical 端点测试"""
+
+    def test_json_response(self, client):
+        """测试默认 JSON 响应结构与 HistoricalResponse 一致"""
+        response = client.post("/features/historical", json=PAYLOAD)
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["status"] == "success" and body["row_count"] == 20 == len(body["data"])
+        assert body["data"][0] == {
+            "symbol": "EURUSD", "time": "2024-01-01T00:00:00Z",
+            "values": {"sma_20": 0.0, "rsi_14": None, "atr_14": None},
+        }
+        serving_app.HistoricalResponse(**body)
+
+    def test_ndjson_response(self, client):
+        """测试 NDJSON 流式响应"""
+        response = client.post("/features/historical", json=PAYLOAD, headers={"accept": "application/x-ndjson"})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        assert response.headers["x-row-count"] == "20"
+        lines = response.text.splitlines()
+        assert len(lines) == 20 and json.loads(lines[-1])["values"]["sma_20"] == 19.0
+
+    def test_arrow_response(self, client):
+        """测试 Arrow IPC 流式响应"""
+        pa = pytest.importorskip("pyarrow")
+        response = client.post(
+            "/features/historical", json=PAYLOAD, headers={"accept": "application/vnd.apache.arrow.stream"}
+        )
+
+        assert response.status_code == 200
+        table = pa.ipc.open_stream(io.BytesIO(response.content)).read_all()
+        assert table.num_rows == 20
+        assert table.column("rsi_14").null_count == 1
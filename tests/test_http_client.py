@@ -0,0 +1,152 @@
+"""连接池 HTTP 客户端与特征快照缓存测试"""
+
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from src.utils.http_client import (
+    FeatureSnapshotCache,
+    PooledHTTPClient,
+    get_http_client,
+    to_epoch_seconds,
+)
+
+FEATURE_COLS = [
+    'sma_20', 'sma_50', 'sma_200', 'rsi_14', 'macd_line', 'macd_signal', 'macd_histogram',
+    'atr_14', 'bb_upper', 'bb_middle', 'bb_lower', 'bb_position', 'rsi_momentum',
+    'macd_strength', 'sma_trend', 'volatility_ratio', 'returns_1d', 'returns_5d',
+]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """返回固定特征的 Feature API, 记录客户端端口以统计连接数"""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length))
+        self.server.requests.append(request)
+        self.server.client_ports.add(self.client_address[1])
+        body = json.dumps({
+            "status": "success",
+            "features": {col: float(i) for i, col in enumerate(FEATURE_COLS)},
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def feature_api():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.requests = []
+    server.client_ports = set()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server, f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+class TestPooledHTTPClient:
+    """PooledHTTPClient 测试"""
+
+    def test_connection_reused(self, feature_api):
+        """测试多次请求复用同一条 keep-alive 连接并记录延迟"""
+        server, url = feature_api
+        client = PooledHTTPClient(url)
+
+        for _ in range(10):
+            assert client.post_json("/features/latest", {"symbol": "EURUSD"}).status_code == 200
+
+        assert len(server.requests) == 10
+        assert len(server.client_ports) == 1
+        stats = client.get_stats()["/features/latest"]
+        assert stats["count"] == 10 and stats["errors"] == 0
+        assert stats["p99_ms"] >= stats["p50_ms"] > 0
+        client.close()
+
+    def test_async_post(self, feature_api):
+        """测试异步接口"""
+        pytest.importorskip("aiohttp")
+        server, url = feature_api
+        client = PooledHTTPClient(url)
+
+        async def main():
+            results = await asyncio.gather(
+                *[client.apost_json("/features/latest", {"n": i}) for i in range(5)]
+            )
+            await client.aclose()
+            return results
+
+        results = asyncio.run(main())
+
+        assert [status for status, _ in results] == [200] * 5
+        assert results[0][1]["status"] == "success"
+        assert client.get_stats()["/features/latest"]["count"] == 5
+
+    def test_shared_registry(self):
+        """测试同一 base_url 共享客户端"""
+        assert get_http_client("http://hub:5001/") is get_http_client("http://hub:5001")
+
+
+class TestFeatureSnapshotCache:
+    """FeatureSnapshotCache 测试"""
+
+    def test_same_bar_hits(self):
+        """测试同一根 K 线命中, 新 K 线失效"""
+        cache = FeatureSnapshotCache(bar_seconds=60)
+        bar = cache.bar_of("2026-01-05T10:00:05Z")
+        cache.put("EURUSD", bar, "snap")
+
+        assert cache.bar_of("2026-01-05T10:00:59+00:00") == bar
+        assert cache.get("EURUSD", bar) == "snap"
+        assert cache.get("EURUSD", cache.bar_of("2026-01-05T10:01:00Z")) is None
+        assert cache.get("GBPUSD", bar) is None
+        assert cache.get_stats()["hits"] == 1 and cache.get_stats()["misses"] == 2
+
+    def test_timestamp_formats(self):
+        """测试 epoch 数字、数字字符串与 ISO 时间戳"""
+        assert to_epoch_seconds(1704153600) == 1704153600.0
+        assert to_epoch_seconds("1704153600") == 1704153600.0
+        assert to_epoch_seconds("2024-01-02T00:00:00Z") == 1704153600.0
+
+
+class TestTradingBotFeatures:
+    """TradingBot.fetch_features 缓存集成测试"""
+
+    def test_ticks_in_same_bar_fetch_once(self, feature_api):
+        """测试同一根 K 线内的 tick 只请求一次 Feature API, 预取填充下一根"""
+        pytest.importorskip("dotenv")
+        from src.bot.trading_bot import TradingBot
+
+        server, url = feature_api
+        bot = TradingBot.__new__(TradingBot)
+        bot.symbols = ["EURUSD"]
+        bot.feature_cols = FEATURE_COLS
+        bot.feature_timeout = 2.0
+        bot.http = PooledHTTPClient(url)
+        bot.feature_cache = FeatureSnapshotCache(bar_seconds=60)
+        bot.adapter = MagicMock()
+
+        first = bot.fetch_features("EURUSD", "2026-01-05T10:00:01Z")
+        second = bot.fetch_features("EURUSD", "2026-01-05T10:00:30Z")
+        assert np.array_equal(first, np.arange(18, dtype=float).reshape(1, -1))
+        assert second is first
+        assert len(server.requests) == 1
+
+        bot.prefetch_features(to_epoch_seconds("2026-01-05T10:01:00Z"))
+        bot.fetch_features("EURUSD", "2026-01-05T10:01:02Z")
+        assert len(server.requests) == 2
+        assert bot.get_latency_stats()["feature_cache"]["hits"] == 2
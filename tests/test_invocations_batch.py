@@ -0,0 +1,196 @@
+"""/invocations 批量推理测试 (向量化映射 + 单次模型调用 + 二进制载荷)"""
+
+import importlib
+import io
+import json
+
+import numpy as np
+import pytest
+
+xgb = pytest.importorskip("xgboost")
+from fastapi.testclient import TestClient  # noqa: E402
+
+from src.model.predict import PricePredictor  # noqa: E402
+from src.serving.feature_map import SENTINEL_DIM, FeatureMapper, map_sentinel_to_model  # noqa: E402
+
+# src.serving 包导出了同名的 app 对象, 需按模块路径取模块本身
+serving_app = importlib.import_module("src.serving.app")
+
+
+@pytest.fixture(scope="module")
+def predictor(tmp_path_factory):
+    """在随机数据上训练的小型 XGBoost 模型"""
+    path = tmp_path_factory.mktemp("model")
+    features = FeatureMapper().model_features
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(400, len(features)))
+    y = (X[:, 1] + X[:, 12] > 0).astype(int)
+    booster = xgb.train(
+        {"objective": "binary:logistic", "max_depth": 3},
+        xgb.DMatrix(X, label=y, feature_names=features),
+        num_boost_round=20,
+    )
+    booster.save_model(str(path / "model.json"))
+    (path / "meta.json").write_text(json.dumps({"features": features}))
+    return PricePredictor(path / "model.json", path / "meta.json")
+
+
+@pytest.fixture
+def client(predictor, monkeypatch):
+    monkeypatch.setattr(serving_app, "model_predictor", predictor)
+    monkeypatch.setattr(serving_app, "feature_mapper", None)
+    monkeypatch.setattr(serving_app, "ENABLE_MOCK_INFERENCE", False)
+    return TestClient(serving_app.app)
+
+
+def _rows(n, seed=1):
+    return np.random.default_rng(seed).normal(size=(n, SENTINEL_DIM))
+
+
+def _per_row_reference(predictor, rows):
+    """原逐行实现: map_sentinel_to_model + predictor.predict"""
+    return [
+        predictor.predict(map_sentinel_to_model(list(row), predictor.feature_names))["probability"]
+        for row in rows
+    ]
+
+
+class TestFeatureMapperBatch:
+    """FeatureMapper.map_batch 单元测试"""
+
+    def test_matches_single_row_mapping(self):
+        """测试批量映射与逐行映射一致 (含 NaN/inf 补零)"""
+        rows = _rows(5)
+        rows[2, 3] = np.nan
+        rows[4, 12] = np.inf
+        mapper = FeatureMapper()
+
+        batch = mapper.map_batch(rows)
+
+        assert batch.dtype == np.float32 and batch.shape == (5, 15)
+        for i, row in enumerate(rows):
+            expected = map_sentinel_to_model(list(row)).to_numpy(dtype=np.float32)[0]
+            np.testing.assert_array_equal(batch[i], expected)
+
+    def test_unmapped_feature_and_out(self):
+        """测试未映射特征补零与预分配输出"""
+        mapper = FeatureMapper(["rsi_14", "unknown", "sma_5"])
+        out = np.full((2, 3), 7.0, dtype=np.float32)
+        rows = _rows(2)
+
+        assert mapper.map_batch(rows, out=out) is out
+        np.testing.assert_array_equal(out[:, 1], 0.0)
+        np.testing.assert_array_equal(out[:, 0], rows[:, 12].astype(np.float32))
+
+    def test_invalid_shape(self):
+        """测试维度错误"""
+        with pytest.raises(ValueError):
+            FeatureMapper().map_batch(np.zeros((2, 22)))
+
+
+class TestInvocationsEndpoint:
+    """/invocations 端点测试"""
+
+    def test_json_batch_matches_per_row(self, client, predictor):
+        """测试批量结果与原逐行实现一致"""
+        rows = _rows(50)
+        payload = {"dataframe_split": {"data": [[row.tolist(), []] for row in rows]}}
+
+        response = client.post("/invocations", json=payload)
+
+        assert response.status_code == 200
+        body = response.json()
+        assert "errors" not in body
+        np.testing.assert_allclose(
+            [p[0] for p in body["predictions"]], _per_row_reference(predictor, rows), rtol=1e-6
+        )
+
+    def test_per_row_errors(self, client):
+        """测试单行错误不影响其他行, 并返回逐行错误"""
+        rows = _rows(3).tolist()
+        payload = {"instances": [[rows[0]], [rows[1][:5]], "bad", [rows[2]]]}
+
+        response = client.post("/invocations", json=payload)
+
+        body = response.json()
+        assert len(body["predictions"]) == 4
+        assert [error["index"] for error in body["errors"]] == [1, 2]
+        assert body["predictions"][1] == [0.5] and body["predictions"][2] == [0.5]
+        assert body["predictions"][0] != [0.5]
+
+    def test_npy_payload(self, client, predictor):
+        """测试 .npy 二进制载荷"""
+        rows = _rows(20)
+        buf = io.BytesIO()
+        np.save(buf, rows)
+
+        response = client.post(
+            "/invocations", content=buf.getvalue(), headers={"content-type": "application/x-npy"}
+        )
+
+        assert response.status_code == 200
+        np.testing.assert_allclose(
+            [p[0] for p in response.json()["predictions"]], _per_row_reference(predictor, rows), rtol=1e-6
+        )
+
+    def test_arrow_payload(self, client):
+        """测试 Arrow IPC 二进制载荷"""
+        pa = pytest.importorskip("pyarrow")
+        rows = _rows(10)
+        table = pa.table({f"f{i}": rows[:, i] for i in range(SENTINEL_DIM)})
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+
+        arrow = client.post(
+            "/invocations", content=sink.getvalue().to_pybytes(),
+            headers={"content-type": "application/vnd.apache.arrow.stream"},
+        )
+        json_resp = client.post("/invocations", json={"inputs": [[row.tolist()] for row in rows]})
+
+        assert arrow.status_code == 200
+        assert arrow.json()["predictions"] == json_resp.json()["predictions"]
+
+    def test_bad_binary_shape(self, client):
+        """测试二进制载荷维度错误"""
+        buf = io.BytesIO()
+        np.save(buf, np.zeros((3, 5)))
+        response = client.post(
+            "/invocations", content=buf.getvalue(), headers={"content-type": "application/x-npy"}
+        )
+        assert response.status_code == 500
+
+    def test_missing_field(self, client):
+        """测试缺少输入字段"""
+        assert client.post("/invocations", json={}).status_code == 500
+
+    def test_malformed_json(self, client):
+        """测试 JSON 无法解析时返回 400 及错误信息, 而非 500"""
+        response = client.post(
+            "/invocations", content=b'{"instances": [', headers={"content-type": "application/json"}
+        )
+        assert response.status_code == 400
+        assert response.json()["detail"]["error_code"] == "INVALID_JSON"
+
+    def test_schema_violation(self, client):
+        """测试字段类型不符时返回 422 及逐字段错误"""
+        response = client.post("/invocations", json={"instances": "not-a-list"})
+        assert response.status_code == 422
+        detail = response.json()["detail"]
+        assert detail["error_code"] == "VALIDATION_ERROR"
+        assert detail["details"][0]["loc"] == ["instances"]
+
+    @pytest.mark.parametrize("body", [b"[1, 2]", b'"x"', b"3"])
+    def test_non_object_body(self, client, body):
+        """测试合法 JSON 但不是对象时返回 422, 而非 500"""
+        response = client.post("/invocations", content=body, headers={"content-type": "application/json"})
+        assert response.status_code == 422
+        assert response.json()["detail"]["error_code"] == "VALIDATION_ERROR"
+
+    def test_mock_mode(self, client, monkeypatch):
+        """测试 mock 模式不加载模型"""
+        monkeypatch.setattr(serving_app, "ENABLE_MOCK_INFERENCE", True)
+        monkeypatch.setattr(serving_app, "model_predictor", None)
+        response = client.post("/invocations", json={"instances": [[_rows(1)[0].tolist()]] * 3})
+        predictions = [p[0] for p in response.json()["predictions"]]
+        assert len(predictions) == 3 and all(0.4 <= p <= 0.8 for p in predictions)
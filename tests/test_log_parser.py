@@ -0,0 +1,137 @@
+"""TradeLogParser 流式解析与增量 tail 测试"""
+
+import re
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.reporting.log_parser import TradeLogParser
+
+
+SAMPLE_LINES = [
+    "2024-01-01 10:00:00,123 INFO [TICK] EURUSD @ 1.0850 (2024-01-01T10:00:00.000)",
+    "2024-01-01 10:00:01,123 INFO [FEAT] Fetched 18 features for EURUSD",
+    "unrelated line without timestamp [TICK] EURUSD @ 9.9 (x)",
+    "2024-01-01 10:00:02,123 INFO [PRED] Signal: -1 (SELL)",
+    "2024-01-01 10:00:02,500 INFO heartbeat",
+    "2024-01-01 10:00:03,123 INFO [EXEC] Sending order: SELL 0.10 EURUSD @ 1.0849",
+    "2024-01-01 10:30:03,123 INFO [FILL] Order 12345 filled @ 1.0840",
+    "2024-01-01 11:00:00,123 INFO [TICK] EURUSD @ 1.0860 (2024-01-01T11:00:00.000)",
+    "2024-01-01 11:00:05,123 INFO [PRED] Signal: 1 (BUY)",
+]
+
+
+def reference_parse(text):
+    """原逐行多正则实现 (作为解析结果基准)"""
+    events = []
+    for line in text.splitlines():
+        ts_match = re.search(r'^(\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2}),\d+', line)
+        if not ts_match:
+            continue
+        timestamp = datetime.strptime(ts_match.group(1), '%Y-%m-%d %H:%M:%S')
+        for event_type, pattern in TradeLogParser.PATTERNS.items():
+            match = re.search(pattern, line)
+            if match:
+                event = {'timestamp': timestamp, 'event_type': event_type.upper()}
+                for (field, kind), value in zip(TradeLogParser.FIELDS[event_type], match.groups()):
+                    event[field] = kind(value)
+                events.append(event)
+                break
+    return pd.DataFrame(events)
+
+
+@pytest.fixture
+def log_path(tmp_path):
+    path = tmp_path / "trading.log"
+    path.write_text("\n".join(SAMPLE_LINES) + "\n")
+    return path
+
+
+class TestTradeLogParser:
+    """TradeLogParser 单元测试"""
+
+    def test_parity_with_reference(self, log_path):
+        """测试与原实现结果一致"""
+        df = TradeLogParser(str(log_path)).parse_log()
+        expected = reference_parse(log_path.read_text())
+
+        assert len(df) == 7
+        pd.testing.assert_frame_equal(
+            df[expected.columns].reset_index(drop=True), expected, check_dtype=False
+        )
+
+    def test_dense_int_column(self, tmp_path):
+        """测试仅含一类事件时整数列保持 int64"""
+        path = tmp_path / "pred.log"
+        path.write_text(
+            "2024-01-01 10:00:02,1 [PRED] Signal: 1 (BUY)\n"
+            "2024-01-01 10:00:03,1 [PRED] Signal: 0 (HOLD)\n"
+        )
+        df = TradeLogParser(str(path)).parse_log()
+        assert df['signal'].dtype == np.int64
+        assert 'price' not in df.columns
+
+    def test_empty_log(self, tmp_path):
+        """测试无事件日志"""
+        path = tmp_path / "empty.log"
+        path.write_text("nothing here\n")
+        assert TradeLogParser(str(path)).parse_log().empty
+
+    def test_missing_file(self, tmp_path):
+        """测试文件不存在"""
+        with pytest.raises(FileNotFoundError):
+            TradeLogParser(str(tmp_path / "missing.log"))
+
+    def test_tail_reads_only_new_lines(self, log_path):
+        """测试增量 tail 只解析新增行"""
+        parser = TradeLogParser(str(log_path))
+        parser.parse_log()
+        offset = parser.offset
+        assert offset == log_path.stat().st_size
+
+        with open(log_path, "a") as f:
+            f.write("2024-01-01 12:00:00,1 [FILL] Order 777 filled @ 1.0900\n")
+            f.write("2024-01-01 12:00:01,1 [TICK] EURUSD @ 1.09")  # still being written
+
+        new_events = parser.tail()
+        assert new_events['event_type'].tolist() == ['FILL']
+        assert len(parser.events) == 8
+
+        with open(log_path, "a") as f:
+            f.write("00 (2024-01-01T12:00:01.000)\n")
+
+        new_events = parser.tail()
+        assert new_events['price'].tolist() == [1.09]
+        assert len(parser.events) == 9
+
+    def test_resume_from_saved_offset(self, log_path):
+        """测试从保存的偏移量恢复"""
+        offset = log_path.stat().st_size
+        with open(log_path, "a") as f:
+            f.write("2024-01-01 12:00:00,1 [PRED] Signal: 0 (HOLD)\n")
+
+        df = TradeLogParser(str(log_path), start_offset=offset).parse_log()
+        assert df['signal_name'].tolist() == ['HOLD']
+
+    def test_tail_after_truncation(self, log_path):
+        """测试日志轮转后从头解析"""
+        parser = TradeLogParser(str(log_path))
+        parser.parse_log()
+
+        log_path.write_text("2024-01-02 00:00:00,1 [PRED] Signal: 1 (BUY)\n")
+        new_events = parser.tail()
+        assert new_events['signal'].tolist() == [1]
+        assert len(parser.events) == 1
+
+    def test_summary_uses_cached_events(self, log_path):
+        """测试统计复用已解析结果"""
+        parser = TradeLogParser(str(log_path))
+        parser.parse_log()
+        summary = parser.get_summary()
+
+        assert summary['total_ticks'] == 2
+        assert summary['buy_signals'] == 1
+        assert summary['sell_signals'] == 1
+        assert summary['closed_trades'] == 1
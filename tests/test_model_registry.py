@@ -0,0 +1,248 @@
+"""模型注册表测试 (一次加载校验、预热、原子热切换、champion/shadow 并行评估)"""
+
+import hashlib
+import pickle
+import threading
+
+import numpy as np
+import pytest
+
+xgb = pytest.importorskip("xgboost")
+
+from src.inference.ml_predictor import MLPredictor  # noqa: E402
+from src.model.registry import (  # noqa: E402
+    CHAMPION, KIND_BOOSTER, KIND_CLASSIFIER, SHADOW, ModelIntegrityError, ModelRegistry,
+    get_model_registry,
+)
+from src.strategy.live_adapter import LiveStrategyAdapter  # noqa: E402
+
+N_FEATURES = 21
+
+
+def _classifier(seed, n_estimators=20):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(500, N_FEATURES)).astype(np.float32)
+    y = (X[:, seed % N_FEATURES] > 0).astype(int)
+    return xgb.XGBClassifier(n_estimators=n_estimators, max_depth=3).fit(X, y)
+
+
+@pytest.fixture(scope="module")
+def artifacts(tmp_path_factory):
+    """两个不同的模型, 各保存为 JSON 与 pickle"""
+    path = tmp_path_factory.mktemp("registry")
+    paths = {}
+    for name, seed in (("v1", 1), ("v2", 2)):
+        model = _classifier(seed)
+        model.save_model(str(path / f"{name}.json"))
+        with open(path / f"{name}.pkl", "wb") as f:
+            pickle.dump(model, f)
+        paths[name] = (path / f"{name}.json", path / f"{name}.pkl", model)
+    return paths
+
+
+@pytest.fixture
+def row():
+    return np.random.default_rng(7).normal(size=N_FEATURES).astype(np.float32)
+
+
+class TestLoading:
+    """加载、缓存与完整性校验测试"""
+
+    def test_loaded_once_and_shared(self, artifacts, row):
+        """测试同一文件重复加载返回同一版本, 换一种加载方式时不重新计算哈希"""
+        json_path, _, model = artifacts["v1"]
+        registry = ModelRegistry()
+
+        booster = registry.load(json_path)
+        assert registry.load(json_path) is booster
+        assert booster.kind == KIND_BOOSTER and booster.compiled is not None
+        assert booster.md5 == hashlib.md5(json_path.read_bytes()).hexdigest()
+
+        classifier = registry.load(json_path, kind=KIND_CLASSIFIER)
+        assert classifier is not booster and classifier.md5 == booster.md5
+        assert len(registry._digests) == 1
+
+        expected = model.predict_proba(row.reshape(1, -1))[0, 1]
+        assert booster.predict(row) == pytest.approx(expected, abs=1e-6)
+        assert classifier.predict(row) == pytest.approx(expected, abs=1e-6)
+
+    def test_integrity_and_warm_up(self, artifacts, tmp_path):
+        """测试哈希不符拒绝加载, 空文件拒绝加载, 加载时完成预热"""
+        _, pkl_path, _ = artifacts["v1"]
+        registry = ModelRegistry(warmup_rows=50)
+
+        with pytest.raises(ModelIntegrityError):
+            registry.load(pkl_path, expected_md5="0" * 32)
+        empty = tmp_path / "empty.pkl"
+        empty.write_bytes(b"")
+        with pytest.raises(ValueError):
+            registry.load(empty)
+
+        version = registry.load(pkl_path, expected_md5=hashlib.md5(pkl_path.read_bytes()).hexdigest())
+        assert version.warmup_ms > 0 and version.num_features == N_FEATURES
+        assert version.latency_stats()["count"] == 0  # 预热不计入线上延迟
+
+
+class TestSlots:
+    """槽位切换、回滚与并行评估测试"""
+
+    def test_swap_promote_rollback(self, artifacts, row):
+        """测试 deploy / promote / rollback 与 champion/shadow 同向量评估"""
+        registry = ModelRegistry(warmup_rows=10)
+        v1 = registry.deploy(artifacts["v1"][0], slot=CHAMPION)
+        v2 = registry.deploy(artifacts["v2"][0], slot=SHADOW)
+
+        results = registry.evaluate(row)
+        assert results[CHAMPION]["version"] == v1.version
+        assert results[SHADOW]["version"] == v2.version
+        assert results[SHADOW]["prediction"] == pytest.approx(v2.score(row))
+
+        assert registry.promote(SHADOW) is v2
+        assert registry.get(CHAMPION) is v2
+        assert registry.rollback(CHAMPION) is v1
+        assert registry.get(CHAMPION) is v1
+
+        status = registry.status()
+        assert status["slots"] == {CHAMPION: v1.version, SHADOW: v2.version}
+        assert [s["to"] for s in status["swaps"]] == [v1.version, v2.version, v2.version, v1.version]
+        assert all(s["swap_us"] >= 0 for s in status["swaps"])
+
+    def test_swap_under_load(self, artifacts, row):
+        """测试读线程持续预测时反复切换: 无异常, 每次都得到完整的某一版本"""
+        registry = ModelRegistry(warmup_rows=10)
+        v1 = registry.deploy(artifacts["v1"][0])
+        v2 = registry.load(artifacts["v2"][0])
+        valid = {v1.score(row), v2.score(row)}
+        seen, errors = set(), []
+        stop = threading.Event()
+
+        def reader():
+            while not stop.is_set():
+                try:
+                    seen.add(registry.predict(row))
+                except Exception as e:  # pragma: no cover - 失败时记录
+                    errors.append(e)
+
+        thread = threading.Thread(target=reader)
+        thread.start()
+        for i in range(200):
+            registry.swap(CHAMPION, v2 if i % 2 == 0 else v1)
+        stop.set()
+        thread.join()
+
+        assert not errors
+        assert seen <= valid
+        assert v1.latency_stats()["count"] + v2.latency_stats()["count"] > 0
+
+    def test_unreferenced_versions_evicted(self, artifacts, tmp_path):
+        """测试反复热切换后, 不再被槽位 / 回滚记录引用的版本从缓存中释放"""
+        registry = ModelRegistry(warmup_rows=10)
+        source = artifacts["v1"][0].read_bytes()
+        paths = []
+        for i in range(4):
+            path = tmp_path / f"model_{i}.json"
+            path.write_bytes(source + b" " * i)  # 内容不同 -> 不同版本
+            paths.append(path)
+            registry.deploy(path)
+
+        assert {v.path for v in registry.versions()} == {str(paths[3].resolve()), str(paths[2].resolve())}
+        assert len(registry._digests) <= 3  # 下一次加载时清理已释放版本的哈希
+        assert registry.rollback(CHAMPION).path == str(paths[2].resolve())
+
+        registry.swap(CHAMPION, None)
+        assert registry.versions() == []
+
+    def test_prometheus_export(self, artifacts, row):
+        """测试 Prometheus 输出包含加载、预热、延迟、槽位与切换指标"""
+        registry = ModelRegistry(warmup_rows=10)
+        version = registry.deploy(artifacts["v1"][0])
+        registry.predict(row)
+
+        text = registry.to_prometheus()
+        labels = f'version="{version.version}",kind="booster"'
+        assert f'model_registry_load_seconds{{{labels}}}' in text
+        assert f'model_registry_predict_latency_seconds{{{labels},quantile="0.99"}}' in text
+        assert f'model_registry_slot_info{{slot="champion",version="{version.version}"}} 1' in text
+        assert 'model_registry_swap_seconds{slot="champion"}' in text
+
+
+class TestPredictorIntegration:
+    """预测器经注册表加载与热切换测试"""
+
+    def test_ml_predictor_hot_swap(self, artifacts, row):
+        """测试 MLPredictor 热切换后下一次预测即使用新模型"""
+        _, pkl_v1, model_v1 = artifacts["v1"]
+        _, pkl_v2, model_v2 = artifacts["v2"]
+        predictor = MLPredictor(model_path=str(pkl_v1), verify_md5=False, registry=ModelRegistry())
+
+        assert predictor.is_loaded
+        _, confidence, _ = predictor.predict(row)
+        assert confidence == pytest.approx(model_v1.predict_proba(row.reshape(1, -1))[0, 1], abs=1e-6)
+
+        info = predictor.swap_model(str(pkl_v2))
+        _, confidence, _ = predictor.predict(row)
+        assert confidence == pytest.approx(model_v2.predict_proba(row.reshape(1, -1))[0, 1], abs=1e-6)
+        assert predictor.get_model_info()["version"]["version"] == info["version"]
+
+    def test_ml_predictors_isolated_by_default(self, artifacts, row):
+        """测试同一注册表中的两个预测器默认使用各自私有槽位, 互不替换, 也不发布 champion"""
+        registry = ModelRegistry()
+        first = MLPredictor(model_path=str(artifacts["v1"][1]), verify_md5=False, registry=registry)
+        second = MLPredictor(model_path=str(artifacts["v2"][1]), verify_md5=False, registry=registry)
+
+        assert first.slot != second.slot
+        assert first.version.path != second.version.path
+        _, confidence, _ = first.predict(row)
+        assert confidence == pytest.approx(
+            artifacts["v1"][2].predict_proba(row.reshape(1, -1))[0, 1], abs=1e-6)
+        assert registry.get(CHAMPION) is None
+
+        slot = second.slot
+        del second
+        assert registry.get(slot) is None  # 回收后释放私有槽位
+
+        champion = MLPredictor(model_path=str(artifacts["v1"][1]), verify_md5=False,
+                               registry=registry, slot=CHAMPION)
+        assert registry.get(CHAMPION) is champion.version
+
+    def test_ml_predictor_swap_verifies_md5(self, artifacts, row):
+        """测试启用 MD5 校验的预测器热切换时哈希不符则拒绝, 原模型继续服务"""
+        _, pkl_v1, _ = artifacts["v1"]
+        _, pkl_v2, _ = artifacts["v2"]
+        registry = ModelRegistry()
+        predictor = MLPredictor(model_path=str(pkl_v1), verify_md5=False, registry=registry)
+        predictor.verify_md5 = True
+        before = predictor.version
+
+        with pytest.raises(ModelIntegrityError):
+            predictor.swap_model(str(pkl_v2))
+        assert predictor.version is before
+
+        md5 = hashlib.md5(pkl_v2.read_bytes()).hexdigest()
+        predictor.swap_model(str(pkl_v2), expected_md5=md5)
+        assert predictor.version.md5 == md5
+
+    def test_ml_predictor_md5_mismatch_degrades(self, artifacts, row):
+        """测试 MD5 校验失败时进入降级模式 (HOLD)"""
+        predictor = MLPredictor(model_path=str(artifacts["v1"][1]), verify_md5=True,
+                                registry=ModelRegistry())
+        assert not predictor.is_loaded
+        assert predictor.predict(row)[0] == 0
+
+    def test_live_adapter_follows_slot(self, artifacts, row):
+        """测试 LiveStrategyAdapter 绑定槽位后跟随切换, 未绑定时不受影响"""
+        slot = "test_live_adapter_follows_slot"
+        registry = get_model_registry()
+        try:
+            adapter = LiveStrategyAdapter(model_path=str(artifacts["v1"][0]), slot=slot)
+            fixed = LiveStrategyAdapter(model_path=str(artifacts["v1"][0]))
+            v1 = registry.get(slot)
+            assert adapter.model is v1.model and fixed.model is v1.model
+
+            v2 = registry.deploy(artifacts["v2"][0], slot=slot, kind=KIND_CLASSIFIER)
+            adapter.generate_signal(row)
+            fixed.generate_signal(row)
+            assert adapter.get_model_info()["version"] == v2.version
+            assert fixed.get_model_info()["version"] == v1.version
+        finally:
+            registry.swap(slot, None)
@@ -0,0 +1,181 @@
+"""多策略运行器分发测试 (symbol 索引、线程/进程隔离、溢出策略、指标)"""
+
+import threading
+import time
+
+import pytest
+
+from src.main import runner as runner_module
+from src.main.runner import MultiStrategyRunner
+from src.main.strategy_worker import StrategyWorker, create_worker
+
+
+class FakeStrategy:
+    """记录 tick 的假策略; config['delay'] 模拟慢策略"""
+
+    def __init__(self, config):
+        self.config = config
+        self.name = config['name']
+        self.symbol = config['symbol']
+        self.delay = config.get('delay', 0.0)
+        self.ticks = []
+        self.shut_down = False
+
+    def on_tick(self, tick):
+        if self.delay:
+            time.sleep(self.delay)
+        if tick.get('fail'):
+            raise RuntimeError("boom")
+        self.ticks.append(tick['n'])
+        return True
+
+    def get_status(self):
+        return {
+            'name': self.name, 'symbol': self.symbol,
+            'ticks_processed': len(self.ticks), 'error_count': 0,
+        }
+
+    def shutdown(self):
+        self.shut_down = True
+
+
+def _write_config(tmp_path, strategies, **global_config):
+    import yaml
+    path = tmp_path / "strategies.yaml"
+    path.write_text(yaml.safe_dump({'global': global_config, 'strategies': strategies}))
+    return str(path)
+
+
+@pytest.fixture
+def fake_strategies(monkeypatch):
+    monkeypatch.setattr(runner_module, "StrategyInstance", FakeStrategy)
+
+
+class TestSymbolIndex:
+    """symbol -> workers 路由测试"""
+
+    def test_routes_only_matching_symbol(self, tmp_path, fake_strategies):
+        """测试 tick 只分发给订阅该 symbol 的策略, 禁用策略不加载"""
+        config = _write_config(tmp_path, [
+            {'name': 'eur_a', 'symbol': 'EURUSD'},
+            {'name': 'eur_b', 'symbol': 'EURUSD'},
+            {'name': 'gbp', 'symbol': 'GBPUSD'},
+            {'name': 'off', 'symbol': 'XAUUSD', 'enabled': False},
+        ])
+        runner = MultiStrategyRunner(config)
+
+        assert sorted(runner.symbol_index) == ['EURUSD', 'GBPUSD']
+        assert runner.dispatch('EURUSD', {'n': 1}) == 2
+        assert runner.dispatch('USDJPY', {'n': 2}) == 0
+
+        ticks = {w.name: w.strategy.ticks for w in runner.workers}
+        assert ticks == {'eur_a': [1], 'eur_b': [1], 'gbp': []}
+
+    def test_split_message_formats(self):
+        """测试 multipart 与单帧 "SYMBOL json" 两种格式"""
+        zmq = pytest.importorskip("zmq")
+        topic, payload = MultiStrategyRunner._split_message(
+            [zmq.Frame(b'EURUSD'), zmq.Frame(b'{"n": 1}')]
+        )
+        assert topic == b'EURUSD' and bytes(payload) == b'{"n": 1}'
+
+        topic, payload = MultiStrategyRunner._split_message([zmq.Frame(b'GBPUSD {"n": 2}')])
+        assert topic == b'GBPUSD' and bytes(payload) == b'{"n": 2}'
+
+        assert MultiStrategyRunner._split_message([zmq.Frame(b'garbage')]) == (b'', None)
+
+
+class TestStrategyWorker:
+    """StrategyWorker 隔离与溢出策略测试"""
+
+    def test_slow_strategy_does_not_block_others(self, tmp_path, fake_strategies):
+        """测试线程模式下慢策略不拖慢同 symbol 的其他策略"""
+        config = _write_config(tmp_path, [
+            {'name': 'slow', 'symbol': 'EURUSD', 'delay': 0.05},
+            {'name': 'fast', 'symbol': 'EURUSD'},
+        ], dispatch_mode='thread', worker_queue_size=100)
+        runner = MultiStrategyRunner(config)
+        runner.start_workers()
+        slow, fast = runner.workers
+
+        start = time.perf_counter()
+        for n in range(10):
+            runner.dispatch('EURUSD', {'n': n})
+        assert time.perf_counter() - start < 0.05
+
+        deadline = time.time() + 2
+        while len(fast.strategy.ticks) < 10 and time.time() < deadline:
+            time.sleep(0.005)
+        assert fast.strategy.ticks == list(range(10))
+        assert len(slow.strategy.ticks) < 10
+
+        runner._shutdown_all()
+        assert slow.strategy.ticks == list(range(10))
+        assert slow.strategy.shut_down and fast.strategy.shut_down
+
+    def _blocked_worker(self, policy):
+        """启动一个在第一个 tick 上阻塞的线程 worker"""
+        release = threading.Event()
+        strategy = FakeStrategy({'name': 's', 'symbol': 'EURUSD'})
+        on_tick = strategy.on_tick
+        strategy.on_tick = lambda tick: release.wait() and on_tick(tick)
+        worker = StrategyWorker(strategy, mode='thread', queue_size=3, overflow_policy=policy)
+        worker.start()
+        worker.submit({'n': 0})
+        time.sleep(0.05)  # 0 is being processed
+        return worker, release
+
+    @pytest.mark.parametrize("policy, accepted, expected", [
+        ('drop_oldest', [True] * 7, [0, 5, 6, 7]),
+        ('drop_newest', [True] * 3 + [False] * 4, [0, 1, 2, 3]),
+    ])
+    def test_overflow_policy(self, policy, accepted, expected):
+        """测试队列满时按策略丢弃最旧/最新 tick 并计数"""
+        worker, release = self._blocked_worker(policy)
+
+        assert [worker.submit({'n': n}) for n in range(1, 8)] == accepted
+        assert worker.queue_depth() == 3
+        release.set()
+        worker.stop()
+
+        assert worker.strategy.ticks == expected
+        assert worker.get_metrics()['dropped'] == 4
+
+    def test_inline_metrics(self):
+        """测试内联模式统计错误与延迟"""
+        inline = StrategyWorker(FakeStrategy({'name': 'i', 'symbol': 'EURUSD'}))
+        assert inline.submit({'n': 1}) is True
+        assert inline.submit({'n': 2, 'fail': True}) is False
+
+        metrics = inline.get_metrics()
+        assert metrics['processed'] == 2 and metrics['errors'] == 1
+        assert metrics['queue_depth'] == 0 and metrics['queue_capacity'] == 0
+        assert metrics['latency_ms_p99'] >= metrics['latency_ms_p50'] >= 0
+
+    def test_invalid_settings(self):
+        """测试未知模式与溢出策略报错"""
+        strategy = FakeStrategy({'name': 's', 'symbol': 'EURUSD'})
+        with pytest.raises(ValueError):
+            create_worker(strategy, {'dispatch_mode': 'fiber'})
+        with pytest.raises(ValueError):
+            create_worker(strategy, {'overflow_policy': 'random'})
+
+
+class TestProcessWorker:
+    """进程模式测试"""
+
+    def test_process_worker_round_trip(self):
+        """测试子进程构建策略、处理 tick 并回传最终状态"""
+        strategy = FakeStrategy({'name': 'proc', 'symbol': 'EURUSD'})
+        worker = create_worker(strategy, {'dispatch_mode': 'process'}, factory=FakeStrategy)
+        worker.start()
+        for n in range(20):
+            assert worker.submit({'n': n})
+        worker.submit({'n': 20, 'fail': True})
+        worker.stop()
+
+        status = worker.get_status()
+        assert status['ticks_processed'] == 20
+        assert status['dispatch']['processed'] == 21
+        assert status['dispatch']['errors'] == 1
+        assert strategy.ticks == []  # parent-side instance untouched
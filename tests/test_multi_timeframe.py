@@ -377,3 +377,136 @@ class TestDataAlignmentEdgeCases:
 
         bars = feed.get_bars(999)  # 不存在的周期
         assert bars == []
+
+
+def _m1_frame(n, start=datetime(2024, 1, 1, 0, 0), seed=0, drop=()):
+    """生成 n 根 M1 bar (可删除部分行模拟缺口)"""
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    close = 1.1 + np.cumsum(rng.normal(0, 1e-4, n))
+    df = pd.DataFrame({
+        'timestamp': [start + timedelta(minutes=i) for i in range(n)],
+        'open': close - 5e-5,
+        'high': close + np.abs(rng.normal(0, 1e-4, n)),
+        'low': close - np.abs(rng.normal(0, 1e-4, n)),
+        'close': close,
+        'volume': rng.integers(1, 100, n).astype(float),
+    })
+    return df.drop(index=list(drop)).reset_index(drop=True)
+
+
+def _stream_frame(feed, df):
+    for row in df.itertuples(index=False):
+        feed.on_base_bar(OHLC(row.timestamp, row.open, row.high, row.low, row.close, row.volume))
+
+
+def _buffer_frame(feed, period):
+    import pandas as pd
+    return pd.DataFrame([b.to_dict() for b in feed.buffers[period].buffer])
+
+
+class TestIncrementalAggregation:
+    """增量聚合 / 时钟对齐 / 向量化回放测试"""
+
+    PERIODS = (3, 5, 15, 30, 60, 240)
+
+    def _feed(self, **kwargs):
+        feed = MultiTimeframeDataFeed(base_period=1, **kwargs)
+        for period in self.PERIODS:
+            feed.add_timeframe(period, lookback=10_000)
+        return feed
+
+    def test_hierarchical_sources(self):
+        """测试分层来源为能整除的最大下级周期"""
+        feed = self._feed()
+        sources = {period: source for period, source, _ in feed._plan}
+        assert sources == {3: 1, 5: 1, 15: 5, 30: 15, 60: 30, 240: 60}
+
+    def test_partial_bar(self):
+        """测试形成中 bar 的增量 high/low/volume"""
+        feed = MultiTimeframeDataFeed(base_period=5)
+        feed.add_timeframe(15)
+        now = datetime(2024, 1, 1)
+        feed.on_base_bar(OHLC(now, 1.0, 1.2, 0.9, 1.1, 10))
+        feed.on_base_bar(OHLC(now + timedelta(minutes=5), 1.1, 1.3, 1.0, 1.2, 20))
+
+        partial = feed.get_partial(15)
+        assert (partial.open, partial.high, partial.low, partial.close, partial.volume) == \
+            (1.0, 1.3, 0.9, 1.2, 30)
+        feed.on_base_bar(OHLC(now + timedelta(minutes=10), 1.2, 1.25, 0.8, 1.0, 5))
+        assert feed.get_partial(15) is None
+        assert feed.get_bars(15)[0].low == 0.8
+
+    def test_clock_alignment(self):
+        """测试时钟对齐: 非整点开始时首根 H1 在整点收盘"""
+        feed = MultiTimeframeDataFeed(base_period=5, align='clock')
+        feed.add_timeframe(60)
+        start = datetime(2024, 1, 1, 9, 30)
+
+        completions = []
+        for i in range(24):
+            ohlc = OHLC(start + timedelta(minutes=5 * i), 1.0, 1.1, 0.9, 1.0, 1)
+            if 60 in feed.on_base_bar(ohlc):
+                completions.append(i)
+
+        # 09:55 bar 收盘于 10:00, 10:55 bar 收盘于 11:00
+        assert completions == [5, 17]
+        assert [bar.volume for bar in feed.get_bars(60, 2)] == [6, 12]
+
+    def test_clock_gap_flush(self):
+        """测试缺口: 未满的时间段在下一段首根 bar 到来时收盘"""
+        feed = MultiTimeframeDataFeed(base_period=5, align='clock')
+        feed.add_timeframe(60)
+        start = datetime(2024, 1, 1, 9, 0)
+
+        for minutes in (0, 5, 10, 65):  # 09:15 之后缺失, 下一根为 10:05
+            completed = feed.on_base_bar(OHLC(start + timedelta(minutes=minutes), 1.0, 1.1, 0.9, 1.0, 1))
+
+        assert 60 in completed
+        assert completed[60].timestamp == start + timedelta(minutes=10)
+        assert completed[60].volume == 3
+
+    def test_session_offset(self):
+        """测试 session_offset 平移日线锚点 (22:00 UTC 开盘)"""
+        feed = MultiTimeframeDataFeed(base_period=60, align='clock', session_offset=22 * 60)
+        feed.add_timeframe(1440)
+        start = datetime(2024, 1, 1, 0, 0)
+
+        completions = []
+        for i in range(48):
+            if 1440 in feed.on_base_bar(OHLC(start + timedelta(hours=i), 1.0, 1.1, 0.9, 1.0, 1)):
+                completions.append(i)
+
+        assert completions == [21, 45]
+
+    @pytest.mark.parametrize('align', ['count', 'clock'])
+    def test_replay_matches_streaming(self, align):
+        """测试向量化回放与逐根流式聚合结果一致"""
+        import pandas as pd
+
+        df = _m1_frame(1000, start=datetime(2024, 1, 1, 0, 7), drop=range(300, 340))
+        streaming = self._feed(align=align)
+        _stream_frame(streaming, df)
+        replayed = self._feed(align=align).replay(df)
+
+        for period in (1,) + self.PERIODS:
+            expected = _buffer_frame(streaming, period)
+            # 基础周期缓冲区只保留默认 lookback 根
+            actual = replayed[period].tail(len(expected)).reset_index(drop=True)
+            assert len(expected) > 0
+            assert len(replayed[period]) == streaming.get_bar_count(period)
+            pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+
+    def test_replay_does_not_touch_state(self):
+        """测试回放不修改流式状态"""
+        feed = self._feed()
+        frames = feed.replay(_m1_frame(120))
+        assert len(frames[60]) == 2
+        assert feed.get_bar_count(60) == 0
+
+    def test_invalid_align(self):
+        """测试无效对齐方式"""
+        with pytest.raises(ValueError, match="对齐方式"):
+            MultiTimeframeDataFeed(align='session')
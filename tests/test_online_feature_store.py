@@ -0,0 +1,245 @@
+"""在线特征存储测试 (fakeredis 后端 + 进程内 LRU)"""
+
+import asyncio
+import importlib
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+
+from src.data_nexus.cache.redis_client import RedisClient  # noqa: E402
+from src.serving.handlers import FeatureService  # noqa: E402
+from src.serving.models import VALID_FEATURES, VALID_SYMBOLS  # noqa: E402
+from src.serving.online_store import OnlineFeatureStore  # noqa: E402
+
+# src.serving 包导出了同名的 app 对象, 需按模块路径取模块本身
+serving_app = importlib.import_module("src.serving.app")
+
+SYMBOLS = [f"SYM{i:02d}" for i in range(50)]
+FEATURES = [f"f{i:02d}" for i in range(30)]
+
+
+@pytest.fixture
+def redis_client():
+    client = RedisClient()
+    client.client = fakeredis.FakeRedis(decode_responses=True)
+    return client
+
+
+class CountingPipelineClient:
+    """统计 pipeline 往返次数的 RedisClient 包装"""
+
+    def __init__(self, inner):
+        self.inner = inner
+        self.executes = 0
+        self.transactions = []
+
+    def pipeline(self, transaction=False):
+        self.transactions.append(transaction)
+        pipe = self.inner.pipeline(transaction)
+        original = pipe.execute
+
+        def execute(*args, **kwargs):
+            self.executes += 1
+            return original(*args, **kwargs)
+
+        pipe.execute = execute
+        return pipe
+
+    def health_check(self):
+        return self.inner.health_check()
+
+
+def _history(days=3):
+    rng = np.random.default_rng(0)
+    times = pd.date_range("2024-01-01", periods=days, freq="D")
+    df = pd.DataFrame({
+        "symbol": np.repeat(SYMBOLS, days),
+        "event_timestamp": np.tile(times, len(SYMBOLS)),
+    })
+    for feat in FEATURES:
+        df[feat] = rng.normal(size=len(df))
+    return df.sample(frac=1, random_state=0)  # 打乱顺序, 物化需按时间取最新
+
+
+class TestOnlineFeatureStore:
+    """OnlineFeatureStore 单元测试"""
+
+    def test_materialize_latest_row(self, redis_client):
+        """测试物化每个符号最新一行, 单次 pipeline 读取"""
+        df = _history()
+        counting = CountingPipelineClient(redis_client)
+        store = OnlineFeatureStore(counting)
+
+        assert store.materialize(df) == len(SYMBOLS)
+        counting.executes = 0
+
+        data, missing = store.get_latest(SYMBOLS, FEATURES)
+
+        expected = df.sort_values("event_timestamp").groupby("symbol").last()
+        assert missing == []
+        assert counting.executes == 1
+        assert data["SYM07"] == pytest.approx(expected.loc["SYM07", FEATURES].to_dict())
+
+    def test_lru_hits_skip_redis(self, redis_client):
+        """测试 LRU 命中不访问 Redis"""
+        counting = CountingPipelineClient(redis_client)
+        store = OnlineFeatureStore(counting, lru_ttl=60)
+        store.materialize(_history())
+        store.get_latest(SYMBOLS, FEATURES)
+        counting.executes = 0
+
+        store.get_latest(SYMBOLS, FEATURES)
+
+        assert counting.executes == 0
+        assert store.stats["hits"] == len(SYMBOLS)
+
+    def test_lru_ttl_and_invalidation_on_write(self, redis_client):
+        """测试写入使 LRU 失效, 过期条目重新读取"""
+        store = OnlineFeatureStore(redis_client, lru_ttl=60)
+        store.write_latest("EURUSD", {"rsi_14": 60.0})
+        assert store.get_latest(["EURUSD"], ["rsi_14"])[0]["EURUSD"]["rsi_14"] == 60.0
+
+        store.write_latest("EURUSD", {"rsi_14": 70.0})
+        assert store.get_latest(["EURUSD"], ["rsi_14"])[0]["EURUSD"]["rsi_14"] == 70.0
+
+        stale = OnlineFeatureStore(redis_client, lru_ttl=0)
+        stale.get_latest(["EURUSD"], ["rsi_14"])
+        redis_client.client.hset("features:latest:EURUSD", "rsi_14", "80.0")
+        assert stale.get_latest(["EURUSD"], ["rsi_14"])[0]["EURUSD"]["rsi_14"] == 80.0
+
+    def test_missing_symbols_and_features(self, redis_client):
+        """测试缺失符号与缺失特征"""
+        store = OnlineFeatureStore(redis_client)
+        store.write_latest("EURUSD", {"rsi_14": float("nan"), "sma_20": 1.08})
+
+        data, missing = store.get_latest(["EURUSD", "GBPUSD"], ["rsi_14", "sma_20", "bb_upper"])
+
+        assert missing == ["GBPUSD"]
+        assert data == {"EURUSD": {"rsi_14": None, "sma_20": 1.08, "bb_upper": None}}
+
+    def test_lru_size_bound(self):
+        """测试 LRU 容量上限 (进程内后端)"""
+        store = OnlineFeatureStore(lru_size=10)
+        store.materialize(_history())
+        store.get_latest(SYMBOLS, FEATURES)
+        assert len(store._lru) == 10
+
+    def test_write_is_transactional(self, redis_client):
+        """测试物化写入在 MULTI/EXEC 中执行 (delete + hset 原子替换)"""
+        counting = CountingPipelineClient(redis_client)
+        OnlineFeatureStore(counting).materialize(_history())
+        assert counting.transactions == [True]
+
+    def test_concurrent_lru_access(self):
+        """测试多线程并发读取、淘汰与失效不抛异常, 计数不丢失"""
+        store = OnlineFeatureStore(lru_size=5, lru_ttl=60)
+        store.materialize(_history())
+        errors = []
+
+        def reader(offset):
+            try:
+                for i in range(300):
+                    symbols = [SYMBOLS[(offset + i + k) % len(SYMBOLS)] for k in range(8)]
+                    store.get_latest(symbols, FEATURES[:2])
+                    if i % 10 == 0:
+                        store.invalidate(symbols[:2])
+            except Exception as e:  # pragma: no cover - 失败时记录
+                errors.append(e)
+
+        threads = [threading.Thread(target=reader, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert not errors
+        assert store.stats["hits"] + store.stats["misses"] == 8 * 300 * 8
+        assert len(store._lru) <= 5
+
+    def test_cached_read_latency(self, redis_client):
+        """测试 50 符号 × 30 特征读取 p99 < 2 ms (LRU 有效期内)"""
+        store = OnlineFeatureStore(redis_client, lru_ttl=60)
+        store.materialize(_history())
+        store.get_latest(SYMBOLS, FEATURES)
+
+        timings = []
+        for _ in range(200):
+            start = time.perf_counter()
+            store.get_latest(SYMBOLS, FEATURES)
+            timings.append(time.perf_counter() - start)
+
+        assert np.percentile(timings, 99) < 0.002
+
+
+class TestFeatureServiceOnline:
+    """FeatureService 在线读取路径测试"""
+
+    def _service(self, online_store):
+        service = FeatureService.__new__(FeatureService)
+        service.online_store = online_store
+        service._get_latest_from_feast = lambda symbols, features: {
+            symbol: {feat: -1.0 for feat in features} for symbol in symbols
+        }
+        return service
+
+    def test_online_first_with_feast_fallback(self):
+        """测试在线存储优先, 未物化符号回退 Feast"""
+        store = OnlineFeatureStore()
+        store.write_latest("EURUSD", {"rsi_14": 55.0})
+        service = self._service(store)
+
+        data, elapsed_ms = service.get_latest_features(["EURUSD", "GBPUSD"], ["rsi_14"])
+
+        assert data == {"EURUSD": {"rsi_14": 55.0}, "GBPUSD": {"rsi_14": -1.0}}
+        assert elapsed_ms >= 0
+
+    def test_entity_df_cartesian_product(self):
+        """测试向量化 entity_df 构建"""
+        entity_df = FeatureService._build_entity_df(["A", "B"], "2024-01-01", "2024-01-03")
+        assert len(entity_df) == 6
+        assert entity_df["symbol"].tolist() == ["A", "B"] * 3
+        assert entity_df["event_timestamp"].iloc[2] == pd.Timestamp("2024-01-02")
+
+    def test_startup_job_fills_online_store(self, monkeypatch):
+        """测试启动时的物化任务从 Feast 填充在线存储, 关闭时取消"""
+        store = OnlineFeatureStore()
+        service = FeatureService.__new__(FeatureService)
+        service.online_store = store
+
+        class FakeFeast:
+            def get_historical_features(self, entity_df, feature_refs):
+                df = entity_df.copy()
+                for ref in feature_refs:
+                    df[ref.split(":")[1]] = 1.5
+                return type("Job", (), {"to_df": lambda job: df})()
+
+        service.store = FakeFeast()
+        monkeypatch.setattr(serving_app, "get_feature_service", lambda: service)
+        monkeypatch.setattr(serving_app, "ENABLE_MOCK_INFERENCE", True)
+        monkeypatch.setattr(serving_app, "MATERIALIZE_INTERVAL_S", 0.01)
+
+        async def run():
+            await serving_app.startup_event()
+            task = serving_app.materialize_task
+            try:
+                for _ in range(200):
+                    if len(store._memory) == len(VALID_SYMBOLS):
+                        break
+                    await asyncio.sleep(0.01)
+            finally:
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+            return task
+
+        task = asyncio.run(run())
+        monkeypatch.setattr(serving_app, "materialize_task", None)
+
+        assert task.cancelled()
+        data, missing = store.get_latest(sorted(VALID_SYMBOLS), sorted(VALID_FEATURES))
+        assert missing == []
+        assert data["EURUSD"]["rsi_14"] == 1.5
@@ -0,0 +1,125 @@
+"""OnlineFeatureCalculator 增量特征与离线 FeatureEngineer 一致性测试"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import src.inference.online_features as online_features
+from src.data.ml_feature_pipeline import FeatureEngineer
+from src.inference.online_features import FEATURE_NAMES, MIN_TICKS, OnlineFeatureCalculator
+
+
+def _bars(n=300, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 1.1 + np.cumsum(rng.normal(0, 1e-3, n))
+    return pd.DataFrame({
+        'open': close,
+        'high': close + np.abs(rng.normal(0, 5e-4, n)),
+        'low': close - np.abs(rng.normal(0, 5e-4, n)),
+        'close': close,
+        'volume': rng.integers(100, 1000, n).astype(float),
+    })
+
+
+def _stream(calc, df):
+    """逐 tick 更新, 返回 {行号: 特征向量副本}"""
+    vectors = {}
+    for i, row in enumerate(df.itertuples(index=False)):
+        calc.update(row.close, row.high, row.low, row.volume)
+        vector = calc.get_feature_vector()
+        if vector is not None:
+            vectors[i] = vector.copy()
+    return vectors
+
+
+class TestOnlineFeatureParity:
+    """在线/离线特征一致性测试"""
+
+    def test_matches_offline_pipeline(self):
+        """测试全部 21 个特征与离线实现一致"""
+        df = _bars()
+        offline = FeatureEngineer().engineer_features(df)
+        vectors = _stream(OnlineFeatureCalculator(), df)
+
+        rows = sorted(vectors)
+        assert rows[0] == MIN_TICKS - 1
+        online = np.vstack([vectors[i] for i in rows])
+        np.testing.assert_allclose(
+            online, offline.loc[rows, FEATURE_NAMES].to_numpy(), rtol=1e-9, atol=1e-10
+        )
+
+    def test_calculate_features_dict(self):
+        """测试字典输出与向量输出一致"""
+        df = _bars(80)
+        calc = OnlineFeatureCalculator()
+        _stream(calc, df)
+
+        features = calc.calculate_features()
+        assert list(features)[:len(FEATURE_NAMES)] == FEATURE_NAMES
+        np.testing.assert_array_equal(
+            [features[name] for name in FEATURE_NAMES], calc.get_feature_vector()
+        )
+
+    def test_resync_keeps_state(self, monkeypatch):
+        """测试周期性重算运行和不改变结果"""
+        df = _bars(200, seed=1)
+        expected = _stream(OnlineFeatureCalculator(), df)
+
+        monkeypatch.setattr(online_features, 'RESYNC_INTERVAL', 7)
+        resynced = _stream(OnlineFeatureCalculator(), df)
+
+        for i in expected:
+            np.testing.assert_allclose(resynced[i], expected[i], rtol=1e-12, atol=1e-14)
+
+
+class TestOnlineFeatureCalculator:
+    """OnlineFeatureCalculator 单元测试"""
+
+    def test_insufficient_data(self):
+        """测试数据不足时返回 None"""
+        calc = OnlineFeatureCalculator()
+        for _ in range(MIN_TICKS - 1):
+            assert calc.update(1.0, 1.1, 0.9, 100.0) is False
+        assert calc.get_feature_vector() is None
+        assert calc.update(1.0, 1.1, 0.9, 100.0) is True
+
+    def test_preallocated_output(self):
+        """测试写入预分配向量, 不产生新数组"""
+        calc = OnlineFeatureCalculator()
+        _stream(calc, _bars(60))
+
+        out = np.zeros(len(FEATURE_NAMES))
+        assert calc.get_feature_vector(out) is out
+        assert calc.get_feature_vector() is calc.get_feature_vector()
+        np.testing.assert_array_equal(out, calc.get_feature_vector())
+
+    def test_buffers_bounded(self):
+        """测试 OHLCV 缓冲区长度受 max_lookback 限制"""
+        calc = OnlineFeatureCalculator(max_lookback=50)
+        assert len(calc.close_buffer) == 0
+        _stream(calc, _bars(120))
+        assert len(calc.close_buffer) == 50
+        assert calc.close_buffer[-1] == pytest.approx(_bars(120)['close'].iloc[-1])
+
+    def test_wilder_rsi_any_period(self):
+        """测试 Wilder RSI 支持任意周期"""
+        df = _bars(200, seed=2)
+        calc = OnlineFeatureCalculator(rsi_periods=(7,), rsi_mode='wilder')
+        _stream(calc, df)
+
+        delta = df['close'].diff().fillna(0)
+        gain, loss = delta.clip(lower=0).to_numpy(), (-delta).clip(lower=0).to_numpy()
+        for period in (7, 14, 21):
+            avg_gain, avg_loss = gain[:period].mean(), loss[:period].mean()
+            for g, l in zip(gain[period:], loss[period:]):
+                avg_gain = (avg_gain * (period - 1) + g) / period
+                avg_loss = (avg_loss * (period - 1) + l) / period
+            expected = 100 - 100 / (1 + avg_gain / (avg_loss + 1e-10))
+            assert calc.rsi(period) == pytest.approx(expected, rel=1e-10)
+
+    def test_invalid_rsi(self):
+        """测试非法 RSI 参数"""
+        with pytest.raises(ValueError):
+            OnlineFeatureCalculator(rsi_mode='ema')
+        with pytest.raises(ValueError):
+            OnlineFeatureCalculator().rsi(9)
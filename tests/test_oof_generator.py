@@ -0,0 +1,140 @@
+"""OOF 预测生成器测试 (向量化窗口索引、折并行、按折磁盘缓存)"""
+
+import numpy as np
+import pytest
+from sklearn.model_selection import KFold
+
+from src.model.ensemble.alignment import DataAlignmentHandler
+from src.model.ensemble.oof_generator import OOFPredictionGenerator
+
+N_SAMPLES = 400
+N_FEATURES = 4
+SEQ_LEN = 20
+
+
+def _softmax(z):
+    z = z - z.max(axis=1, keepdims=True)
+    e = np.exp(z)
+    return (e / e.sum(axis=1, keepdims=True)).astype(np.float32)
+
+
+class TabularLearner:
+    """表格基学习器 (记录预测行数)"""
+
+    def __init__(self, seed=0):
+        self.w = np.random.default_rng(seed).normal(size=(N_FEATURES, 3))
+        self.rows = 0
+
+    def predict_proba(self, X):
+        self.rows += len(X)
+        return _softmax(X @ self.w)
+
+
+class SequenceLearner:
+    """序列基学习器: 窗口均值线性打分 (记录每批大小)"""
+
+    def __init__(self, seed=1):
+        self.w = np.random.default_rng(seed).normal(size=(N_FEATURES, 3))
+        self.batches = []
+
+    def predict_proba(self, X):
+        self.batches.append(len(X))
+        return _softmax(X.mean(axis=1) @ self.w)
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(N_SAMPLES, N_FEATURES)).astype(np.float32)
+    y = rng.integers(-1, 2, N_SAMPLES)
+    return X, y
+
+
+def _generator(**kwargs):
+    return OOFPredictionGenerator(cv_splitter=KFold(n_splits=4),
+                                  alignment_handler=DataAlignmentHandler(sequence_length=SEQ_LEN), **kwargs)
+
+
+def _serial_reference(X, y, windows, lgb, lstm):
+    """原实现的逐折串行逻辑 (Python 循环计算窗口索引)"""
+    lgb_oof = np.zeros((len(X), 3), dtype=np.float32)
+    lstm_oof = np.zeros((len(windows), 3), dtype=np.float32)
+    for _, val_idx in KFold(n_splits=4).split(X, y):
+        lgb_oof[val_idx] = lgb.predict_proba(X[val_idx])
+        window_idx = np.array([i - (SEQ_LEN - 1) for i in val_idx if i >= SEQ_LEN - 1])
+        lstm_oof[window_idx] = lstm.predict_proba(windows[window_idx])
+    return lgb_oof, lstm_oof
+
+
+class TestOOFGeneration:
+    """并行生成结果与原串行实现一致性测试"""
+
+    def test_matches_serial_reference(self, data):
+        """测试并行 + 分批推理得到与逐折串行相同的 OOF, 且 LSTM 按 batch_size 分批"""
+        X, y = data
+        generator = _generator(max_workers=4, batch_size=32)
+        windows = generator._create_sliding_window_sequences(X, SEQ_LEN)
+        lstm = SequenceLearner()
+
+        lgb_oof, lstm_oof, valid = generator.generate_oof_predictions(TabularLearner(), lstm, X, windows, y)
+        expected_lgb, expected_lstm = _serial_reference(X, y, windows, TabularLearner(), SequenceLearner())
+
+        np.testing.assert_allclose(lgb_oof, expected_lgb, rtol=1e-6)
+        np.testing.assert_allclose(lstm_oof, expected_lstm, rtol=1e-6)
+        np.testing.assert_array_equal(valid, np.arange(SEQ_LEN - 1, N_SAMPLES))
+        assert max(lstm.batches) <= 32
+        assert [s['fold'] for s in generator.fold_stats] == [1, 2, 3, 4]
+
+    def test_window_indices_vectorized(self):
+        """测试窗口索引与逐样本循环一致 (含 stride 与越界样本)"""
+        generator = OOFPredictionGenerator(cv_splitter=KFold(n_splits=2),
+                                           alignment_handler=DataAlignmentHandler(sequence_length=10, stride=3))
+        val_idx = np.arange(0, 100)
+        n_windows = (100 - 10) // 3 + 1
+        expected = [(i - 9) // 3 for i in val_idx if i >= 9 and (i - 9) % 3 == 0 and (i - 9) // 3 < n_windows]
+        np.testing.assert_array_equal(generator.validation_window_indices(val_idx, 100), expected)
+
+
+class TestOOFCache:
+    """按折缓存测试"""
+
+    def test_second_run_served_from_cache(self, data, tmp_path):
+        """测试相同模型与数据再次运行时不再调用基学习器, 并报告每折节省时间"""
+        X, y = data
+        windows = _generator()._create_sliding_window_sequences(X, SEQ_LEN)
+        first = _generator(cache_dir=tmp_path)
+        lgb_oof, lstm_oof, _ = first.generate_oof_predictions(TabularLearner(), SequenceLearner(), X, windows, y)
+        assert not any(s['lgb_cached'] or s['lstm_cached'] for s in first.fold_stats)
+        assert len(list(tmp_path.glob("*.npz"))) == 8
+
+        lgb, lstm = TabularLearner(), SequenceLearner()
+        second = _generator(cache_dir=tmp_path)
+        cached_lgb, cached_lstm, _ = second.generate_oof_predictions(lgb, lstm, X, windows, y)
+
+        assert lgb.rows == 0 and lstm.batches == []
+        assert all(s['lgb_cached'] and s['lstm_cached'] for s in second.fold_stats)
+        assert all('saved_ms' in s for s in second.fold_stats)
+        np.testing.assert_array_equal(cached_lgb, lgb_oof)
+        np.testing.assert_array_equal(cached_lstm, lstm_oof)
+
+    def test_cache_invalidated_by_model_data_or_folds(self, data, tmp_path):
+        """测试模型、数据或折划分变化时重新预测"""
+        X, y = data
+        windows = _generator()._create_sliding_window_sequences(X, SEQ_LEN)
+        _generator(cache_dir=tmp_path).generate_oof_predictions(TabularLearner(), SequenceLearner(), X, windows, y)
+
+        changed_model = TabularLearner(seed=5)
+        _generator(cache_dir=tmp_path).generate_oof_predictions(changed_model, SequenceLearner(), X, windows, y)
+        assert changed_model.rows == N_SAMPLES
+
+        X2 = X.copy()
+        X2[0, 0] += 1.0
+        lgb = TabularLearner()
+        _generator(cache_dir=tmp_path).generate_oof_predictions(lgb, SequenceLearner(), X2, windows, y)
+        assert lgb.rows == N_SAMPLES
+
+        lstm = SequenceLearner()
+        other_folds = OOFPredictionGenerator(cv_splitter=KFold(n_splits=5), cache_dir=tmp_path,
+                                             alignment_handler=DataAlignmentHandler(sequence_length=SEQ_LEN))
+        other_folds.generate_oof_predictions(TabularLearner(), lstm, X, windows, y)
+        assert sum(lstm.batches) == len(windows)
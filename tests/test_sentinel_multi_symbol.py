@@ -0,0 +1,161 @@
+"""Sentinel 多品种并发轮询测试 (本地 HTTP 替身: EODHD intraday + HUB /invocations)"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("aiohttp")
+pytest.importorskip("schedule")
+pytest.importorskip("prometheus_client")
+
+from src.strategy.feature_builder import FeatureBuilder  # noqa: E402
+from src.strategy.sentinel_daemon import SentinelDaemon  # noqa: E402
+
+BASE_TS = 1767225600  # 2026-01-01 00:00 UTC
+LATENCY = 0.1
+
+
+def _bars(symbol, start, end):
+    """确定性的小时线 (EODHD intraday 格式)"""
+    seed = sum(map(ord, symbol))
+    times = pd.to_datetime(np.arange(start, end) * 3600 + BASE_TS, unit="s").strftime("%Y-%m-%d %H:%M:%S")
+    bars = []
+    for i, dt in zip(range(start, end), times):
+        close = 1.0 + 0.01 * np.sin((i + seed) / 7.0)
+        bars.append({
+            "timestamp": BASE_TS + i * 3600,
+            "gmtoffset": 0,
+            "datetime": dt,
+            "open": close, "high": close + 0.001, "low": close - 0.001,
+            "close": close, "volume": 100 + i % 7,
+        })
+    return bars
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def _send(self, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        symbol = url.path.rsplit("/", 1)[-1].split(".")[0]
+        since = parse_qs(url.query).get("from", [None])[0]
+        self.server.fetches.append((symbol, since))
+        time.sleep(LATENCY)
+
+        start = 0 if since is None else (int(since) - BASE_TS + 3599) // 3600
+        self._send(_bars(symbol, start, self.server.total_bars))
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        rows = request["dataframe_split"]["data"]
+        self.server.batches.append(len(rows))
+        self._send({"predictions": [[0.1, 0.1, 0.8]] * len(rows)})
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stand_in():
+    server = _Server(("127.0.0.1", 0), _Handler)
+    server.total_bars = 200
+    server.fetches = []
+    server.batches = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _daemon(server, symbols):
+    port = server.server_address[1]
+    return SentinelDaemon(
+        hub_host="127.0.0.1", hub_port=port,
+        eodhd_api_key="test", eodhd_base_url=f"http://127.0.0.1:{port}/api",
+        symbols=symbols, max_concurrency=64, requests_per_second=1000,
+        lookback_bars=200, dry_run=True,
+    )
+
+
+class TestMultiSymbolCycle:
+    """SentinelDaemon 多品种周期测试"""
+
+    def test_batched_cycle(self, stand_in):
+        """测试并发获取、一次批量预测、按品种下单"""
+        daemon = _daemon(stand_in, ["EURUSD", "GBPUSD", "USDJPY"])
+
+        summary = daemon.execute_multi_symbol_cycle()
+        daemon.close()
+
+        assert summary["featured"] == 3
+        assert stand_in.batches == [3]
+        assert summary["decisions"]["GBPUSD"] == ("BUY", 0.8)
+        assert summary["signals"] == 3
+
+    def test_incremental_fetch(self, stand_in):
+        """测试后续周期只获取新 K 线, 缓冲区保持 lookback_bars"""
+        daemon = _daemon(stand_in, ["EURUSD", "GBPUSD"])
+        daemon.execute_multi_symbol_cycle()
+        last_ts = daemon._last_bar_ts["EURUSD"]
+
+        stand_in.total_bars = 202
+        stand_in.fetches.clear()
+        daemon.execute_multi_symbol_cycle()
+        daemon.close()
+
+        assert sorted(stand_in.fetches) == [("EURUSD", str(last_ts + 1)), ("GBPUSD", str(last_ts + 1))]
+        assert daemon._last_bar_ts["EURUSD"] == last_ts + 2 * 3600
+        assert len(daemon._bars["EURUSD"]) == 200
+
+    def test_cycle_time_flat(self, stand_in):
+        """测试品种数从 1 增到 50 时获取耗时基本不变"""
+        single = _daemon(stand_in, ["EURUSD"])
+        one = single.execute_multi_symbol_cycle()
+        single.close()
+
+        symbols = [f"SYM{i:02d}" for i in range(50)]
+        many = _daemon(stand_in, symbols)
+        fifty = many.execute_multi_symbol_cycle()
+        many.close()
+
+        assert fifty["featured"] == 50 and stand_in.batches[-1] == 50
+        assert one["fetch_sec"] >= LATENCY
+        assert fifty["fetch_sec"] < 50 * LATENCY / 5  # serial polling would take 50 * LATENCY
+
+
+class TestBatchFeatures:
+    """FeatureBuilder.build_features_batch 测试"""
+
+    def test_matches_single_symbol_path(self):
+        """测试批量特征与逐品种 build_features / build_sequence 完全一致"""
+        builder = FeatureBuilder(lookback_period=60)
+        frames = {
+            symbol: SentinelDaemon._bars_to_frame(_bars(symbol, 0, n))
+            for symbol, n in (("EURUSD", 200), ("GBPUSD", 150), ("USDJPY", 90))
+        }
+
+        symbols, tabular, sequential = builder.build_features_batch(frames, sequence_length=60)
+
+        assert symbols == ["EURUSD", "GBPUSD"]  # USDJPY: insufficient history
+        for i, symbol in enumerate(symbols):
+            np.testing.assert_allclose(tabular[i], builder.build_features(frames[symbol]).values[0])
+            np.testing.assert_allclose(sequential[i], builder.build_sequence(frames[symbol], 60))
@@ -0,0 +1,283 @@
+"""服务并发原语测试 (有界执行器、请求合并、推理微批处理)"""
+
+import asyncio
+import importlib
+import threading
+import time
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from src.serving.concurrency import (
+    BoundedExecutor, ExecutorSaturatedError, MicroBatcher, SingleFlight
+)
+from src.serving.feature_map import SENTINEL_DIM
+
+# src.serving 包导出了同名的 app 对象, 需按模块路径取模块本身
+serving_app = importlib.import_module("src.serving.app")
+
+
+class TestBoundedExecutor:
+    """BoundedExecutor 测试"""
+
+    def test_runs_off_event_loop(self):
+        """测试任务在工作线程中执行"""
+        executor = BoundedExecutor(max_workers=2, max_queue=4)
+
+        async def main():
+            return await executor.run(threading.get_ident)
+
+        try:
+            assert asyncio.run(main()) != threading.get_ident()
+            assert executor.stats["completed"] == 1
+        finally:
+            executor.shutdown()
+
+    def test_rejects_when_queue_full(self):
+        """测试排队已满时快速拒绝"""
+        executor = BoundedExecutor(max_workers=1, max_queue=1)
+        gate = threading.Event()
+
+        async def main():
+            running = asyncio.ensure_future(executor.run(gate.wait))
+            while executor._running == 0:
+                await asyncio.sleep(0.001)
+            queued = asyncio.ensure_future(executor.run(lambda: "queued"))
+            await asyncio.sleep(0)
+
+            with pytest.raises(ExecutorSaturatedError):
+                await executor.run(lambda: "rejected")
+            assert executor.queue_depth == 1
+
+            gate.set()
+            return await asyncio.gather(running, queued)
+
+        try:
+            assert asyncio.run(main())[1] == "queued"
+            metrics = executor.metrics()
+            assert metrics["rejected"] == 1 and metrics["completed"] == 2
+            assert metrics["queue_depth"] == 0 and metrics["max_queue_depth"] == 1
+        finally:
+            executor.shutdown()
+
+    def test_failure_counted(self):
+        """测试异常透传并计数"""
+        executor = BoundedExecutor(max_workers=1)
+
+        async def main():
+            await executor.run(lambda: 1 / 0)
+
+        try:
+            with pytest.raises(ZeroDivisionError):
+                asyncio.run(main())
+            assert executor.stats["failed"] == 1
+        finally:
+            executor.shutdown()
+
+
+class TestSingleFlight:
+    """SingleFlight 测试"""
+
+    def test_coalesces_identical_requests(self):
+        """测试相同 key 的并发请求只执行一次"""
+        flights = SingleFlight()
+        calls = []
+
+        async def fetch(key):
+            calls.append(key)
+            await asyncio.sleep(0.01)
+            return {"key": key}
+
+        async def main():
+            results = await asyncio.gather(
+                *(flights.do("a", lambda: fetch("a")) for _ in range(5)),
+                flights.do("b", lambda: fetch("b")),
+            )
+            return results
+
+        results = asyncio.run(main())
+
+        assert calls == ["a", "b"]
+        assert all(r is results[0] for r in results[:5])
+        assert flights.stats == {"leaders": 2, "coalesced": 4}
+        assert flights.inflight == 0
+
+    def test_error_shared_and_cleared(self):
+        """测试异常传给所有等待者, 之后可重新执行"""
+        flights = SingleFlight()
+
+        async def boom():
+            await asyncio.sleep(0.005)
+            raise ValueError("boom")
+
+        async def main():
+            results = await asyncio.gather(
+                *(flights.do("k", boom) for _ in range(3)), return_exceptions=True
+            )
+            retry = await flights.do("k", lambda: asyncio.sleep(0, result="ok"))
+            return results, retry
+
+        results, retry = asyncio.run(main())
+        assert all(isinstance(r, ValueError) for r in results)
+        assert retry == "ok"
+
+
+class TestMicroBatcher:
+    """MicroBatcher 测试"""
+
+    def test_merges_and_splits(self):
+        """测试窗口内的请求合并为一次调用并按行拆分"""
+        executor = BoundedExecutor(max_workers=2)
+        batch_sizes = []
+
+        def process(matrix):
+            batch_sizes.append(len(matrix))
+            return matrix[:, 0] * 2
+
+        batcher = MicroBatcher(process, executor, max_wait_ms=5)
+        inputs = [np.full((n, 3), float(i)) for i, n in enumerate([1, 4, 2])]
+
+        async def main():
+            return await asyncio.gather(*(batcher.submit(m) for m in inputs))
+
+        try:
+            results = asyncio.run(main())
+        finally:
+            executor.shutdown()
+
+        assert batch_sizes == [7]
+        for i, (matrix, result) in enumerate(zip(inputs, results)):
+            np.testing.assert_array_equal(result, np.full(len(matrix), 2.0 * i))
+        assert batcher.metrics()["max_batch_requests"] == 3
+
+    def test_row_limit_flushes_immediately(self):
+        """测试大请求不等待窗口"""
+        executor = BoundedExecutor(max_workers=1)
+        batcher = MicroBatcher(lambda m: m.sum(axis=1), executor, max_wait_ms=10_000, max_batch_rows=4)
+
+        async def main():
+            small = asyncio.ensure_future(batcher.submit(np.ones((2, 2))))
+            await asyncio.sleep(0)
+            other = batcher.submit(np.ones((2, 2)))
+            large = batcher.submit(np.ones((5, 2)))
+            return await asyncio.wait_for(asyncio.gather(small, other, large), timeout=5)
+
+        try:
+            small, other, large = asyncio.run(main())
+        finally:
+            executor.shutdown()
+
+        assert len(small) == 2 and len(other) == 2 and len(large) == 5
+        assert batcher.stats["batches"] == 2
+
+    def test_error_propagates_to_all(self):
+        """测试批处理异常传给批内所有请求"""
+        executor = BoundedExecutor(max_workers=1)
+
+        def process(matrix):
+            raise RuntimeError("model down")
+
+        batcher = MicroBatcher(process, executor, max_wait_ms=1)
+
+        async def main():
+            return await asyncio.gather(
+                batcher.submit(np.ones((1, 2))), batcher.submit(np.ones((1, 2))),
+                return_exceptions=True,
+            )
+
+        try:
+            results = asyncio.run(main())
+        finally:
+            executor.shutdown()
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+
+class _SlowService:
+    """模拟阻塞的 Feast 查询"""
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.calls = 0
+
+    def get_latest_features(self, symbols, features):
+        self.calls += 1
+        time.sleep(self.delay)
+        return {s: {f: 1.0 for f in features} for s in symbols}, self.delay * 1000
+
+
+class TestServingEndpoints:
+    """端点接入测试"""
+
+    def test_latest_coalesced_off_loop(self, monkeypatch):
+        """测试并发的相同 /features/latest 请求合并且不阻塞事件循环"""
+        import httpx
+
+        service = _SlowService()
+        monkeypatch.setattr(serving_app, "feature_service", service)
+        payload = {"symbols": ["EURUSD"], "features": ["rsi_14"]}
+
+        async def main():
+            transport = httpx.ASGITransport(app=serving_app.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                start = time.perf_counter()
+                responses = await asyncio.gather(
+                    *(client.post("/features/latest", json=payload) for _ in range(8)),
+                    client.get("/metrics/serving"),
+                )
+                return responses, time.perf_counter() - start
+
+        responses, elapsed = asyncio.run(main())
+
+        assert all(r.status_code == 200 for r in responses)
+        assert service.calls == 1
+        assert elapsed < 8 * service.delay
+        assert "feature_executor" in responses[-1].json()
+
+    def test_saturation_returns_503(self, monkeypatch):
+        """测试执行器已满时返回 503"""
+        full = BoundedExecutor(max_workers=1, max_queue=0)
+        monkeypatch.setattr(serving_app, "feature_executor", full)
+        monkeypatch.setattr(serving_app, "feature_service", _SlowService(0))
+        try:
+            response = TestClient(serving_app.app).post(
+                "/features/latest", json={"symbols": ["EURUSD"], "features": ["rsi_14"]}
+            )
+        finally:
+            full.shutdown()
+
+        assert response.status_code == 503
+        assert response.json()["detail"]["error_code"] == "OVERLOADED"
+
+    def test_invocations_micro_batched(self, monkeypatch):
+        """测试并发 /invocations 请求合并为一次模型调用"""
+        import httpx
+
+        batch_sizes = []
+
+        def process(matrix):
+            batch_sizes.append(len(matrix))
+            return matrix[:, 0]
+
+        executor = BoundedExecutor(max_workers=2)
+        monkeypatch.setattr(serving_app, "ENABLE_MOCK_INFERENCE", False)
+        monkeypatch.setattr(serving_app, "model_predictor", object())
+        monkeypatch.setattr(serving_app, "invocation_batcher",
+                            MicroBatcher(process, executor, max_wait_ms=20))
+        rows = np.arange(6 * SENTINEL_DIM, dtype=float).reshape(6, SENTINEL_DIM) / 1000
+
+        async def main():
+            transport = httpx.ASGITransport(app=serving_app.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return await asyncio.gather(*(
+                    client.post("/invocations", json={"instances": [[row.tolist()]]}) for row in rows
+                ))
+
+        try:
+            responses = asyncio.run(main())
+        finally:
+            executor.shutdown()
+
+        assert batch_sizes == [6]
+        for row, response in zip(rows, responses):
+            assert response.json()["predictions"] == [[pytest.approx(row[0])]]
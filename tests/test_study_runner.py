@@ -0,0 +1,197 @@
+"""Optuna Study 运行器测试 (共享矩阵、折矩阵复用、每轮上报剪枝、续跑、多进程)"""
+
+import importlib.util
+import sys
+from functools import partial
+
+import numpy as np
+import pytest
+
+optuna = pytest.importorskip("optuna")
+xgb = pytest.importorskip("xgboost")
+
+from sklearn.metrics import f1_score  # noqa: E402
+from sklearn.model_selection import TimeSeriesSplit  # noqa: E402
+
+from src.model import study_runner  # noqa: E402
+from src.model.optimization import OptunaOptimizer, xgboost_search_space  # noqa: E402
+from src.model.study_runner import StudyRunner, holdout_folds  # noqa: E402
+
+N_SAMPLES = 600
+N_FEATURES = 6
+
+
+def small_space(trial):
+    """小轮数搜索空间 (学习率跨度大, 便于剪枝)"""
+    return {
+        'max_depth': trial.suggest_int('max_depth', 2, 4),
+        'learning_rate': trial.suggest_float('learning_rate', 1e-4, 0.5, log=True),
+        'n_estimators': trial.suggest_int('n_estimators', 10, 20),
+        'tree_method': 'hist',
+        'verbosity': 0,
+    }
+
+
+def lightgbm_space(trial):
+    """LightGBM 小搜索空间"""
+    return {
+        'objective': 'binary',
+        'metric': 'binary_logloss',
+        'num_leaves': trial.suggest_int('num_leaves', 4, 16),
+        'learning_rate': trial.suggest_float('learning_rate', 0.05, 0.3, log=True),
+        'min_child_samples': trial.suggest_int('min_child_samples', 5, 50),
+        'n_jobs': -1,
+    }
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(N_SAMPLES, N_FEATURES)).astype(np.float32)
+    y = (X[:, 0] + 0.5 * rng.normal(size=N_SAMPLES) > 0).astype(int)
+    return X, y
+
+
+def _folds(X):
+    return list(TimeSeriesSplit(n_splits=3).split(X))
+
+
+class TestStudyRunner:
+    """单进程运行测试"""
+
+    def test_matches_classifier_and_reports_every_round(self, data, tmp_path):
+        """测试试验得分等于 XGBClassifier 逐折训练的 F1, 且每折每轮都有上报"""
+        X, y = data
+        runner = StudyRunner(X, y, _folds(X), small_space, pruner='none', max_rounds=20,
+                             study_dir=tmp_path, n_startup_trials=2)
+        report = runner.optimize(3)
+        assert report['completed'] == 3 and report['trials_per_hour'] > 0
+
+        for trial in runner.study.trials:
+            params = small_space(optuna.trial.FixedTrial(trial.params))
+            expected = []
+            for train_idx, valid_idx in _folds(X):
+                model = xgb.XGBClassifier(**params).fit(X[train_idx], y[train_idx])
+                expected.append(f1_score(y[valid_idx], model.predict(X[valid_idx]), average='weighted'))
+            assert trial.value == pytest.approx(np.mean(expected), abs=1e-9)
+
+            rounds = trial.params['n_estimators']
+            steps = sorted(trial.intermediate_values)
+            assert steps == [k * 20 + r for k in range(3) for r in range(rounds)]
+
+    def test_fold_matrices_built_once(self, data, tmp_path, monkeypatch):
+        """测试折矩阵每个 runner 只构建一次, close() 时释放; 训练矩阵以 memmap 共享"""
+        X, y = data
+        calls = []
+        build = study_runner._build_folds
+        monkeypatch.setattr(study_runner, '_build_folds', lambda *a: calls.append(a) or build(*a))
+
+        with StudyRunner(X, y, _folds(X), small_space, study_dir=tmp_path) as runner:
+            runner.optimize(4)
+            runner.optimize(2)
+            assert len(calls) == 1 and len(runner._fold_cache) == 1
+        assert runner._fold_cache == {}
+        assert len(runner.study.trials) == 6
+
+        shared = np.load(tmp_path / 'X.npy', mmap_mode='r')
+        assert isinstance(shared, np.memmap)
+        np.testing.assert_array_equal(shared, X)
+
+    def test_temporary_study_dir_removed(self, data):
+        """测试未指定 study_dir 时 close() 删除临时目录, Study 结果仍可读取"""
+        X, y = data
+        with StudyRunner(X, y, _folds(X), small_space, pruner='none') as runner:
+            study_dir = runner.study_dir
+            report = runner.optimize(2)
+            assert (study_dir / 'X.npy').exists()
+        assert not study_dir.exists()
+        assert runner.study.best_value == report['best_value']
+        assert len(runner.study.trials) == 2 and runner.study.best_trial.user_attrs['fold_scores']
+
+        dropped = StudyRunner(X, y, _folds(X), small_space)
+        study_dir = dropped.study_dir
+        del dropped
+        assert not study_dir.exists()  # 未 close() 时回收 runner 也会删除
+
+    def test_median_pruning(self, data, tmp_path):
+        """测试中位数剪枝: 启动期后劣于中位数的试验在训练中途被剪枝"""
+        X, y = data
+        runner = StudyRunner(X, y, _folds(X), small_space, pruner='median', max_rounds=20,
+                             study_dir=tmp_path, n_startup_trials=3, n_warmup_steps=2, seed=0)
+        report = runner.optimize(15)
+        pruned = [t for t in runner.study.trials if t.state == optuna.trial.TrialState.PRUNED]
+        assert report['pruned'] == len(pruned) > 0
+        for trial in pruned:
+            assert trial.last_step < 3 * 20
+
+    def test_lightgbm_with_weights_and_early_stopping(self, data, tmp_path):
+        """测试 LightGBM 后端: holdout 折、样本权重、早停与 logloss 指标"""
+        X, y = data
+        weight = np.random.default_rng(1).uniform(0.5, 1.5, N_SAMPLES)
+        runner = StudyRunner(X, y, holdout_folds(450, 150), lightgbm_space, backend='lightgbm',
+                             scoring='logloss', sample_weight=weight, pruner='hyperband',
+                             max_rounds=100, early_stopping_rounds=5, study_dir=tmp_path)
+        report = runner.optimize(4)
+        assert report['completed'] + report['pruned'] == 4
+        assert -1.0 < report['best_value'] < 0
+        assert (tmp_path / 'weight.npy').exists()
+
+
+class TestOptunaOptimizer:
+    """OptunaOptimizer 驱动测试"""
+
+    def test_validates_inputs_once(self, data, tmp_path, monkeypatch):
+        """测试 optimize() 在构建 Study 前验证一次训练/测试特征"""
+        from scripts.ai_governance import data_validator
+
+        X, y = data
+        calls = []
+        validate = data_validator.DataValidator.validate_features
+        monkeypatch.setattr(data_validator.DataValidator, 'validate_features',
+                            lambda self, features, name="Features", **kw:
+                            calls.append(name) or validate(self, features, name, **kw))
+
+        optimizer = OptunaOptimizer(X[:450], X[450:], y[:450], y[450:], n_trials=2,
+                                    study_dir=tmp_path, pruner='none')
+        optimizer.optimize()
+        assert calls == ["Training Features", "Test Features"]
+
+
+class TestStudyPersistence:
+    """存储续跑与多进程测试"""
+
+    @pytest.mark.parametrize("storage", ["journal", "sqlite"])
+    def test_resume(self, data, tmp_path, storage):
+        """测试同一目录同名 Study 再次运行时续跑, 数据变化时拒绝"""
+        X, y = data
+        StudyRunner(X, y, _folds(X), small_space, study_dir=tmp_path, study_name='s',
+                    storage=storage).optimize(2)
+
+        resumed = StudyRunner(X, y, _folds(X), small_space, study_dir=tmp_path, study_name='s',
+                              storage=storage)
+        assert len(resumed.study.trials) == 2
+        report = resumed.optimize(2)
+        assert report['trials'] == 2 and report['total_trials'] == 4
+
+        with pytest.raises(ValueError):
+            StudyRunner(X + 1, y, _folds(X), small_space, study_dir=tmp_path, study_name='s',
+                        storage=storage)
+        np.testing.assert_array_equal(np.load(tmp_path / 'X.npy'), X)  # 原 Study 的共享矩阵未被覆盖
+
+    def test_multiprocess_workers(self, data, tmp_path):
+        """测试多个 spawn worker 共享存储, 试验数按 worker 均分"""
+        X, y = data
+        runner = StudyRunner(X, y, _folds(X), partial(xgboost_search_space, random_state=0),
+                             study_dir=tmp_path, n_jobs=2, max_rounds=20)
+        report = runner.optimize(3)
+        assert report['trials'] == 3 and report['failed'] == 0
+        assert report['n_jobs'] == 2
+
+    def test_optuna3_journal_fallback(self, monkeypatch):
+        """测试没有 optuna.storages.journal (optuna 3.x) 时回退到 JournalFileStorage"""
+        monkeypatch.setitem(sys.modules, 'optuna.storages.journal', None)
+        spec = importlib.util.spec_from_file_location('study_runner_optuna3', study_runner.__file__)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        assert module.optuna is optuna
+        assert module.JournalFileBackend is optuna.storages.JournalFileStorage
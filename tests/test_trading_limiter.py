@@ -0,0 +1,167 @@
+"""交易轨道限流测试 (asyncio 原生速率/并发限制器、轨道隔离)"""
+
+import asyncio
+import time
+
+import pytest
+
+from src.trading import (
+    AssetType,
+    AsyncConcurrencyLimiter,
+    AsyncRateLimiter,
+    DispatcherConfig,
+    Order,
+    OrderSide,
+    OrderType,
+    RateLimiter,
+    TrackConfig,
+    TrackDispatcher,
+)
+
+
+def _order(asset_type):
+    return Order(asset_type=asset_type, order_type=OrderType.MARKET, side=OrderSide.BUY, quantity=0.1)
+
+
+class TestAsyncRateLimiter:
+    """AsyncRateLimiter 测试"""
+
+    def test_fifo_exact_wait(self):
+        """测试令牌耗尽后按调用顺序、按精确时长等待"""
+        limiter = AsyncRateLimiter(20)
+
+        async def main():
+            order = []
+
+            async def take(n):
+                await limiter.acquire()
+                order.append(n)
+
+            start = time.perf_counter()
+            await asyncio.gather(*[take(n) for n in range(25)])
+            return order, time.perf_counter() - start
+
+        order, elapsed = asyncio.run(main())
+
+        assert order == list(range(25))
+        assert 0.2 <= elapsed < 0.4  # 5 个超额令牌 / 20 每秒
+        metrics = limiter.get_metrics()
+        assert metrics['acquired'] == 25 and metrics['waited'] == 5
+        assert metrics['max_wait_ms'] == pytest.approx(250, abs=10)
+
+    def test_cancelled_waiter_returns_reservation(self):
+        """测试等待中被取消的请求归还预约, 不拖慢后续请求"""
+        limiter = AsyncRateLimiter(10)
+
+        async def main():
+            for _ in range(10):
+                await limiter.acquire()
+            with pytest.raises(asyncio.TimeoutError):
+                async with asyncio.timeout(0.01):
+                    await limiter.acquire(5)
+            return await limiter.acquire()
+
+        assert asyncio.run(main()) < 0.15
+        assert limiter.get_metrics()['waiting'] == 0
+
+    def test_try_acquire_does_not_jump_queue(self):
+        """测试非阻塞获取不插队"""
+        limiter = AsyncRateLimiter(5)
+
+        async def main():
+            for _ in range(5):
+                assert limiter.try_acquire()
+            waiter = asyncio.create_task(limiter.acquire())
+            await asyncio.sleep(0)
+            assert not limiter.try_acquire()
+            await waiter
+
+        asyncio.run(main())
+
+    def test_sync_limiter_still_works(self):
+        """测试线程版 wait_and_acquire 按令牌补充时长等待"""
+        limiter = RateLimiter(50)
+        start = time.perf_counter()
+        for _ in range(55):
+            limiter.wait_and_acquire()
+        assert 0.08 <= time.perf_counter() - start < 0.3
+
+
+class TestAsyncConcurrencyLimiter:
+    """AsyncConcurrencyLimiter 测试"""
+
+    def test_fifo_handoff_per_track(self):
+        """测试许可释放时按 FIFO 转交给同轨道等待者, 并统计指标"""
+        limiter = AsyncConcurrencyLimiter(global_limit=10, track_limits={'EUR': 2})
+
+        async def main():
+            order = []
+
+            async def job(n):
+                await limiter.acquire('EUR')
+                order.append(n)
+                await asyncio.sleep(0.01)
+                limiter.release('EUR')
+
+            tasks = [asyncio.create_task(job(n)) for n in range(6)]
+            await asyncio.sleep(0.001)
+            metrics = limiter.get_metrics()['tracks']['EUR']
+            await asyncio.gather(*tasks)
+            return order, metrics
+
+        order, busy = asyncio.run(main())
+
+        assert order == list(range(6))
+        assert busy['in_use'] == 2 and busy['waiting'] == 4 and busy['utilization'] == 1.0
+        assert limiter.get_track_usage('EUR') == 0 and limiter.get_global_usage() == 0
+        assert limiter.get_metrics()['tracks']['EUR']['acquired'] == 6
+
+    def test_global_limit_and_try_acquire(self):
+        """测试全局上限与非阻塞获取失败时不泄漏轨道许可"""
+        limiter = AsyncConcurrencyLimiter(global_limit=1, track_limits={'EUR': 1, 'BTC': 1})
+
+        assert limiter.try_acquire('EUR')
+        assert not limiter.try_acquire('BTC')
+        assert limiter.get_track_usage('BTC') == 0
+        assert not limiter.is_track_available('BTC')
+
+        limiter.release('EUR')
+        assert limiter.try_acquire('BTC')
+
+
+class TestTrackIsolation:
+    """跨轨道隔离测试"""
+
+    def test_saturated_track_does_not_delay_other_track(self):
+        """测试 BTC 轨道限流排队时 EUR 订单仍立即完成"""
+        config = DispatcherConfig(track_configs={
+            asset: TrackConfig(track_id=f"TRACK_{asset.value}", asset_type=asset,
+                               max_concurrent=500, rate_limit_per_second=20)
+            for asset in (AssetType.EUR, AssetType.BTC)
+        })
+        dispatcher = TrackDispatcher(config)
+
+        async def main():
+            crypto = [asyncio.create_task(dispatcher.dispatch(_order(AssetType.BTC))) for _ in range(100)]
+            await asyncio.sleep(0.05)
+
+            latencies = []
+            for _ in range(5):
+                start = time.perf_counter()
+                assert (await dispatcher.dispatch(_order(AssetType.EUR))).success
+                latencies.append(time.perf_counter() - start)
+                await asyncio.sleep(0.01)
+
+            btc_waiting = dispatcher.tracks[AssetType.BTC].get_limiter_metrics()['waiting']
+            for task in crypto:
+                task.cancel()
+            await asyncio.gather(*crypto, return_exceptions=True)
+            return latencies, btc_waiting, dispatcher.get_system_status()
+
+        latencies, btc_waiting, status = asyncio.run(main())
+        dispatcher.shutdown_all()
+
+        assert btc_waiting > 50
+        assert max(latencies) < 0.02
+        assert status['tracks']['BTC']['active_orders'] == 0
+        assert status['global_concurrency']['current'] == 0
@@ -0,0 +1,125 @@
+"""交易指标收集器测试 (线程分片、延迟直方图、Prometheus 导出)"""
+
+import threading
+
+import pytest
+
+from src.trading.utils.metrics import LATENCY_BUCKETS_MS, MetricsCollector
+
+
+class TestShardedCounters:
+    """分片计数与合并测试"""
+
+    def test_summary_compatible(self):
+        """测试摘要字段与旧实现一致"""
+        metrics = MetricsCollector()
+        for _ in range(4):
+            metrics.record_order_submitted()
+        metrics.record_order_success(10.0, 'TRACK_EUR')
+        metrics.record_order_success(30.0, 'TRACK_EUR')
+        metrics.record_order_failure('TRACK_BTC', 'TIMEOUT')
+        metrics.record_order_rejected('TRACK_BTC')
+
+        summary = metrics.get_summary()
+
+        assert summary['total_orders'] == 4
+        assert summary['successful_orders'] == 2
+        assert summary['failed_orders'] == 1
+        assert summary['rejected_orders'] == 1
+        assert summary['success_rate_percent'] == 50.0
+        assert summary['avg_execution_time_ms'] == 20.0
+        assert summary['track_metrics']['TRACK_EUR'] == {'successful': 2.0, 'total_execution_time': 40.0}
+        assert summary['track_metrics']['TRACK_BTC'] == {'failed': 1.0, 'error_TIMEOUT': 1.0, 'rejected': 1.0}
+
+    def test_threads_merge_on_read(self):
+        """测试多线程各写各的分片, 读取时合并不丢计数"""
+        metrics = MetricsCollector()
+
+        def worker(track):
+            for i in range(5000):
+                metrics.record_order_success(1.0 + i % 10, track)
+                metrics.record_order_failure(track, 'TIMEOUT', 50.0)
+
+        threads = [threading.Thread(target=worker, args=(f'T{n % 2}',)) for n in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        summary = metrics.get_summary()
+        assert summary['successful_orders'] == 20000
+        assert summary['failed_orders'] == 20000
+        assert summary['track_metrics']['T0']['error_TIMEOUT'] == 10000
+        assert len(metrics._shards) == 4
+
+    def test_reset(self):
+        """测试重置后重新计数"""
+        metrics = MetricsCollector()
+        metrics.record_order_success(5.0, 'TRACK_EUR')
+        metrics.reset()
+        metrics.record_order_rejected('TRACK_EUR')
+
+        summary = metrics.get_summary()
+        assert summary['successful_orders'] == 0 and summary['rejected_orders'] == 1
+
+
+class TestLatencyHistogram:
+    """延迟直方图测试"""
+
+    def test_percentiles_per_track_and_code(self):
+        """测试分位数在桶精度内, 且按轨道和错误码分开"""
+        metrics = MetricsCollector()
+        for ms in range(1, 1001):
+            metrics.record_order_success(float(ms), 'TRACK_EUR')
+        metrics.record_order_failure('TRACK_EUR', 'TIMEOUT', 30000.0)
+
+        ok = metrics.get_latency_percentiles('TRACK_EUR')
+        assert ok['count'] == 1000
+        assert ok['avg'] == pytest.approx(500.5)
+        assert ok['p50'] == pytest.approx(500, rel=0.19)
+        assert ok['p99'] == pytest.approx(990, rel=0.19)
+
+        timeout = metrics.get_latency_percentiles('TRACK_EUR', 'TIMEOUT')
+        assert timeout['count'] == 1 and timeout['p50'] == pytest.approx(30000, rel=0.19)
+        assert metrics.get_latency_percentiles('TRACK_GBP')['count'] == 0
+        assert set(metrics.get_track_summary('TRACK_EUR')['latency_ms']) == {'OK', 'TIMEOUT'}
+
+    def test_prometheus_export(self):
+        """测试 Prometheus 文本格式: 累积桶、+Inf、sum/count 与计数器"""
+        metrics = MetricsCollector()
+        metrics.record_order_submitted()
+        for ms in (0.5, 2.0, 3.0, 1e9):
+            metrics.record_order_success(ms, 'TRACK_EUR')
+        metrics.record_order_failure('TRACK_EUR', 'TIMEOUT')
+
+        text = metrics.to_prometheus()
+        lines = dict(line.rsplit(' ', 1) for line in text.splitlines() if not line.startswith('#'))
+
+        labels = 'track="TRACK_EUR",code="OK"'
+        assert lines[f'trading_order_latency_seconds_bucket{{{labels},le="0.001"}}'] == '1'
+        assert lines[f'trading_order_latency_seconds_bucket{{{labels},le="0.002"}}'] == '2'
+        assert lines[f'trading_order_latency_seconds_bucket{{{labels},le="0.004"}}'] == '3'
+        assert lines[f'trading_order_latency_seconds_bucket{{{labels},le="+Inf"}}'] == '4'
+        assert lines[f'trading_order_latency_seconds_count{{{labels}}}'] == '4'
+        assert lines['trading_orders_total{track="all",outcome="submitted"}'] == '1'
+        assert lines['trading_orders_total{track="TRACK_EUR",outcome="successful"}'] == '4'
+        assert lines['trading_order_errors_total{track="TRACK_EUR",error_code="TIMEOUT"}'] == '1'
+        assert '# TYPE trading_order_latency_seconds histogram' in text
+
+        buckets = [int(v) for k, v in lines.items() if k.startswith('trading_order_latency_seconds_bucket')]
+        assert buckets == sorted(buckets)
+        assert len(buckets) == len(range(0, len(LATENCY_BUCKETS_MS), 4)) + 1
+
+    def test_exporter_serves_registered_collector(self):
+        """测试 Prometheus 导出器附加已注册指标源的输出"""
+        from src.monitoring.prometheus_exporter import PrometheusMetrics
+
+        metrics = MetricsCollector()
+        metrics.record_order_success(1.0, 'TRACK_BTC')
+        exporter = PrometheusMetrics()
+        exporter.register_collector(metrics)
+        exporter.register_collector(metrics)
+
+        text = exporter.to_prometheus_format()
+        assert text.count('# TYPE trading_order_latency_seconds histogram') == 1
+        assert 'trading_orders_total{track="TRACK_BTC",outcome="successful"} 1' in text